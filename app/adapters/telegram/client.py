@@ -7,6 +7,7 @@ from typing import Any
 
 import httpx
 
+from app.adapters.telegram.scheduler import StaleDraft, TelegramSendScheduler, retry_after_s
 from app.ui.native_buttons import (
     contains_advanced_button_fields,
     decorate_reply_markup,
@@ -17,18 +18,64 @@ from app.ui.presentation import polish_telegram_text
 from app.ui.rich_messages import tactical_rich_message
 
 
+_DRAFT_METHODS = frozenset({"sendRichMessageDraft", "sendMessageDraft"})
+# Methods that do not deliver anything to a chat skip the outbound budget.
+_UNSCHEDULED_METHODS = frozenset({"answerCallbackQuery", "getFile", "setChatMenuButton", "setMyCommands"})
+
+
+def _chat_key(chat_id: Any) -> int | None:
+    try:
+        return int(chat_id)
+    except (TypeError, ValueError):
+        return None
+
+
 class TelegramClient:
-    def __init__(self, bot_token: str):
+    def __init__(
+        self,
+        bot_token: str,
+        *,
+        scheduler: TelegramSendScheduler | None = None,
+        max_retry_after_s: float = 30.0,
+        max_attempts: int = 3,
+    ):
         self._token = bot_token
         self._base = f"https://api.telegram.org/bot{bot_token}"
         self._file_base = f"https://api.telegram.org/file/bot{bot_token}"
         self._client = httpx.AsyncClient(timeout=60)
+        self.scheduler = scheduler or TelegramSendScheduler()
+        self.max_retry_after_s = max(0.0, float(max_retry_after_s))
+        self.max_attempts = max(1, int(max_attempts))
 
     async def close(self) -> None:
         await self._client.aclose()
 
+    async def _post(self, method: str, chat_id: Any = None, *, retry: bool = True, **kwargs: Any) -> httpx.Response:
+        """POST one Bot API call inside the outbound budget, honoring 429 retry_after.
+
+        Drafts are never retried; a superseded draft raises StaleDraft.
+        Multipart uploads pass retry=False because their file body is consumed.
+        """
+
+        url = f"{self._base}/{method}"
+        if method in _UNSCHEDULED_METHODS:
+            return await self._client.post(url, **kwargs)
+        draft = method in _DRAFT_METHODS
+        chat = _chat_key(chat_id)
+        attempts = 1 if draft or not retry else self.max_attempts
+        for attempt in range(1, attempts + 1):
+            async with self.scheduler.slot(chat, draft=draft):
+                response = await self._client.post(url, **kwargs)
+            if response.status_code != 429:
+                return response
+            wait = retry_after_s(response)
+            self.scheduler.rate_limited(chat, wait)
+            if attempt >= attempts or wait > self.max_retry_after_s:
+                return response
+        return response
+
     async def _post_json(self, method: str, payload: dict) -> httpx.Response:
-        return await self._client.post(f"{self._base}/{method}", json=payload)
+        return await self._post(method, payload.get("chat_id"), json=payload)
 
     @staticmethod
     def _prepare_markup(reply_markup: dict | None) -> dict | None:
@@ -95,9 +142,17 @@ class TelegramClient:
         """
         Stream an ephemeral Bot API 10.1 draft.
 
-        Returns `rich`, `plain` or `unsupported`. Draft failures are deliberately
-        non-fatal because the final persistent answer uses send_message().
+        Returns `rich`, `plain`, `unsupported` or `skipped` (superseded while
+        waiting for send budget). Draft failures are deliberately non-fatal
+        because the final persistent answer uses send_message().
         """
+        try:
+            return await self._send_live_draft(chat_id, draft_id, text)
+        except StaleDraft:
+            # A newer draft or the final answer for this chat is queued.
+            return "skipped"
+
+    async def _send_live_draft(self, chat_id: int, draft_id: int, text: str) -> str:
         polished = polish_telegram_text(text)
         rich_message = tactical_rich_message(polished)
         if rich_message is not None:
@@ -283,7 +338,7 @@ class TelegramClient:
             data["reply_markup"] = json.dumps(styled_markup, ensure_ascii=False)
         with open(file_path, "rb") as file_handle:
             files = {"voice": (os.path.basename(file_path), file_handle, "audio/ogg")}
-            response = await self._client.post(f"{self._base}/sendVoice", data=data, files=files)
+            response = await self._post("sendVoice", chat_id, retry=False, data=data, files=files)
             response.raise_for_status()
 
     async def get_file(self, file_id: str) -> dict:
@@ -378,7 +433,7 @@ class TelegramClient:
             data["reply_markup"] = json.dumps(styled_markup, ensure_ascii=False)
         with open(file_path, "rb") as file_handle:
             files = {"animation": (os.path.basename(file_path), file_handle, "video/mp4")}
-            response = await self._client.post(f"{self._base}/sendAnimation", data=data, files=files)
+            response = await self._post("sendAnimation", chat_id, retry=False, data=data, files=files)
             response.raise_for_status()
 
     async def send_video_file(
@@ -398,5 +453,5 @@ class TelegramClient:
             data["reply_markup"] = json.dumps(styled_markup, ensure_ascii=False)
         with open(file_path, "rb") as file_handle:
             files = {"video": (os.path.basename(file_path), file_handle, "video/mp4")}
-            response = await self._client.post(f"{self._base}/sendVideo", data=data, files=files)
+            response = await self._post("sendVideo", chat_id, retry=False, data=data, files=files)
             response.raise_for_status()
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable
+
+import httpx
+
+
+class StaleDraft(Exception):
+    """A queued draft was superseded by a newer draft or a final message."""
+
+
+class _Bucket:
+    """Token bucket: `rate` tokens per second, at most `capacity` banked."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        self.rate = max(1e-6, float(rate))
+        self.capacity = max(1.0, float(capacity))
+        self.tokens = self.capacity
+        self.updated_at = now
+
+    def refill(self, now: float) -> None:
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+    def wait_s(self, now: float, reserve: float = 0.0) -> float:
+        """Seconds until one token is available above `reserve`."""
+
+        self.refill(now)
+        missing = 1.0 + reserve - self.tokens
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, now: float) -> None:
+        self.tokens -= 1.0
+
+    @property
+    def idle(self) -> bool:
+        return self.tokens >= self.capacity
+
+
+class _Window:
+    """Sliding window: at most `limit` sends in any `period_s` seconds."""
+
+    __slots__ = ("limit", "period_s", "sent")
+
+    def __init__(self, limit: float, period_s: float) -> None:
+        self.limit = max(1, int(limit))
+        self.period_s = max(1e-3, float(period_s))
+        self.sent: deque[float] = deque()
+
+    def wait_s(self, now: float, reserve: float = 0.0) -> float:
+        while self.sent and self.sent[0] <= now - self.period_s:
+            self.sent.popleft()
+        allowed = self.limit - int(reserve)
+        if len(self.sent) < allowed:
+            return 0.0
+        return self.sent[len(self.sent) - allowed] + self.period_s - now
+
+    def take(self, now: float) -> None:
+        self.sent.append(now)
+
+    @property
+    def idle(self) -> bool:
+        return not self.sent
+
+
+@dataclass
+class _ChatState:
+    bucket: _Bucket | _Window
+    blocked_until: float = 0.0
+    roomy: bool = False
+    finals: deque[int] = field(default_factory=deque)
+    latest_draft: int = 0
+    waiting: int = 0
+
+
+def retry_after_s(response: httpx.Response) -> float:
+    """Bot API `parameters.retry_after` of a 429, falling back to Retry-After."""
+
+    try:
+        payload = response.json()
+        value = ((payload or {}).get("parameters") or {}).get("retry_after")
+        if value is not None:
+            return max(0.0, float(value))
+    except Exception:
+        pass
+    try:
+        return max(0.0, float(response.headers.get("retry-after") or 1.0))
+    except ValueError:
+        return 1.0
+
+
+@dataclass
+class TelegramSendScheduler:
+    """Outbound Bot API budget shared by every send of one bot process.
+
+    Three limits are enforced before a request leaves: a global sliding
+    window (Telegram's ~30 messages/second per bot), a per-chat token bucket
+    (about one message per second with a small burst) and a sliding window
+    per group (20 messages/minute). A 429 blocks the chat (or the whole bot when it
+    names no chat) for its `retry_after`.
+
+    Drafts are best-effort previews: only the newest draft per chat may wait,
+    any queued draft is dropped once a final message for the chat is
+    waiting, drafts leave one chat token and the last `draft_reserve` share
+    of the global budget to final messages, and give up after
+    `draft_max_wait_s`.
+    """
+
+    global_rate_per_s: float = 30.0
+    chat_rate_per_s: float = 1.0
+    chat_burst: int = 3
+    group_limit: int = 20
+    group_period_s: float = 60.0
+    draft_reserve: float = 0.2
+    draft_max_wait_s: float = 2.0
+    max_chats: int = 10_000
+    clock: Callable[[], float] = time.monotonic
+    _chats: "OrderedDict[int, _ChatState]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _stats: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        now = self.clock()
+        self.global_rate_per_s = max(1.0, float(self.global_rate_per_s))
+        self._global = _Window(self.global_rate_per_s, 1.0)
+        self._global_blocked_until = 0.0
+        self._tickets = 0
+        self._waiting = 0
+        self._waiting_drafts = 0
+        self._stats = {"sent": 0, "dropped_drafts": 0, "rate_limited": 0, "throttled": 0}
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "TelegramSendScheduler":
+        return cls(
+            global_rate_per_s=float(getattr(settings, "telegram_global_rate_per_s", 30.0) or 30.0),
+            chat_rate_per_s=float(getattr(settings, "telegram_chat_rate_per_s", 1.0) or 1.0),
+            chat_burst=int(getattr(settings, "telegram_chat_burst", 3) or 3),
+            group_limit=int(getattr(settings, "telegram_group_rate_per_min", 20) or 20),
+        )
+
+    def _chat(self, chat_id: int, now: float) -> _ChatState:
+        state = self._chats.get(chat_id)
+        if state is None:
+            if chat_id < 0:
+                bucket: _Bucket | _Window = _Window(self.group_limit, self.group_period_s)
+            else:
+                bucket = _Bucket(self.chat_rate_per_s, self.chat_burst, now)
+            roomy = (self.group_limit if chat_id < 0 else self.chat_burst) > 1
+            state = self._chats[chat_id] = _ChatState(bucket, roomy=roomy)
+            self._prune(now)
+        self._chats.move_to_end(chat_id)
+        return state
+
+    def _prune(self, now: float) -> None:
+        # Idle chats with a refilled bucket carry no information; drop the oldest.
+        for chat_id in list(self._chats)[: max(0, len(self._chats) - self.max_chats)]:
+            state = self._chats[chat_id]
+            state.bucket.wait_s(now)
+            if not state.waiting and state.blocked_until <= now and state.bucket.idle:
+                del self._chats[chat_id]
+
+    @asynccontextmanager
+    async def slot(self, chat_id: int | None, *, draft: bool = False) -> AsyncIterator[None]:
+        """Wait for budget to send one request to `chat_id`; raises StaleDraft."""
+
+        now = self.clock()
+        state = self._chat(int(chat_id), now) if chat_id is not None else None
+        self._tickets += 1
+        ticket = self._tickets
+        self._waiting += 1
+        if draft:
+            self._waiting_drafts += 1
+        if state is not None:
+            state.waiting += 1
+            if draft:
+                state.latest_draft = ticket
+            else:
+                state.finals.append(ticket)
+        started = now
+        throttled = False
+        try:
+            while True:
+                now = self.clock()
+                if draft and state is not None and (state.latest_draft != ticket or state.finals):
+                    self._stats["dropped_drafts"] += 1
+                    raise StaleDraft()
+                waits = [
+                    self._global_blocked_until - now,
+                    self._global.wait_s(now, self.global_rate_per_s * self.draft_reserve if draft else 0.0),
+                ]
+                if state is not None:
+                    waits.append(state.blocked_until - now)
+                    # Drafts leave one chat token for the final answer.
+                    waits.append(state.bucket.wait_s(now, 1.0 if draft and state.roomy else 0.0))
+                    if not draft and state.finals[0] != ticket:
+                        # Messages to one chat leave in the order they were queued.
+                        waits.append(0.01)
+                wait = max(waits)
+                if wait <= 0:
+                    break
+                if draft and now + wait - started > self.draft_max_wait_s:
+                    self._stats["dropped_drafts"] += 1
+                    raise StaleDraft()
+                throttled = True
+                # Short naps so a final message can overtake a waiting draft.
+                await asyncio.sleep(min(wait, 0.25))
+            self._global.take(now)
+            if state is not None:
+                state.bucket.take(now)
+            self._stats["sent"] += 1
+            if throttled:
+                self._stats["throttled"] += 1
+        finally:
+            self._waiting -= 1
+            if draft:
+                self._waiting_drafts -= 1
+            if state is not None:
+                state.waiting -= 1
+                if not draft:
+                    state.finals.remove(ticket)
+        yield
+
+    def rate_limited(self, chat_id: int | None, retry_after: float) -> None:
+        """Honor a 429: hold the chat, or every chat when none is named."""
+
+        until = self.clock() + max(0.0, float(retry_after))
+        self._stats["rate_limited"] += 1
+        if chat_id is None:
+            self._global_blocked_until = max(self._global_blocked_until, until)
+            return
+        state = self._chat(int(chat_id), self.clock())
+        state.blocked_until = max(state.blocked_until, until)
+
+    def status(self) -> dict[str, Any]:
+        now = self.clock()
+        return {
+            "queue_depth": self._waiting,
+            "queued_drafts": self._waiting_drafts,
+            "blocked_chats": sum(1 for state in self._chats.values() if state.blocked_until > now),
+            "globally_blocked": self._global_blocked_until > now,
+            "tracked_chats": len(self._chats),
+            **self._stats,
+        }
@@ -41,6 +41,42 @@ class Settings(BaseSettings):
     telegram_update_dedupe_max_entries: int = int(
         os.getenv("TELEGRAM_UPDATE_DEDUPE_MAX_ENTRIES", "20000")
     )
+    # Outbound Bot API budget: global, per-chat and per-group send rates.
+    # A 429 retry_after above the cap is surfaced instead of waited out.
+    telegram_global_rate_per_s: float = float(
+        os.getenv("TELEGRAM_GLOBAL_RATE_PER_S", "30")
+    )
+    telegram_chat_rate_per_s: float = float(
+        os.getenv("TELEGRAM_CHAT_RATE_PER_S", "1")
+    )
+    telegram_chat_burst: int = int(
+        os.getenv("TELEGRAM_CHAT_BURST", "3")
+    )
+    telegram_group_rate_per_min: int = int(
+        os.getenv("TELEGRAM_GROUP_RATE_PER_MIN", "20")
+    )
+    telegram_max_retry_after_s: float = float(
+        os.getenv("TELEGRAM_MAX_RETRY_AFTER_S", "30")
+    )
+    # Background update queue: the webhook acks at once and in-process
+    # workers handle updates, in order per chat and in parallel across chats.
+    telegram_update_queue_enabled: bool = _env_on(
+        "TELEGRAM_UPDATE_QUEUE_ENABLED"
+    )
+    telegram_update_workers: int = int(
+        os.getenv("TELEGRAM_UPDATE_WORKERS", "8")
+    )
+    telegram_update_queue_max: int = int(
+        os.getenv("TELEGRAM_UPDATE_QUEUE_MAX", "1000")
+    )
+    telegram_update_queue_max_per_chat: int = int(
+        os.getenv("TELEGRAM_UPDATE_QUEUE_MAX_PER_CHAT", "50")
+    )
+    telegram_update_drain_timeout_s: float = float(
+        os.getenv("TELEGRAM_UPDATE_DRAIN_TIMEOUT_S", "20")
+    )
+    # Bearer token for GET /metrics (Prometheus text). Empty = endpoint off.
+    metrics_token: str = os.getenv("METRICS_TOKEN", "")
     telegram_aaa_console_enabled: bool = _env_on(
         "TELEGRAM_AAA_CONSOLE_ENABLED"
     )
@@ -72,6 +108,12 @@ class Settings(BaseSettings):
     usage_guard_max_buckets: int = int(
         os.getenv("USAGE_GUARD_MAX_BUCKETS", "10000")
     )
+    usage_guard_max_bytes: int = int(
+        os.getenv("USAGE_GUARD_MAX_BYTES", str(16 * 1024 * 1024))
+    )
+    # SQLite file shared by the workers on one host so quotas and update
+    # dedupe hold across processes; empty keeps process-local guards.
+    guard_state_path: str = os.getenv("GUARD_STATE_PATH", "")
     ai_rate_limit_1m: int = int(os.getenv("AI_RATE_LIMIT_1M", "12"))
     ai_rate_limit_1h: int = int(os.getenv("AI_RATE_LIMIT_1H", "120"))
     ai_global_rate_limit_1m: int = int(
@@ -114,12 +156,28 @@ class Settings(BaseSettings):
     memory_max_turns: int = int(os.getenv("MEMORY_MAX_TURNS", "20"))
     storage_backend: str = os.getenv("STORAGE_BACKEND", "auto")
     storage_timeout_s: float = float(os.getenv("STORAGE_TIMEOUT_S", "8"))
+    # Async pooled PostgREST engine: one bounded (HTTP/2 when available)
+    # connection pool shared by all store calls, each with its own deadline.
+    storage_call_deadline_s: float = float(
+        os.getenv("STORAGE_CALL_DEADLINE_S", "4")
+    )
+    storage_pool_max_connections: int = int(
+        os.getenv("STORAGE_POOL_MAX_CONNECTIONS", "32")
+    )
+    storage_http2_enabled: bool = _env_on("STORAGE_HTTP2_ENABLED")
     storage_outbox_max: int = int(
         os.getenv("STORAGE_OUTBOX_MAX", "500")
     )
     storage_replay_batch: int = int(
         os.getenv("STORAGE_REPLAY_BATCH", "50")
     )
+    # Crash-safe SQLite outbox journal; an empty path keeps the process-local one.
+    storage_outbox_path: str = os.getenv(
+        "STORAGE_OUTBOX_PATH", ".bco_storage/outbox.sqlite3"
+    )
+    storage_durable_outbox_max: int = int(
+        os.getenv("STORAGE_DURABLE_OUTBOX_MAX", "50000")
+    )
     supabase_url: str = os.getenv(
         "SUPABASE_URL",
         DEFAULT_BCO_SUPABASE_URL,
@@ -161,6 +219,43 @@ class Settings(BaseSettings):
     entitlement_timeout_s: float = float(
         os.getenv("ENTITLEMENT_TIMEOUT_S", "8")
     )
+    # Per-user Telegram entitlement status cache; failures use the shorter TTL.
+    entitlement_cache_ttl_s: float = float(
+        os.getenv("ENTITLEMENT_CACHE_TTL_S", "60")
+    )
+    entitlement_negative_ttl_s: float = float(
+        os.getenv("ENTITLEMENT_NEGATIVE_TTL_S", "10")
+    )
+    entitlement_cache_max_entries: int = int(
+        os.getenv("ENTITLEMENT_CACHE_MAX_ENTRIES", "5000")
+    )
+    # Telegram -> canonical identity resolutions; unresolved users use the
+    # shorter TTL. Link, unlink and purge invalidate explicitly.
+    identity_cache_ttl_s: float = float(
+        os.getenv("IDENTITY_CACHE_TTL_S", "600")
+    )
+    identity_negative_ttl_s: float = float(
+        os.getenv("IDENTITY_NEGATIVE_TTL_S", "30")
+    )
+    identity_cache_max_entries: int = int(
+        os.getenv("IDENTITY_CACHE_MAX_ENTRIES", "10000")
+    )
+    # Per-player progression projections; this process's own writes update
+    # them in place, other workers' writes show up after the TTL.
+    progression_projection_ttl_s: float = float(
+        os.getenv("PROGRESSION_PROJECTION_TTL_S", "15")
+    )
+    progression_projection_max_players: int = int(
+        os.getenv("PROGRESSION_PROJECTION_MAX_PLAYERS", "2000")
+    )
+    # Materialized player views (Operator Twin) folded forward from this
+    # process's write journal; rebuilt from storage after the TTL.
+    player_view_ttl_s: float = float(
+        os.getenv("PLAYER_VIEW_TTL_S", "15")
+    )
+    player_view_max_players: int = int(
+        os.getenv("PLAYER_VIEW_MAX_PLAYERS", "2000")
+    )
 
     # Live official game intelligence
     live_knowledge_enabled: bool = _env_on("LIVE_KNOWLEDGE_ENABLED")
@@ -237,6 +332,12 @@ class Settings(BaseSettings):
     voice_model_timeout_s: float = float(
         os.getenv("VOICE_MODEL_TIMEOUT_S", "120")
     )
+    # Parallel voice renders: cloud requests in flight, and loaded Piper
+    # instances per local model (each holds its own ONNX session).
+    voice_cloud_concurrency: int = int(
+        os.getenv("VOICE_CLOUD_CONCURRENCY", "8")
+    )
+    voice_piper_workers: int = int(os.getenv("VOICE_PIPER_WORKERS", "2"))
     voice_max_chars: int = int(os.getenv("VOICE_MAX_CHARS", "3200"))
     voice_duplex_max_chars: int = int(
         os.getenv("VOICE_DUPLEX_MAX_CHARS", "1800")
@@ -260,6 +361,16 @@ class Settings(BaseSettings):
     ai_enabled: bool = _env_on("AI_ENABLED")
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+    # Process-wide keep-alive OpenAI clients with per-purpose concurrency caps.
+    openai_pool_max_connections: int = int(
+        os.getenv("OPENAI_POOL_MAX_CONNECTIONS", "20")
+    )
+    openai_pool_acquire_timeout_s: float = float(
+        os.getenv("OPENAI_POOL_ACQUIRE_TIMEOUT_S", "30")
+    )
+    openai_chat_concurrency: int = int(os.getenv("OPENAI_CHAT_CONCURRENCY", "16"))
+    openai_vision_concurrency: int = int(os.getenv("OPENAI_VISION_CONCURRENCY", "4"))
+    openai_tts_concurrency: int = int(os.getenv("OPENAI_TTS_CONCURRENCY", "8"))
 
 
 @lru_cache(maxsize=1)
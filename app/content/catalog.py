@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
+import threading
+import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from app.domain.enums import Game, InputDevice, SkillTier, Mode
 
+log = logging.getLogger("bco.content")
 
-@dataclass
+
+@dataclass(frozen=True)
 class SettingsPack:
     game: Game
     mode: Mode
@@ -17,16 +25,127 @@ class SettingsPack:
     title: str
     last_updated: str
     source: str
-    settings: dict[str, Any]
+    settings: Mapping[str, Any]
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """One parse of the data directory, indexed by the file naming convention."""
+
+    signature: tuple[tuple[str, int, int], ...]
+    files: Mapping[str, Any]
+    packs: Mapping[tuple[Game, Mode, InputDevice, SkillTier], SettingsPack]
+    training: Mapping[tuple[Game, Mode, SkillTier], Mapping[str, Any]]
+    classes: Mapping[Game, Mapping[str, Any]]
+
+
+def _index(signature: tuple[tuple[str, int, int], ...], files: dict[str, Any]) -> _Snapshot:
+    packs: dict[tuple[Game, Mode, InputDevice, SkillTier], SettingsPack] = {}
+    training: dict[tuple[Game, Mode, SkillTier], Mapping[str, Any]] = {}
+    classes: dict[Game, Mapping[str, Any]] = {}
+    for name, raw in files.items():
+        parts = name[: -len(".json")].split("__")
+        try:
+            if parts[0] == "classes" and len(parts) == 2:
+                classes[Game(parts[1])] = raw
+            elif parts[0] == "training" and len(parts) == 4:
+                training[(Game(parts[1]), Mode(parts[2]), SkillTier(parts[3]))] = raw
+            elif len(parts) == 4:
+                game, mode, device, tier = Game(parts[0]), Mode(parts[1]), InputDevice(parts[2]), SkillTier(parts[3])
+                packs[(game, mode, device, tier)] = SettingsPack(
+                    game=game,
+                    mode=mode,
+                    device=device,
+                    tier=tier,
+                    title=raw["title"],
+                    last_updated=raw["last_updated"],
+                    source=raw["source"],
+                    settings=raw["settings"],
+                )
+        except (KeyError, ValueError, TypeError):
+            log.warning("content file skipped name=%s reason=unindexed", name)
+    return _Snapshot(
+        signature=signature,
+        files=MappingProxyType(files),
+        packs=MappingProxyType(packs),
+        training=MappingProxyType(training),
+        classes=MappingProxyType(classes),
+    )
 
 
 class ContentCatalog:
-    def __init__(self, base_dir: str = "app/content/data"):
+    """Preset content from `app/content/data`, parsed once and served from memory.
+
+    Every JSON file is decoded at construction into read-only mappings and
+    tuples, then indexed by game/mode/device/tier, so lookups on the chat path
+    are dict accesses. Operators can still edit files in place: at most every
+    `reload_interval_s` a lookup compares file mtimes and sizes and swaps in a
+    fresh snapshot when they changed. A file that fails to parse keeps its
+    previous content. `reload_interval_s=None` turns the check off.
+    """
+
+    def __init__(self, base_dir: str = "app/content/data", *, reload_interval_s: float | None = 2.0):
         self.base = Path(base_dir)
+        self.reload_interval_s = None if reload_interval_s is None else max(0.0, float(reload_interval_s))
+        self._reload_lock = threading.Lock()
+        self._checked_at = time.monotonic()
+        self._snapshot = self._build(None)
+        self.reloads = 0
+
+    def _signature(self) -> tuple[tuple[str, int, int], ...]:
+        try:
+            entries = []
+            for entry in os.scandir(self.base):
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            return ()
+        return tuple(sorted(entries))
+
+    def _build(self, previous: _Snapshot | None) -> _Snapshot:
+        signature = self._signature()
+        files: dict[str, Any] = {}
+        for name, _mtime, _size in signature:
+            try:
+                files[name] = _freeze(json.loads((self.base / name).read_text(encoding="utf-8")))
+            except (OSError, ValueError) as exc:
+                if previous is not None and name in previous.files:
+                    files[name] = previous.files[name]
+                log.warning("content file unreadable name=%s error=%s", name, type(exc).__name__)
+        return _index(signature, files)
 
-    def _load_json(self, name: str) -> dict[str, Any]:
-        p = self.base / name
-        return json.loads(p.read_text(encoding="utf-8"))
+    def _current(self) -> _Snapshot:
+        if self.reload_interval_s is None:
+            return self._snapshot
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval_s:
+            return self._snapshot
+        # One caller rechecks; the rest keep serving the current snapshot.
+        if self._reload_lock.acquire(blocking=False):
+            try:
+                self._checked_at = now
+                if self._signature() != self._snapshot.signature:
+                    self._snapshot = self._build(self._snapshot)
+                    self.reloads += 1
+                    log.info("content catalog reloaded files=%d", len(self._snapshot.files))
+            finally:
+                self._reload_lock.release()
+        return self._snapshot
+
+    def _load_json(self, name: str) -> Mapping[str, Any]:
+        try:
+            return self._current().files[name]
+        except KeyError:
+            raise FileNotFoundError(str(self.base / name)) from None
 
     def list_games(self) -> list[Game]:
         return [Game.WARZONE, Game.BF6, Game.BO7]
@@ -41,24 +160,31 @@ class ContentCatalog:
         return []
 
     def load_settings_pack(self, game: Game, mode: Mode, device: InputDevice, tier: SkillTier) -> SettingsPack:
+        snapshot = self._current()
+        pack = snapshot.packs.get((game, mode, device, tier))
+        if pack is not None:
+            return pack
         # file naming convention
         fname = f"{game.value}__{mode.value}__{device.value}__{tier.value}.json"
-        raw = self._load_json(fname)
-        return SettingsPack(
-            game=game,
-            mode=mode,
-            device=device,
-            tier=tier,
-            title=raw["title"],
-            last_updated=raw["last_updated"],
-            source=raw["source"],
-            settings=raw["settings"],
-        )
-
-    def load_training_plan(self, game: Game, mode: Mode, tier: SkillTier) -> dict[str, Any]:
-        fname = f"training__{game.value}__{mode.value}__{tier.value}.json"
-        return self._load_json(fname)
-
-    def load_classes(self, game: Game) -> dict[str, Any]:
-        fname = f"classes__{game.value}.json"
-        return self._load_json(fname)
+        if fname in snapshot.files:
+            raise KeyError(fname)  # present but missing a required field
+        raise FileNotFoundError(str(self.base / fname))
+
+    def load_training_plan(self, game: Game, mode: Mode, tier: SkillTier) -> Mapping[str, Any]:
+        plan = self._current().training.get((game, mode, tier))
+        if plan is None:
+            raise FileNotFoundError(str(self.base / f"training__{game.value}__{mode.value}__{tier.value}.json"))
+        return plan
+
+    def load_classes(self, game: Game) -> Mapping[str, Any]:
+        classes = self._current().classes.get(game)
+        if classes is None:
+            raise FileNotFoundError(str(self.base / f"classes__{game.value}.json"))
+        return classes
+
+
+@lru_cache(maxsize=8)
+def default_catalog(base_dir: str = "app/content/data") -> ContentCatalog:
+    """Process-wide catalog, so the data directory is parsed once per process."""
+
+    return ContentCatalog(base_dir)
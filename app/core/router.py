@@ -142,21 +142,23 @@ class Router(_base.Router):
 
     async def _chat_to_brain(self, chat_id: int, text: str) -> None:
         text = (text or "").strip()
-        profile = self._get_profile(chat_id)
+        # Store calls are sync PostgREST round trips; run them off the event
+        # loop so one slow storage call never stalls every other chat.
+        profile = await asyncio.to_thread(self._get_profile, chat_id)
         locale = resolve_locale(profile=profile, text=text)
         if str(profile.get("language_override") or "").strip() == "":
-            try: self.profiles.patch(chat_id, {"language": locale})
+            try: await asyncio.to_thread(self.profiles.patch, chat_id, {"language": locale})
             except Exception: pass
             profile["language"] = locale
         if not text:
             await self._send_main(chat_id, _base._wrap_premium(tr(locale, "🤝 Напиши ситуацию текстом. Пустой запрос анализировать нечего.", "🤝 Describe the situation in text. There is nothing to analyze in an empty request."), profile=profile)); return
         if len(text) > 6000: text = _base._truncate(text, 6000)
         if self.store and hasattr(self.store, "add"):
-            try: self.store.add(chat_id, "user", text)
+            try: await asyncio.to_thread(self.store.add, chat_id, "user", text)
             except Exception: pass
         history=[]
         if self.store and hasattr(self.store,"get"):
-            try: history=list(self.store.get(chat_id) or [])
+            try: history=list(await asyncio.to_thread(self.store.get, chat_id) or [])
             except Exception: history=[]
         live_enabled=bool(getattr(self.settings,"telegram_live_drafts_enabled",True) if self.settings is not None else True)
         live=TelegramLiveResponse(tg=self.tg,chat_id=chat_id)
@@ -186,7 +188,7 @@ class Router(_base.Router):
                 try: await live.finish(final_reply)
                 except Exception: pass
             if self.store and hasattr(self.store,"add"):
-                try: self.store.add(chat_id,"assistant",final_reply)
+                try: await asyncio.to_thread(self.store.add,chat_id,"assistant",final_reply)
                 except Exception: pass
             await self._send_main(chat_id,_base._wrap_premium(final_reply,profile=profile))
         finally:
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Mapping
+
+
+# Seconds. Covers store calls (ms) through VOD analysis (tens of seconds).
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0,
+)
+OTHER = "other"
+MAX_SERIES_PER_METRIC = 64
+
+
+@dataclass(frozen=True)
+class HistogramSpec:
+    name: str
+    help: str
+    labels: Mapping[str, frozenset[str]] = field(default_factory=dict)
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+
+
+_OUTCOMES = frozenset({"ok", "error", "empty", "timeout", "disabled", "currentness_blocked", "saturated"})
+
+HISTOGRAMS: tuple[HistogramSpec, ...] = (
+    HistogramSpec(
+        "bco_brain_reply_seconds",
+        "BrainEngine.reply wall time.",
+        {"outcome": _OUTCOMES},
+    ),
+    HistogramSpec(
+        "bco_ai_stream_first_token_seconds",
+        "Time from stream request to the first content token.",
+    ),
+    HistogramSpec(
+        "bco_ai_stream_seconds",
+        "Full streamed completion time.",
+        {"outcome": frozenset({"ok", "empty", "error"})},
+    ),
+    HistogramSpec(
+        "bco_store_request_seconds",
+        "Supabase PostgREST request time.",
+        {
+            "method": frozenset({"GET", "POST", "PATCH", "DELETE", "HEAD"}),
+            "target": frozenset({"table", "rpc"}),
+            "outcome": frozenset({"ok", "http_4xx", "http_5xx", "error"}),
+        },
+    ),
+    HistogramSpec(
+        "bco_voice_synthesize_seconds",
+        "VoiceService.synthesize time including mastering.",
+        {"provider": frozenset({"openai", "piper", "error"})},
+    ),
+    HistogramSpec(
+        "bco_vod_analyze_seconds",
+        "VODAnalysisService.analyze_media time (frames + vision).",
+        {"outcome": frozenset({"ok", "error"})},
+    ),
+    HistogramSpec(
+        "bco_webhook_seconds",
+        "Telegram webhook time: HTTP ack and update processing.",
+        {"stage": frozenset({"ack", "process"})},
+    ),
+)
+
+
+class _Series:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class LatencyHistogram:
+    """Cumulative-bucket histogram with allow-listed label values.
+
+    A label value outside its allow-list is recorded as "other", and a
+    metric never grows past MAX_SERIES_PER_METRIC label combinations, so
+    cardinality stays bounded whatever callers pass in.
+    """
+
+    def __init__(self, spec: HistogramSpec) -> None:
+        self.spec = spec
+        self.buckets = tuple(sorted(float(x) for x in spec.buckets))
+        self._label_names = tuple(spec.labels)
+        self._series: dict[tuple[str, ...], _Series] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Mapping[str, Any]) -> tuple[str, ...]:
+        key = []
+        for name in self._label_names:
+            value = str(labels.get(name, "") or "")
+            key.append(value if value in self.spec.labels[name] else OTHER)
+        return tuple(key)
+
+    def observe(self, seconds: float, **labels: Any) -> None:
+        value = max(0.0, float(seconds))
+        if math.isnan(value):
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if len(self._series) >= MAX_SERIES_PER_METRIC:
+                    key = tuple(OTHER for _ in self._label_names)
+                    series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = _Series(len(self.buckets) + 1)
+            series.counts[index] += 1
+            series.total += value
+            series.count += 1
+
+    def _copy(self) -> list[tuple[tuple[str, ...], list[int], float, int]]:
+        with self._lock:
+            return [(key, list(s.counts), s.total, s.count) for key, s in sorted(self._series.items())]
+
+    def quantile(self, q: float, counts: list[int]) -> float:
+        """Linear interpolation inside the bucket holding the q-th observation."""
+
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = q * total
+        running = 0
+        for index, count in enumerate(counts):
+            if running + count >= rank and count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index >= len(self.buckets):
+                    return self.buckets[-1]
+                upper = self.buckets[index]
+                return lower + (upper - lower) * ((rank - running) / count)
+            running += count
+        return self.buckets[-1]
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        rows = []
+        for key, counts, total, count in self._copy():
+            rows.append({
+                "labels": dict(zip(self._label_names, key)),
+                "count": count,
+                "avg_ms": round(total / count * 1000, 1) if count else 0.0,
+                "p50_ms": round(self.quantile(0.50, counts) * 1000, 1),
+                "p95_ms": round(self.quantile(0.95, counts) * 1000, 1),
+                "p99_ms": round(self.quantile(0.99, counts) * 1000, 1),
+            })
+        return rows
+
+    def render(self) -> list[str]:
+        name = self.spec.name
+        lines = [f"# HELP {name} {self.spec.help}", f"# TYPE {name} histogram"]
+        for key, counts, total, count in self._copy():
+            pairs = [f'{label}="{value}"' for label, value in zip(self._label_names, key)]
+            running = 0
+            bounds = [_fmt(bound) for bound in self.buckets] + ["+Inf"]
+            for bound, bucket_count in zip(bounds, counts):
+                running += bucket_count
+                labels = ",".join(pairs + [f'le="{bound}"'])
+                lines.append(f"{name}_bucket{{{labels}}} {running}")
+            suffix = "{" + ",".join(pairs) + "}" if pairs else ""
+            lines.append(f"{name}_sum{suffix} {_fmt(total)}")
+            lines.append(f"{name}_count{suffix} {count}")
+        return lines
+
+
+def _fmt(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else f"{float(value):.1f}"
+
+
+class LatencyMetrics:
+    """Process-wide registry of the hot-path latency histograms."""
+
+    def __init__(self, specs: tuple[HistogramSpec, ...] = HISTOGRAMS) -> None:
+        self._histograms = {spec.name: LatencyHistogram(spec) for spec in specs}
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        histogram = self._histograms.get(name)
+        if histogram is not None:
+            histogram.observe(seconds, **labels)
+
+    @contextmanager
+    def time(self, name: str, **labels: Any) -> Iterator[dict[str, Any]]:
+        """Time a block; the yielded dict may update labels before it exits."""
+
+        started = time.perf_counter()
+        labels.setdefault("outcome", "ok")
+        try:
+            yield labels
+        except BaseException:
+            if labels.get("outcome") == "ok":
+                labels["outcome"] = "error"
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        return {name: histogram.snapshot() for name, histogram in self._histograms.items()}
+
+    def render_prometheus(self) -> str:
+        lines: list[str] = []
+        for histogram in self._histograms.values():
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+
+latency_metrics = LatencyMetrics()
@@ -6,6 +6,7 @@ from collections import Counter
 from dataclasses import dataclass, field
 from typing import Any, Iterable
 
+from app.observability.metrics import latency_metrics
 
 _CANONICAL_PROMOTION_BLOCKERS = {
     "shadow_disabled",
@@ -84,6 +85,7 @@ class QualityTelemetry:
             self._intents[str(intent or "UNKNOWN")[:64]] += 1
             self._knowledge[str(knowledge or "UNKNOWN")[:64]] += 1
             self._outcomes[str(outcome or "unknown")[:32]] += 1
+        latency_metrics.observe("bco_brain_reply_seconds", max(0, int(latency_ms or 0)) / 1000.0, outcome=outcome)
 
     def record_feedback(self, rating: str) -> None:
         with self._lock:
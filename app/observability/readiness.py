@@ -4,6 +4,7 @@ from __future__ import annotations
 import os
 from typing import Any
 
+from app.observability.metrics import latency_metrics
 from app.observability.quality import quality_telemetry
 from app.release import (
     API_CONTRACT_VERSION,
@@ -12,9 +13,11 @@ from app.release import (
     VOICE_RUNTIME,
     runtime_build_metadata,
 )
+from app.services.ai.client_pool import openai_pool
 from app.services.operator_intelligence.evidence_freshness import AGING_MAX_DAYS, FRESH_MAX_DAYS
 from app.services.operator_intelligence.mission_orchestrator import CURRENT_HORIZON_MAX_DAYS, ORCHESTRATOR_SCHEMA, STAGES
 from app.services.operator_intelligence.regime_change import MIN_CANDIDATE_CYCLES, MIN_CONFIRMED_CYCLES, WINDOW_SIZE
+from app.services.voice.scheduler import tts_scheduler
 
 
 def _env_on(name: str, default: str = "1") -> bool:
@@ -30,6 +33,8 @@ def readiness_snapshot(
     usage_guard: Any = None,
     replay_guard: Any = None,
     entitlement_service: Any = None,
+    update_queue: Any = None,
+    telegram_scheduler: Any = None,
 ) -> dict:
     """Privacy-safe runtime readiness. Never exposes secret values/content."""
     ai_enabled = bool(getattr(settings, "ai_enabled", True))
@@ -50,6 +55,8 @@ def readiness_snapshot(
                 "outbox_dropped": int(raw.get("outbox_dropped") or 0),
                 "last_primary_error": str(raw.get("last_primary_error") or "")[:64],
                 "outbox_max": int(raw.get("outbox_max") or 0),
+                "outbox_durable": bool(raw.get("outbox_durable", False)),
+                "outbox_oldest_age_s": float(raw.get("outbox_oldest_age_s") or 0.0),
                 "last_probe_ok": raw.get("last_probe_ok") if isinstance(raw.get("last_probe_ok"), bool) else None,
                 "last_probe_at": str(raw.get("last_probe_at") or "")[:64],
                 "probe_successes": int(raw.get("probe_successes") or 0),
@@ -58,6 +65,94 @@ def readiness_snapshot(
         except Exception:
             recovery = {"status": "unavailable"}
 
+    identity_cache: dict[str, Any] = {}
+    identity_cache_fn = getattr(store, "identity_cache_status", None)
+    if callable(identity_cache_fn):
+        try:
+            raw = dict(identity_cache_fn() or {})
+            identity_cache = {
+                "enabled": bool(raw.get("enabled", False)),
+                "ttl_s": float(raw.get("ttl_s") or 0.0),
+                "negative_ttl_s": float(raw.get("negative_ttl_s") or 0.0),
+                "max_entries": int(raw.get("max_entries") or 0),
+                **{
+                    name: int(raw.get(name) or 0)
+                    for name in ("entries", "hits", "misses", "negative_hits", "invalidations", "evictions")
+                },
+            }
+        except Exception:
+            identity_cache = {"status": "unavailable"}
+
+    progression_cache: dict[str, Any] = {}
+    progression_cache_fn = getattr(store, "progression_cache_status", None)
+    if callable(progression_cache_fn):
+        try:
+            raw = dict(progression_cache_fn() or {})
+            progression_cache = {
+                "enabled": bool(raw.get("enabled", False)),
+                "ttl_s": float(raw.get("ttl_s") or 0.0),
+                "max_players": int(raw.get("max_players") or 0),
+                **{
+                    name: int(raw.get(name) or 0)
+                    for name in ("players", "hits", "misses", "records", "invalidations", "evictions")
+                },
+            }
+        except Exception:
+            progression_cache = {"status": "unavailable"}
+
+    player_views: dict[str, Any] = {}
+    player_views_fn = getattr(store, "player_views_status", None)
+    if callable(player_views_fn):
+        try:
+            raw = dict(player_views_fn() or {})
+            player_views = {
+                "enabled": bool(raw.get("enabled", False)),
+                "ttl_s": float(raw.get("ttl_s") or 0.0),
+                "max_players": int(raw.get("max_players") or 0),
+                "players": int(raw.get("players") or 0),
+                "views": {
+                    str(name): {key: int(value or 0) for key, value in dict(view or {}).items()}
+                    for name, view in dict(raw.get("views") or {}).items()
+                },
+            }
+        except Exception:
+            player_views = {"status": "unavailable"}
+
+    engine: dict[str, Any] = {}
+    engine_fn = getattr(store, "engine_status", None)
+    if callable(engine_fn):
+        try:
+            raw = dict(engine_fn() or {})
+            if raw:
+                engine = {
+                    "engine": str(raw.get("engine") or "")[:32],
+                    "started": bool(raw.get("started", False)),
+                    "http2": bool(raw.get("http2", False)),
+                    "max_connections": int(raw.get("max_connections") or 0),
+                    "deadline_s": float(raw.get("deadline_s") or 0.0),
+                    "in_flight": int(raw.get("in_flight") or 0),
+                    "max_in_flight": int(raw.get("max_in_flight") or 0),
+                    "completed": int(raw.get("completed") or 0),
+                    "errors": int(raw.get("errors") or 0),
+                    "deadline_exceeded": int(raw.get("deadline_exceeded") or 0),
+                }
+        except Exception:
+            engine = {"status": "unavailable"}
+
+    try:
+        raw_pool = dict(openai_pool.stats() or {})
+        ai_clients: dict[str, Any] = {
+            "max_connections": int(raw_pool.get("max_connections") or 0),
+            "http_pools": int(raw_pool.get("http_pools") or 0),
+            "pools_opened": int(raw_pool.get("pools_opened") or 0),
+            "purposes": {
+                str(purpose)[:16]: {key: int(value or 0) for key, value in dict(gate).items()}
+                for purpose, gate in dict(raw_pool.get("purposes") or {}).items()
+            },
+        }
+    except Exception:
+        ai_clients = {"status": "unavailable"}
+
     guard_snapshot: dict[str, Any] = {}
     if usage_guard is not None and callable(getattr(usage_guard, "snapshot", None)):
         try:
@@ -72,6 +167,37 @@ def readiness_snapshot(
         except Exception:
             replay_snapshot = {"status": "unavailable"}
 
+    updates: dict[str, Any] = {"mode": "inline"}
+    if update_queue is not None and callable(getattr(update_queue, "stats", None)):
+        try:
+            raw = dict(update_queue.stats() or {})
+            updates = {"mode": "queued", "draining": bool(raw.get("draining", False))}
+            updates.update({
+                key: int(raw.get(key) or 0)
+                for key in (
+                    "workers", "max_pending", "max_pending_per_chat", "pending", "active_lanes", "in_flight",
+                    "max_in_flight", "max_pending_seen", "accepted", "processed", "failed", "rejected", "dropped",
+                )
+            })
+            updates["oldest_wait_s"] = float(raw.get("oldest_wait_s") or 0.0)
+        except Exception:
+            updates = {"mode": "queued", "status": "unavailable"}
+
+    outbound: dict[str, Any] = {}
+    if telegram_scheduler is not None and callable(getattr(telegram_scheduler, "status", None)):
+        try:
+            raw = dict(telegram_scheduler.status() or {})
+            outbound = {
+                key: int(raw.get(key) or 0)
+                for key in (
+                    "queue_depth", "queued_drafts", "blocked_chats", "tracked_chats",
+                    "sent", "dropped_drafts", "rate_limited", "throttled",
+                )
+            }
+            outbound["globally_blocked"] = bool(raw.get("globally_blocked", False))
+        except Exception:
+            outbound = {"status": "unavailable"}
+
     entitlement_snapshot: dict[str, Any] = {
         "enabled": False,
         "configured": False,
@@ -88,6 +214,12 @@ def readiness_snapshot(
                 "last_success_at": str(raw.get("last_success_at") or "")[:64] or None,
                 "last_error": str(raw.get("last_error") or "")[:64],
             }
+            cache = raw.get("status_cache")
+            if isinstance(cache, dict):
+                entitlement_snapshot["status_cache"] = {
+                    key: int(cache.get(key) or 0)
+                    for key in ("entries", "hits", "misses", "negative_hits", "invalidations")
+                }
         except Exception:
             entitlement_snapshot = {
                 "enabled": True,
@@ -132,7 +264,19 @@ def readiness_snapshot(
         "output_sample_rate_hz": 48000,
         "speech_max_chars": int(getattr(settings, "voice_max_chars", 3200) or 3200),
         "duplex_max_chars": int(getattr(settings, "voice_duplex_max_chars", 1800) or 1800),
+        "cloud_concurrency": int(getattr(settings, "voice_cloud_concurrency", 8) or 8),
+        "piper_workers": int(getattr(settings, "voice_piper_workers", 2) or 2),
     }
+    try:
+        voice_snapshot["render_lanes"] = {
+            str(name)[:64]: {
+                key: (dict(value) if isinstance(value, dict) else int(value or 0))
+                for key, value in dict(lane).items()
+            }
+            for name, lane in dict(tts_scheduler.stats() or {}).items()
+        }
+    except Exception:
+        voice_snapshot["render_lanes"] = {"status": "unavailable"}
 
     command_console_enabled = bool(getattr(settings, "telegram_aaa_console_enabled", True))
     telegram_live_drafts = bool(getattr(settings, "telegram_live_drafts_enabled", True))
@@ -267,6 +411,8 @@ def readiness_snapshot(
         "storage_startup_probe": callable(getattr(store, "probe_primary", None)),
         "abuse_guard": bool(getattr(settings, "usage_guard_enabled", True)),
         "telegram_replay_dedupe": replay_guard is not None,
+        "telegram_update_queue": update_queue is not None,
+        "metrics_endpoint": bool(getattr(settings, "metrics_token", "")),
         "premium_account_link": entitlement_snapshot["enabled"] and entitlement_snapshot["configured"],
         "premium_entitlement_authority": entitlement_snapshot["configured"],
     }
@@ -310,6 +456,10 @@ def readiness_snapshot(
             "persistent_configured": features["persistent_memory_configured"],
             "resilient_fallback": "Resilient" in storage_class,
             "recovery": recovery,
+            "engine": engine,
+            "identity_cache": identity_cache,
+            "progression_projection": progression_cache,
+            "player_views": player_views,
         },
         "voice_runtime": voice_snapshot,
         "live_intelligence": live_intelligence_snapshot,
@@ -321,5 +471,9 @@ def readiness_snapshot(
             "telegram_replay": replay_snapshot,
             "telegram_max_update_bytes": int(getattr(settings, "telegram_max_update_bytes", 0) or 0),
         },
+        "telegram_updates": updates,
+        "telegram_outbound": outbound,
+        "ai_clients": ai_clients,
         "quality": quality_telemetry.snapshot(),
+        "latency": latency_metrics.snapshot(),
     }
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Sequence
+
+log = logging.getLogger("bco.security")
+
+# Expired rows are swept on every Nth write instead of on every call.
+_SWEEP_EVERY = 256
+
+
+class SQLiteGuardState:
+    """Guard state in one local SQLite file shared by every worker on a host.
+
+    Each check-and-consume and each update-id claim runs in a `begin
+    immediate` transaction, so N uvicorn workers see one quota and one
+    replay window instead of N. Timestamps are wall-clock seconds: they must
+    compare across processes and survive a restart of a single worker.
+
+    Callers run on the webhook's event loop, so a file another worker holds
+    locked fails fast after `busy_timeout_ms`; the guards then fall back to
+    their process-local windows instead of stalling the loop.
+    """
+
+    def __init__(self, path: str | Path, *, busy_timeout_ms: int = 30) -> None:
+        self.path = Path(path)
+        self.busy_timeout_ms = max(1, int(busy_timeout_ms))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._db = sqlite3.connect(
+            str(self.path),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=self.busy_timeout_ms / 1000.0,
+        )
+        self._db.execute("pragma journal_mode=wal")
+        self._db.execute("pragma synchronous=normal")
+        self._db.execute(
+            "create table if not exists bco_guard_events ("
+            " bucket text not null,"
+            " at real not null)"
+        )
+        self._db.execute("create index if not exists bco_guard_events_bucket_at on bco_guard_events (bucket, at)")
+        self._db.execute(
+            "create table if not exists bco_guard_replay ("
+            " key text primary key,"
+            " at real not null)"
+        )
+        self._db.execute("create index if not exists bco_guard_replay_at on bco_guard_replay (at)")
+
+    def _begin(self) -> None:
+        self._db.execute("begin immediate")
+
+    def check_and_consume(
+        self,
+        checks: Sequence[tuple[str, Sequence[tuple[int, float]]]],
+        now: float,
+    ) -> list[float]:
+        """Atomically test every (bucket, [(max_events, window_s)]) and record one event.
+
+        Returns the wait per check; the event is recorded in every bucket only
+        when all waits are zero.
+        """
+
+        with self._lock:
+            self._begin()
+            try:
+                waits: list[float] = []
+                for bucket, limits in checks:
+                    longest = max((window for _max, window in limits), default=0.0)
+                    self._db.execute(
+                        "delete from bco_guard_events where bucket = ? and at <= ?",
+                        (bucket, now - longest),
+                    )
+                    wait = 0.0
+                    for max_events, window_s in limits:
+                        # The max_events-th newest event in the window decides when a slot frees up.
+                        row = self._db.execute(
+                            "select at from bco_guard_events where bucket = ? and at > ?"
+                            " order by at desc limit 1 offset ?",
+                            (bucket, now - window_s, int(max_events) - 1),
+                        ).fetchone()
+                        if row is not None:
+                            wait = max(wait, float(row[0]) + window_s - now)
+                    waits.append(max(0.0, wait))
+                if not any(w > 0 for w in waits):
+                    self._db.executemany(
+                        "insert into bco_guard_events (bucket, at) values (?, ?)",
+                        [(bucket, now) for bucket, _limits in checks],
+                    )
+                    self._maybe_sweep(now)
+                self._db.execute("commit")
+                return waits
+            except BaseException:
+                self._db.execute("rollback")
+                raise
+
+    def claim(self, key: str, now: float, ttl_s: float, max_entries: int) -> bool:
+        """Record `key` as seen; False when another worker already saw it within ttl."""
+
+        with self._lock:
+            self._begin()
+            try:
+                row = self._db.execute("select at from bco_guard_replay where key = ?", (key,)).fetchone()
+                fresh = row is None or float(row[0]) <= now - ttl_s
+                self._db.execute(
+                    "insert into bco_guard_replay (key, at) values (?, ?)"
+                    " on conflict (key) do update set at = excluded.at",
+                    (key, now),
+                )
+                self._writes += 1
+                if self._writes % _SWEEP_EVERY == 0:
+                    self._db.execute("delete from bco_guard_replay where at <= ?", (now - ttl_s,))
+                    self._db.execute(
+                        "delete from bco_guard_replay where key in ("
+                        " select key from bco_guard_replay order by at desc limit -1 offset ?)",
+                        (int(max_entries),),
+                    )
+                self._db.execute("commit")
+                return fresh
+            except BaseException:
+                self._db.execute("rollback")
+                raise
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            self._db.execute("delete from bco_guard_replay where key = ?", (key,))
+
+    def _maybe_sweep(self, now: float) -> None:
+        self._writes += 1
+        if self._writes % _SWEEP_EVERY == 0:
+            # Guard windows are at most a day; anything older is dead weight.
+            self._db.execute("delete from bco_guard_events where at <= ?", (now - 86_400.0,))
+
+    def active_buckets(self) -> int:
+        with self._lock:
+            return int(self._db.execute("select count(distinct bucket) from bco_guard_events").fetchone()[0])
+
+    def tracked_updates(self) -> int:
+        with self._lock:
+            return int(self._db.execute("select count(*) from bco_guard_replay").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._db.close()
+            except Exception:
+                pass
+
+
+def build_guard_state(path: str | Path | None) -> SQLiteGuardState | None:
+    """Shared guard state when a path is configured and usable, else None (process-local)."""
+
+    if path:
+        try:
+            return SQLiteGuardState(path)
+        except Exception as exc:
+            log.error("guard shared state unavailable error=%s; using process-local guards", type(exc).__name__)
+    return None
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import logging
 import math
 import threading
 import time
@@ -8,6 +9,15 @@ from collections import Counter, OrderedDict, deque
 from dataclasses import dataclass
 from typing import Any, Callable, Deque, Iterable
 
+from app.security.shared_state import SQLiteGuardState
+
+log = logging.getLogger("bco.security")
+
+# Rough CPython footprint of one subject bucket (key tuple, strings, deque,
+# OrderedDict link) and of one timestamp stored in it.
+_BUCKET_BYTES = 900
+_EVENT_BYTES = 32
+
 
 @dataclass(frozen=True)
 class WindowLimit:
@@ -33,11 +43,21 @@ class GuardRule:
 
 
 class UsageGuard:
-    """Process-local abuse/cost guard for expensive server capabilities.
+    """Abuse/cost guard for expensive server capabilities.
 
     STT and TTS have independent budgets so a normal duplex exchange does not
     count twice against one opaque voice bucket. The guard intentionally does
     not identify users in telemetry and remains bounded against forged IDs.
+
+    Windows are process-local unless a shared `state` is given; then every
+    worker on the host checks and consumes the same windows atomically. If
+    the shared state fails, the guard falls back to its local windows.
+
+    Local subject buckets are kept in last-touch order, which doubles as the
+    expiry index: a bucket whose newest event left its longest window is dead
+    and is dropped from the front in amortized O(1). When live buckets still
+    exceed `max_buckets` or `max_bytes`, the least recently touched one goes.
+    Global buckets are never evicted.
     """
 
     def __init__(
@@ -45,12 +65,17 @@ class UsageGuard:
         *,
         enabled: bool = True,
         rules: dict[str, GuardRule] | None = None,
-        clock: Callable[[], float] = time.monotonic,
+        clock: Callable[[], float] | None = None,
         max_buckets: int = 10_000,
+        max_bytes: int = 16 * 1024 * 1024,
+        state: SQLiteGuardState | None = None,
     ) -> None:
         self.enabled = bool(enabled)
-        self._clock = clock
+        self._state = state
+        # Shared windows are compared across processes, so they need wall time.
+        self._clock = clock or (time.time if state is not None else time.monotonic)
         self._max_buckets = max(128, int(max_buckets or 10_000))
+        self._max_bytes = max(128 * _BUCKET_BYTES, int(max_bytes or 16 * 1024 * 1024))
         self._rules = {
             str(category): GuardRule(
                 subject_limits=tuple(x.normalized() for x in rule.subject_limits),
@@ -58,13 +83,21 @@ class UsageGuard:
             )
             for category, rule in dict(rules or {}).items()
         }
+        self._subject_windows = {
+            category: max((x.window_s for x in rule.subject_limits), default=1.0)
+            for category, rule in self._rules.items()
+        }
         self._buckets: "OrderedDict[tuple[str, str], Deque[float]]" = OrderedDict()
+        self._globals: dict[str, Deque[float]] = {}
+        self._events = 0
+        self._evictions: Counter[str] = Counter()
         self._allowed: Counter[str] = Counter()
         self._blocked: Counter[str] = Counter()
+        self._shared_errors = 0
         self._lock = threading.RLock()
 
     @classmethod
-    def from_settings(cls, settings: Any) -> "UsageGuard":
+    def from_settings(cls, settings: Any, *, state: SQLiteGuardState | None = None) -> "UsageGuard":
         def _limit(name: str, default: int, window_s: int) -> WindowLimit | None:
             raw = getattr(settings, name, default)
             try:
@@ -124,6 +157,8 @@ class UsageGuard:
             enabled=bool(getattr(settings, "usage_guard_enabled", True)),
             rules=rules,
             max_buckets=int(getattr(settings, "usage_guard_max_buckets", 10_000) or 10_000),
+            max_bytes=int(getattr(settings, "usage_guard_max_bytes", 16 * 1024 * 1024) or 16 * 1024 * 1024),
+            state=state,
         )
 
     @staticmethod
@@ -136,41 +171,58 @@ class UsageGuard:
 
     @staticmethod
     def _retry_after(events: Deque[float], now: float, limit: WindowLimit) -> float:
-        threshold = now - limit.window_s
-        relevant = [ts for ts in events if ts > threshold]
-        if len(relevant) < limit.max_events:
+        # Events are in time order, so the window is full exactly when the
+        # max_events-th newest event is still inside it.
+        if len(events) < limit.max_events:
+            return 0.0
+        oldest_counted = events[-limit.max_events]
+        if oldest_counted <= now - limit.window_s:
             return 0.0
-        index = len(relevant) - limit.max_events
-        unblock_at = relevant[index] + limit.window_s
-        return max(0.0, unblock_at - now)
+        return max(0.0, oldest_counted + limit.window_s - now)
 
     @staticmethod
-    def _prune(events: Deque[float], now: float, max_window_s: float) -> None:
+    def _prune(events: Deque[float], now: float, max_window_s: float) -> int:
         threshold = now - max_window_s
+        dropped = 0
         while events and events[0] <= threshold:
             events.popleft()
+            dropped += 1
+        return dropped
 
-    def _bucket(self, key: tuple[str, str]) -> Deque[float]:
+    def _approx_bytes(self) -> int:
+        return (len(self._buckets) + len(self._globals)) * _BUCKET_BYTES + self._events * _EVENT_BYTES
+
+    def _evict(self, now: float) -> None:
+        # Expired buckets sit at the front because touches move buckets to the end.
+        while self._buckets:
+            key, events = next(iter(self._buckets.items()))
+            if events and events[-1] > now - self._subject_windows.get(key[0], 1.0):
+                break
+            self._buckets.popitem(last=False)
+            self._events -= len(events)
+            self._evictions["expired"] += 1
+        max_subjects = max(1, self._max_buckets - len(self._globals))
+        while self._buckets and (len(self._buckets) >= max_subjects or self._approx_bytes() >= self._max_bytes):
+            _key, events = self._buckets.popitem(last=False)
+            self._events -= len(events)
+            self._evictions["capacity"] += 1
+
+    def _bucket(self, key: tuple[str, str], now: float) -> Deque[float]:
         bucket = self._buckets.get(key)
         if bucket is None:
-            while len(self._buckets) >= self._max_buckets:
-                victim = next(
-                    (
-                        existing
-                        for existing in self._buckets.keys()
-                        if existing[1] != "global" and existing != key
-                    ),
-                    None,
-                )
-                if victim is None:
-                    break
-                del self._buckets[victim]
+            self._evict(now)
             bucket = deque()
             self._buckets[key] = bucket
         else:
             self._buckets.move_to_end(key)
         return bucket
 
+    def _global(self, category: str) -> Deque[float]:
+        bucket = self._globals.get(category)
+        if bucket is None:
+            bucket = self._globals[category] = deque()
+        return bucket
+
     def check(self, subject: Any, category: str) -> UsageDecision:
         category = str(category or "").strip().lower()
         if not self.enabled:
@@ -184,14 +236,18 @@ class UsageGuard:
         subject_bucket_key = (category, f"subject:{subject_key}")
         global_bucket_key = (category, "global")
 
+        if self._state is not None:
+            decision = self._check_shared(rule, category, subject_bucket_key, global_bucket_key, now)
+            if decision is not None:
+                return decision
+
         with self._lock:
-            subject_events = self._bucket(subject_bucket_key)
-            global_events = self._bucket(global_bucket_key)
+            subject_events = self._bucket(subject_bucket_key, now)
+            global_events = self._global(category)
 
-            max_subject_window = max((x.window_s for x in rule.subject_limits), default=1.0)
             max_global_window = max((x.window_s for x in rule.global_limits), default=1.0)
-            self._prune(subject_events, now, max_subject_window)
-            self._prune(global_events, now, max_global_window)
+            self._events -= self._prune(subject_events, now, self._subject_windows[category])
+            self._events -= self._prune(global_events, now, max_global_window)
 
             waits: list[tuple[str, float]] = []
             for limit in rule.subject_limits:
@@ -208,16 +264,63 @@ class UsageGuard:
                 self._blocked[category] += 1
                 return UsageDecision(False, category, retry_after_s=max(1, int(math.ceil(wait))), scope=scope)
 
-            subject_events.append(now)
-            global_events.append(now)
+            # An allowed check records one event on each side that has limits; refusals record none.
+            if rule.subject_limits:
+                subject_events.append(now)
+                self._events += 1
+            if rule.global_limits:
+                global_events.append(now)
+                self._events += 1
             self._allowed[category] += 1
             return UsageDecision(True, category)
 
+    def _check_shared(
+        self,
+        rule: GuardRule,
+        category: str,
+        subject_bucket_key: tuple[str, str],
+        global_bucket_key: tuple[str, str],
+        now: float,
+    ) -> UsageDecision | None:
+        assert self._state is not None
+        checks = [
+            ("|".join(subject_bucket_key), [(x.max_events, x.window_s) for x in rule.subject_limits]),
+            ("|".join(global_bucket_key), [(x.max_events, x.window_s) for x in rule.global_limits]),
+        ]
+        try:
+            subject_wait, global_wait = self._state.check_and_consume(checks, now)
+        except Exception as exc:
+            with self._lock:
+                self._shared_errors += 1
+            log.warning("usage guard shared state failed error=%s; using local windows", type(exc).__name__)
+            return None
+        with self._lock:
+            if subject_wait > 0 or global_wait > 0:
+                scope, wait = ("subject", subject_wait) if subject_wait >= global_wait else ("global", global_wait)
+                self._blocked[category] += 1
+                return UsageDecision(False, category, retry_after_s=max(1, int(math.ceil(wait))), scope=scope)
+            self._allowed[category] += 1
+            return UsageDecision(True, category)
+
+    def _backend(self) -> dict[str, Any]:
+        if self._state is None:
+            return {"backend": "process"}
+        try:
+            active = self._state.active_buckets()
+        except Exception:
+            active = len(self._buckets) + len(self._globals)
+        return {"backend": "sqlite", "active_buckets": active, "shared_errors": self._shared_errors}
+
     def snapshot(self) -> dict[str, Any]:
+        backend = self._backend()
         with self._lock:
             return {
                 "enabled": self.enabled,
-                "active_buckets": len(self._buckets),
+                "active_buckets": len(self._buckets) + len(self._globals),
+                "tracked_events": self._events,
+                "approx_bytes": self._approx_bytes(),
+                "evictions": dict(self._evictions),
+                **backend,
                 "allowed": dict(self._allowed),
                 "blocked": dict(self._blocked),
                 "categories": {
@@ -231,18 +334,24 @@ class UsageGuard:
 
 
 class UpdateReplayGuard:
-    """Bounded TTL dedupe for Telegram update_id values."""
+    """Bounded TTL dedupe for Telegram update_id values.
+
+    With a shared `state` an update retried into another worker is still
+    recognised; a failing shared state falls back to the local window.
+    """
 
     def __init__(
         self,
         *,
         ttl_s: float = 15 * 60,
         max_entries: int = 20_000,
-        clock: Callable[[], float] = time.monotonic,
+        clock: Callable[[], float] | None = None,
+        state: SQLiteGuardState | None = None,
     ) -> None:
         self.ttl_s = max(30.0, float(ttl_s or 900.0))
         self.max_entries = max(128, int(max_entries or 20_000))
-        self._clock = clock
+        self._state = state
+        self._clock = clock or (time.time if state is not None else time.monotonic)
         self._seen: "OrderedDict[str, float]" = OrderedDict()
         self._lock = threading.RLock()
         self.duplicates = 0
@@ -258,6 +367,16 @@ class UpdateReplayGuard:
     def accept(self, update_id: Any) -> bool:
         key = str(update_id)
         now = float(self._clock())
+        if self._state is not None:
+            try:
+                fresh = self._state.claim(f"update:{key}", now, self.ttl_s, self.max_entries)
+            except Exception as exc:
+                log.warning("replay guard shared state failed error=%s; using local window", type(exc).__name__)
+            else:
+                if not fresh:
+                    with self._lock:
+                        self.duplicates += 1
+                return fresh
         with self._lock:
             self._prune(now)
             existing = self._seen.get(key)
@@ -271,6 +390,26 @@ class UpdateReplayGuard:
                 self._seen.popitem(last=False)
             return True
 
-    def snapshot(self) -> dict[str, int]:
+    def forget(self, update_id: Any) -> None:
+        """Un-see an update that was accepted but refused, so its retry is processed."""
+        if self._state is not None:
+            try:
+                self._state.release(f"update:{update_id}")
+            except Exception as exc:
+                log.warning("replay guard shared state failed error=%s", type(exc).__name__)
+        with self._lock:
+            self._seen.pop(str(update_id), None)
+
+    def snapshot(self) -> dict[str, Any]:
+        tracked = None
+        if self._state is not None:
+            try:
+                tracked = self._state.tracked_updates()
+            except Exception:
+                tracked = None
         with self._lock:
-            return {"tracked": len(self._seen), "duplicates": int(self.duplicates)}
+            return {
+                "tracked": len(self._seen) if tracked is None else tracked,
+                "duplicates": int(self.duplicates),
+                "backend": "process" if self._state is None else "sqlite",
+            }
@@ -8,6 +8,7 @@ from app.services.crown_session import CrownSessionService
 from app.services.operator_intelligence.orchestrated_service import OrchestratedOperatorIntelligenceService
 from app.services.operator_intelligence.strategy_outcomes import PremiumStrategyOutcomeService
 from app.services.session_cycle import CrownSessionCycleService
+from app.services.storage.progression import progression_projection
 
 
 class CrownAfterActionService:
@@ -43,13 +44,13 @@ class CrownAfterActionService:
             out.append({"metric": str(key)[:40], "before": bv, "after": av, "delta": delta})
         return out[:12]
 
-    def _progression(self, chat_id: int) -> list[dict[str, Any]]:
-        fn = getattr(self.store, "list_progression_events", None)
-        if not callable(fn): return []
-        try: rows = fn(int(chat_id), 220)
-        except TypeError: rows = fn(int(chat_id))
-        except Exception: return []
-        return [dict(x) for x in list(rows or []) if isinstance(x, Mapping)]
+    def _progression(self, chat_id: int, crown_session_id: str = "") -> list[dict[str, Any]]:
+        indexed = getattr(self.store, "list_crown_session_events", None)
+        if crown_session_id and callable(indexed):
+            try: rows = indexed(int(chat_id), crown_session_id)
+            except Exception: return []
+            return [dict(x) for x in list(rows or []) if isinstance(x, Mapping)]
+        return progression_projection(self.store, int(chat_id)).select("vod_evidence", "engagements")
 
     def _session_vod_evidence(self, rows: list[dict[str, Any]], crown_session_id: str, mission_id: str) -> list[dict[str, Any]]:
         out: list[dict[str, Any]] = []
@@ -106,7 +107,7 @@ class CrownAfterActionService:
         cycle_service = CrownSessionCycleService(self.store)
         cycle = cycle_service.current(cid, mission_id)
         crown_session_id = str((cycle or {}).get("crown_session_id") or "")[:64]
-        rows = self._progression(cid)
+        rows = self._progression(cid, crown_session_id)
         linked_vod = self._session_vod_evidence(rows, crown_session_id, mission_id)
         engagements = self._session_engagements(rows, crown_session_id, mission_id)
 
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Mapping
+
+import certifi
+import httpx
+from openai import OpenAI
+
+
+log = logging.getLogger("bco.ai.pool")
+
+PURPOSES = ("chat", "vision", "tts")
+
+
+@dataclass(frozen=True)
+class PurposeProfile:
+    timeout: httpx.Timeout
+    user_agent: str
+    concurrency: int
+
+
+_PROFILES: dict[str, PurposeProfile] = {
+    "chat": PurposeProfile(
+        httpx.Timeout(connect=20.0, read=75.0, write=45.0, pool=75.0), "BLACK-CROWN-OPS/18.0", 16,
+    ),
+    "vision": PurposeProfile(
+        httpx.Timeout(connect=20.0, read=90.0, write=60.0, pool=90.0), "BLACK-CROWN-OPS/VOD-4.0", 4,
+    ),
+    "tts": PurposeProfile(
+        httpx.Timeout(connect=20.0, read=45.0, write=45.0, pool=45.0), "BLACK-CROWN-OPS/voice-v40-hotfix", 8,
+    ),
+}
+
+
+class OpenAIPoolSaturated(RuntimeError):
+    """No concurrency slot for the purpose became free inside the wait budget."""
+
+
+class _PurposeGate:
+    """Concurrency cap for one purpose, shared by sync threads and async tasks."""
+
+    def __init__(self, purpose: str, cap: int) -> None:
+        self.purpose = purpose
+        self.cap = max(1, int(cap))
+        self._sync = threading.BoundedSemaphore(self.cap)
+        self._async: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.acquired = 0
+        self.rejected = 0
+
+    def enter(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.acquired += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def exit(self) -> None:
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def reject(self) -> OpenAIPoolSaturated:
+        with self._lock:
+            self.rejected += 1
+        return OpenAIPoolSaturated(f"{self.purpose} concurrency cap {self.cap} saturated")
+
+    def acquire(self, timeout_s: float) -> None:
+        if not self._sync.acquire(timeout=timeout_s):
+            raise self.reject()
+        self.enter()
+
+    def release(self) -> None:
+        self.exit()
+        self._sync.release()
+
+    def async_semaphore(self) -> asyncio.Semaphore:
+        # asyncio primitives bind to one loop; production runs a single loop,
+        # tests may run several sequential ones.
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            sem = self._async.get(loop)
+            if sem is None:
+                sem = self._async[loop] = asyncio.Semaphore(self.cap)
+            return sem
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "cap": self.cap,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "acquired": self.acquired,
+                "rejected": self.rejected,
+            }
+
+
+class OpenAILease:
+    """One concurrency slot on a shared OpenAI client.
+
+    Quacks like the `OpenAI` client it wraps. `close()` returns the slot and
+    never closes the pooled connections, so callers keep their established
+    acquire/close shape.
+    """
+
+    def __init__(self, client: OpenAI, gate: _PurposeGate) -> None:
+        self._client = client
+        self._gate = gate
+        self._released = False
+        self._release_lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def close(self) -> None:
+        with self._release_lock:
+            if self._released:
+                return
+            self._released = True
+        self._gate.release()
+
+    def __enter__(self) -> "OpenAILease":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+
+class OpenAIClientPool:
+    """Process-wide long-lived OpenAI clients with per-purpose concurrency caps.
+
+    Each purpose (chat, vision, tts) keeps its own keep-alive HTTP pool so a
+    burst of VOD uploads cannot starve chat replies of connections. Clients
+    are created lazily and rebuilt after `close()`, which the FastAPI
+    lifespan calls on shutdown.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        acquire_timeout_s: float = 30.0,
+        concurrency: Mapping[str, int] | None = None,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._http: dict[str, httpx.Client] = {}
+        self._clients: dict[tuple[str, str], OpenAI] = {}
+        self._async_http: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = weakref.WeakKeyDictionary()
+        self._gates: dict[str, _PurposeGate] = {}
+        self._pools_opened = 0
+        self.configure(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            acquire_timeout_s=acquire_timeout_s,
+            concurrency=concurrency,
+        )
+
+    def configure(
+        self,
+        *,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        acquire_timeout_s: float = 30.0,
+        concurrency: Mapping[str, int] | None = None,
+    ) -> None:
+        """Apply settings. Caps change only for purposes with nothing in flight."""
+
+        caps = dict(concurrency or {})
+        with self._lock:
+            self.max_connections = max(1, min(int(max_connections or 20), 256))
+            self.max_keepalive_connections = max(0, min(int(max_keepalive_connections or 0), self.max_connections))
+            self.acquire_timeout_s = max(0.1, float(acquire_timeout_s or 30.0))
+            for purpose in PURPOSES:
+                cap = max(1, int(caps.get(purpose) or _PROFILES[purpose].concurrency))
+                gate = self._gates.get(purpose)
+                if gate is None or (gate.cap != cap and gate.in_flight == 0):
+                    self._gates[purpose] = _PurposeGate(purpose, cap)
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+        )
+
+    @staticmethod
+    def _profile(purpose: str) -> PurposeProfile:
+        try:
+            return _PROFILES[purpose]
+        except KeyError:
+            raise ValueError(f"unknown OpenAI client purpose: {purpose}") from None
+
+    def _openai(self, purpose: str, api_key: str) -> OpenAI:
+        profile = self._profile(purpose)
+        with self._lock:
+            client = self._clients.get((purpose, api_key))
+            if client is not None:
+                return client
+            http_client = self._http.get(purpose)
+            if http_client is None:
+                http_client = self._http[purpose] = httpx.Client(
+                    timeout=profile.timeout,
+                    limits=self._limits(),
+                    verify=certifi.where(),
+                    headers={"User-Agent": profile.user_agent},
+                )
+                self._pools_opened += 1
+            base_url = str(os.getenv("OPENAI_BASE_URL") or "").strip() or None
+            client = self._clients[(purpose, api_key)] = OpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+            return client
+
+    def lease(self, purpose: str, api_key: str) -> OpenAILease:
+        """Take a concurrency slot for `purpose` on its shared OpenAI client."""
+
+        client = self._openai(purpose, str(api_key or ""))
+        gate = self._gates[purpose]
+        gate.acquire(self.acquire_timeout_s)
+        return OpenAILease(client, gate)
+
+    def async_http(self) -> httpx.AsyncClient:
+        """Shared keep-alive async client for raw OpenAI HTTP calls (speech)."""
+
+        loop = asyncio.get_running_loop()
+        profile = self._profile("tts")
+        with self._lock:
+            client = self._async_http.get(loop)
+            if client is None or client.is_closed:
+                client = self._async_http[loop] = httpx.AsyncClient(
+                    timeout=profile.timeout,
+                    limits=self._limits(),
+                    headers={"User-Agent": profile.user_agent},
+                )
+                self._pools_opened += 1
+            return client
+
+    @asynccontextmanager
+    async def async_slot(self, purpose: str) -> AsyncIterator[None]:
+        self._profile(purpose)
+        gate = self._gates[purpose]
+        sem = gate.async_semaphore()
+        try:
+            await asyncio.wait_for(sem.acquire(), timeout=self.acquire_timeout_s)
+        except asyncio.TimeoutError:
+            raise gate.reject() from None
+        gate.enter()
+        try:
+            yield
+        finally:
+            gate.exit()
+            sem.release()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            gates = dict(self._gates)
+            data: dict[str, Any] = {
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "http_pools": len(self._http) + len(self._async_http),
+                "clients": len(self._clients),
+                "pools_opened": self._pools_opened,
+            }
+        data["purposes"] = {purpose: gate.stats() for purpose, gate in gates.items()}
+        return data
+
+    def close(self) -> None:
+        with self._lock:
+            http_clients = list(self._http.values())
+            self._http.clear()
+            self._clients.clear()
+        for client in http_clients:
+            try:
+                client.close()
+            except Exception as exc:
+                log.warning("openai pool close failed: %s", type(exc).__name__)
+
+    async def aclose(self) -> None:
+        with self._lock:
+            async_clients = list(self._async_http.values())
+            self._async_http.clear()
+        for client in async_clients:
+            try:
+                await client.aclose()
+            except Exception as exc:
+                log.warning("openai pool async close failed: %s", type(exc).__name__)
+        self.close()
+
+
+openai_pool = OpenAIClientPool()
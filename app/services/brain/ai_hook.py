@@ -2,16 +2,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import os
 import time
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import Any, Mapping
 
-import certifi
-import httpx
-from openai import OpenAI
-
+from app.observability.metrics import latency_metrics
+from app.services.ai.client_pool import OpenAILease, OpenAIPoolSaturated, openai_pool
 from app.services.brain.intents import IntentResult, classify_intent
 from app.services.brain.knowledge_context import KnowledgeContext
 from app.services.brain.prompt_builder import PromptBuilder
@@ -103,6 +100,14 @@ def _emit_partial(
         pass
 
 
+def _unavailable_text(error: Exception | None) -> str:
+    return (
+        "🧠 ИИ временно недоступен после повторных попыток.\n"
+        f"Ошибка: {type(error).__name__ if error else 'unknown'}.\n"
+        "Проверь OPENAI_API_KEY / OPENAI_MODEL и повтори запрос."
+    )
+
+
 @dataclass
 class AIHook:
     api_key: str
@@ -112,17 +117,10 @@ class AIHook:
     prompt_builder: PromptBuilder | None = None
     last_generation_meta: dict[str, Any] = field(default_factory=dict, init=False)
 
-    def _client(self) -> OpenAI:
-        timeout = httpx.Timeout(connect=20.0, read=75.0, write=45.0, pool=75.0)
-        limits = httpx.Limits(max_keepalive_connections=10, max_connections=20)
-        http_client = httpx.Client(
-            timeout=timeout,
-            limits=limits,
-            verify=certifi.where(),
-            headers={"User-Agent": "BLACK-CROWN-OPS/18.0"},
-        )
-        base_url = _s(os.getenv("OPENAI_BASE_URL"), "") or None
-        return OpenAI(api_key=self.api_key, base_url=base_url, http_client=http_client)
+    def _client(self) -> OpenAILease:
+        # A chat slot on the process-wide keep-alive client; close() releases
+        # the slot, never the pooled connections.
+        return openai_pool.lease("chat", self.api_key)
 
     def _looks_like_repeat(self, history: list[dict], candidate: str) -> bool:
         last = ""
@@ -148,7 +146,7 @@ class AIHook:
 
     @staticmethod
     def _stream_completion(
-        client: OpenAI,
+        client: Any,
         *,
         model: str,
         messages: list[dict[str, Any]],
@@ -160,13 +158,16 @@ class AIHook:
         chunks = 0
         emitted_chars = 0
         last_emit = 0.0
-        stream = client.chat.completions.create(
-            model=model,
-            messages=messages,
-            temperature=temperature,
-            stream=True,
-        )
+        started = time.perf_counter()
+        outcome = "error"
+        stream = None
         try:
+            stream = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                stream=True,
+            )
             for event in stream:
                 choices = getattr(event, "choices", None) or []
                 if not choices:
@@ -175,6 +176,8 @@ class AIHook:
                 content = getattr(delta, "content", None) if delta is not None else None
                 if not content:
                     continue
+                if not chunks:
+                    latency_metrics.observe("bco_ai_stream_first_token_seconds", time.perf_counter() - started)
                 output += str(content)
                 chunks += 1
                 now = time.monotonic()
@@ -188,7 +191,9 @@ class AIHook:
                     )
                     emitted_chars = len(output)
                     last_emit = now
+            outcome = "ok" if output.strip() else "empty"
         finally:
+            latency_metrics.observe("bco_ai_stream_seconds", time.perf_counter() - started, outcome=outcome)
             close = getattr(stream, "close", None)
             if callable(close):
                 try:
@@ -244,7 +249,14 @@ class AIHook:
             player_context=player_context,
         )
 
-        client = self._client()
+        try:
+            client = self._client()
+        except OpenAIPoolSaturated as exc:
+            self.last_generation_meta["outcome"] = "error"
+            self.last_generation_meta["error_class"] = type(exc).__name__
+            fallback = _unavailable_text(exc)
+            _emit_partial(on_partial, fallback, phase="final", reset=True)
+            return fallback
         temp = _temperature(profile, user_text)
         last_error: Exception | None = None
 
@@ -332,11 +344,7 @@ class AIHook:
                         time.sleep(self.base_sleep * attempt)
 
             self.last_generation_meta["outcome"] = "error"
-            fallback = (
-                "🧠 ИИ временно недоступен после повторных попыток.\n"
-                f"Ошибка: {type(last_error).__name__ if last_error else 'unknown'}.\n"
-                "Проверь OPENAI_API_KEY / OPENAI_MODEL и повтори запрос."
-            )
+            fallback = _unavailable_text(last_error)
             _emit_partial(on_partial, fallback, phase="final", reset=True)
             return fallback
         finally:
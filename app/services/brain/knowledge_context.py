@@ -5,7 +5,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Mapping, Protocol
 
-from app.content.catalog import ContentCatalog
+from app.content.catalog import ContentCatalog, default_catalog
 from app.domain.enums import Game, InputDevice, Mode, SkillTier
 from app.services.brain.intents import Intent, IntentResult
 from app.services.brain.knowledge import TOP_RULES
@@ -105,12 +105,12 @@ def _device(profile: Mapping[str, Any]) -> InputDevice | None:
 def _flatten(prefix: str, value: Any, out: list[str], limit: int = 16) -> None:
     if len(out) >= limit:
         return
-    if isinstance(value, dict):
+    if isinstance(value, Mapping):
         for k, v in value.items():
             _flatten(f"{prefix}.{k}" if prefix else str(k), v, out, limit)
             if len(out) >= limit:
                 break
-    elif isinstance(value, list):
+    elif isinstance(value, (list, tuple)):
         for item in value:
             _flatten(prefix, item, out, limit)
             if len(out) >= limit:
@@ -127,7 +127,7 @@ class StaticKnowledgeProvider:
     """
 
     def __init__(self, catalog: ContentCatalog | None = None):
-        self.catalog = catalog or ContentCatalog()
+        self.catalog = catalog or default_catalog()
 
     def query(self, request: KnowledgeRequest) -> KnowledgeContext:
         intent = request.intent.intent
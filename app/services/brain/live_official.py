@@ -3,8 +3,11 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
 import time
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from html.parser import HTMLParser
 from typing import Callable
@@ -47,6 +50,22 @@ class OfficialDocument:
 class _CacheEntry:
     document: OfficialDocument
     expires_at: float
+    stale_until: float
+    article_url: str = ""
+    anchor_text: str = ""
+
+
+@dataclass(frozen=True)
+class _Validators:
+    final_url: str
+    etag: str
+    last_modified: str
+
+
+# A fetcher returns (final_url, html). html is None when the server answered
+# 304 Not Modified to a conditional GET, i.e. the last copy is still current.
+Fetcher = Callable[[str], tuple[str, str | None]]
+_MAX_VALIDATORS = 32
 
 
 class _AnchorParser(HTMLParser):
@@ -236,45 +255,97 @@ class OfficialPatchKnowledgeProvider:
     the official article, caches it briefly, and exposes only compact relevant
     evidence. A live official patch note verifies current patch facts; it does
     not turn an AI recommendation into an "official meta ranking".
+
+    Refreshes are single-flight per game: concurrent chats wait for one fetch
+    instead of each downloading and parsing the page. For `stale_s` after the
+    TTL a cached document is served at once while one background refresh runs.
+    Refreshes send If-None-Match/If-Modified-Since, and a 304 reuses the parsed
+    document without touching the HTML parsers.
     """
 
     def __init__(
         self,
         *,
         ttl_s: int = 900,
+        stale_s: int | None = None,
         timeout_s: float = 6.0,
-        fetcher: Callable[[str], tuple[str, str]] | None = None,
+        fetcher: Fetcher | None = None,
     ) -> None:
         self.ttl_s = max(60, int(ttl_s))
+        self.stale_s = max(0, int(self.ttl_s if stale_s is None else stale_s))
         self.timeout_s = max(1.0, min(float(timeout_s), 20.0))
         self.fetcher = fetcher or self._http_fetch
         self._cache: dict[str, _CacheEntry] = {}
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._validators: "OrderedDict[str, _Validators]" = OrderedDict()
+        self._client: httpx.Client | None = None
+
+    def _http_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    timeout=self.timeout_s,
+                    follow_redirects=True,
+                    headers={
+                        "User-Agent": "BLACK-CROWN-OPS/3.0 live-knowledge",
+                        "Accept": "text/html,application/xhtml+xml",
+                    },
+                )
+            return self._client
 
-    def _http_fetch(self, url: str) -> tuple[str, str]:
+    def _http_fetch(self, url: str) -> tuple[str, str | None]:
         if not _is_allowed_url(url):
             raise ValueError("official source URL is not allowlisted")
-        headers = {
-            "User-Agent": "BLACK-CROWN-OPS/3.0 live-knowledge",
-            "Accept": "text/html,application/xhtml+xml",
-        }
-        with httpx.Client(timeout=self.timeout_s, follow_redirects=True, headers=headers) as client:
-            response = client.get(url)
-            response.raise_for_status()
-            final_url = str(response.url)
-            if not _is_allowed_url(final_url):
-                raise ValueError("official source redirected outside allowlist")
-            return final_url, response.text[:2_000_000]
+        with self._lock:
+            known = self._validators.get(url)
+        headers = {}
+        if known is not None:
+            if known.etag:
+                headers["If-None-Match"] = known.etag
+            if known.last_modified:
+                headers["If-Modified-Since"] = known.last_modified
+        response = self._http_client().get(url, headers=headers)
+        if response.status_code == 304 and known is not None:
+            return known.final_url, None
+        response.raise_for_status()
+        final_url = str(response.url)
+        if not _is_allowed_url(final_url):
+            raise ValueError("official source redirected outside allowlist")
+        etag = response.headers.get("ETag", "")
+        last_modified = response.headers.get("Last-Modified", "")
+        with self._lock:
+            if etag or last_modified:
+                self._validators[url] = _Validators(final_url, etag, last_modified)
+                self._validators.move_to_end(url)
+                while len(self._validators) > _MAX_VALIDATORS:
+                    self._validators.popitem(last=False)
+            else:
+                self._validators.pop(url, None)
+        return final_url, response.text[:2_000_000]
+
+    def _get(self, url: str, *, reusable: bool) -> tuple[str, str | None]:
+        """Fetch url; a 304 is only accepted when the caller can reuse its last result."""
+
+        final_url, text = self.fetcher(url)
+        if text is None and not reusable:
+            with self._lock:
+                self._validators.pop(url, None)
+            final_url, text = self.fetcher(url)
+        return final_url, text
 
     def _index_url(self, game: str) -> str:
         return _BF6_INDEX if game == "bf6" else _COD_INDEX
 
-    def _discover_article(self, game: str) -> tuple[str, str]:
+    def _discover_article(self, game: str, previous: _CacheEntry | None = None) -> tuple[str, str]:
         index_url = self._index_url(game)
-        final_index, html = self.fetcher(index_url)
+        final_index, html = self._get(index_url, reusable=bool(previous and previous.article_url))
         if not _is_allowed_url(final_index):
             raise ValueError("index redirect outside allowlist")
+        if html is None and previous is not None:
+            return previous.article_url, previous.anchor_text
         parser = _AnchorParser()
-        parser.feed(html)
+        parser.feed(html or "")
         parser.close()
         seen: set[str] = set()
         for href, text in parser.links:
@@ -287,33 +358,75 @@ class OfficialPatchKnowledgeProvider:
             return absolute, text
         raise LookupError(f"no official {game} patch article found")
 
-    def _load_document(self, game: str) -> OfficialDocument:
-        now = time.monotonic()
-        cached = self._cache.get(game)
-        if cached and cached.expires_at > now:
-            return cached.document
-
-        article_url, anchor_text = self._discover_article(game)
-        final_url, raw_html = self.fetcher(article_url)
+    def _fetch_document(self, game: str, previous: _CacheEntry | None) -> _CacheEntry:
+        article_url, anchor_text = self._discover_article(game, previous)
+        same_article = previous is not None and previous.article_url == article_url
+        final_url, raw_html = self._get(article_url, reusable=same_article)
         if not _is_allowed_url(final_url):
             raise ValueError("article redirect outside allowlist")
 
-        parser = _VisibleTextParser()
-        parser.feed(raw_html)
-        parser.close()
-        blocks = [" ".join(x.split()) for x in parser.blocks if x.strip()]
-        published = _published_date(blocks, raw_html)
         fetched_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
-        document = OfficialDocument(
-            game=game,
-            title=_document_title(game, blocks, anchor_text),
-            url=final_url,
-            published=published,
-            blocks=tuple(blocks[:1200]),
-            fetched_at=fetched_at,
+        if raw_html is None and previous is not None:
+            document = replace(previous.document, fetched_at=fetched_at)
+        else:
+            parser = _VisibleTextParser()
+            parser.feed(raw_html or "")
+            parser.close()
+            blocks = [" ".join(x.split()) for x in parser.blocks if x.strip()]
+            document = OfficialDocument(
+                game=game,
+                title=_document_title(game, blocks, anchor_text),
+                url=final_url,
+                published=_published_date(blocks, raw_html or ""),
+                blocks=tuple(blocks[:1200]),
+                fetched_at=fetched_at,
+            )
+        now = time.monotonic()
+        return _CacheEntry(
+            document=document,
+            expires_at=now + self.ttl_s,
+            stale_until=now + self.ttl_s + self.stale_s,
+            article_url=article_url,
+            anchor_text=anchor_text,
         )
-        self._cache[game] = _CacheEntry(document=document, expires_at=now + self.ttl_s)
-        return document
+
+    def _refresh(self, game: str, previous: _CacheEntry | None, flight: Future) -> None:
+        try:
+            entry = self._fetch_document(game, previous)
+            with self._lock:
+                self._cache[game] = entry
+            flight.set_result(entry.document)
+        except BaseException as exc:
+            if previous is not None:
+                log.warning("official knowledge refresh failed game=%s error=%s", game, type(exc).__name__)
+            flight.set_exception(exc)
+        finally:
+            with self._lock:
+                if self._inflight.get(game) is flight:
+                    del self._inflight[game]
+
+    def _load_document(self, game: str) -> OfficialDocument:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(game)
+            if cached and cached.expires_at > now:
+                return cached.document
+            flight = self._inflight.get(game)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[game] = Future()
+        if cached and cached.stale_until > now:
+            if leader:
+                threading.Thread(
+                    target=self._refresh,
+                    args=(game, cached, flight),
+                    name=f"bco-official-refresh-{game}",
+                    daemon=True,
+                ).start()
+            return cached.document
+        if leader:
+            self._refresh(game, cached, flight)
+        return flight.result()
 
     def query(self, request: KnowledgeRequest) -> KnowledgeContext:
         if request.intent.intent not in {Intent.META_CURRENT, Intent.PATCH_CURRENT}:
@@ -90,7 +90,47 @@ class PromptBuilder:
             lines.append(f"- {fact.text}")
         return "\n".join(lines)
 
-    def build_system(
+    def _static_block(self) -> str:
+        return f"""SYSTEM
+You are {self.product_name}, Artificial Competitive Intelligence for FPS.
+
+Priority:
+1. Correctness
+2. Context awareness
+3. Actionable tactical value
+4. Personalization
+5. Natural conversation
+6. Brand personality
+
+Never trade correctness for confidence, branding, hype or aggression.
+Never fabricate a source, patch, weapon attachment, statistic, player history or video observation.
+Distinguish internally between trusted facts, model knowledge, inference and recommendations.
+
+Operator reasoning contract:
+- A verified fact is scoped to its evidence; do not generalize it into a permanent personality trait.
+- A high-confidence player pattern is strong evidence, not certainty. Phrase it as a recurring pattern.
+- A weak pattern must be tentative. A hypothesis is for measurement/questioning, not diagnosis.
+- Unknown dimensions remain unknown. Never backfill them from generic FPS stereotypes or model intuition.
+- Do not expose internal claim labels, evidence weights, hidden scoring mechanics or raw system metadata to the user.
+- If a mission is ACTIVE, treat its objective as the player's current training priority. Align tactical coaching with it when relevant instead of silently replacing it.
+- A calibration mission exists specifically because evidence is sparse; do not invent a weakness to make the advice feel more personalized.
+- A post-session result can update the next recommendation, but one result alone does not prove causation.
+- Emotion detection changes delivery only. It is not evidence that the player has a persistent tilt-susceptibility trait.
+
+Rules:
+- Use game jargon naturally.
+- No fake pro-player quotes or invented authority.
+- Do not expose internal labels, policies, tokens or hidden confidence scores.
+- Never reveal internal profile keys beginning with underscore.
+- Do not repeat a fixed Diagnosis/Now/Next template for every intent.
+- Ask at most one clarification question and only if it materially changes the recommendation.
+- If VOD is text/timestamp-only, never claim frame analysis.
+- Treat player trends as historical evidence only when the supplied persistent context contains enough observations.
+- When response policy includes sources and trusted knowledge has a source/date, include one concise source/date line.
+- Never describe a BCO meta recommendation as an official developer ranking unless the official evidence actually says that.
+- Write in Russian unless the user explicitly requests another language."""
+
+    def build_sections(
         self,
         *,
         profile: Mapping[str, Any],
@@ -100,7 +140,16 @@ class PromptBuilder:
         emotion_state: str,
         emotion_intensity: str,
         player_context: Mapping[str, Any] | None = None,
-    ) -> str:
+    ) -> list[tuple[str, str]]:
+        """System prompt segments, most stable first.
+
+        Provider prompt caches match on a byte-identical prefix, so the
+        instructions shared by every player and turn come first ("static"),
+        then what changes per player ("player"), then per request ("turn").
+        The language rule closes the static block: the locale variants share
+        everything before it.
+        """
+
         voice = _clean(profile.get("voice") or profile.get("voice_mode") or "TEAMMATE").upper()
         brain = _clean(profile.get("difficulty") or profile.get("brain_mode") or "Normal").upper()
         today = datetime.now(timezone.utc).date().isoformat()
@@ -142,23 +191,18 @@ class PromptBuilder:
         resolved_player_context = player_context or profile
         operator_context = render_operator_context(resolved_player_context)
 
-        return f"""SYSTEM
-You are {self.product_name}, Artificial Competitive Intelligence for FPS.
+        player = f"""Delivery:
+{delivery}
+Brain mode: {brain}. {premium}
 
-Priority:
-1. Correctness
-2. Context awareness
-3. Actionable tactical value
-4. Personalization
-5. Natural conversation
-6. Brand personality
+Server/player context (persistent memory is evidence, not permission to invent missing history):
+{self._profile_block(resolved_player_context)}
 
-Never trade correctness for confidence, branding, hype or aggression.
-Never fabricate a source, patch, weapon attachment, statistic, player history or video observation.
-Distinguish internally between trusted facts, model knowledge, inference and recommendations.
-{current_rule}
+Operator Twin context (server-derived, bounded, truth-calibrated):
+{operator_context}"""
 
-UTC date: {today}
+        turn = f"""UTC date: {today}
+{current_rule}
 Intent: {intent.intent.value} (confidence={intent.confidence:.2f})
 Intent rule: {_INTENT_RULES[intent.intent]}
 
@@ -170,45 +214,34 @@ Response policy:
 - include sources={policy.include_sources}
 - include training={policy.include_training}
 - uncertainty required={policy.require_uncertainty}
-
-Delivery:
-{delivery}
-Brain mode: {brain}. {premium}
 Emotion: {emotion_state}/{emotion_intensity}. {emotion}
 
 Trusted knowledge context:
-{self._knowledge_block(knowledge)}
+{self._knowledge_block(knowledge)}"""
 
-Server/player context (persistent memory is evidence, not permission to invent missing history):
-{self._profile_block(resolved_player_context)}
-
-Operator Twin context (server-derived, bounded, truth-calibrated):
-{operator_context}
+        return [("static", self._static_block()), ("player", player.strip()), ("turn", turn.strip())]
 
-Operator reasoning contract:
-- A verified fact is scoped to its evidence; do not generalize it into a permanent personality trait.
-- A high-confidence player pattern is strong evidence, not certainty. Phrase it as a recurring pattern.
-- A weak pattern must be tentative. A hypothesis is for measurement/questioning, not diagnosis.
-- Unknown dimensions remain unknown. Never backfill them from generic FPS stereotypes or model intuition.
-- Do not expose internal claim labels, evidence weights, hidden scoring mechanics or raw system metadata to the user.
-- If a mission is ACTIVE, treat its objective as the player's current training priority. Align tactical coaching with it when relevant instead of silently replacing it.
-- A calibration mission exists specifically because evidence is sparse; do not invent a weakness to make the advice feel more personalized.
-- A post-session result can update the next recommendation, but one result alone does not prove causation.
-- Emotion detection changes delivery only. It is not evidence that the player has a persistent tilt-susceptibility trait.
-
-Rules:
-- Write in Russian unless the user explicitly requests another language.
-- Use game jargon naturally.
-- No fake pro-player quotes or invented authority.
-- Do not expose internal labels, policies, tokens or hidden confidence scores.
-- Never reveal internal profile keys beginning with underscore.
-- Do not repeat a fixed Diagnosis/Now/Next template for every intent.
-- Ask at most one clarification question and only if it materially changes the recommendation.
-- If VOD is text/timestamp-only, never claim frame analysis.
-- Treat player trends as historical evidence only when the supplied persistent context contains enough observations.
-- When response policy includes sources and trusted knowledge has a source/date, include one concise source/date line.
-- Never describe a BCO meta recommendation as an official developer ranking unless the official evidence actually says that.
-""".strip()
+    def build_system(
+        self,
+        *,
+        profile: Mapping[str, Any],
+        intent: IntentResult,
+        policy: ResponsePolicy,
+        knowledge: KnowledgeContext,
+        emotion_state: str,
+        emotion_intensity: str,
+        player_context: Mapping[str, Any] | None = None,
+    ) -> str:
+        sections = self.build_sections(
+            profile=profile,
+            intent=intent,
+            policy=policy,
+            knowledge=knowledge,
+            emotion_state=emotion_state,
+            emotion_intensity=emotion_intensity,
+            player_context=player_context,
+        )
+        return "\n\n".join(text for _name, text in sections)
 
     def build_messages(
         self,
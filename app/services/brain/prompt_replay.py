@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""Replay recorded conversations through the prompt builder.
+
+    python -m app.services.brain.prompt_replay turns.jsonl [--min-cached-tokens 1024]
+
+Each input line is one recorded turn: ``{"chat_id": 1, "text": "...",
+"profile": {...}, "reply": "..."}``; ``history`` may be given explicitly,
+otherwise it is rebuilt per chat from earlier ``text``/``reply`` pairs. The
+report covers how much of each request repeats a prefix already sent
+(what a provider prompt cache can reuse) and the size of each system
+prompt section. Nothing is sent anywhere.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from app.services.brain.ai_hook import detect_emotion
+from app.services.brain.intents import classify_intent
+from app.services.brain.knowledge_context import KnowledgeRequest, StaticKnowledgeProvider
+from app.services.brain.prompt_builder import PromptBuilder, _recent
+from app.services.brain.response_policy import get_response_policy
+
+# Requests compared for a shared prefix; providers only keep recent prefixes.
+PREFIX_WINDOW = 256
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough BPE-sized count: about four UTF-8 bytes per token."""
+
+    size = len(text.encode("utf-8"))
+    return (size + 3) // 4
+
+
+def _common_prefix(a: str, b: str) -> int:
+    # Binary search on slice equality keeps the comparison in C.
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+@dataclass
+class ReplayReport:
+    requests: int = 0
+    total_tokens: int = 0
+    shared_prefix_tokens: int = 0
+    cacheable_tokens: int = 0
+    section_tokens: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def shared_prefix_ratio(self) -> float:
+        return self.shared_prefix_tokens / self.total_tokens if self.total_tokens else 0.0
+
+    @property
+    def cacheable_ratio(self) -> float:
+        return self.cacheable_tokens / self.total_tokens if self.total_tokens else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        requests = max(1, self.requests)
+        return {
+            "requests": self.requests,
+            "total_tokens": self.total_tokens,
+            "shared_prefix_tokens": self.shared_prefix_tokens,
+            "shared_prefix_ratio": round(self.shared_prefix_ratio, 4),
+            "cacheable_tokens": self.cacheable_tokens,
+            "cacheable_ratio": round(self.cacheable_ratio, 4),
+            "avg_section_tokens": {name: round(count / requests, 1) for name, count in self.section_tokens.items()},
+        }
+
+
+def _serialize(messages: list[dict]) -> str:
+    return "".join(f"<|{m['role']}|>{m['content']}" for m in messages)
+
+
+def replay(
+    turns: Iterable[Mapping[str, Any]],
+    *,
+    builder: PromptBuilder | None = None,
+    min_cached_tokens: int = 1024,
+) -> ReplayReport:
+    builder = builder or PromptBuilder()
+    knowledge_provider = StaticKnowledgeProvider()
+    histories: dict[str, list[dict]] = {}
+    previous: list[str] = []
+    report = ReplayReport()
+
+    for turn in turns:
+        text = str(turn.get("text") or "")
+        profile = dict(turn.get("profile") or {})
+        chat = str(turn.get("chat_id") or "")
+        history = turn.get("history")
+        if not isinstance(history, list):
+            history = histories.setdefault(chat, [])
+        intent = classify_intent(text, profile)
+        emotion_state, emotion_intensity = detect_emotion(text)
+        sections = builder.build_sections(
+            profile=profile,
+            intent=intent,
+            policy=get_response_policy(intent, profile),
+            knowledge=knowledge_provider.query(KnowledgeRequest(intent=intent, text=text, profile=profile)),
+            emotion_state=emotion_state,
+            emotion_intensity=emotion_intensity,
+        )
+        messages = [{"role": "system", "content": "\n\n".join(body for _name, body in sections)}]
+        messages.extend(_recent(list(history)))
+        messages.append({"role": "user", "content": text.strip()[:6000]})
+        request = _serialize(messages)
+
+        shared = max((_common_prefix(request, earlier) for earlier in previous), default=0)
+        shared_tokens = estimate_tokens(request[:shared])
+        report.requests += 1
+        report.total_tokens += estimate_tokens(request)
+        report.shared_prefix_tokens += shared_tokens
+        if shared_tokens >= min_cached_tokens:
+            report.cacheable_tokens += shared_tokens
+        for name, body in sections:
+            report.section_tokens[name] = report.section_tokens.get(name, 0) + estimate_tokens(body)
+
+        previous.append(request)
+        del previous[:-PREFIX_WINDOW]
+        if turn.get("history") is None:
+            history.append({"role": "user", "content": text})
+            if turn.get("reply"):
+                history.append({"role": "assistant", "content": str(turn["reply"])})
+    return report
+
+
+def _read_turns(path: Path) -> list[dict]:
+    turns: list[dict] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line:
+            turns.append(json.loads(line))
+    return turns
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded turns and report prompt prefix reuse.")
+    parser.add_argument("path", type=Path, help="JSONL file with one recorded turn per line")
+    parser.add_argument("--min-cached-tokens", type=int, default=1024, help="provider minimum cacheable prefix")
+    args = parser.parse_args(argv)
+    report = replay(_read_turns(args.path), min_cached_tokens=args.min_cached_tokens)
+    json.dump(report.as_dict(), sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,6 +8,7 @@ from typing import Any
 
 from app.services.operator_intelligence.context import OperatorContextService
 from app.services.player_memory.service import PlayerMemoryService
+from app.services.storage.turn_snapshot import player_turn
 
 
 PartialCallback = Callable[[str, dict[str, Any]], None]
@@ -110,6 +111,29 @@ class ConversationService:
             except Exception:
                 chat_id = None
 
+        # One turn, one player snapshot: profile, player memory, operator
+        # context and the post-reply derived refresh share store reads until
+        # a write for this chat invalidates them.
+        with player_turn(chat_id if trusted else None):
+            return self._reply_turn(
+                text=text,
+                profile=profile,
+                history=history,
+                on_partial=on_partial,
+                trusted=trusted,
+                chat_id=chat_id,
+            )
+
+    def _reply_turn(
+        self,
+        *,
+        text: str,
+        profile: dict,
+        history: list[dict],
+        on_partial: PartialCallback | None,
+        trusted: bool,
+        chat_id: int | None,
+    ) -> str:
         # Enforce cost limits at the canonical AI generation boundary. This
         # protects both Telegram and verified Mini App calls and deliberately
         # happens before Mini App working-memory writes.
@@ -1,22 +1,38 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import asyncio
+import logging
+import time
 from dataclasses import asdict, is_dataclass
 from datetime import datetime, timezone
-from typing import Any, Mapping
+from typing import Any, Awaitable, Callable, Mapping
 
 from app.services.analytics.command_center import CommandCenterService
 from app.services.identity import CrownIdentityCore
 from app.services.operator_intelligence.orchestrated_service import OrchestratedOperatorIntelligenceService
+from app.services.storage.bundle import load_player_bundle
+from app.services.storage.turn_snapshot import player_turn
+
+log = logging.getLogger("bco.crown_session")
+
+DEFAULT_DEADLINE_S = 6.0
 
 
 class CrownSessionService:
-    """Compose one trusted, read-only player session for every BLACK CROWN surface."""
+    """Compose one trusted, read-only player session for every BLACK CROWN surface.
+
+    Identity, entitlement and the player bundle load concurrently. The profile,
+    command-center and operator views then read that one bundle through the
+    turn snapshot. Every store part runs off the event loop. Anything still
+    missing when `deadline_s` runs out is left out and named in `partial`.
+    """
 
-    def __init__(self, *, store: Any, profiles: Any, entitlements: Any = None) -> None:
+    def __init__(self, *, store: Any, profiles: Any, entitlements: Any = None, deadline_s: float = DEFAULT_DEADLINE_S) -> None:
         self.store = store
         self.profiles = profiles
         self.entitlements = entitlements
+        self.deadline_s = max(0.1, float(deadline_s))
 
     @staticmethod
     def _public_entitlement(status: Any) -> dict[str, Any]:
@@ -56,22 +72,59 @@ class CrownSessionService:
             "linked_at": str(raw.get("linked_at") or "")[:64] or None,
         }
 
+    async def _gather(self, cid: int, uid: int) -> tuple[dict[str, Any], list[str]]:
+        bundle = asyncio.ensure_future(asyncio.to_thread(load_player_bundle, self.store, cid))
+
+        async def after_bundle(fn: Callable[[], Any]) -> Any:
+            # Bundle failures are fine: each view falls back to its own reads.
+            await asyncio.wait({bundle})
+            return await asyncio.to_thread(fn)
+
+        parts: dict[str, Awaitable[Any]] = {
+            "identity": asyncio.to_thread(CrownIdentityCore(self.store).resolve_telegram, uid),
+            "profile": after_bundle(lambda: dict(self.profiles.get(cid) or {})),
+            "player": after_bundle(lambda: CommandCenterService(store=self.store, profiles=self.profiles).snapshot(cid)),
+            "operator_twin": after_bundle(
+                lambda: OrchestratedOperatorIntelligenceService.from_components(store=self.store, profiles=self.profiles).snapshot(cid)
+            ),
+        }
+        if self.entitlements is not None:
+            parts["entitlement"] = self.entitlements.get_status(uid)
+        tasks = {name: asyncio.ensure_future(part) for name, part in parts.items()}
+        await asyncio.wait(tasks.values(), timeout=self.deadline_s)
+
+        values: dict[str, Any] = {}
+        partial: list[str] = []
+        for name, task in tasks.items():
+            if not task.done():
+                task.cancel()
+                partial.append(name)
+                log.warning("crown session part timed out part=%s deadline_s=%.1f", name, self.deadline_s)
+                continue
+            try:
+                values[name] = task.result()
+            except Exception as exc:
+                partial.append(name)
+                log.warning("crown session part failed part=%s error=%s", name, type(exc).__name__)
+        if not bundle.done():
+            bundle.cancel()
+        elif not bundle.cancelled():
+            bundle.exception()
+        return values, partial
+
     async def snapshot(self, *, chat_id: int, telegram_user_id: int) -> dict[str, Any]:
         cid = int(chat_id)
         uid = int(telegram_user_id)
-        identity = CrownIdentityCore(self.store).resolve_telegram(uid)
-        profile = dict(self.profiles.get(cid) or {})
-        player = CommandCenterService(store=self.store, profiles=self.profiles).snapshot(cid)
-        operator = OrchestratedOperatorIntelligenceService.from_components(store=self.store, profiles=self.profiles).snapshot(cid)
+        started = time.monotonic()
+        with player_turn(cid):
+            values, partial = await self._gather(cid, uid)
+        identity = values.get("identity")
+        profile = dict(values.get("profile") or {})
+        player = dict(values.get("player") or {})
+        operator = dict(values.get("operator_twin") or {})
 
-        entitlement_status = None
-        entitlement_state = "unavailable"
-        if self.entitlements is not None:
-            try:
-                entitlement_status = await self.entitlements.get_status(uid)
-                entitlement_state = "resolved"
-            except Exception:
-                entitlement_state = "unavailable"
+        entitlement_status = values.get("entitlement")
+        entitlement_state = "resolved" if "entitlement" in values else "unavailable"
 
         canonical_id = identity.black_crown_user_id if identity is not None else str(profile.get("_black_crown_user_id") or "") or None
         identity_status = identity.status if identity is not None else str(profile.get("_identity_status") or "") or None
@@ -107,4 +160,6 @@ class CrownSessionService:
                 "mini_app": {"trusted": True, "identity_source": "telegram_init_data"},
                 "canonical": bool(canonical_id),
             },
+            "partial": partial,
+            "assembly_ms": int((time.monotonic() - started) * 1000),
         }
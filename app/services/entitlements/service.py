@@ -4,9 +4,11 @@ from __future__ import annotations
 import hashlib
 import logging
 import secrets
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable
 from urllib.parse import quote, urlsplit
 
 import httpx
@@ -46,15 +48,32 @@ class EntitlementStatus:
     linked_at: str | None = None
 
 
+@dataclass(frozen=True)
+class _CachedStatus:
+    expires_at: float
+    status: EntitlementStatus | None = None
+    error: Exception | None = None
+
+
 class PremiumEntitlementService:
     """Server-only bridge between Telegram identity and Supabase GAME.
 
     The bot creates the one-time token and stores only its SHA-256 hash through
     a service-role-only RPC. Account linking never creates Premium ownership;
     `bco_premium` must already exist as an authoritative entitlement row.
+
+    Telegram statuses are cached per user for a short TTL (failures for a
+    shorter one) and dropped at once when this process links or unlinks;
+    `on_link_change` lets other per-user caches (canonical identity) follow.
     """
 
-    def __init__(self, settings: Any, *, client: httpx.AsyncClient | None = None):
+    def __init__(
+        self,
+        settings: Any,
+        *,
+        client: httpx.AsyncClient | None = None,
+        on_link_change: Callable[[int | None], None] | None = None,
+    ):
         self._enabled = bool(getattr(settings, "premium_link_enabled", True))
         self._base_url = str(getattr(settings, "supabase_url", "") or "").strip().rstrip("/")
         self._service_key = str(getattr(settings, "supabase_service_role_key", "") or "").strip()
@@ -68,6 +87,14 @@ class PremiumEntitlementService:
         self._client = client or httpx.AsyncClient(timeout=httpx.Timeout(timeout_s))
         self._last_error = ""
         self._last_success_at: str | None = None
+        self._status_ttl_s = max(0.0, float(getattr(settings, "entitlement_cache_ttl_s", 60.0) or 0.0))
+        self._negative_ttl_s = max(0.0, float(getattr(settings, "entitlement_negative_ttl_s", 10.0) or 0.0))
+        self._status_cache_max = max(1, int(getattr(settings, "entitlement_cache_max_entries", 5000) or 5000))
+        self._status_cache: "OrderedDict[int, _CachedStatus]" = OrderedDict()
+        # sha256(code) -> (telegram_user_id, expires_at) for challenges issued here.
+        self._pending_links: "OrderedDict[str, tuple[int, float]]" = OrderedDict()
+        self._cache_stats = {"hits": 0, "misses": 0, "negative_hits": 0, "invalidations": 0}
+        self._on_link_change = on_link_change
 
     @property
     def configured(self) -> bool:
@@ -93,8 +120,40 @@ class PremiumEntitlementService:
             "configured": self.configured,
             "last_success_at": self._last_success_at,
             "last_error": self._last_error[:64],
+            "status_cache": {
+                "ttl_s": self._status_ttl_s,
+                "negative_ttl_s": self._negative_ttl_s,
+                "entries": len(self._status_cache),
+                **self._cache_stats,
+            },
         }
 
+    def invalidate_status(self, telegram_user_id: int | None = None) -> None:
+        """Drop one user's cached status, or every cached status when None."""
+
+        if telegram_user_id is None:
+            self._status_cache.clear()
+        else:
+            self._status_cache.pop(int(telegram_user_id), None)
+        self._cache_stats["invalidations"] += 1
+
+    def _link_changed(self, telegram_user_id: int | None) -> None:
+        self.invalidate_status(telegram_user_id)
+        if self._on_link_change is None:
+            return
+        try:
+            self._on_link_change(telegram_user_id)
+        except Exception as exc:
+            log.warning("entitlement link hook failed error=%s", type(exc).__name__)
+
+    def _cache_status(self, user_id: int, entry: _CachedStatus) -> None:
+        if entry.expires_at <= time.monotonic():
+            return
+        self._status_cache[user_id] = entry
+        self._status_cache.move_to_end(user_id)
+        while len(self._status_cache) > self._status_cache_max:
+            self._status_cache.popitem(last=False)
+
     async def close(self) -> None:
         if self._owns_client:
             await self._client.aclose()
@@ -214,6 +273,12 @@ class PremiumEntitlementService:
             },
         )
         ttl = max(60, min(int(raw.get("ttl_seconds") or self._ttl_seconds), 900))
+        now = time.monotonic()
+        self._pending_links[code_hash] = (user_id, now + ttl)
+        while self._pending_links and (
+            len(self._pending_links) > 1000 or next(iter(self._pending_links.values()))[1] <= now
+        ):
+            self._pending_links.popitem(last=False)
         base = self._account_url.split("#", 1)[0]
         url = f"{base}#telegram-link={quote(code, safe='-_')}"
         return LinkChallenge(
@@ -227,8 +292,24 @@ class PremiumEntitlementService:
         user_id = int(telegram_user_id)
         if user_id <= 0:
             raise ValueError("invalid_telegram_identity")
-        raw = await self._rpc(_RPC_TELEGRAM_STATUS, {"p_telegram_user_id": user_id})
-        return self._status_from_raw(raw)
+        now = time.monotonic()
+        cached = self._status_cache.get(user_id)
+        if cached is not None and cached.expires_at > now:
+            self._status_cache.move_to_end(user_id)
+            if cached.error is not None:
+                self._cache_stats["negative_hits"] += 1
+                raise cached.error.with_traceback(None)
+            self._cache_stats["hits"] += 1
+            return cached.status
+        self._cache_stats["misses"] += 1
+        try:
+            raw = await self._rpc(_RPC_TELEGRAM_STATUS, {"p_telegram_user_id": user_id})
+        except Exception as exc:
+            self._cache_status(user_id, _CachedStatus(time.monotonic() + self._negative_ttl_s, error=exc))
+            raise
+        status = self._status_from_raw(raw)
+        self._cache_status(user_id, _CachedStatus(time.monotonic() + self._status_ttl_s, status=status))
+        return status
 
     async def complete_site_link(self, *, code: str, site_user_id: str) -> EntitlementStatus:
         safe_code = self._safe_code(code)
@@ -237,10 +318,17 @@ class PremiumEntitlementService:
             raise ValueError("invalid_or_expired_code")
         if not safe_user:
             raise ValueError("invalid_site_user")
-        raw = await self._rpc(
-            _RPC_COMPLETE_LINK,
-            {"p_code": safe_code, "p_site_user_id": safe_user},
-        )
+        code_hash = hashlib.sha256(safe_code.encode("utf-8")).hexdigest()
+        try:
+            raw = await self._rpc(
+                _RPC_COMPLETE_LINK,
+                {"p_code": safe_code, "p_site_user_id": safe_user},
+            )
+        finally:
+            # The RPC does not echo the Telegram user; challenges issued by this
+            # process are remembered, anything else clears the whole cache.
+            pending = self._pending_links.pop(code_hash, None)
+            self._link_changed(pending[0] if pending else None)
         return self._status_from_raw({**raw, "site_user_id": safe_user})
 
     async def get_site_status(self, site_user_id: str) -> EntitlementStatus:
@@ -254,5 +342,8 @@ class PremiumEntitlementService:
         user_id = int(telegram_user_id)
         if user_id <= 0:
             raise ValueError("invalid_telegram_identity")
-        raw = await self._rpc(_RPC_UNLINK, {"p_telegram_user_id": user_id})
+        try:
+            raw = await self._rpc(_RPC_UNLINK, {"p_telegram_user_id": user_id})
+        finally:
+            self._link_changed(user_id)
         return raw.get("unlinked") is True
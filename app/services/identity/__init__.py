@@ -1,3 +1,4 @@
+from app.services.identity.cache import IdentityCache
 from app.services.identity.core import CrownIdentity, CrownIdentityCore
 
-__all__ = ["CrownIdentity", "CrownIdentityCore"]
+__all__ = ["CrownIdentity", "CrownIdentityCore", "IdentityCache"]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+
+class IdentityCache:
+    """Bounded TTL cache for Telegram -> canonical identity resolutions.
+
+    Resolved identities are kept for ``ttl_s``; an empty resolution (no
+    canonical account yet) only for ``negative_ttl_s`` so a fresh link shows
+    up quickly even when no explicit invalidation reached this process.
+    Entries are evicted least recently used past ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float = 600.0,
+        negative_ttl_s: float = 30.0,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_s = max(0.0, float(ttl_s))
+        self.negative_ttl_s = max(0.0, min(self.ttl_s, float(negative_ttl_s)))
+        self.max_entries = max(1, min(int(max_entries or 10_000), 100_000))
+        self._clock = clock
+        self._entries: OrderedDict[int, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "negative_hits": 0, "invalidations": 0, "evictions": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_s > 0
+
+    def get(self, telegram_user_id: int) -> dict[str, Any] | None:
+        """Cached resolution (``{}`` for a cached miss), or None."""
+
+        key = int(telegram_user_id)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                expires_at, value = cached
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    if not value:
+                        self._stats["negative_hits"] += 1
+                    return dict(value)
+                del self._entries[key]
+            self._stats["misses"] += 1
+            return None
+
+    @property
+    def generation(self) -> int:
+        """Bumped by every invalidation; read it before resolving."""
+
+        return self._generation
+
+    def put(self, telegram_user_id: int, value: dict[str, Any], *, generation: int | None = None) -> None:
+        ttl = self.ttl_s if value else self.negative_ttl_s
+        if ttl <= 0:
+            return
+        key = int(telegram_user_id)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                # Invalidated while the resolver was in flight: the value may
+                # predate a link change, so let the next read fetch again.
+                return
+            self._entries[key] = (self._clock() + ttl, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, telegram_user_id: int | None = None) -> None:
+        """Drop one user's resolution, or every resolution when None."""
+
+        with self._lock:
+            self._generation += 1
+            self._stats["invalidations"] += 1
+            if telegram_user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(int(telegram_user_id), None)
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "ttl_s": self.ttl_s,
+                "negative_ttl_s": self.negative_ttl_s,
+                "max_entries": self.max_entries,
+                "entries": len(self._entries),
+                **self._stats,
+            }
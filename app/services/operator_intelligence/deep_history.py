@@ -6,6 +6,7 @@ from statistics import mean
 from typing import Any, Mapping
 
 from app.services.operator_intelligence.service import MISSION_EVENT_TYPE
+from app.services.storage.progression import progression_projection
 from app.services.vod.mission_evidence import EVENT_TYPE as MISSION_EVIDENCE_EVENT_TYPE
 
 PREMIUM_MAX_CYCLES = 36
@@ -32,16 +33,7 @@ class PremiumDeepHistoryService:
         self.store = store
 
     def _rows(self, chat_id: int) -> list[dict[str, Any]]:
-        fn = getattr(self.store, "list_progression_events", None)
-        if not callable(fn):
-            return []
-        try:
-            rows = fn(int(chat_id), 100)
-        except TypeError:
-            rows = fn(int(chat_id))
-        except Exception:
-            return []
-        return [dict(row) for row in list(rows or []) if isinstance(row, Mapping)]
+        return progression_projection(self.store, int(chat_id)).select("outcomes", "vod_evidence")
 
     def snapshot(self, chat_id: int) -> dict[str, Any]:
         rows = self._rows(int(chat_id))
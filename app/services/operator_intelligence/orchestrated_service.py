@@ -6,6 +6,7 @@ from typing import Any, Mapping
 
 from app.services.operator_intelligence.mission_orchestrator import MissionOrchestrator
 from app.services.operator_intelligence.v28 import OperatorIntelligenceService as CurrentOperatorIntelligenceService
+from app.services.storage.progression import progression_projection
 
 
 def _env_on(name: str, default: str = "1") -> bool:
@@ -78,19 +79,8 @@ class OrchestratedOperatorIntelligenceService:
         return bool(self.base.missions_enabled)
 
     def _progression(self, chat_id: int) -> list[dict[str, Any]]:
-        fn = getattr(self.store, "list_progression_events", None)
-        if not callable(fn):
-            return []
-        try:
-            rows = fn(int(chat_id), 120)
-        except TypeError:
-            try:
-                rows = fn(int(chat_id))
-            except Exception:
-                return []
-        except Exception:
-            return []
-        return [dict(row) for row in list(rows or []) if isinstance(row, Mapping)]
+        # Mission staging replays explicit mission outcomes only.
+        return progression_projection(self.store, int(chat_id)).missions
 
     def _decorate_mission(
         self,
@@ -1,15 +1,17 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
 import math
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from statistics import mean, pstdev
 from typing import Any, Mapping
 
 from app.services.player_memory.service import PlayerMemoryService
+from app.services.operator_intelligence.twin_state import merge_evidence, operator_twin_view
 
 MISSION_EVENT_TYPE = "operator_mission"
 MISSION_SOURCE = "operator_twin_v25"
@@ -107,7 +109,7 @@ def _time_of(item: Mapping[str, Any]) -> str:
     return str(item.get("at") or item.get("created_at") or item.get("last_seen") or "")[:64]
 
 
-def _age_days(value: Any) -> int | None:
+def _parse_time(value: Any) -> datetime | None:
     raw = str(value or "").strip()
     if not raw:
         return None
@@ -115,11 +117,18 @@ def _age_days(value: Any) -> int | None:
         when = datetime.fromisoformat(raw.replace("Z", "+00:00"))
         if when.tzinfo is None:
             when = when.replace(tzinfo=timezone.utc)
-        return max(0, int((_now() - when.astimezone(timezone.utc)).total_seconds() // 86400))
+        return when.astimezone(timezone.utc)
     except Exception:
         return None
 
 
+def _age_days(value: Any) -> int | None:
+    when = _parse_time(value)
+    if when is None:
+        return None
+    return max(0, int((_now() - when).total_seconds() // 86400))
+
+
 def _classify(text: Any) -> list[str]:
     low = " ".join(str(text or "").casefold().split())
     if not low:
@@ -165,8 +174,11 @@ class OperatorIntelligenceService:
         except Exception:
             return default
 
-    def _profile(self, chat_id: int) -> dict[str, Any]:
+    def _profile(self, chat_id: int, stored: Mapping[str, Any] | None = None) -> dict[str, Any]:
+        compose = getattr(self.profiles, "compose", None)
         try:
+            if stored is not None and callable(compose):
+                return dict(compose(int(chat_id), stored) or {})
             return dict(self.profiles.get(int(chat_id)) or {})
         except Exception:
             return {}
@@ -183,8 +195,8 @@ class OperatorIntelligenceService:
             "fact_class": fact_class, "value": value,
         }
 
-    def _collect_evidence(self, profile: Mapping[str, Any], mistakes: list[dict[str, Any]], progression: list[dict[str, Any]], episodes: list[dict[str, Any]], derived: Mapping[str, Any]) -> dict[str, list[dict[str, Any]]]:
-        evidence = {domain: [] for domain in DOMAINS}
+    def _mistake_evidence(self, mistakes: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+        evidence: dict[str, list[dict[str, Any]]] = {}
         for row in mistakes:
             label = str(row.get("label") or "").strip()
             domains = _classify(label)
@@ -194,71 +206,98 @@ class OperatorIntelligenceService:
             at = str(row.get("last_seen") or "")[:64]
             weight = 0.9 + min(3.6, count * 0.45)
             for domain in domains:
-                evidence[domain].append(self._evidence_item(
+                evidence.setdefault(domain, []).append(self._evidence_item(
                     domain=domain, source="recurring_mistake", label=label, direction="risk", weight=weight, at=at,
                     fact_class="high_confidence_pattern" if count >= 3 else "weak_pattern", value={"count": count},
                 ))
+        return evidence
+
+    def _profile_evidence(self, profile: Mapping[str, Any]) -> dict[str, list[dict[str, Any]]]:
+        evidence: dict[str, list[dict[str, Any]]] = {}
         for domain, field in _PROFILE_SCORE_FIELDS.items():
             value = _safe_number(profile.get(field))
             if value is None:
                 continue
             value = max(0.0, min(100.0, value))
             direction = "risk" if value < 55 else ("strength" if value >= 75 else "neutral")
-            evidence[domain].append(self._evidence_item(
+            evidence.setdefault(domain, []).append(self._evidence_item(
                 domain=domain, source="reported_profile", label=f"{field}={value:g}", direction=direction,
                 weight=1.0, fact_class="verified_fact", value=value,
             ))
-        for row in progression:
-            event_type = str(row.get("type") or row.get("event") or "")
-            at = _time_of(row)
-            if event_type == MISSION_EVENT_TYPE and str(row.get("status") or "").casefold() == "completed":
-                domain = str(row.get("focus") or "").casefold()
-                if domain in evidence:
-                    outcome = str(row.get("outcome") or "reported").casefold()
-                    direction = "strength" if outcome == "clean" else ("risk" if outcome == "failed" else "neutral")
-                    evidence[domain].append(self._evidence_item(
-                        domain=domain, source="mission_result", label=f"mission outcome={outcome}", direction=direction,
-                        weight=1.4, at=at, fact_class="verified_fact", value=outcome,
-                    ))
-            accuracy = _metric(row, "accuracy_pct")
-            if accuracy is not None:
-                accuracy = max(0.0, min(100.0, accuracy))
-                direction = "risk" if accuracy < 45 else ("strength" if accuracy >= 62 else "neutral")
-                evidence["aim"].append(self._evidence_item(
-                    domain="aim", source="explicit_match_report", label=f"accuracy_pct={accuracy:g}", direction=direction,
-                    weight=0.8, at=at, fact_class="verified_fact", value=accuracy,
+        return evidence
+
+    def _progression_evidence(self, row: Mapping[str, Any]) -> dict[str, list[dict[str, Any]]]:
+        evidence: dict[str, list[dict[str, Any]]] = {}
+        event_type = str(row.get("type") or row.get("event") or "")
+        at = _time_of(row)
+        if event_type == MISSION_EVENT_TYPE and str(row.get("status") or "").casefold() == "completed":
+            domain = str(row.get("focus") or "").casefold()
+            if domain in DOMAINS:
+                outcome = str(row.get("outcome") or "reported").casefold()
+                direction = "strength" if outcome == "clean" else ("risk" if outcome == "failed" else "neutral")
+                evidence.setdefault(domain, []).append(self._evidence_item(
+                    domain=domain, source="mission_result", label=f"mission outcome={outcome}", direction=direction,
+                    weight=1.4, at=at, fact_class="verified_fact", value=outcome,
                 ))
-        for row in episodes:
-            if str(row.get("kind") or "") != "vod_sampled_frames":
-                continue
-            at = _time_of(row)
-            for label in list(row.get("confirmed_mistakes") or [])[:8]:
-                for domain in _classify(label):
-                    evidence[domain].append(self._evidence_item(
-                        domain=domain, source="vod_sampled_frames", label=str(label), direction="risk", weight=2.1,
-                        at=at, fact_class="high_confidence_pattern",
-                    ))
+        accuracy = _metric(row, "accuracy_pct")
+        if accuracy is not None:
+            accuracy = max(0.0, min(100.0, accuracy))
+            direction = "risk" if accuracy < 45 else ("strength" if accuracy >= 62 else "neutral")
+            evidence.setdefault("aim", []).append(self._evidence_item(
+                domain="aim", source="explicit_match_report", label=f"accuracy_pct={accuracy:g}", direction=direction,
+                weight=0.8, at=at, fact_class="verified_fact", value=accuracy,
+            ))
+        return evidence
+
+    def _episode_evidence(self, row: Mapping[str, Any]) -> dict[str, list[dict[str, Any]]]:
+        evidence: dict[str, list[dict[str, Any]]] = {}
+        if str(row.get("kind") or "") != "vod_sampled_frames":
+            return evidence
+        at = _time_of(row)
+        for label in list(row.get("confirmed_mistakes") or [])[:8]:
+            for domain in _classify(label):
+                evidence.setdefault(domain, []).append(self._evidence_item(
+                    domain=domain, source="vod_sampled_frames", label=str(label), direction="risk", weight=2.1,
+                    at=at, fact_class="high_confidence_pattern",
+                ))
+        return evidence
+
+    def _trend_evidence(self, derived: Mapping[str, Any]) -> dict[str, list[dict[str, Any]]]:
         trends = derived.get("trends") if isinstance(derived.get("trends"), Mapping) else {}
         accuracy_trend = trends.get("accuracy_pct") if isinstance(trends, Mapping) else None
         if isinstance(accuracy_trend, Mapping):
             delta = _safe_number(accuracy_trend.get("delta"))
             if delta is not None and abs(delta) >= 0.5:
-                evidence["aim"].append(self._evidence_item(
+                return {"aim": [self._evidence_item(
                     domain="aim", source="derived_trend", label=f"accuracy trend Δ{delta:+g}",
                     direction="strength" if delta > 0 else "risk", weight=min(1.8, 0.5 + abs(delta) / 8.0),
                     fact_class="weak_pattern", value=delta,
-                ))
+                )]}
+        return {}
+
+    def _consistency_evidence(self, progression: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
         series = [value for row in progression[:20] if (value := _metric(row, "accuracy_pct")) is not None]
-        if len(series) >= 5:
-            avg = mean(series)
-            cv = (pstdev(series) / max(1.0, abs(avg))) * 100.0
-            evidence["consistency"].append(self._evidence_item(
-                domain="consistency", source="repeated_match_reports",
-                label=f"accuracy relative spread={cv:.1f}% across {len(series)} reports",
-                direction="risk" if cv >= 22 else ("strength" if cv <= 10 else "neutral"),
-                weight=1.5, fact_class="weak_pattern", value=round(cv, 2),
-            ))
-        return evidence
+        if len(series) < 5:
+            return {}
+        avg = mean(series)
+        cv = (pstdev(series) / max(1.0, abs(avg))) * 100.0
+        return {"consistency": [self._evidence_item(
+            domain="consistency", source="repeated_match_reports",
+            label=f"accuracy relative spread={cv:.1f}% across {len(series)} reports",
+            direction="risk" if cv >= 22 else ("strength" if cv <= 10 else "neutral"),
+            weight=1.5, fact_class="weak_pattern", value=round(cv, 2),
+        )]}
+
+    def _collect_evidence(self, profile: Mapping[str, Any], mistakes: list[dict[str, Any]], progression: list[dict[str, Any]], episodes: list[dict[str, Any]], derived: Mapping[str, Any]) -> dict[str, list[dict[str, Any]]]:
+        parts = [
+            self._mistake_evidence(mistakes),
+            self._profile_evidence(profile),
+            *(self._progression_evidence(row) for row in progression),
+            *(self._episode_evidence(row) for row in episodes),
+            self._trend_evidence(derived),
+            self._consistency_evidence(progression),
+        ]
+        return merge_evidence(parts, DOMAINS)
 
     @staticmethod
     def _trend_for(items: list[dict[str, Any]]) -> str:
@@ -322,6 +361,17 @@ class OperatorIntelligenceService:
             "uncertainty": uncertainty, "evidence": items[:6], "_priority": round(priority, 2),
         }
 
+    @staticmethod
+    def _dimension_expiry(items: list[dict[str, Any]]) -> datetime | None:
+        """When `_dimension(items)` would next change on its own: the day its recency ticks over."""
+
+        items = sorted(items, key=lambda x: float(x.get("weight") or 0.0), reverse=True)[:12]
+        times = [when for when in (_parse_time(x.get("at")) for x in items) if when is not None]
+        if not times:
+            return None
+        newest = max(times)
+        return newest + timedelta(days=max(0, int((_now() - newest).total_seconds() // 86400)) + 1)
+
     @staticmethod
     def _truth_model(dimensions: Mapping[str, Mapping[str, Any]]) -> dict[str, int]:
         result = {"verified_facts": 0, "high_confidence_patterns": 0, "weak_patterns": 0, "hypotheses": 0, "unknown_dimensions": 0}
@@ -412,18 +462,13 @@ class OperatorIntelligenceService:
 
     def snapshot(self, chat_id: int) -> dict[str, Any]:
         cid = int(chat_id)
-        profile = self._profile(cid)
-        mistakes = self._rows("list_mistake_stats", cid, 20)
-        progression = self._rows("list_progression_events", cid, 60)
-        episodes = self._rows("list_episodes", cid, 40, takes_limit=True)
-        derived = self._call("get_derived_intelligence", cid, default={}) or {}
-        if not isinstance(derived, Mapping): derived = {}
-        evidence = self._collect_evidence(profile, mistakes, progression, episodes, derived)
-        dimensions = {domain: self._dimension(domain, evidence[domain]) for domain in DOMAINS}
+        dimensions, progression = operator_twin_view(
+            self, cid, now=_now(), domains=DOMAINS, progression_limit=60, episodes_limit=40,
+        )
         truth = self._truth_model(dimensions)
         state = self._operator_state(dimensions, truth)
         history = self._mission_history(progression)
-        active = self._active_mission(history.get("active"))
+        active = self._active_mission(copy.deepcopy(history.get("active")))
         mission = active or self._candidate(cid, dimensions, history)
         public_dimensions = {}
         for domain, dim in dimensions.items():
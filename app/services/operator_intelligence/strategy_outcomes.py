@@ -7,6 +7,7 @@ from collections import defaultdict
 from typing import Any, Mapping
 
 from app.services.operator_intelligence.service import MISSION_EVENT_TYPE
+from app.services.storage.progression import progression_projection
 
 STRATEGY_EVENT_TYPE = "premium_strategy"
 STRATEGY_SOURCE = "premium_adaptive_strategy_v31"
@@ -47,16 +48,7 @@ class PremiumStrategyOutcomeService:
         self.store = store
 
     def _rows(self, chat_id: int) -> list[dict[str, Any]]:
-        fn = getattr(self.store, "list_progression_events", None)
-        if not callable(fn):
-            return []
-        try:
-            rows = fn(int(chat_id), 120)
-        except TypeError:
-            rows = fn(int(chat_id))
-        except Exception:
-            return []
-        return [dict(row) for row in list(rows or []) if isinstance(row, Mapping)]
+        return progression_projection(self.store, int(chat_id)).select("strategies", "outcomes")
 
     @staticmethod
     def _completed_generation(rows: list[dict[str, Any]]) -> int:
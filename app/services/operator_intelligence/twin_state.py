@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import copy
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Iterable, Mapping, Sequence
+
+from app.services.storage.bundle import load_player_bundle
+
+Evidence = dict[str, list[dict[str, Any]]]
+
+# Store reads that refresh the parts of the twin a change kind touches.
+_REREADS = {
+    "mistakes": "list_mistake_stats",
+    "profile": "get_profile",
+    "derived": "get_derived_intelligence",
+}
+
+
+def merge_evidence(parts: Iterable[Mapping[str, list[dict[str, Any]]]], domains: Sequence[str]) -> Evidence:
+    evidence: Evidence = {domain: [] for domain in domains}
+    for part in parts:
+        for domain, items in part.items():
+            evidence[domain].extend(items)
+    return evidence
+
+
+class OperatorTwinState:
+    """Materialized Operator Twin for one player.
+
+    Keeps the evidence each input row contributes (mistakes, profile scores,
+    the progression and episode windows, the derived trend) next to the rows,
+    so a new event only classifies itself and only the domains it touches
+    re-run `_dimension`. A cached dimension also expires on the day its
+    recency would change, which keeps every read identical to a full
+    recompute of the same inputs.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        chat_id: int,
+        bundle: Mapping[str, Any],
+        *,
+        domains: Sequence[str],
+        progression_limit: int,
+        episodes_limit: int,
+        version: int = 0,
+        built_at: float = 0.0,
+    ) -> None:
+        self.chat_id = int(chat_id)
+        self.domains = tuple(domains)
+        self.progression_limit = int(progression_limit)
+        self.episodes_limit = int(episodes_limit)
+        self.version = int(version)
+        self.built_at = float(built_at)
+        self.lock = threading.Lock()
+        self._dimensions: dict[str, tuple[dict[str, Any], datetime | None]] = {}
+        profile = engine._profile(self.chat_id, bundle["profile"])
+        self._mistakes = engine._mistake_evidence(bundle["mistakes"][:20])
+        self._profile = engine._profile_evidence(profile)
+        self._trend = engine._trend_evidence(bundle["derived"])
+        self._progression = deque(
+            (row, engine._progression_evidence(row)) for row in bundle["progression"][: self.progression_limit]
+        )
+        self._episodes = deque(
+            (row, engine._episode_evidence(row)) for row in bundle["episodes"][: self.episodes_limit]
+        )
+        self._consistency = engine._consistency_evidence(self.progression)
+
+    @property
+    def progression(self) -> list[dict[str, Any]]:
+        return [row for row, _evidence in self._progression]
+
+    def _parts(self) -> list[Mapping[str, list[dict[str, Any]]]]:
+        # Same source order as `_collect_evidence`; `_dimension` sorts stably, so order matters.
+        return [
+            self._mistakes,
+            self._profile,
+            *(evidence for _row, evidence in self._progression),
+            *(evidence for _row, evidence in self._episodes),
+            self._trend,
+            self._consistency,
+        ]
+
+    def evidence(self) -> Evidence:
+        return merge_evidence(self._parts(), self.domains)
+
+    @staticmethod
+    def _push(window: deque, item: tuple[dict[str, Any], Evidence], limit: int) -> set[str]:
+        window.appendleft(item)
+        touched = set(item[1])
+        if len(window) > limit:
+            touched.update(window.pop()[1])
+        return touched
+
+    def apply(self, engine: Any, kind: str, payload: Any) -> bool:
+        """Fold one logged write into the twin; False when it needs a rebuild."""
+
+        if kind == "progression" and isinstance(payload, Mapping):
+            row = dict(payload)
+            touched = self._push(self._progression, (row, engine._progression_evidence(row)), self.progression_limit)
+            self._consistency = engine._consistency_evidence(self.progression)
+            touched.add("consistency")
+        elif kind == "episode" and isinstance(payload, Mapping):
+            row = dict(payload)
+            touched = self._push(self._episodes, (row, engine._episode_evidence(row)), self.episodes_limit)
+        elif kind in _REREADS:
+            raw = engine._call(_REREADS[kind], self.chat_id, default=None)
+            if raw is None:
+                return False
+            if kind == "mistakes":
+                rows = [dict(row) for row in list(raw or []) if isinstance(row, Mapping)][:20]
+                before, self._mistakes = self._mistakes, engine._mistake_evidence(rows)
+                after = self._mistakes
+            elif kind == "profile":
+                before, self._profile = self._profile, engine._profile_evidence(engine._profile(self.chat_id, dict(raw)))
+                after = self._profile
+            else:
+                before, self._trend = self._trend, engine._trend_evidence(dict(raw))
+                after = self._trend
+            touched = set(before) | set(after)
+        else:
+            return False
+        for domain in touched:
+            self._dimensions.pop(domain, None)
+        return True
+
+    def read(self, engine: Any, now: datetime) -> tuple[dict[str, dict[str, Any]], list[dict[str, Any]], int]:
+        """Dimensions and the progression window; the int counts re-run dimensions."""
+
+        evidence: Evidence | None = None
+        computed = 0
+        dimensions: dict[str, dict[str, Any]] = {}
+        for domain in self.domains:
+            cached = self._dimensions.get(domain)
+            if cached is None or (cached[1] is not None and now >= cached[1]):
+                if evidence is None:
+                    evidence = self.evidence()
+                items = evidence[domain]
+                cached = (engine._dimension(domain, items), engine._dimension_expiry(items))
+                self._dimensions[domain] = cached
+                computed += 1
+            dimensions[domain] = cached[0]
+        # Callers decorate the snapshot in place; the cached dimensions stay private.
+        return copy.deepcopy(dimensions), self.progression, computed
+
+
+class OperatorTwinCache:
+    """Operator Twin states for recently active players, kept on the store.
+
+    The store's change journal tells each read which of this process's
+    writes landed since the state was built; those are folded in and
+    everything else is served from memory. Anything the journal cannot
+    vouch for, or a state older than the journal TTL, is rebuilt from one
+    player bundle read.
+    """
+
+    def __init__(self, journal: Any) -> None:
+        self._journal = journal
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, OperatorTwinState]" = OrderedDict()
+        self._stats = {"hits": 0, "incremental": 0, "rebuilds": 0, "dimensions_computed": 0, "dimensions_reused": 0}
+
+    def _count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += value
+
+    def _cached(self, chat_id: int) -> OperatorTwinState | None:
+        with self._lock:
+            state = self._entries.get(chat_id)
+            if state is not None:
+                self._entries.move_to_end(chat_id)
+            return state
+
+    def _forget(self, chat_id: int, state: OperatorTwinState) -> None:
+        with self._lock:
+            if self._entries.get(chat_id) is state:
+                del self._entries[chat_id]
+
+    def _put(self, chat_id: int, state: OperatorTwinState) -> None:
+        with self._lock:
+            self._entries[chat_id] = state
+            self._entries.move_to_end(chat_id)
+            while len(self._entries) > self._journal.max_players:
+                self._entries.popitem(last=False)
+
+    def _read(self, engine: Any, state: OperatorTwinState, now: datetime) -> tuple[dict[str, dict[str, Any]], list[dict[str, Any]]]:
+        dimensions, progression, computed = state.read(engine, now)
+        self._count("dimensions_computed", computed)
+        self._count("dimensions_reused", len(dimensions) - computed)
+        return dimensions, progression
+
+    def read(
+        self,
+        engine: Any,
+        chat_id: int,
+        *,
+        now: datetime,
+        domains: Sequence[str],
+        progression_limit: int,
+        episodes_limit: int,
+    ) -> tuple[dict[str, dict[str, Any]], list[dict[str, Any]]]:
+        cid = int(chat_id)
+        store = engine.store
+        state = self._cached(cid)
+        if state is not None and self._journal.fresh(state.built_at):
+            with state.lock:
+                changes = store.player_changes(cid, state.version)
+                if changes is not None:
+                    applied = True
+                    for seq, kind, payload in changes:
+                        if not state.apply(engine, kind, payload):
+                            applied = False
+                            break
+                        state.version = seq
+                    if applied:
+                        self._count("incremental" if changes else "hits")
+                        return self._read(engine, state, now)
+            self._forget(cid, state)
+
+        head = store.player_change_head()
+        bundle = load_player_bundle(store, cid, progression_limit=progression_limit, episodes_limit=episodes_limit)
+        state = OperatorTwinState(
+            engine,
+            cid,
+            bundle,
+            domains=domains,
+            progression_limit=progression_limit,
+            episodes_limit=episodes_limit,
+            version=head,
+            built_at=self._journal.clock(),
+        )
+        self._count("rebuilds")
+        # A write that overlapped the bundle read may or may not be in it.
+        if self._journal.enabled and store.player_changes(cid, head) == []:
+            self._put(cid, state)
+        with state.lock:
+            return self._read(engine, state, now)
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {"players": len(self._entries), **self._stats}
+
+
+def operator_twin_view(
+    engine: Any,
+    chat_id: int,
+    *,
+    now: datetime,
+    domains: Sequence[str],
+    progression_limit: int,
+    episodes_limit: int,
+) -> tuple[dict[str, dict[str, Any]], list[dict[str, Any]]]:
+    """Operator Twin dimensions and progression window for `engine.snapshot`.
+
+    Served from the store's materialized twin when the store keeps a change
+    journal, otherwise computed from one bundle read as before.
+    """
+
+    cid = int(chat_id)
+    view = getattr(engine.store, "player_view", None)
+    if callable(view):
+        try:
+            cache = view(f"operator_twin:{type(engine).__module__}.{type(engine).__qualname__}", OperatorTwinCache)
+        except Exception:
+            cache = None
+        if isinstance(cache, OperatorTwinCache):
+            return cache.read(
+                engine,
+                cid,
+                now=now,
+                domains=domains,
+                progression_limit=progression_limit,
+                episodes_limit=episodes_limit,
+            )
+    bundle = load_player_bundle(engine.store, cid, progression_limit=progression_limit, episodes_limit=episodes_limit)
+    state = OperatorTwinState(
+        engine,
+        cid,
+        bundle,
+        domains=domains,
+        progression_limit=progression_limit,
+        episodes_limit=episodes_limit,
+    )
+    dimensions, progression, _computed = state.read(engine, now)
+    return dimensions, progression
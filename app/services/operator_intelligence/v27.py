@@ -4,6 +4,7 @@ from __future__ import annotations
 from typing import Any, Mapping
 
 from app.services.operator_intelligence.v25 import OperatorIntelligenceService as _V25OperatorIntelligenceService
+from app.services.storage.progression import progression_projection
 from app.services.vod.mission_evidence import EVENT_TYPE
 
 
@@ -19,7 +20,7 @@ class OperatorIntelligenceService(_V25OperatorIntelligenceService):
     """v27 Operator Twin with active-mission evidence fusion telemetry."""
 
     def _mission_evidence(self, chat_id: int, mission_id: str) -> dict[str, Any] | None:
-        events = self._rows("list_progression_events", int(chat_id), 100)
+        events = progression_projection(self.store, int(chat_id)).vod_evidence
         matched = [
             row for row in events
             if str(row.get("type") or "") == EVENT_TYPE
@@ -8,6 +8,7 @@ from typing import Any, Mapping
 
 from app.services.operator_intelligence.service import MISSION_EVENT_TYPE
 from app.services.operator_intelligence.v27 import OperatorIntelligenceService as _V27OperatorIntelligenceService
+from app.services.storage.progression import progression_projection
 from app.services.vod.mission_evidence import EVENT_TYPE as MISSION_EVIDENCE_EVENT_TYPE
 
 MIN_DIRECTIONAL_CYCLES = 3
@@ -44,7 +45,7 @@ class OperatorIntelligenceService(_V27OperatorIntelligenceService):
         return _env_on("OPERATOR_LONGITUDINAL_INTELLIGENCE_ENABLED")
 
     def _longitudinal(self, chat_id: int) -> dict[str, Any]:
-        rows = self._rows("list_progression_events", int(chat_id), 100)
+        rows = progression_projection(self.store, int(chat_id)).select("outcomes", "vod_evidence")
         completed = [
             row for row in rows
             if str(row.get("type") or "") == MISSION_EVENT_TYPE
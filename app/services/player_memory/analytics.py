@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from statistics import mean
 from typing import Any
 
+from app.services.storage.bundle import load_player_bundle
+
 
 @dataclass
 class PlayerAnalytics:
@@ -53,22 +55,14 @@ class PlayerAnalytics:
         return {"previous_avg": round(a, 3), "recent_avg": round(b, 3), "delta": round(b - a, 3)}
 
     def snapshot(self, chat_id: int) -> dict[str, Any]:
-        try:
-            mistakes = list(self.store.list_mistake_stats(chat_id) or [])[:5]
-        except Exception:
-            mistakes = []
-        try:
-            progression = list(self.store.list_progression_events(chat_id) or [])[:20]
-        except Exception:
-            progression = []
+        bundle = load_player_bundle(self.store, chat_id, progression_limit=20, episodes_limit=20)
+        mistakes = bundle["mistakes"][:5]
+        progression = bundle["progression"][:20]
         try:
             training = list(self.store.list_training_sessions(chat_id) or [])[:10]
         except Exception:
             training = []
-        try:
-            episodes = list(self.store.list_episodes(chat_id, 20) or [])
-        except Exception:
-            episodes = []
+        episodes = bundle["episodes"][:20]
 
         trends: dict[str, Any] = {}
         for key in ("kills", "placement", "accuracy_pct"):
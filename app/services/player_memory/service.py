@@ -9,6 +9,7 @@ from app.services.brain.intents import Intent, classify_intent
 from app.services.player_memory.analytics import PlayerAnalytics
 from app.services.player_memory.extractor import extract_player_memory
 from app.services.session_cycle import CrownSessionCycleService
+from app.services.storage.bundle import load_player_bundle
 from app.services.vod.engagements import VODEngagementIntelligenceService
 from app.services.vod.mission_evidence import MissionEvidenceFusionService
 
@@ -34,16 +35,13 @@ class PlayerMemoryService:
 
     def context(self, chat_id: int, profile: dict[str, Any] | None = None) -> dict[str, Any]:
         base = dict(profile or {})
-        try: summary = str(self.store.get_summary(chat_id) or "")
-        except Exception: summary = ""
-        try: mistakes = list(self.store.list_mistake_stats(chat_id) or [])[:5]
-        except Exception: mistakes = []
+        bundle = load_player_bundle(self.store, chat_id, progression_limit=5, episodes_limit=1)
+        summary = bundle["summary"]
+        mistakes = bundle["mistakes"][:5]
         try: training = list(self.store.list_training_sessions(chat_id) or [])[:3]
         except Exception: training = []
-        try: progression = list(self.store.list_progression_events(chat_id) or [])[:5]
-        except Exception: progression = []
-        try: derived = dict(self.store.get_derived_intelligence(chat_id) or {})
-        except Exception: derived = {}
+        progression = bundle["progression"][:5]
+        derived = bundle["derived"]
         base.update({
             "memory_summary": summary,
             "top_mistakes": [{"label": x.get("label"), "count": x.get("count", 1)} for x in mistakes if x.get("label")],
@@ -57,7 +57,14 @@ class ProfileService:
                 prof = self.store.get_profile(chat_id) or {}
             except Exception:
                 prof = {}
+        return self.compose(chat_id, prof)
 
+    def compose(self, chat_id: int, prof: Mapping[str, Any] | None) -> Dict[str, Any]:
+        """Build the server profile from an already-read stored profile row.
+
+        Used by readers that fetched the player bundle so the same row is not
+        read a second time.
+        """
         out: Dict[str, Any] = dict(DEFAULT_PROFILE)
         for key, value in (prof or {}).items():
             out[str(key)] = value
@@ -5,7 +5,10 @@ import hashlib
 from datetime import datetime, timezone
 from typing import Any, Mapping
 
-EVENT_TYPE = "crown_session_cycle"
+from app.services.storage.progression import progression_projection
+from app.services.storage.session_index import SESSION_CYCLE_EVENT, open_session_from_events
+
+EVENT_TYPE = SESSION_CYCLE_EVENT
 
 
 def _now_iso() -> str:
@@ -13,16 +16,7 @@ def _now_iso() -> str:
 
 
 def _rows(store: Any, chat_id: int) -> list[dict[str, Any]]:
-    fn = getattr(store, "list_progression_events", None)
-    if not callable(fn):
-        return []
-    try:
-        raw = fn(int(chat_id), 160)
-    except TypeError:
-        raw = fn(int(chat_id))
-    except Exception:
-        return []
-    return [dict(x) for x in list(raw or []) if isinstance(x, Mapping)]
+    return progression_projection(store, int(chat_id)).sessions
 
 
 class CrownSessionCycleService:
@@ -33,21 +27,14 @@ class CrownSessionCycleService:
 
     def current(self, chat_id: int, mission_id: str | None = None) -> dict[str, Any] | None:
         wanted = str(mission_id or "").strip()
-        rows = _rows(self.store, int(chat_id))
-        closed = {
-            str(x.get("crown_session_id") or "")
-            for x in rows
-            if str(x.get("type") or "") == EVENT_TYPE and str(x.get("status") or "") == "closed"
-        }
-        candidates = [
-            x for x in rows
-            if str(x.get("type") or "") == EVENT_TYPE
-            and str(x.get("status") or "") == "prepared"
-            and str(x.get("crown_session_id") or "") not in closed
-            and (not wanted or str(x.get("mission_id") or "") == wanted)
-        ]
-        candidates.sort(key=lambda x: str(x.get("at") or x.get("created_at") or ""), reverse=True)
-        return dict(candidates[0]) if candidates else None
+        indexed = getattr(self.store, "get_open_crown_session", None)
+        if callable(indexed):
+            try:
+                found = indexed(int(chat_id), wanted or None)
+            except Exception:
+                return None
+            return dict(found) if isinstance(found, Mapping) and found else None
+        return open_session_from_events(_rows(self.store, int(chat_id)), wanted)
 
     def start(self, chat_id: int, mission: Mapping[str, Any] | None) -> dict[str, Any]:
         mission = dict(mission or {})
@@ -38,6 +38,10 @@ class Storage(Protocol):
     def add_progression_event(self, chat_id: int, event: Mapping[str, Any]) -> None: ...
     def list_progression_events(self, chat_id: int) -> list[dict]: ...
 
+    # Session-cycle index (maintained from progression events)
+    def get_open_crown_session(self, chat_id: int, mission_id: str | None = None) -> dict[str, Any] | None: ...
+    def list_crown_session_events(self, chat_id: int, crown_session_id: str) -> list[dict]: ...
+
     # Privacy / lifecycle
     def purge_player(self, chat_id: int) -> None: ...
     def close(self) -> None: ...
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from typing import Any, Mapping
+
+BUNDLE_MISTAKES_LIMIT = 20
+BUNDLE_PROGRESSION_LIMIT = 100
+BUNDLE_EPISODES_LIMIT = 40
+
+
+def _dict_rows(raw: Any) -> list[dict[str, Any]]:
+    return [dict(row) for row in list(raw or []) if isinstance(row, Mapping)]
+
+
+def normalize_player_bundle(raw: Any) -> dict[str, Any]:
+    """Coerce any adapter's bundle into the stable product shape."""
+    data = raw if isinstance(raw, Mapping) else {}
+    profile = data.get("profile")
+    derived = data.get("derived")
+    return {
+        "profile": dict(profile) if isinstance(profile, Mapping) else {},
+        "summary": str(data.get("summary") or ""),
+        "derived": dict(derived) if isinstance(derived, Mapping) else {},
+        "mistakes": _dict_rows(data.get("mistakes"))[:BUNDLE_MISTAKES_LIMIT],
+        "progression": _dict_rows(data.get("progression")),
+        "episodes": _dict_rows(data.get("episodes")),
+    }
+
+
+def compose_player_bundle(
+    store: Any,
+    chat_id: int,
+    *,
+    progression_limit: int = BUNDLE_PROGRESSION_LIMIT,
+    episodes_limit: int = BUNDLE_EPISODES_LIMIT,
+) -> dict[str, Any]:
+    """Build the bundle from per-surface reads for adapters without a bundle call.
+
+    Each surface fails open independently, exactly like the legacy readers.
+    """
+
+    cid = int(chat_id)
+
+    def call(name: str, *args: Any, default: Any) -> Any:
+        fn = getattr(store, name, None)
+        if not callable(fn):
+            return default
+        try:
+            return fn(cid, *args)
+        except Exception:
+            return default
+
+    return normalize_player_bundle({
+        "profile": call("get_profile", default={}),
+        "summary": call("get_summary", default=""),
+        "derived": call("get_derived_intelligence", default={}),
+        "mistakes": call("list_mistake_stats", default=[]),
+        "progression": list(call("list_progression_events", default=[]) or [])[: max(1, int(progression_limit))],
+        "episodes": call("list_episodes", max(1, min(int(episodes_limit), 100)), default=[]),
+    })
+
+
+def load_player_bundle(
+    store: Any,
+    chat_id: int,
+    *,
+    progression_limit: int = BUNDLE_PROGRESSION_LIMIT,
+    episodes_limit: int = BUNDLE_EPISODES_LIMIT,
+) -> dict[str, Any]:
+    """Read the player row, recent mistakes, progression and episodes at once.
+
+    Uses the adapter's coalesced `get_player_bundle` when available and falls
+    back to the established per-surface reads otherwise.
+    """
+
+    fn = getattr(store, "get_player_bundle", None)
+    if callable(fn):
+        try:
+            bundle = normalize_player_bundle(
+                fn(int(chat_id), progression_limit=progression_limit, episodes_limit=episodes_limit)
+            )
+            bundle["progression"] = bundle["progression"][: max(1, int(progression_limit))]
+            bundle["episodes"] = bundle["episodes"][: max(1, int(episodes_limit))]
+            return bundle
+        except Exception:
+            pass
+    return compose_player_bundle(
+        store,
+        chat_id,
+        progression_limit=progression_limit,
+        episodes_limit=episodes_limit,
+    )
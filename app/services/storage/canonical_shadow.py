@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
 import threading
@@ -11,6 +12,7 @@ from dataclasses import dataclass
 from typing import Any, Callable
 
 from app.observability.quality import QualityTelemetry, quality_telemetry
+from app.services.storage.shadow_worker import ShadowComparisonWorker
 
 
 @dataclass(frozen=True)
@@ -31,6 +33,10 @@ class CanonicalReadShadowStore:
     controlled account relink from leaving a window where shadow comparison
     reads a previous canonical owner. Only unresolved/conflict outcomes use a
     small bounded cache, and a verified identity refresh invalidates it.
+
+    With a `worker`, the identity RPC, canonical read and diff run off the
+    caller's thread against a copy of the legacy value; a full queue drops
+    the sample (outcome `shadow_dropped`) instead of delaying the read.
     """
 
     def __init__(
@@ -43,8 +49,10 @@ class CanonicalReadShadowStore:
         identity_negative_cache_ttl_s: float = 5.0,
         identity_cache_max_entries: int = 10_000,
         telemetry: QualityTelemetry | None = None,
+        worker: ShadowComparisonWorker | None = None,
     ) -> None:
         self.primary = primary
+        self.worker = worker
         self.enabled = bool(enabled)
         self.sample_rate = max(0.0, min(1.0, float(sample_rate or 0.0)))
         # Retained for configuration compatibility and as an upper bound for
@@ -76,6 +84,8 @@ class CanonicalReadShadowStore:
         return getattr(self.primary, name)
 
     def close(self) -> None:
+        if self.worker is not None:
+            self.worker.close()
         close = getattr(self.primary, "close", None)
         if callable(close):
             close()
@@ -94,6 +104,11 @@ class CanonicalReadShadowStore:
             "resolved_identity_cache_enabled": False,
             "returns_legacy": True,
             "canonical_primary_enabled": False,
+            "comparisons": (
+                self.worker.status()
+                if self.worker is not None
+                else {"mode": "inline"}
+            ),
         }
 
     def _identity_cache_size(self) -> int:
@@ -320,6 +335,37 @@ class CanonicalReadShadowStore:
                 )
             return legacy
 
+        if self.worker is None:
+            self._compare_now(surface, chat_id, legacy, canonical_loader)
+            return legacy
+
+        # The caller owns (and may mutate) the returned value.
+        snapshot = copy.deepcopy(legacy)
+        if not self.worker.submit(
+            lambda: self._compare_now(
+                surface,
+                chat_id,
+                snapshot,
+                canonical_loader,
+            )
+        ):
+            self.telemetry.record_canonical_read(
+                surface=surface,
+                outcome="shadow_dropped",
+                latency_ms=0,
+                legacy_items=self._cardinality(legacy),
+                canonical_items=0,
+                compared=False,
+            )
+        return legacy
+
+    def _compare_now(
+        self,
+        surface: str,
+        chat_id: int,
+        legacy: Any,
+        canonical_loader: Callable[[str], CanonicalReadResult],
+    ) -> None:
         started = time.perf_counter()
         try:
             candidates = self._identity_candidates(chat_id)
@@ -332,7 +378,7 @@ class CanonicalReadShadowStore:
                 canonical_items=0,
                 compared=False,
             )
-            return legacy
+            return
 
         if len(candidates) == 0:
             self.telemetry.record_canonical_read(
@@ -343,7 +389,7 @@ class CanonicalReadShadowStore:
                 canonical_items=0,
                 compared=False,
             )
-            return legacy
+            return
         if len(candidates) != 1:
             self.telemetry.record_canonical_read(
                 surface=surface,
@@ -353,7 +399,7 @@ class CanonicalReadShadowStore:
                 canonical_items=0,
                 compared=False,
             )
-            return legacy
+            return
 
         try:
             canonical = canonical_loader(candidates[0])
@@ -366,7 +412,7 @@ class CanonicalReadShadowStore:
                 canonical_items=0,
                 compared=False,
             )
-            return legacy
+            return
 
         outcome = (
             "canonical_ambiguous"
@@ -381,7 +427,6 @@ class CanonicalReadShadowStore:
             canonical_items=canonical.row_count,
             compared=True,
         )
-        return legacy
 
     def get(self, chat_id: int) -> list[dict]:
         legacy = list(self.primary.get(chat_id) or [])
@@ -536,3 +581,39 @@ class CanonicalReadShadowStore:
             return CanonicalReadResult(value, len(rows))
 
         return self._compare_shadow("progression_events", chat_id, legacy, load)
+
+    def get_player_bundle(
+        self,
+        chat_id: int,
+        *,
+        progression_limit: int = 100,
+        episodes_limit: int = 40,
+    ) -> dict[str, Any]:
+        legacy = dict(
+            self.primary.get_player_bundle(
+                chat_id,
+                progression_limit=progression_limit,
+                episodes_limit=episodes_limit,
+            )
+            or {}
+        )
+        # The bundle replaces three separate player-row reads; keep their
+        # parity surfaces observable under the same names.
+        for surface, key, default in (
+            ("profile", "profile", {}),
+            ("summary", "summary", ""),
+            ("derived_intelligence", "derived", {}),
+        ):
+            self._compare_shadow(
+                surface,
+                chat_id,
+                legacy.get(key, default),
+                lambda owner_id, key=key, default=default: (
+                    self._canonical_player_field(
+                        owner_id,
+                        key,
+                        default=default,
+                    )
+                ),
+            )
+        return legacy
@@ -401,3 +401,21 @@ class CanonicalReadShadowControlStore:
             )
             or []
         )
+
+    def get_player_bundle(
+        self,
+        chat_id: int,
+        *,
+        progression_limit: int = 100,
+        episodes_limit: int = 40,
+    ) -> dict[str, Any]:
+        return dict(
+            self._read(
+                "get_player_bundle",
+                "player_bundle",
+                chat_id,
+                progression_limit=progression_limit,
+                episodes_limit=episodes_limit,
+            )
+            or {}
+        )
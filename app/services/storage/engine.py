@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Mapping
+
+import httpx
+
+
+log = logging.getLogger("bco.storage")
+
+
+class StorageDeadlineExceeded(TimeoutError):
+    """A single PostgREST call did not finish inside its per-call deadline."""
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class AsyncSupabaseEngine:
+    """Async-native pooled PostgREST transport behind the sync Storage API.
+
+    One `httpx.AsyncClient` with a bounded (HTTP/2 when `h2` is installed)
+    connection pool runs on a dedicated storage event loop. Sync callers in
+    service threads block only their own thread for at most the per-call
+    deadline; async callers await `arequest` without blocking their loop.
+    The object is call-compatible with `httpx.Client.request`/`close`, so
+    `SupabaseStore._client` keeps its established contract.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout_s: float = 8.0,
+        deadline_s: float | None = None,
+        max_connections: int = 32,
+        max_keepalive_connections: int | None = None,
+        http2: bool = True,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.timeout_s = max(0.5, float(timeout_s or 8.0))
+        self.deadline_s = max(0.1, float(deadline_s or self.timeout_s))
+        self.max_connections = max(1, min(int(max_connections or 32), 512))
+        keepalive = self.max_connections if max_keepalive_connections is None else int(max_keepalive_connections)
+        self.max_keepalive_connections = max(0, min(keepalive, self.max_connections))
+        self.http2 = bool(http2) and transport is None and _http2_available()
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._closed = False
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._completed = 0
+        self._errors = 0
+        self._deadline_exceeded = 0
+
+    # Loop lifecycle ---------------------------------------------------
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("storage engine is closed")
+            if self._loop is not None:
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run() -> None:
+                asyncio.set_event_loop(loop)
+                self._client = httpx.AsyncClient(
+                    timeout=httpx.Timeout(self.timeout_s, pool=self.deadline_s),
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive_connections,
+                    ),
+                    http2=self.http2,
+                    transport=self._transport,
+                )
+                self._slots = asyncio.Semaphore(self.max_connections)
+                ready.set()
+                loop.run_forever()
+
+            thread = threading.Thread(target=run, name="bco-storage-engine", daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop, self._thread = loop, thread
+            log.info(
+                "storage engine started pool=%d http2=%s deadline_s=%.2f",
+                self.max_connections, self.http2, self.deadline_s,
+            )
+            return loop
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None,
+        json: Any,
+        headers: Mapping[str, str] | None,
+    ) -> httpx.Response:
+        try:
+            # The deadline covers the wait for a pool slot and the full body.
+            response = await asyncio.wait_for(self._pooled(method, url, params, json, headers), timeout=self.deadline_s)
+        except (asyncio.TimeoutError, httpx.PoolTimeout) as exc:
+            with self._lock:
+                self._deadline_exceeded += 1
+            raise StorageDeadlineExceeded(f"{method} exceeded {self.deadline_s:.2f}s") from exc
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+        with self._lock:
+            self._completed += 1
+        return response
+
+    async def _pooled(
+        self,
+        method: str,
+        url: str,
+        params: Mapping[str, Any] | None,
+        json: Any,
+        headers: Mapping[str, str] | None,
+    ) -> httpx.Response:
+        assert self._client is not None and self._slots is not None
+        async with self._slots:
+            with self._lock:
+                self._in_flight += 1
+                self._max_in_flight = max(self._max_in_flight, self._in_flight)
+            try:
+                response = await self._client.request(
+                    method, url, params=dict(params or {}), json=json, headers=dict(headers or {}),
+                )
+                await response.aread()
+                return response
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+    # Public transport -------------------------------------------------
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        json: Any = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> httpx.Response:
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._send(method, url, params, json, headers), loop)
+        try:
+            # The deadline is enforced on the storage loop; the small grace only
+            # covers cross-thread scheduling of the already-failed future.
+            return future.result(timeout=self.deadline_s + 1.0)
+        except StorageDeadlineExceeded:
+            raise
+        except FutureTimeoutError as exc:
+            future.cancel()
+            with self._lock:
+                self._deadline_exceeded += 1
+            raise StorageDeadlineExceeded(f"{method} exceeded {self.deadline_s:.2f}s") from exc
+
+    async def arequest(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        json: Any = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> httpx.Response:
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._send(method, url, params, json, headers), loop)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "engine": "async_pool",
+                "started": self._loop is not None,
+                "http2": self.http2,
+                "max_connections": self.max_connections,
+                "deadline_s": self.deadline_s,
+                "in_flight": self._in_flight,
+                "max_in_flight": self._max_in_flight,
+                "completed": self._completed,
+                "errors": self._errors,
+                "deadline_exceeded": self._deadline_exceeded,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            loop, thread = self._loop, self._thread
+        if loop is None:
+            return
+        client = self._client
+        if client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5.0)
+            except Exception as exc:
+                log.warning("storage engine close failed: %s", type(exc).__name__)
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5.0)
+        if not loop.is_running():
+            loop.close()
@@ -5,12 +5,17 @@ import logging
 import os
 from typing import Any, Mapping
 
+from app.services.identity.cache import IdentityCache
 from app.services.storage.canonical_shadow import CanonicalReadShadowStore
 from app.services.storage.canonical_shadow_control import (
     CanonicalReadShadowControlStore,
 )
 from app.services.storage.memory import InMemoryStore
+from app.services.storage.outbox import build_outbox
+from app.services.storage.player_changes import PlayerChangeJournal
+from app.services.storage.progression import ProgressionProjection, ProgressionProjectionCache
 from app.services.storage.resilient import ResilientStore
+from app.services.storage.shadow_worker import ShadowComparisonWorker
 from app.services.storage.supabase import SupabaseStore
 
 
@@ -63,16 +68,124 @@ class PersistentSupabaseStore(SupabaseStore):
 
 
 class PersistentResilientStore(ResilientStore):
+    def __init__(
+        self,
+        *args: Any,
+        identity_cache: IdentityCache | None = None,
+        progression_cache: ProgressionProjectionCache | None = None,
+        change_journal: PlayerChangeJournal | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.identity_cache = identity_cache if identity_cache is not None else IdentityCache()
+        self.progression_cache = progression_cache if progression_cache is not None else ProgressionProjectionCache()
+        self.change_journal = change_journal if change_journal is not None else PlayerChangeJournal()
+
     def purge_player(self, chat_id: int) -> None:
-        self._write("purge_player", chat_id)
+        with self.change_journal.write(chat_id, "purge"):
+            self._write("purge_player", chat_id)
+        self.invalidate_telegram_identity(chat_id)
+        self.progression_cache.invalidate(chat_id)
+
+    def set_profile(self, chat_id: int, patch: Mapping[str, Any]) -> None:
+        with self.change_journal.write(chat_id, "profile"):
+            super().set_profile(chat_id, patch)
+
+    def reset_profile(self, chat_id: int) -> None:
+        # The whole player row goes, derived included: views rebuild from the store.
+        with self.change_journal.write(chat_id, "reset"):
+            super().reset_profile(chat_id)
+
+    def set_derived_intelligence(self, chat_id: int, data: Mapping[str, Any]) -> None:
+        with self.change_journal.write(chat_id, "derived"):
+            super().set_derived_intelligence(chat_id, data)
+
+    def add_recurring_mistake(self, chat_id: int, mistake: str) -> None:
+        with self.change_journal.write(chat_id, "mistakes"):
+            super().add_recurring_mistake(chat_id, mistake)
+
+    def _stamped(self, event: Mapping[str, Any]) -> dict[str, Any]:
+        # Stamp here so the stored row and the row views apply carry the same time.
+        row = dict(event or {})
+        row.setdefault("created_at", self._now_iso())
+        return row
+
+    def add_episode(self, chat_id: int, event: Mapping[str, Any]) -> None:
+        row = self._stamped(event)
+        with self.change_journal.write(chat_id, "episode", row):
+            super().add_episode(chat_id, row)
+
+    def add_progression_event(self, chat_id: int, event: Mapping[str, Any]) -> None:
+        row = self._stamped(event)
+        self.progression_cache.begin_write()
+        with self.change_journal.write(chat_id, "progression", row):
+            super().add_progression_event(chat_id, row)
+        self.progression_cache.record(int(chat_id), row)
+
+    def player_changes(self, chat_id: int, since: int) -> list[tuple[int, str, Any]] | None:
+        """This process's writes for the player after `since`; None means rebuild.
+
+        Views built from a degraded read are never extended: while the
+        primary is down or writes are queued the answer is always None.
+        """
+
+        if not (self._primary_available and not self._pending):
+            return None
+        return self.change_journal.changes(chat_id, since)
+
+    def player_change_head(self) -> int:
+        return self.change_journal.head()
+
+    def player_view(self, name: str, factory: Any) -> Any:
+        return self.change_journal.view(name, factory)
+
+    def player_views_status(self) -> dict[str, Any]:
+        return self.change_journal.status()
+
+    def progression_projection(self, chat_id: int) -> ProgressionProjection:
+        """Typed view of the player's recent progression events.
+
+        Loaded with one read and kept current by this process's writes; as
+        with identities, only answers from the primary are cached.
+        """
+
+        cid = int(chat_id)
+        cached = self.progression_cache.get(cid)
+        if cached is not None:
+            return cached
+        generation = self.progression_cache.generation
+        projection = ProgressionProjection(self.list_progression_events(cid))
+        if self._primary_available and not self._pending:
+            self.progression_cache.put(cid, projection, generation=generation)
+        return projection
+
+    def progression_cache_status(self) -> dict[str, Any]:
+        return self.progression_cache.status()
 
     def resolve_telegram_identity(self, telegram_user_id: int) -> dict[str, Any]:
-        """Expose the server resolver through the resilient storage boundary."""
+        """Expose the server resolver through the resilient storage boundary.
 
-        return dict(
-            self._read("resolve_telegram_identity", int(telegram_user_id))
-            or {}
-        )
+        Resolutions are cached per process; only answers from the primary are
+        kept, so a degraded read is retried once the primary is back.
+        """
+
+        user_id = int(telegram_user_id)
+        cached = self.identity_cache.get(user_id)
+        if cached is not None:
+            return cached
+        generation = self.identity_cache.generation
+        value = dict(self._read("resolve_telegram_identity", user_id) or {})
+        if self._primary_available and not self._pending:
+            self.identity_cache.put(user_id, value, generation=generation)
+        return value
+
+    def invalidate_telegram_identity(self, telegram_user_id: int | None = None) -> None:
+        """Forget a cached resolution after a link, unlink or purge."""
+
+        self.identity_cache.invalidate(telegram_user_id)
+
+    def identity_cache_status(self) -> dict[str, Any]:
+        return self.identity_cache.status()
 
     def canonical_read_shadow_status(self) -> dict[str, Any]:
         status = getattr(self.primary, "canonical_read_shadow_status", None)
@@ -127,6 +240,9 @@ def build_store(settings: Any):
             memory_max_turns=getattr(settings, "memory_max_turns", 20),
             schema=str(getattr(settings, "supabase_schema", "public") or "public"),
             timeout_s=float(getattr(settings, "storage_timeout_s", 8.0) or 8.0),
+            call_deadline_s=float(getattr(settings, "storage_call_deadline_s", 4.0) or 4.0),
+            pool_max_connections=int(getattr(settings, "storage_pool_max_connections", 32) or 32),
+            http2=bool(getattr(settings, "storage_http2_enabled", True)),
         )
         shadow_enabled = _env_on("CANONICAL_READ_SHADOW_ENABLED")
         shadow_sample_rate = float(
@@ -149,6 +265,15 @@ def build_store(settings: Any):
             os.getenv("CANONICAL_READ_SHADOW_FLAG_TTL_S", "30")
             or "30"
         )
+        # Comparisons run off the request path; a full queue drops samples.
+        shadow_queue_max = int(
+            os.getenv("CANONICAL_READ_SHADOW_QUEUE_MAX", "1000")
+            or "1000"
+        )
+        shadow_workers = int(
+            os.getenv("CANONICAL_READ_SHADOW_WORKERS", "2")
+            or "2"
+        )
         shadow = CanonicalReadShadowStore(
             persistent,
             enabled=shadow_enabled,
@@ -156,19 +281,31 @@ def build_store(settings: Any):
             identity_cache_ttl_s=shadow_identity_ttl_s,
             identity_negative_cache_ttl_s=shadow_negative_ttl_s,
             identity_cache_max_entries=shadow_cache_max_entries,
+            worker=ShadowComparisonWorker(
+                max_queue=shadow_queue_max,
+                workers=shadow_workers,
+            ),
         )
         primary = CanonicalReadShadowControlStore(
             shadow,
             flag_ttl_s=shadow_flag_ttl_s,
         )
-        outbox_max = int(getattr(settings, "storage_outbox_max", 500) or 500)
+        outbox_path = str(getattr(settings, "storage_outbox_path", "") or "").strip()
+        outbox = build_outbox(
+            outbox_path,
+            int(getattr(settings, "storage_durable_outbox_max", 50_000) or 50_000)
+            if outbox_path
+            else int(getattr(settings, "storage_outbox_max", 500) or 500),
+        )
+        outbox_max = outbox.max_entries
         replay_batch = int(getattr(settings, "storage_replay_batch", 50) or 50)
         credential_kind = "secret" if key.startswith("sb_secret_") else "legacy_or_unknown"
         log.info(
             "storage backend=supabase credential=%s resilient_fallback=memory "
-            "outbox_max=%d replay_batch=%d canonical_shadow_local=%s "
+            "outbox=%s outbox_max=%d replay_batch=%d canonical_shadow_local=%s "
             "canonical_shadow_sample=%.3f",
             credential_kind,
+            "durable" if outbox.durable else "memory",
             outbox_max,
             replay_batch,
             shadow_enabled,
@@ -179,6 +316,20 @@ def build_store(settings: Any):
             fallback=memory,
             outbox_max=outbox_max,
             replay_batch=replay_batch,
+            outbox=outbox,
+            identity_cache=IdentityCache(
+                ttl_s=float(getattr(settings, "identity_cache_ttl_s", 600.0)),
+                negative_ttl_s=float(getattr(settings, "identity_negative_ttl_s", 30.0)),
+                max_entries=int(getattr(settings, "identity_cache_max_entries", 10_000) or 10_000),
+            ),
+            progression_cache=ProgressionProjectionCache(
+                ttl_s=float(getattr(settings, "progression_projection_ttl_s", 15.0)),
+                max_players=int(getattr(settings, "progression_projection_max_players", 2_000) or 2_000),
+            ),
+            change_journal=PlayerChangeJournal(
+                ttl_s=float(getattr(settings, "player_view_ttl_s", 15.0)),
+                max_players=int(getattr(settings, "player_view_max_players", 2_000) or 2_000),
+            ),
         )
     except Exception as exc:
         log.warning("storage init failed backend=supabase error=%s; using memory", type(exc).__name__)
@@ -5,6 +5,9 @@ from collections import defaultdict
 from datetime import datetime, timezone
 from typing import Any, Mapping
 
+from app.services.storage.bundle import compose_player_bundle
+from app.services.storage.session_index import CrownSessionIndex
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -28,6 +31,7 @@ class InMemoryStore:
         self._episodes: dict[int, list[dict]] = defaultdict(list)
         self._training: dict[int, list[dict]] = defaultdict(list)
         self._progression: dict[int, list[dict]] = defaultdict(list)
+        self._sessions: dict[int, CrownSessionIndex] = {}
 
     # Canonical identity ---------------------------------------------
     def resolve_telegram_identity(self, telegram_user_id: int) -> dict[str, Any]:
@@ -134,10 +138,23 @@ class InMemoryStore:
         item.setdefault("created_at", _now_iso())
         self._progression[cid].append(item)
         self._progression[cid] = self._progression[cid][-100:]
+        if item.get("crown_session_id"):
+            self._sessions.setdefault(cid, CrownSessionIndex()).record(item)
 
     def list_progression_events(self, chat_id: int) -> list[dict]:
         return [dict(x) for x in reversed(self._progression.get(int(chat_id), []))]
 
+    def get_open_crown_session(self, chat_id: int, mission_id: str | None = None) -> dict[str, Any] | None:
+        index = self._sessions.get(int(chat_id))
+        return index.open_session(mission_id) if index is not None else None
+
+    def list_crown_session_events(self, chat_id: int, crown_session_id: str) -> list[dict]:
+        index = self._sessions.get(int(chat_id))
+        return index.session_events(crown_session_id) if index is not None else []
+
+    def get_player_bundle(self, chat_id: int, *, progression_limit: int = 100, episodes_limit: int = 40) -> dict[str, Any]:
+        return compose_player_bundle(self, chat_id, progression_limit=progression_limit, episodes_limit=episodes_limit)
+
     # Lifecycle / stats ---------------------------------------------
     def purge_player(self, chat_id: int) -> None:
         cid = int(chat_id)
@@ -149,6 +166,7 @@ class InMemoryStore:
         self._episodes.pop(cid, None)
         self._training.pop(cid, None)
         self._progression.pop(cid, None)
+        self._sessions.pop(cid, None)
 
     def stats(self, chat_id: int) -> dict:
         cid = int(chat_id)
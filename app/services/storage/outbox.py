@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+log = logging.getLogger("bco.storage")
+
+
+@dataclass(frozen=True)
+class PendingWrite:
+    operation_id: str
+    method: str
+    args: tuple
+    kwargs: dict
+    enqueued_at: float = field(default_factory=time.time, compare=False)
+
+
+class MemoryOutbox:
+    """Bounded process-local FIFO. Pending writes die with the process."""
+
+    durable = False
+
+    def __init__(self, max_entries: int = 500) -> None:
+        self.max_entries = max(10, int(max_entries or 500))
+        self._items: deque[PendingWrite] = deque()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def append(self, op: PendingWrite) -> bool:
+        if len(self._items) >= self.max_entries:
+            return False
+        self._items.append(op)
+        return True
+
+    def head(self) -> PendingWrite | None:
+        return self._items[0] if self._items else None
+
+    def ack(self, op: PendingWrite) -> None:
+        if self._items and self._items[0].operation_id == op.operation_id:
+            self._items.popleft()
+
+    def oldest_enqueued_at(self) -> float | None:
+        return self._items[0].enqueued_at if self._items else None
+
+    def close(self) -> None:
+        return None
+
+
+class SQLiteOutbox:
+    """Crash-safe FIFO outbox journal in a local SQLite file.
+
+    A write the primary could not take is journaled (WAL, synchronous=FULL)
+    and removed only after its replay was acknowledged. A crash between the
+    primary commit and the ack replays the same `operation_id`, which the
+    primary's idempotency primitives turn into a no-op.
+
+    Workers on one host may share the file, so every row belongs to the
+    process that journaled it and each process replays only its own rows.
+    Rows left by a process that is no longer running are claimed by the
+    next process to open the file or look for its head.
+    """
+
+    durable = True
+
+    def __init__(self, path: str | Path, max_entries: int = 50_000, *, owner: str | None = None) -> None:
+        self.path = Path(path)
+        self.max_entries = max(10, int(max_entries or 50_000))
+        self.owner = str(owner or os.getpid())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("pragma journal_mode=wal")
+        self._db.execute("pragma synchronous=full")
+        self._db.execute(
+            "create table if not exists bco_outbox ("
+            " seq integer primary key autoincrement,"
+            " operation_id text not null unique,"
+            " method text not null,"
+            " args text not null,"
+            " kwargs text not null,"
+            " enqueued_at real not null)"
+        )
+        columns = {row[1] for row in self._db.execute("pragma table_info(bco_outbox)")}
+        if "owner" not in columns:
+            self._db.execute("alter table bco_outbox add column owner text")
+        self._db.execute("create index if not exists bco_outbox_owner_seq_idx on bco_outbox (owner, seq)")
+        with self._lock:
+            claimed = self._claim_orphans_locked()
+            pending = self._count_locked()
+        if pending:
+            log.warning(
+                "storage durable outbox recovered pending=%d claimed=%d path=%s",
+                pending,
+                claimed,
+                self.path.name,
+            )
+
+    def _count_locked(self) -> int:
+        return int(self._db.execute("select count(*) from bco_outbox where owner = ?", (self.owner,)).fetchone()[0])
+
+    def _claim_orphans_locked(self) -> int:
+        claimed = 0
+        for (owner,) in self._db.execute("select distinct owner from bco_outbox where owner is not ?", (self.owner,)).fetchall():
+            if owner is not None and _owner_alive(owner):
+                continue
+            cursor = self._db.execute("update bco_outbox set owner = ? where owner is ?", (self.owner, owner))
+            claimed += max(0, cursor.rowcount)
+        return claimed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count_locked()
+
+    def __bool__(self) -> bool:
+        # Checked on every store call; an index probe, not a count.
+        with self._lock:
+            row = self._db.execute("select exists(select 1 from bco_outbox where owner = ?)", (self.owner,)).fetchone()
+        return bool(row[0])
+
+    def append(self, op: PendingWrite) -> bool:
+        args = json.dumps(list(op.args), ensure_ascii=False, default=str)
+        kwargs = json.dumps(dict(op.kwargs), ensure_ascii=False, default=str)
+        with self._lock:
+            if self._count_locked() >= self.max_entries:
+                return False
+            self._db.execute(
+                "insert or ignore into bco_outbox (operation_id, method, args, kwargs, enqueued_at, owner)"
+                " values (?, ?, ?, ?, ?, ?)",
+                (op.operation_id, op.method, args, kwargs, float(op.enqueued_at), self.owner),
+            )
+        return True
+
+    def head(self) -> PendingWrite | None:
+        query = (
+            "select operation_id, method, args, kwargs, enqueued_at from bco_outbox"
+            " where owner = ? order by seq limit 1"
+        )
+        with self._lock:
+            row = self._db.execute(query, (self.owner,)).fetchone()
+            if row is None and self._claim_orphans_locked():
+                row = self._db.execute(query, (self.owner,)).fetchone()
+        if row is None:
+            return None
+        return PendingWrite(row[0], row[1], tuple(json.loads(row[2])), dict(json.loads(row[3])), float(row[4]))
+
+    def ack(self, op: PendingWrite) -> None:
+        with self._lock:
+            self._db.execute("delete from bco_outbox where operation_id = ? and owner = ?", (op.operation_id, self.owner))
+
+    def oldest_enqueued_at(self) -> float | None:
+        with self._lock:
+            row = self._db.execute("select min(enqueued_at) from bco_outbox where owner = ?", (self.owner,)).fetchone()
+        return float(row[0]) if row and row[0] is not None else None
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._db.close()
+            except Exception:
+                pass
+
+
+def _owner_alive(owner: str) -> bool:
+    """Whether the process that journaled a row is still running on this host."""
+
+    try:
+        pid = int(owner)
+    except (TypeError, ValueError):
+        return False
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def build_outbox(path: str | Path | None, max_entries: int) -> MemoryOutbox | SQLiteOutbox:
+    """Durable journal when a path is configured and usable, else process-local."""
+
+    if path:
+        try:
+            return SQLiteOutbox(path, max_entries=max_entries)
+        except Exception as exc:
+            log.error("storage durable outbox unavailable error=%s; using memory outbox", type(exc).__name__)
+    return MemoryOutbox(max_entries)
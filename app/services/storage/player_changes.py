@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+
+class _PlayerLog:
+    __slots__ = ("floor", "changes", "writing")
+
+    def __init__(self, floor: int, max_changes: int) -> None:
+        self.floor = floor
+        self.changes: deque[tuple[int, str, Any]] = deque(maxlen=max_changes)
+        self.writing = 0
+
+
+class PlayerChangeJournal:
+    """Per-process log of player writes for incrementally maintained views.
+
+    Every write gets a process-wide sequence number. A view remembers the
+    sequence it has applied and asks for the player's changes since then;
+    `changes` answers None whenever the log cannot prove it is complete (a
+    write still in flight, entries dropped past `max_changes`, or the player
+    evicted) and the view rebuilds from a full read. Writes from other
+    workers never reach this log, so views also expire after `ttl_s`.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float = 15.0,
+        max_players: int = 2_000,
+        max_changes: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_s = max(0.0, float(ttl_s))
+        self.max_players = max(1, int(max_players or 2_000))
+        self.max_changes = max(1, int(max_changes or 64))
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._evicted_floor = 0
+        self._players: "OrderedDict[int, _PlayerLog]" = OrderedDict()
+        self._views: dict[str, Any] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_s > 0
+
+    def _log(self, chat_id: int) -> _PlayerLog:
+        log = self._players.get(chat_id)
+        if log is None:
+            log = self._players[chat_id] = _PlayerLog(self._evicted_floor, self.max_changes)
+            while len(self._players) > self.max_players:
+                _cid, evicted = self._players.popitem(last=False)
+                last = evicted.changes[-1][0] if evicted.changes else evicted.floor
+                self._evicted_floor = max(self._evicted_floor, last)
+        else:
+            self._players.move_to_end(chat_id)
+        return log
+
+    @contextmanager
+    def write(self, chat_id: int, kind: str, payload: Any = None) -> Iterator[None]:
+        """Wrap one store write; the change is logged once the write returns."""
+
+        cid = int(chat_id)
+        with self._lock:
+            self._log(cid).writing += 1
+        done = False
+        try:
+            yield
+            done = True
+        finally:
+            with self._lock:
+                log = self._log(cid)
+                log.writing = max(0, log.writing - 1)
+                self._seq += 1
+                if len(log.changes) == log.changes.maxlen:
+                    log.floor = log.changes[0][0]
+                # A write that raised may or may not have landed; views rebuild.
+                log.changes.append((self._seq, str(kind), payload) if done else (self._seq, "reset", None))
+
+    def head(self) -> int:
+        with self._lock:
+            return self._seq
+
+    def changes(self, chat_id: int, since: int) -> list[tuple[int, str, Any]] | None:
+        """Changes after `since`, oldest first, or None when a rebuild is required."""
+
+        with self._lock:
+            log = self._players.get(int(chat_id))
+            if log is None:
+                return [] if since >= self._evicted_floor else None
+            if log.writing or since < log.floor:
+                return None
+            return [change for change in log.changes if change[0] > since]
+
+    def fresh(self, built_at: float) -> bool:
+        return self.enabled and self.clock() - built_at < self.ttl_s
+
+    def view(self, name: str, factory: Callable[["PlayerChangeJournal"], Any]) -> Any:
+        """The journal's single instance of a named view, created on first use."""
+
+        with self._lock:
+            view = self._views.get(name)
+            if view is None:
+                view = self._views[name] = factory(self)
+            return view
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            views = dict(self._views)
+            status = {
+                "enabled": self.enabled,
+                "ttl_s": self.ttl_s,
+                "max_players": self.max_players,
+                "players": len(self._players),
+                "head": self._seq,
+            }
+        status["views"] = {name: view.status() for name, view in views.items() if callable(getattr(view, "status", None))}
+        return status
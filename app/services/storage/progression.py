@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import copy
+import heapq
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Mapping
+
+from app.services.storage.bundle import BUNDLE_PROGRESSION_LIMIT
+from app.services.storage.session_index import SESSION_CYCLE_EVENT
+
+# Progression event types the operator services read. They are owned by the
+# services; the projection only needs the strings.
+MISSION_EVENT = "operator_mission"
+STRATEGY_EVENT = "premium_strategy"
+MISSION_EVIDENCE_EVENT = "operator_mission_evidence"
+ENGAGEMENT_EVENT = "vod_engagement_intelligence"
+_OUTCOMES = frozenset({"clean", "mixed", "failed"})
+
+
+def _type(row: Mapping[str, Any]) -> str:
+    return str(row.get("type") or "")
+
+
+def _is_outcome(row: Mapping[str, Any]) -> bool:
+    return (
+        _type(row) == MISSION_EVENT
+        and str(row.get("status") or "").casefold() == "completed"
+        and str(row.get("outcome") or "").casefold() in _OUTCOMES
+    )
+
+
+_VIEWS: dict[str, Callable[[Mapping[str, Any]], bool]] = {
+    "missions": lambda row: _type(row) == MISSION_EVENT,
+    "outcomes": _is_outcome,
+    "strategies": lambda row: _type(row) == STRATEGY_EVENT,
+    "sessions": lambda row: _type(row) == SESSION_CYCLE_EVENT,
+    "vod_evidence": lambda row: _type(row) == MISSION_EVIDENCE_EVENT,
+    "engagements": lambda row: _type(row) == ENGAGEMENT_EVENT,
+}
+
+
+class ProgressionProjection:
+    """One player's recent progression events, indexed by what services read.
+
+    Holds the same newest-first window `list_progression_events` returns and
+    keeps typed views (missions, completed outcomes, strategies, session
+    cycles, VOD evidence, engagements) beside it. `record` adds one event and
+    drops the oldest past the window in O(1), so a write never forces a full
+    re-read. Views hand out deep copies; the projection itself is never
+    exposed to callers.
+    """
+
+    def __init__(self, rows: Iterable[Mapping[str, Any]] = (), *, window: int = BUNDLE_PROGRESSION_LIMIT) -> None:
+        self.window = max(1, int(window))
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._rows: deque[tuple[int, dict[str, Any]]] = deque()
+        self._views: dict[str, deque[tuple[int, dict[str, Any]]]] = {name: deque() for name in _VIEWS}
+        newest_first = [dict(row) for row in list(rows or []) if isinstance(row, Mapping)][: self.window]
+        for row in reversed(newest_first):
+            self._append(row)
+
+    def _append(self, row: dict[str, Any]) -> None:
+        self._seq += 1
+        item = (self._seq, row)
+        self._rows.appendleft(item)
+        for name, matches in _VIEWS.items():
+            if matches(row):
+                self._views[name].appendleft(item)
+        if len(self._rows) > self.window:
+            seq, _row = self._rows.pop()
+            for view in self._views.values():
+                if view and view[-1][0] == seq:
+                    view.pop()
+
+    def record(self, event: Mapping[str, Any]) -> None:
+        row = copy.deepcopy(dict(event or {}))
+        row.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+        with self._lock:
+            self._append(row)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    def recent(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Newest-first events, like `list_progression_events`."""
+
+        with self._lock:
+            rows = list(self._rows)[: limit if limit is not None else None]
+        return [copy.deepcopy(row) for _seq, row in rows]
+
+    def select(self, *views: str) -> list[dict[str, Any]]:
+        """Newest-first events of the named views, each event once."""
+
+        with self._lock:
+            streams = [list(self._views[name]) for name in views]
+        if len(streams) == 1:
+            return [copy.deepcopy(row) for _seq, row in streams[0]]
+        picked: list[dict[str, Any]] = []
+        last = None
+        for seq, row in heapq.merge(*streams, key=lambda item: -item[0]):
+            if seq != last:
+                picked.append(copy.deepcopy(row))
+                last = seq
+        return picked
+
+    @property
+    def missions(self) -> list[dict[str, Any]]:
+        return self.select("missions")
+
+    @property
+    def outcomes(self) -> list[dict[str, Any]]:
+        """Completed missions with a clean, mixed or failed outcome."""
+
+        return self.select("outcomes")
+
+    @property
+    def strategies(self) -> list[dict[str, Any]]:
+        return self.select("strategies")
+
+    @property
+    def sessions(self) -> list[dict[str, Any]]:
+        return self.select("sessions")
+
+    @property
+    def vod_evidence(self) -> list[dict[str, Any]]:
+        return self.select("vod_evidence")
+
+    @property
+    def engagements(self) -> list[dict[str, Any]]:
+        return self.select("engagements")
+
+
+class ProgressionProjectionCache:
+    """Per-process projections for recently active players.
+
+    A projection is loaded with one `list_progression_events` read and then
+    kept current by this process's own `add_progression_event` calls. Writes
+    from other workers become visible when the entry expires after `ttl_s`.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_s: float = 15.0,
+        max_players: int = 2_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_s = max(0.0, float(ttl_s))
+        self.max_players = max(1, int(max_players or 2_000))
+        self._clock = clock
+        self._entries: "OrderedDict[int, tuple[float, ProgressionProjection]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "records": 0, "invalidations": 0, "evictions": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_s > 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, chat_id: int) -> ProgressionProjection | None:
+        key = int(chat_id)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                expires_at, projection = cached
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return projection
+                del self._entries[key]
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, chat_id: int, projection: ProgressionProjection, *, generation: int | None = None) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            # A write or purge that landed while this projection was loading makes it stale.
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[int(chat_id)] = (self._clock() + self.ttl_s, projection)
+            self._entries.move_to_end(int(chat_id))
+            while len(self._entries) > self.max_players:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def begin_write(self) -> None:
+        """Mark a write in flight so loads overlapping it are not cached."""
+
+        with self._lock:
+            self._generation += 1
+
+    def record(self, chat_id: int, event: Mapping[str, Any]) -> None:
+        with self._lock:
+            self._generation += 1
+            cached = self._entries.get(int(chat_id))
+            if cached is not None:
+                cached[1].record(event)
+                self._stats["records"] += 1
+
+    def invalidate(self, chat_id: int | None = None) -> None:
+        with self._lock:
+            self._generation += 1
+            self._stats["invalidations"] += 1
+            if chat_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(int(chat_id), None)
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "ttl_s": self.ttl_s,
+                "max_players": self.max_players,
+                "players": len(self._entries),
+                **self._stats,
+            }
+
+
+def progression_projection(store: Any, chat_id: int) -> ProgressionProjection:
+    """The store's maintained projection, or one built from a single list read.
+
+    Fails open to an empty projection, like the per-service readers did.
+    """
+
+    fn = getattr(store, "progression_projection", None)
+    if callable(fn):
+        try:
+            projection = fn(int(chat_id))
+            if isinstance(projection, ProgressionProjection):
+                return projection
+        except Exception:
+            pass
+    fn = getattr(store, "list_progression_events", None)
+    if not callable(fn):
+        return ProgressionProjection()
+    try:
+        return ProgressionProjection(fn(int(chat_id)) or [])
+    except Exception:
+        return ProgressionProjection()
@@ -5,33 +5,41 @@ import copy
 import inspect
 import logging
 import threading
+import time
 import uuid
-from collections import deque
-from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Mapping
 
-
-log = logging.getLogger("bco.storage")
+from app.services.storage.bundle import BUNDLE_EPISODES_LIMIT, BUNDLE_PROGRESSION_LIMIT, compose_player_bundle
+from app.services.storage.outbox import MemoryOutbox, PendingWrite, SQLiteOutbox
+from app.services.storage.session_index import open_session_from_events
+from app.services.storage.turn_snapshot import active_turn, seed_turn_from_bundle, turn_invalidate, turn_read
 
 
-@dataclass(frozen=True)
-class PendingWrite:
-    operation_id: str
-    method: str
-    args: tuple
-    kwargs: dict
+log = logging.getLogger("bco.storage")
 
 
 class ResilientStore:
-    """Persistent primary + memory mirror + bounded FIFO write recovery."""
-
-    def __init__(self, primary: Any, fallback: Any, *, outbox_max: int = 500, replay_batch: int = 50) -> None:
+    """Persistent primary + memory mirror + bounded FIFO write recovery.
+
+    The outbox is process-local by default; pass a `SQLiteOutbox` to keep
+    pending writes across restarts.
+    """
+
+    def __init__(
+        self,
+        primary: Any,
+        fallback: Any,
+        *,
+        outbox_max: int = 500,
+        replay_batch: int = 50,
+        outbox: MemoryOutbox | SQLiteOutbox | None = None,
+    ) -> None:
         self.primary = primary
         self.fallback = fallback
-        self.outbox_max = max(10, int(outbox_max or 500))
+        self._pending = outbox if outbox is not None else MemoryOutbox(outbox_max)
+        self.outbox_max = self._pending.max_entries
         self.replay_batch = max(1, min(int(replay_batch or 50), self.outbox_max))
-        self._pending: deque[PendingWrite] = deque()
         self._lock = threading.RLock()
         self._primary_available = True
         self._last_primary_error = ""
@@ -70,25 +78,30 @@ class ResilientStore:
         log.warning("storage primary failed method=%s error=%s", method, self._last_primary_error)
 
     def _enqueue_locked(self, op: PendingWrite) -> None:
-        if len(self._pending) >= self.outbox_max:
+        try:
+            accepted = self._pending.append(op)
+        except Exception as exc:
+            log.error("storage recovery outbox append failed method=%s error=%s", op.method, type(exc).__name__)
+            accepted = False
+        if not accepted:
             self._dropped += 1
             log.error(
                 "storage recovery outbox full method=%s pending=%d dropped=%d",
                 op.method, len(self._pending), self._dropped,
             )
-            return
-        self._pending.append(op)
 
     def _flush_locked(self) -> int:
         replayed_now = 0
-        while self._pending and replayed_now < self.replay_batch:
-            op = self._pending[0]
+        while replayed_now < self.replay_batch:
+            op = self._pending.head()
+            if op is None:
+                break
             try:
                 self._primary_call(op)
             except Exception as exc:
                 self._remember_failure(op.method, exc)
                 break
-            self._pending.popleft()
+            self._pending.ack(op)
             self._replayed += 1
             replayed_now += 1
             self._primary_available = True
@@ -128,19 +141,30 @@ class ResilientStore:
                 return False
 
     def _read(self, name: str, *args, **kwargs):
+        return turn_read(name, args, kwargs, lambda: self._read_through(name, *args, **kwargs))
+
+    def _read_through(self, name: str, *args, **kwargs):
         with self._lock:
             if self._pending:
                 self._flush_locked()
                 if self._pending:
                     return getattr(self.fallback, name)(*args, **kwargs)
-            try:
-                value = getattr(self.primary, name)(*args, **kwargs)
-                self._primary_available = True
-                self._last_primary_error = ""
-                return value
-            except Exception as exc:
+        # Reads never hold the outbox lock across network I/O: one slow
+        # primary read must not serialize every other chat's store calls.
+        try:
+            value = getattr(self.primary, name)(*args, **kwargs)
+        except Exception as exc:
+            with self._lock:
                 self._remember_failure(name, exc)
+            return getattr(self.fallback, name)(*args, **kwargs)
+        with self._lock:
+            self._primary_available = True
+            self._last_primary_error = ""
+            # A write queued while the read was in flight is not in `value`;
+            # serve the fallback, which already holds it.
+            if self._pending:
                 return getattr(self.fallback, name)(*args, **kwargs)
+        return value
 
     def _write(self, name: str, *args, **kwargs) -> None:
         try:
@@ -150,6 +174,8 @@ class ResilientStore:
             frozen_args = tuple(args)
             frozen_kwargs = dict(kwargs)
         op = PendingWrite(self._new_operation_id(), name, frozen_args, frozen_kwargs)
+        if args:
+            turn_invalidate(args[0], name)
 
         with self._lock:
             try:
@@ -252,6 +278,44 @@ class ResilientStore:
     def list_progression_events(self, chat_id: int) -> list[dict]:
         return list(self._read("list_progression_events", chat_id) or [])
 
+    def get_open_crown_session(self, chat_id: int, mission_id: str | None = None) -> dict[str, Any] | None:
+        if not callable(getattr(self.primary, "get_open_crown_session", None)):
+            return open_session_from_events(self.list_progression_events(chat_id), mission_id)
+        found = self._read("get_open_crown_session", chat_id, mission_id)
+        return dict(found) if found else None
+
+    def list_crown_session_events(self, chat_id: int, crown_session_id: str) -> list[dict]:
+        if not callable(getattr(self.primary, "list_crown_session_events", None)):
+            sid = str(crown_session_id or "")
+            return [x for x in self.list_progression_events(chat_id) if str(x.get("crown_session_id") or "") == sid]
+        return list(self._read("list_crown_session_events", chat_id, crown_session_id) or [])
+
+    def get_player_bundle(self, chat_id: int, *, progression_limit: int = 100, episodes_limit: int = 40) -> dict[str, Any]:
+        if not (hasattr(self.primary, "get_player_bundle") and hasattr(self.fallback, "get_player_bundle")):
+            return compose_player_bundle(self, chat_id, progression_limit=progression_limit, episodes_limit=episodes_limit)
+        if active_turn(chat_id) is None:
+            return dict(self._read(
+                "get_player_bundle", chat_id, progression_limit=progression_limit, episodes_limit=episodes_limit,
+            ) or {})
+        # Inside a conversation turn every reader shares one full-depth bundle
+        # and its surfaces, whatever depth the individual reader asked for.
+        full_progression = max(int(progression_limit), BUNDLE_PROGRESSION_LIMIT)
+        full_episodes = max(int(episodes_limit), BUNDLE_EPISODES_LIMIT)
+        bundle = dict(self._read(
+            "get_player_bundle", chat_id, progression_limit=full_progression, episodes_limit=full_episodes,
+        ) or {})
+        seed_turn_from_bundle(chat_id, bundle, progression_limit=full_progression)
+        bundle["progression"] = list(bundle.get("progression") or [])[: max(1, int(progression_limit))]
+        bundle["episodes"] = list(bundle.get("episodes") or [])[: max(1, int(episodes_limit))]
+        return bundle
+
+    def _oldest_pending_age_s(self) -> float:
+        try:
+            oldest = self._pending.oldest_enqueued_at()
+        except Exception:
+            return 0.0
+        return round(max(0.0, time.time() - oldest), 3) if oldest is not None else 0.0
+
     def recovery_status(self) -> dict[str, Any]:
         with self._lock:
             return {
@@ -261,16 +325,28 @@ class ResilientStore:
                 "outbox_dropped": self._dropped,
                 "last_primary_error": self._last_primary_error,
                 "outbox_max": self.outbox_max,
+                "outbox_durable": bool(self._pending.durable),
+                "outbox_oldest_age_s": self._oldest_pending_age_s(),
                 "last_probe_ok": self._last_probe_ok,
                 "last_probe_at": self._last_probe_at,
                 "probe_successes": self._probe_successes,
                 "probe_failures": self._probe_failures,
             }
 
+    def engine_status(self) -> dict[str, Any]:
+        status = getattr(self.primary, "engine_status", None)
+        if not callable(status):
+            return {}
+        try:
+            return dict(status() or {})
+        except Exception:
+            return {}
+
     def close(self) -> None:
         with self._lock:
             if self._pending:
                 self._flush_locked()
+            self._pending.close()
         for store in (self.primary, self.fallback):
             fn = getattr(store, "close", None)
             if callable(fn):
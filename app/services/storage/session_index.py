@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from typing import Any, Iterable, Mapping
+
+SESSION_CYCLE_EVENT = "crown_session_cycle"
+
+
+def _text(row: Mapping[str, Any], key: str) -> str:
+    return str(row.get(key) or "")
+
+
+def open_session_from_events(rows: Iterable[Mapping[str, Any]], mission_id: str | None = None) -> dict[str, Any] | None:
+    """Newest prepared, not yet closed session cycle in a progression event list.
+
+    This is the scan the index replaces; stores without an index (and test
+    doubles) still answer through it.
+    """
+
+    wanted = str(mission_id or "").strip()
+    rows = [x for x in rows if isinstance(x, Mapping) and _text(x, "type") == SESSION_CYCLE_EVENT]
+    closed = {_text(x, "crown_session_id") for x in rows if _text(x, "status") == "closed"}
+    candidates = [
+        x for x in rows
+        if _text(x, "status") == "prepared"
+        and _text(x, "crown_session_id") not in closed
+        and (not wanted or _text(x, "mission_id") == wanted)
+    ]
+    candidates.sort(key=lambda x: str(x.get("at") or x.get("created_at") or ""), reverse=True)
+    return dict(candidates[0]) if candidates else None
+
+
+class CrownSessionIndex:
+    """One chat's session cycles, kept current as progression events are written.
+
+    Open sessions are held per mission in prepare order, so the open-session
+    lookup is a dict access plus the last item of an ordered dict. Events that
+    carry a crown_session_id (VOD mission evidence, engagements) are kept per
+    session for the after-action report. Nothing here is trimmed with the
+    progression list, so a session prepared hundreds of events ago is still
+    found.
+    """
+
+    def __init__(self, *, max_sessions: int = 200, max_events_per_session: int = 50) -> None:
+        self.max_sessions = max(1, int(max_sessions))
+        self.max_events_per_session = max(1, int(max_events_per_session))
+        self._open: "OrderedDict[str, dict[str, Any]]" = OrderedDict()
+        self._open_by_mission: dict[str, "OrderedDict[str, dict[str, Any]]"] = {}
+        self._closed: "OrderedDict[str, None]" = OrderedDict()
+        self._events: "OrderedDict[str, deque[dict[str, Any]]]" = OrderedDict()
+
+    def record(self, event: Mapping[str, Any]) -> None:
+        session_id = _text(event, "crown_session_id")
+        if not session_id:
+            return
+        if _text(event, "type") != SESSION_CYCLE_EVENT:
+            events = self._events.get(session_id)
+            if events is None:
+                events = self._events[session_id] = deque(maxlen=self.max_events_per_session)
+                while len(self._events) > self.max_sessions:
+                    self._events.popitem(last=False)
+            events.append(dict(event))
+            return
+
+        status = _text(event, "status")
+        if status == "prepared" and session_id not in self._closed:
+            mission_id = _text(event, "mission_id")
+            self._open[session_id] = dict(event)
+            self._open.move_to_end(session_id)
+            by_mission = self._open_by_mission.setdefault(mission_id, OrderedDict())
+            by_mission[session_id] = self._open[session_id]
+            by_mission.move_to_end(session_id)
+        elif status == "closed":
+            self._closed[session_id] = None
+            while len(self._closed) > self.max_sessions:
+                self._closed.popitem(last=False)
+            opened = self._open.pop(session_id, None)
+            if opened is not None:
+                mission_id = _text(opened, "mission_id")
+                by_mission = self._open_by_mission.get(mission_id)
+                if by_mission is not None:
+                    by_mission.pop(session_id, None)
+                    if not by_mission:
+                        del self._open_by_mission[mission_id]
+
+    def open_session(self, mission_id: str | None = None) -> dict[str, Any] | None:
+        wanted = str(mission_id or "").strip()
+        sessions = self._open_by_mission.get(wanted) if wanted else self._open
+        if not sessions:
+            return None
+        return dict(next(reversed(sessions.values())))
+
+    def session_events(self, crown_session_id: str) -> list[dict[str, Any]]:
+        """Events linked to one session, newest first."""
+
+        return [dict(x) for x in reversed(self._events.get(str(crown_session_id or ""), ()))]
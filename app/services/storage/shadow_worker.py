@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+log = logging.getLogger("bco.storage")
+
+_STOP = object()
+
+
+class ShadowComparisonWorker:
+    """Bounded background executor for canonical read shadow comparisons.
+
+    `submit` never blocks: when the queue is full the comparison is dropped
+    and counted, so a slow canonical backend can only lose samples, never
+    slow the legacy read that product code is waiting on. Threads start on
+    the first submit.
+    """
+
+    def __init__(self, *, max_queue: int = 1_000, workers: int = 2) -> None:
+        self.max_queue = max(1, int(max_queue or 1_000))
+        self.workers = max(1, min(int(workers or 2), 16))
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.max_queue)
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+        self._submitted = 0
+        self._completed = 0
+        self._dropped = 0
+        self._errors = 0
+        self._lag_total_s = 0.0
+        self._lag_max_s = 0.0
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._threads or self._closed:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"bco-canonical-shadow-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, job: Callable[[], None]) -> bool:
+        """Queue `job`; False when it was dropped because the queue is full or closed."""
+
+        if self._closed:
+            return False
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((time.monotonic(), job))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+            return False
+        with self._lock:
+            self._submitted += 1
+        return True
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                queued_at, job = item
+                lag_s = time.monotonic() - queued_at
+                with self._lock:
+                    self._lag_total_s += lag_s
+                    self._lag_max_s = max(self._lag_max_s, lag_s)
+                try:
+                    job()
+                except Exception as exc:
+                    with self._lock:
+                        self._errors += 1
+                    log.warning("canonical shadow comparison failed error=%s", type(exc).__name__)
+                with self._lock:
+                    self._completed += 1
+            finally:
+                self._queue.task_done()
+
+    def drain(self, timeout_s: float = 5.0) -> bool:
+        """Wait until every queued comparison has run; True when the queue emptied in time."""
+
+        done = self._queue.all_tasks_done
+        with done:
+            return done.wait_for(lambda: self._queue.unfinished_tasks == 0, timeout=max(0.0, timeout_s))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+        for _thread in threads:
+            try:
+                self._queue.put(_STOP, timeout=1.0)
+            except queue.Full:
+                break
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            completed = self._completed
+            return {
+                "mode": "background",
+                "workers": self.workers,
+                "queue_depth": self._queue.qsize(),
+                "max_queue": self.max_queue,
+                "submitted": self._submitted,
+                "completed": completed,
+                "dropped": self._dropped,
+                "errors": self._errors,
+                "avg_lag_ms": round(self._lag_total_s / completed * 1000, 1) if completed else 0.0,
+                "max_lag_ms": round(self._lag_max_s * 1000, 1),
+            }
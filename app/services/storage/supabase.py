@@ -2,16 +2,23 @@
 from __future__ import annotations
 
 import hashlib
+import time
 from typing import Any, Mapping
 
 import httpx
 
+from app.observability.metrics import latency_metrics
+from app.services.storage.bundle import compose_player_bundle, normalize_player_bundle
+from app.services.storage.engine import AsyncSupabaseEngine
+from app.services.storage.session_index import open_session_from_events
+
 
 class SupabaseStore:
     """Persistent Storage implementation backed by Supabase/PostgREST."""
 
     def __init__(self, *, url: str, service_role_key: str, memory_max_turns: int = 20,
-                 schema: str = "public", timeout_s: float = 8.0) -> None:
+                 schema: str = "public", timeout_s: float = 8.0, call_deadline_s: float | None = None,
+                 pool_max_connections: int = 32, http2: bool = True) -> None:
         self.url = (url or "").strip().rstrip("/")
         self.key = (service_role_key or "").strip()
         if not self.url or not self.key:
@@ -19,7 +26,11 @@ class SupabaseStore:
         self.rest_url = f"{self.url}/rest/v1"
         self.schema = (schema or "public").strip() or "public"
         self.memory_max_turns = max(4, int(memory_max_turns or 20))
-        self._client = httpx.Client(timeout=httpx.Timeout(timeout_s))
+        # Every store call shares one bounded async pool with a per-call deadline,
+        # so a slow PostgREST request occupies one pool slot instead of a worker.
+        self._bundle_rpc_available = True
+        self._session_rpc_available = True
+        self._client = AsyncSupabaseEngine(timeout_s=timeout_s, deadline_s=call_deadline_s, max_connections=pool_max_connections, http2=http2)
 
     def _headers(self, extra: Mapping[str, str] | None = None) -> dict[str, str]:
         headers = {"apikey": self.key,"Authorization": f"Bearer {self.key}","Accept": "application/json","Content-Type": "application/json","Accept-Profile": self.schema,"Content-Profile": self.schema,"User-Agent": "BLACK-CROWN-OPS/storage-v39"}
@@ -27,7 +38,17 @@ class SupabaseStore:
         return headers
 
     def _request(self, method: str, path: str, *, params: Mapping[str, Any] | None = None, json: Any = None, extra_headers: Mapping[str, str] | None = None) -> httpx.Response:
-        response = self._client.request(method, f"{self.rest_url}/{path.lstrip('/')}", params=dict(params or {}), json=json, headers=self._headers(extra_headers)); response.raise_for_status(); return response
+        started, outcome = time.perf_counter(), "error"
+        try:
+            response = self._client.request(method, f"{self.rest_url}/{path.lstrip('/')}", params=dict(params or {}), json=json, headers=self._headers(extra_headers))
+            outcome = "ok" if response.status_code < 400 else f"http_{response.status_code // 100}xx"
+            response.raise_for_status(); return response
+        finally:
+            latency_metrics.observe("bco_store_request_seconds", time.perf_counter() - started, method=method, target="rpc" if path.lstrip("/").startswith("rpc/") else "table", outcome=outcome)
+
+    def engine_status(self) -> dict[str, Any]:
+        stats = getattr(self._client, "stats", None)
+        return dict(stats()) if callable(stats) else {"engine": "sync_client"}
 
     def _rows(self, response: httpx.Response) -> list[dict]:
         if not response.content: return []
@@ -76,6 +97,10 @@ class SupabaseStore:
         rows=self._rows(self._request("GET","bco_players",params={"chat_id":f"eq.{int(chat_id)}","select":"derived","limit":"1"})); v=rows[0].get("derived") if rows else {}; return dict(v) if isinstance(v,dict) else {}
     def set_derived_intelligence(self,chat_id:int,data:Mapping[str,Any],*,operation_id:str|None=None)->None:self._request("POST","bco_players",params={"on_conflict":"chat_id"},json={"chat_id":int(chat_id),"derived":dict(data or {})},extra_headers={"Prefer":"resolution=merge-duplicates,return=minimal"})
     @staticmethod
+    def _event_row(x:Mapping[str,Any],**columns:Any)->dict[str,Any]:
+        """The stored event; a `created_at` stamped at write time wins over the insert default."""
+        row=dict(x.get("data") if isinstance(x.get("data"),dict) else {},**columns);row["created_at"]=row.get("created_at") or x.get("created_at");return row
+    @staticmethod
     def _mistake_key(mistake:str)->str:return hashlib.sha1(" ".join(str(mistake or "").lower().split()).encode("utf-8")).hexdigest()[:20]
     def add_recurring_mistake(self,chat_id:int,mistake:str,*,operation_id:str|None=None)->None:
         label=str(mistake or "").strip();
@@ -88,13 +113,42 @@ class SupabaseStore:
     def add_episode(self,chat_id:int,event:Mapping[str,Any],*,operation_id:str|None=None)->None:
         payload=dict(event or {});self._append("bco_episodes",{"chat_id":int(chat_id),"kind":str(payload.pop("kind","event"))[:64],"data":payload},operation_id)
     def list_episodes(self,chat_id:int,limit:int=20)->list[dict]:
-        rows=self._rows(self._request("GET","bco_episodes",params={"chat_id":f"eq.{int(chat_id)}","select":"kind,data,created_at","order":"id.desc","limit":str(max(1,min(int(limit),100)))}));return [dict((r.get("data") if isinstance(r.get("data"),dict) else {}),kind=r.get("kind"),created_at=r.get("created_at")) for r in rows]
+        rows=self._rows(self._request("GET","bco_episodes",params={"chat_id":f"eq.{int(chat_id)}","select":"kind,data,created_at","order":"id.desc","limit":str(max(1,min(int(limit),100)))}));return [self._event_row(r,kind=r.get("kind")) for r in rows]
     def add_training_session(self,chat_id:int,event:Mapping[str,Any],*,operation_id:str|None=None)->None:self._append("bco_training_sessions",{"chat_id":int(chat_id),"data":dict(event or {})},operation_id)
     def list_training_sessions(self,chat_id:int)->list[dict]:
         rows=self._rows(self._request("GET","bco_training_sessions",params={"chat_id":f"eq.{int(chat_id)}","select":"data,created_at","order":"id.desc","limit":"50"}));return [dict(x.get("data") or {},created_at=x.get("created_at")) for x in rows]
     def add_progression_event(self,chat_id:int,event:Mapping[str,Any],*,operation_id:str|None=None)->None:self._append("bco_progression_events",{"chat_id":int(chat_id),"data":dict(event or {})},operation_id)
     def list_progression_events(self,chat_id:int)->list[dict]:
-        rows=self._rows(self._request("GET","bco_progression_events",params={"chat_id":f"eq.{int(chat_id)}","select":"data,created_at","order":"id.desc","limit":"100"}));return [dict(x.get("data") or {},created_at=x.get("created_at")) for x in rows]
+        rows=self._rows(self._request("GET","bco_progression_events",params={"chat_id":f"eq.{int(chat_id)}","select":"data,created_at","order":"id.desc","limit":"100"}));return [self._event_row(x) for x in rows]
+    def get_open_crown_session(self,chat_id:int,mission_id:str|None=None)->dict[str,Any]|None:
+        """Newest open session cycle via the indexed bco_open_crown_session RPC."""
+        if not self._session_rpc_available:return open_session_from_events(self.list_progression_events(chat_id),mission_id)
+        try:response=self._request("POST","rpc/bco_open_crown_session",json={"p_chat_id":int(chat_id),"p_mission_id":str(mission_id or "").strip() or None})
+        except httpx.HTTPStatusError as exc:
+            # Migration 013 not applied yet: scan the recent progression events.
+            if exc.response.status_code!=404:raise
+            self._session_rpc_available=False;return open_session_from_events(self.list_progression_events(chat_id),mission_id)
+        data=response.json() if response.content else None
+        if isinstance(data,list):data=data[0] if data else None
+        if isinstance(data,dict) and len(data)==1 and "bco_open_crown_session" in data:data=data["bco_open_crown_session"]
+        return dict(data) if isinstance(data,dict) and data else None
+    def list_crown_session_events(self,chat_id:int,crown_session_id:str)->list[dict]:
+        rows=self._rows(self._request("GET","bco_progression_events",params={"chat_id":f"eq.{int(chat_id)}","data->>crown_session_id":f"eq.{str(crown_session_id or '')}","select":"data,created_at","order":"id.desc","limit":"100"}));return [self._event_row(x) for x in rows]
+    def get_player_bundle(self,chat_id:int,*,progression_limit:int=100,episodes_limit:int=40)->dict[str,Any]:
+        """Player row + recent mistakes/progression/episodes in one PostgREST round trip."""
+        if not self._bundle_rpc_available:return compose_player_bundle(self,chat_id,progression_limit=progression_limit,episodes_limit=episodes_limit)
+        try:response=self._request("POST","rpc/bco_player_bundle",json={"p_chat_id":int(chat_id),"p_progression_limit":max(1,min(int(progression_limit),100)),"p_episode_limit":max(1,min(int(episodes_limit),100))})
+        except httpx.HTTPStatusError as exc:
+            # Migration 012 not applied yet: keep serving through per-surface reads.
+            if exc.response.status_code!=404:raise
+            self._bundle_rpc_available=False;return compose_player_bundle(self,chat_id,progression_limit=progression_limit,episodes_limit=episodes_limit)
+        data=response.json() if response.content else {}
+        if isinstance(data,list):data=data[0] if data and isinstance(data[0],dict) else {}
+        if isinstance(data,dict) and len(data)==1 and isinstance(data.get("bco_player_bundle"),dict):data=data["bco_player_bundle"]
+        raw=data if isinstance(data,dict) else {}
+        progression=[self._event_row(x) for x in list(raw.get("progression") or []) if isinstance(x,dict)]
+        episodes=[self._event_row(x,kind=x.get("kind")) for x in list(raw.get("episodes") or []) if isinstance(x,dict)]
+        return normalize_player_bundle({**raw,"progression":progression,"episodes":episodes})
     def stats(self,chat_id:int)->dict:
         cid=int(chat_id);return {"backend":"supabase","turns":self._count("bco_messages",cid),"has_profile":bool(self.get_profile(cid)),"has_summary":bool(self.get_summary(cid)),"recurring_mistakes":self._count("bco_player_mistakes",cid),"training_sessions":self._count("bco_training_sessions",cid),"progression_events":self._count("bco_progression_events",cid),"episodes":self._count("bco_episodes",cid),"max_turns":self.memory_max_turns}
     def close(self)->None:self._client.close()
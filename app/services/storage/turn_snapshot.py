@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import copy
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Mapping
+
+from app.services.storage.bundle import BUNDLE_PROGRESSION_LIMIT
+
+
+# Player-surface reads keyed by chat_id that may be served from the turn
+# snapshot. Identity resolution and adapter status are deliberately absent.
+TURN_CACHED_READS = frozenset({
+    "get",
+    "get_profile",
+    "get_summary",
+    "get_derived_intelligence",
+    "list_recurring_mistakes",
+    "list_mistake_stats",
+    "list_episodes",
+    "list_training_sessions",
+    "list_progression_events",
+    "get_open_crown_session",
+    "list_crown_session_events",
+    "get_player_bundle",
+})
+
+# Reads each write can change. Writes not listed here drop the whole snapshot.
+_BUNDLE = "get_player_bundle"
+TURN_WRITE_SURFACES: dict[str, frozenset[str]] = {
+    "add": frozenset({"get"}),
+    "clear": frozenset({"get"}),
+    "set_profile": frozenset({"get_profile", _BUNDLE}),
+    # Supabase deletes the whole player row, summary and derived included.
+    "reset_profile": frozenset({"get_profile", "get_summary", "get_derived_intelligence", _BUNDLE}),
+    "set_summary": frozenset({"get_summary", _BUNDLE}),
+    "set_derived_intelligence": frozenset({"get_derived_intelligence", _BUNDLE}),
+    "add_recurring_mistake": frozenset({"list_recurring_mistakes", "list_mistake_stats", _BUNDLE}),
+    "add_episode": frozenset({"list_episodes", _BUNDLE}),
+    "add_training_session": frozenset({"list_training_sessions"}),
+    "add_progression_event": frozenset({
+        "list_progression_events", "get_open_crown_session", "list_crown_session_events", _BUNDLE,
+    }),
+}
+
+
+class TurnSnapshot:
+    """Read-through memo of one chat's store reads for a single conversation turn.
+
+    A write for the chat drops every memoized read it can change, so a read
+    after a write inside the same turn always goes back to the store. Values
+    are deep-copied in both directions; callers can never mutate the snapshot.
+    """
+
+    def __init__(self, chat_id: int) -> None:
+        self.chat_id = int(chat_id)
+        self._values: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(name: str, args: tuple, kwargs: Mapping[str, Any]) -> tuple:
+        return (name, tuple(args), tuple(sorted(kwargs.items())))
+
+    def lookup(self, key: tuple) -> tuple[bool, Any]:
+        with self._lock:
+            if key not in self._values:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, copy.deepcopy(self._values[key])
+
+    def remember(self, key: tuple, value: Any) -> None:
+        with self._lock:
+            self._values[key] = copy.deepcopy(value)
+
+    def invalidate(self, reads: frozenset[str] | None = None) -> None:
+        with self._lock:
+            stale = [key for key in self._values if reads is None or key[0] in reads]
+            if stale:
+                self.invalidations += 1
+            for key in stale:
+                del self._values[key]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._values),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+_ACTIVE: ContextVar[TurnSnapshot | None] = ContextVar("bco_turn_snapshot", default=None)
+
+
+@contextmanager
+def player_turn(chat_id: int | None) -> Iterator[TurnSnapshot | None]:
+    """Scope store reads for `chat_id` to one shared snapshot.
+
+    `None` opens no scope. Re-entering for the same chat reuses the outer
+    snapshot; the scope lives in a context variable, so concurrent turns in
+    other threads or tasks never observe it.
+    """
+
+    if chat_id is None:
+        yield None
+        return
+    current = _ACTIVE.get()
+    if current is not None and current.chat_id == int(chat_id):
+        yield current
+        return
+    token = _ACTIVE.set(TurnSnapshot(int(chat_id)))
+    try:
+        yield _ACTIVE.get()
+    finally:
+        _ACTIVE.reset(token)
+
+
+def active_turn(chat_id: Any) -> TurnSnapshot | None:
+    snapshot = _ACTIVE.get()
+    if snapshot is None:
+        return None
+    try:
+        return snapshot if snapshot.chat_id == int(chat_id) else None
+    except (TypeError, ValueError):
+        return None
+
+
+def turn_read(name: str, args: tuple, kwargs: Mapping[str, Any], load: Callable[[], Any]) -> Any:
+    """Serve a player-surface read from the active turn snapshot or load it."""
+
+    snapshot = active_turn(args[0]) if args and name in TURN_CACHED_READS else None
+    if snapshot is None:
+        return load()
+    key = TurnSnapshot.key(name, (snapshot.chat_id, *args[1:]), kwargs)
+    hit, value = snapshot.lookup(key)
+    if hit:
+        return value
+    value = load()
+    snapshot.remember(key, value)
+    return value
+
+
+def turn_invalidate(chat_id: Any, write: str = "") -> None:
+    snapshot = active_turn(chat_id)
+    if snapshot is not None:
+        snapshot.invalidate(TURN_WRITE_SURFACES.get(write))
+
+
+def seed_turn_from_bundle(chat_id: Any, bundle: Mapping[str, Any], *, progression_limit: int) -> None:
+    """Expose a freshly read player bundle as the per-surface reads it covers."""
+
+    snapshot = active_turn(chat_id)
+    if snapshot is None:
+        return
+    cid = int(chat_id)
+    surfaces: dict[str, Any] = {
+        "get_profile": dict(bundle.get("profile") or {}),
+        "get_summary": str(bundle.get("summary") or ""),
+        "get_derived_intelligence": dict(bundle.get("derived") or {}),
+        "list_mistake_stats": list(bundle.get("mistakes") or []),
+    }
+    if int(progression_limit) >= BUNDLE_PROGRESSION_LIMIT:
+        surfaces["list_progression_events"] = list(bundle.get("progression") or [])
+    for name, value in surfaces.items():
+        snapshot.remember(TurnSnapshot.key(name, (cid,), {}), value)
@@ -113,7 +113,7 @@ class TelegramLiveResponse:
             mode = await self.tg.send_live_draft(self.chat_id, self.draft_id, card)
             if mode == "unsupported":
                 self._supported = False
-            else:
+            elif mode != "skipped":
                 self._last_sent_at = time.monotonic()
                 self._last_text = str(text or "")
                 self._last_meta = dict(meta or {})
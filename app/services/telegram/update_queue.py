@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+
+log = logging.getLogger("bco.telegram.updates")
+
+UpdateHandler = Callable[[dict], Awaitable[Any]]
+
+_CHAT_CARRIERS = ("message", "edited_message", "channel_post", "edited_channel_post", "business_message")
+_USER_CARRIERS = ("callback_query", "inline_query", "chosen_inline_result", "pre_checkout_query", "shipping_query")
+
+
+def update_order_key(raw: dict) -> str:
+    """Ordering lane for an update: its chat, else its sender, else itself.
+
+    Updates without a chat or sender (polls, service updates) get a lane of
+    their own and therefore run unordered.
+    """
+
+    if isinstance(raw, dict):
+        callback = raw.get("callback_query")
+        carriers = [raw.get(name) for name in _CHAT_CARRIERS]
+        if isinstance(callback, dict):
+            carriers.insert(0, callback.get("message"))
+        for carrier in carriers:
+            chat = carrier.get("chat") if isinstance(carrier, dict) else None
+            if isinstance(chat, dict) and chat.get("id") is not None:
+                return f"chat:{chat.get('id')}"
+        for name in _USER_CARRIERS + ("my_chat_member", "chat_member", "chat_join_request"):
+            carrier = raw.get(name)
+            chat = carrier.get("chat") if isinstance(carrier, dict) else None
+            if isinstance(chat, dict) and chat.get("id") is not None:
+                return f"chat:{chat.get('id')}"
+            sender = carrier.get("from") if isinstance(carrier, dict) else None
+            if isinstance(sender, dict) and sender.get("id") is not None:
+                return f"user:{sender.get('id')}"
+        return f"update:{raw.get('update_id')}"
+    return "update:None"
+
+
+@dataclass
+class _Job:
+    update: dict
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class ChatOrderedUpdateQueue:
+    """In-process worker pool for Telegram updates.
+
+    Every ordering key (normally the chat) owns a FIFO lane drained by a
+    single task, so one chat's updates are handled strictly in arrival order
+    while different chats run in parallel, at most `workers` at a time. The
+    total backlog and each lane are bounded; `submit()` refuses work beyond
+    either bound so the webhook can push back on Telegram instead of growing
+    memory. `drain()` stops intake and waits for the backlog on shutdown.
+    """
+
+    def __init__(
+        self,
+        handler: UpdateHandler,
+        *,
+        workers: int = 8,
+        max_pending: int = 1000,
+        max_pending_per_chat: int = 50,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._handler = handler
+        self.workers = max(1, int(workers or 8))
+        self.max_pending = max(1, int(max_pending or 1000))
+        self.max_pending_per_chat = max(1, min(int(max_pending_per_chat or 50), self.max_pending))
+        self._clock = clock
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._idle: asyncio.Event | None = None
+        self._lanes: dict[str, deque[_Job]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._pending = 0
+        self._in_flight = 0
+        self._closed = False
+        self.accepted = 0
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.max_pending_seen = 0
+        self.max_in_flight = 0
+
+    def _bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        # asyncio primitives belong to one loop; lanes left on a finished loop
+        # (test clients run one per request) can no longer make progress.
+        if self._loop is loop:
+            return
+        if self._pending:
+            log.warning("telegram update queue rebound to a new loop dropped=%d", self._pending)
+            self.dropped += self._pending
+        self._loop = loop
+        self._slots = asyncio.Semaphore(self.workers)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._lanes = {}
+        self._tasks = set()
+        self._pending = 0
+        self._in_flight = 0
+
+    def start(self) -> None:
+        """Bind to the running loop and (re)open intake. Called at startup."""
+
+        self._bind(asyncio.get_running_loop())
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, update: dict) -> bool:
+        """Queue one update; False means the queue is full or draining."""
+
+        self._bind(asyncio.get_running_loop())
+        key = update_order_key(update)
+        lane = self._lanes.get(key)
+        if self._closed or self._pending >= self.max_pending or (lane is not None and len(lane) >= self.max_pending_per_chat):
+            self.rejected += 1
+            return False
+        job = _Job(update, self._clock())
+        if lane is None:
+            lane = self._lanes[key] = deque()
+            lane.append(job)
+            task = self._loop.create_task(self._run_lane(key, lane))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            lane.append(job)
+        self._pending += 1
+        self.accepted += 1
+        self.max_pending_seen = max(self.max_pending_seen, self._pending)
+        self._idle.clear()
+        return True
+
+    async def _run_lane(self, key: str, lane: deque[_Job]) -> None:
+        slots = self._slots
+        try:
+            while lane:
+                job = lane[0]
+                async with slots:
+                    self._in_flight += 1
+                    self.max_in_flight = max(self.max_in_flight, self._in_flight)
+                    try:
+                        await self._handler(job.update)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as exc:
+                        self.failed += 1
+                        log.exception("telegram update handler crashed lane=%s error=%s", key.split(":", 1)[0], type(exc).__name__)
+                    finally:
+                        self._in_flight -= 1
+                lane.popleft()
+                self.processed += 1
+                self._done(1)
+        finally:
+            if lane:
+                self.dropped += len(lane)
+                self._done(len(lane))
+                lane.clear()
+            if self._lanes.get(key) is lane:
+                del self._lanes[key]
+
+    def _done(self, count: int) -> None:
+        self._pending = max(0, self._pending - count)
+        if not self._pending and self._idle is not None:
+            self._idle.set()
+
+    async def drain(self, timeout_s: float = 20.0) -> bool:
+        """Stop intake and wait for queued updates; cancel what is left at the deadline."""
+
+        self._closed = True
+        if self._idle is None or self._loop is not asyncio.get_running_loop():
+            return not self._pending
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=max(0.0, float(timeout_s)))
+            return True
+        except asyncio.TimeoutError:
+            tasks = list(self._tasks)
+            log.warning("telegram update queue drain timed out pending=%d lanes=%d", self._pending, len(tasks))
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return False
+
+    def stats(self) -> dict[str, Any]:
+        now = self._clock()
+        heads = [lane[0].enqueued_at for lane in list(self._lanes.values()) if lane]
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "max_pending_per_chat": self.max_pending_per_chat,
+            "pending": self._pending,
+            "active_lanes": len(self._lanes),
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "max_pending_seen": self.max_pending_seen,
+            "oldest_wait_s": round(max(0.0, now - min(heads)), 3) if heads else 0.0,
+            "accepted": self.accepted,
+            "processed": self.processed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "draining": self._closed,
+        }
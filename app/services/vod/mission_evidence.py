@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 from typing import Any, Mapping
 
 from app.services.session_cycle import CrownSessionCycleService
+from app.services.storage.progression import progression_projection
 
 
 EVENT_TYPE = "operator_mission_evidence"
@@ -95,13 +96,8 @@ class MissionEvidenceFusionService:
         return _env_on("MISSION_VOD_EVIDENCE_FUSION_ENABLED")
 
     def _progression(self, chat_id: int) -> list[dict[str, Any]]:
-        fn = getattr(self.store, "list_progression_events", None)
-        if not callable(fn):
-            return []
-        try:
-            return [dict(row) for row in list(fn(int(chat_id)) or [])[:160] if isinstance(row, Mapping)]
-        except Exception:
-            return []
+        # Only mission events decide the active mission.
+        return progression_projection(self.store, int(chat_id)).missions
 
     def _signals(self, result: Any, focus: str) -> list[dict[str, Any]]:
         signals: list[dict[str, Any]] = []
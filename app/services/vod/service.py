@@ -3,17 +3,16 @@ from __future__ import annotations
 
 import base64
 import json
-import os
 import re
 import subprocess
 import tempfile
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Iterable
 
-import certifi
-import httpx
-from openai import OpenAI
+from app.observability.metrics import latency_metrics
+from app.services.ai.client_pool import openai_pool
 
 try:
     import imageio_ffmpeg
@@ -23,6 +22,8 @@ except Exception:  # pragma: no cover - tested through capability fallback
 
 _TIME_RE = re.compile(r"^\s*(?:(\d+):)?(\d{1,2}):(\d{2})(?:\.(\d{1,3}))?\s*$")
 _SAFE_KEY_RE = re.compile(r"[^a-z0-9_]+")
+SINGLE_PASS_MAX_GAP_S = 2.0
+_SHOWINFO_PTS_RE = re.compile(r"\bn:\s*\d+\s+pts:\s*-?\d+\s+pts_time:\s*(-?[0-9.]+)")
 
 
 class VODError(RuntimeError):
@@ -176,6 +177,23 @@ def select_sample_timestamps(
     return sorted(_dedupe(picked))[:max_frames]
 
 
+def cluster_timestamps(timestamps: Iterable[float], max_gap_s: float = SINGLE_PASS_MAX_GAP_S) -> list[list[float]]:
+    """Split sorted sample times into runs worth decoding in one pass.
+
+    Inside a run the decoder walks at most `max_gap_s` of video per extra
+    frame, about what a fresh seek costs with a typical 1-2 s keyframe
+    interval. A lone timestamp is a plain accurate seek.
+    """
+
+    groups: list[list[float]] = []
+    for value in sorted(float(x) for x in timestamps):
+        if groups and value - groups[-1][-1] <= max_gap_s:
+            groups[-1].append(value)
+        else:
+            groups.append([value])
+    return groups
+
+
 def telegram_media_from_message(message: dict[str, Any] | None) -> VODMedia | None:
     msg = message or {}
     raw: dict[str, Any] | None = None
@@ -262,50 +280,154 @@ class FrameExtractor:
             max_frames=self.max_frames,
         )
         exe = self._ffmpeg()
+        deadline = time.monotonic() + self.timeout_s
         samples: list[FrameSample] = []
-
         with tempfile.TemporaryDirectory(prefix="bco_vod_frames_") as td:
-            for index, timestamp in enumerate(timestamps):
-                out = Path(td) / f"frame_{index:02d}.jpg"
-                cmd = [
-                    exe,
-                    "-hide_banner",
-                    "-loglevel",
-                    "error",
-                    "-ss",
-                    f"{timestamp:.3f}",
-                    "-i",
-                    str(path),
-                    "-frames:v",
-                    "1",
-                    "-vf",
-                    f"scale=min({self.max_width}\\,iw):-2",
-                    "-q:v",
-                    "4",
-                    "-y",
-                    str(out),
-                ]
-                try:
-                    subprocess.run(
-                        cmd,
-                        check=True,
-                        stdout=subprocess.DEVNULL,
-                        stderr=subprocess.PIPE,
-                        timeout=self.timeout_s,
-                    )
-                except (subprocess.SubprocessError, OSError):
-                    continue
-                try:
-                    data = out.read_bytes()
-                except OSError:
-                    data = b""
-                if data:
-                    samples.append(FrameSample(timestamp_s=timestamp, jpeg_bytes=data))
+            for index, group in enumerate(cluster_timestamps(timestamps)):
+                work_dir = Path(td) / f"pass_{index:02d}"
+                samples.extend(self._extract_single_pass(exe, path, group, work_dir, deadline=deadline))
+            missing = [x for x in timestamps if all(x != sample.timestamp_s for sample in samples)]
+            if missing and time.monotonic() < deadline:
+                samples.extend(self._extract_each(exe, path, missing, Path(td), deadline=deadline))
+        samples.sort(key=lambda sample: sample.timestamp_s)
 
         if not samples:
             raise VODCapabilityError("no video frames could be extracted")
         return samples
 
+    def _extract_single_pass(
+        self,
+        exe: str,
+        path: Path,
+        timestamps: list[float],
+        work_dir: Path,
+        *,
+        deadline: float,
+    ) -> list[FrameSample]:
+        """Decode every frame of one timestamp cluster in one ffmpeg run.
+
+        Seeks once to the first timestamp and picks, for each timestamp, the
+        first frame at or after it. One decoder with two threads bounds
+        memory, and ffmpeg stops after the last selected frame.
+        """
+
+        remaining = deadline - time.monotonic()
+        if not timestamps or remaining <= 0:
+            return []
+        # Input seeking restarts the clock at the first timestamp, so the
+        # filter sees times relative to it.
+        start = timestamps[0]
+        picks = "+".join(
+            f"gte(t,{x - start:.3f})*(isnan(prev_pts)+lt(prev_pts*TB,{x - start:.3f}))" for x in timestamps
+        )
+        work_dir.mkdir(parents=True, exist_ok=True)
+        cmd = [
+            exe,
+            "-hide_banner",
+            "-loglevel",
+            "info",
+            "-nostats",
+            "-threads",
+            "2",
+            "-ss",
+            f"{start:.3f}",
+            "-i",
+            str(path),
+            "-an",
+            "-sn",
+            "-dn",
+            "-filter_threads",
+            "1",
+            "-vf",
+            f"select='gt({picks},0)',scale=min({self.max_width}\\,iw):-2,showinfo",
+            "-fps_mode",
+            "passthrough",
+            "-frames:v",
+            str(len(timestamps)),
+            "-q:v",
+            "4",
+            "-y",
+            str(work_dir / "frame_%02d.jpg"),
+        ]
+        try:
+            done = subprocess.run(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=remaining,
+            )
+        except (subprocess.SubprocessError, OSError):
+            return []
+        frame_times = [start + float(x) for x in _SHOWINFO_PTS_RE.findall(done.stderr.decode("utf-8", "replace"))]
+
+        samples: list[FrameSample] = []
+        pending = list(timestamps)
+        for index, frame_t in enumerate(frame_times):
+            try:
+                data = (work_dir / f"frame_{index + 1:02d}.jpg").read_bytes()
+            except OSError:
+                continue
+            # One decoded frame serves every timestamp it is the first frame for.
+            served = [x for x in pending if x <= frame_t + 0.0005]
+            pending = [x for x in pending if x > frame_t + 0.0005]
+            if data:
+                samples.extend(FrameSample(timestamp_s=x, jpeg_bytes=data) for x in served)
+        return samples
+
+    def _extract_each(
+        self,
+        exe: str,
+        path: Path,
+        timestamps: list[float],
+        work_dir: Path,
+        *,
+        deadline: float | None = None,
+    ) -> list[FrameSample]:
+        """One accurate-seek ffmpeg run per timestamp; fallback for frames a pass missed."""
+
+        samples: list[FrameSample] = []
+        deadline = deadline if deadline is not None else time.monotonic() + self.timeout_s
+        for index, timestamp in enumerate(timestamps):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            out = work_dir / f"seek_{index:02d}.jpg"
+            cmd = [
+                exe,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-ss",
+                f"{timestamp:.3f}",
+                "-i",
+                str(path),
+                "-frames:v",
+                "1",
+                "-vf",
+                f"scale=min({self.max_width}\\,iw):-2",
+                "-q:v",
+                "4",
+                "-y",
+                str(out),
+            ]
+            try:
+                subprocess.run(
+                    cmd,
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    timeout=remaining,
+                )
+            except (subprocess.SubprocessError, OSError):
+                continue
+            try:
+                data = out.read_bytes()
+            except OSError:
+                data = b""
+            if data:
+                samples.append(FrameSample(timestamp_s=timestamp, jpeg_bytes=data))
+        return samples
+
 
 class VisionVODAnalyzer:
     def __init__(
@@ -322,14 +444,7 @@ class VisionVODAnalyzer:
     def _client(self) -> Any:
         if self.client_factory is not None:
             return self.client_factory()
-        timeout = httpx.Timeout(connect=20.0, read=90.0, write=60.0, pool=90.0)
-        http_client = httpx.Client(
-            timeout=timeout,
-            verify=certifi.where(),
-            headers={"User-Agent": "BLACK-CROWN-OPS/VOD-4.0"},
-        )
-        base_url = str(os.getenv("OPENAI_BASE_URL") or "").strip() or None
-        return OpenAI(api_key=self.api_key, base_url=base_url, http_client=http_client)
+        return openai_pool.lease("vision", self.api_key)
 
     @staticmethod
     def _safe_key(value: str, fallback: str) -> str:
@@ -389,8 +504,9 @@ class VisionVODAnalyzer:
                 }
             )
 
-        client = self._client()
+        client: Any = None
         try:
+            client = self._client()
             response = client.chat.completions.create(
                 model=self.model,
                 messages=[
@@ -403,6 +519,13 @@ class VisionVODAnalyzer:
             raw = (response.choices[0].message.content or "").strip()
         except Exception as exc:
             raise VODError(f"vision request failed: {type(exc).__name__}") from exc
+        finally:
+            close = getattr(client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception:
+                    pass
 
         try:
             data = json.loads(raw)
@@ -506,12 +629,13 @@ class VODAnalysisService:
         note: str = "",
         requested_timecodes: list[str] | None = None,
     ) -> VODAnalysisResult:
-        samples = self.extractor.extract(
-            video_path,
-            duration_s=media.duration,
-            requested_timecodes=requested_timecodes,
-        )
-        return self.analyzer.analyze(samples=samples, profile=profile, note=note)
+        with latency_metrics.time("bco_vod_analyze_seconds"):
+            samples = self.extractor.extract(
+                video_path,
+                duration_s=media.duration,
+                requested_timecodes=requested_timecodes,
+            )
+            return self.analyzer.analyze(samples=samples, profile=profile, note=note)
 
     @staticmethod
     def format_report(result: VODAnalysisResult) -> str:
@@ -9,6 +9,8 @@ from typing import Any, Mapping
 
 import httpx
 
+from app.services.ai.client_pool import openai_pool
+
 log = logging.getLogger("bco.voice.openai")
 OPENAI_SPEECH_URL = "https://api.openai.com/v1/audio/speech"
 DEFAULT_TTS_MODEL = "gpt-4o-mini-tts"
@@ -142,8 +144,10 @@ class OpenAITTSBackend:
         self.default_voice = normalize_tts_voice(default_voice)
         self.max_bytes = max(256 * 1024, min(int(max_bytes or 0), 64 * 1024 * 1024))
         timeout = max(5.0, min(float(timeout_s or 45.0), 120.0))
-        self._owns_client = client is None
-        self._client = client or httpx.AsyncClient(timeout=httpx.Timeout(connect=min(timeout, 20.0), read=timeout, write=timeout, pool=timeout))
+        self._timeout = httpx.Timeout(connect=min(timeout, 20.0), read=timeout, write=timeout, pool=timeout)
+        # Without an injected client, speech shares the process-wide keep-alive
+        # pool; the FastAPI lifespan closes it, not this backend.
+        self._injected_client = client
 
     @property
     def configured(self) -> bool:
@@ -159,9 +163,12 @@ class OpenAITTSBackend:
             return IDENTITY_DEFAULT_VOICES[identity]
         return self.default_voice
 
+    def _http(self) -> httpx.AsyncClient:
+        return self._injected_client if self._injected_client is not None else openai_pool.async_http()
+
     async def close(self) -> None:
-        if self._owns_client:
-            await self._client.aclose()
+        # Injected clients belong to the caller; pooled ones to the app lifespan.
+        return None
 
     async def _download_once(self, *, text: str, output: Path, profile: Mapping[str, Any]) -> Path:
         if not self.configured:
@@ -187,7 +194,9 @@ class OpenAITTSBackend:
         part.unlink(missing_ok=True)
         total = 0
         try:
-            async with self._client.stream("POST", OPENAI_SPEECH_URL, headers=headers, json=payload) as response:
+            async with openai_pool.async_slot("tts"), self._http().stream(
+                "POST", OPENAI_SPEECH_URL, headers=headers, json=payload, timeout=self._timeout,
+            ) as response:
                 response.raise_for_status()
                 declared = int(response.headers.get("content-length") or 0)
                 if declared and declared > self.max_bytes:
@@ -5,9 +5,10 @@ import hashlib
 import json
 import threading
 import wave
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Callable, Iterator, Mapping
 
 import httpx
 
@@ -134,11 +135,55 @@ class PiperModelManager:
             return self.model_path, self.config_path
 
 
+class PiperVoicePool:
+    """Up to `size` loaded PiperVoice instances for one model.
+
+    Each render checks out an instance for its exclusive use, so `size`
+    renders of the same model run in parallel threads. Instances are loaded
+    lazily and kept for the life of the process.
+    """
+
+    def __init__(self, loader: Callable[[], Any], size: int = 1) -> None:
+        self._loader = loader
+        self.size = max(1, int(size or 1))
+        self._idle: list[Any] = []
+        self._loaded = 0
+        self._cond = threading.Condition()
+
+    @property
+    def loaded(self) -> int:
+        with self._cond:
+            return self._loaded
+
+    @contextmanager
+    def checkout(self) -> Iterator[Any]:
+        with self._cond:
+            while not self._idle and self._loaded >= self.size:
+                self._cond.wait()
+            voice = self._idle.pop() if self._idle else None
+            if voice is None:
+                self._loaded += 1
+        if voice is None:
+            try:
+                voice = self._loader()
+            except Exception:
+                with self._cond:
+                    self._loaded -= 1
+                    self._cond.notify()
+                raise
+        try:
+            yield voice
+        finally:
+            with self._cond:
+                self._idle.append(voice)
+                self._cond.notify()
+
+
 class PiperBackend:
-    def __init__(self, manager: PiperModelManager) -> None:
+    def __init__(self, manager: PiperModelManager, *, workers: int = 1) -> None:
         self.manager = manager
-        self._voice: Any = None
-        self._voice_key: tuple[str, str] | None = None
+        self.workers = max(1, int(workers or 1))
+        self._pools: dict[str, PiperVoicePool] = {}
         self._lock = threading.Lock()
 
     @property
@@ -150,14 +195,21 @@ class PiperBackend:
 
     def _load_voice(self):
         model_path, config_path = self.manager.ensure()
-        key = (str(model_path), str(config_path))
-        if self._voice is not None and self._voice_key == key:
-            return self._voice
         from piper import PiperVoice
 
-        self._voice = PiperVoice.load(str(model_path), config_path=str(config_path), use_cuda=False)
-        self._voice_key = key
-        return self._voice
+        return PiperVoice.load(str(model_path), config_path=str(config_path), use_cuda=False)
+
+    def _pool(self) -> PiperVoicePool:
+        with self._lock:
+            pool = self._pools.get(self.model_name)
+            if pool is None:
+                pool = self._pools[self.model_name] = PiperVoicePool(self._load_voice, self.workers)
+            return pool
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            pools = dict(self._pools)
+        return {name: {"workers": pool.size, "loaded": pool.loaded} for name, pool in pools.items()}
 
     @staticmethod
     def _synthesis_values(profile: Mapping[str, Any]) -> tuple[float, float, float]:
@@ -191,8 +243,7 @@ class PiperBackend:
             normalize_audio=True,
         )
 
-        with self._lock:
-            voice = self._load_voice()
+        with self._pool().checkout() as voice:
             with wave.open(str(output), "wb") as wav_file:
                 voice.synthesize_wav(text, wav_file, syn_config=syn_config)
 
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable
+
+
+_SAMPLES = 512
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class _Timing:
+    """Count/total/max plus percentiles over the most recent samples (ms)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._recent: deque[float] = deque(maxlen=_SAMPLES)
+
+    def add(self, seconds: float) -> None:
+        ms = max(0.0, float(seconds)) * 1000.0
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self._recent.append(ms)
+
+    def snapshot(self) -> dict[str, float]:
+        recent = list(self._recent)
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": round(_percentile(recent, 0.50), 1),
+            "p95_ms": round(_percentile(recent, 0.95), 1),
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+class _FairLane:
+    """Concurrency cap for one TTS backend with round-robin hand-off between chats.
+
+    Waiters queue per chat; a freed slot goes to the next chat in rotation,
+    so one chat with many queued replies cannot starve the others.
+    """
+
+    def __init__(self, name: str, cap: int) -> None:
+        self.name = name
+        self.cap = max(1, int(cap))
+        self.active = 0
+        self.max_active = 0
+        self.completed = 0
+        self.failed = 0
+        self._waiters: "OrderedDict[str, deque[asyncio.Future]]" = OrderedDict()
+        self.queue_wait = _Timing()
+        self.render = _Timing()
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self._waiters.values())
+
+    def _grant(self) -> None:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+
+    async def acquire(self, chat_key: str) -> None:
+        if self.active < self.cap and not self._waiters:
+            self._grant()
+            return
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(chat_key, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as the waiter was cancelled.
+                self.release()
+            else:
+                queue = self._waiters.get(chat_key)
+                if queue is not None:
+                    try:
+                        queue.remove(future)
+                    except ValueError:
+                        pass
+                    if not queue:
+                        self._waiters.pop(chat_key, None)
+            raise
+
+    def release(self) -> None:
+        self.active = max(0, self.active - 1)
+        while self._waiters and self.active < self.cap:
+            chat_key, queue = next(iter(self._waiters.items()))
+            future = queue.popleft()
+            if queue:
+                self._waiters.move_to_end(chat_key)
+            else:
+                del self._waiters[chat_key]
+            if future.done():
+                continue
+            self._grant()
+            future.set_result(None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "cap": self.cap,
+            "active": self.active,
+            "max_active": self.max_active,
+            "waiting": self.waiting,
+            "waiting_chats": len(self._waiters),
+            "completed": self.completed,
+            "failed": self.failed,
+            "queue_wait": self.queue_wait.snapshot(),
+            "render": self.render.snapshot(),
+        }
+
+
+class TTSScheduler:
+    """Fair, bounded scheduling of voice renders per backend lane.
+
+    A lane is one backend (the cloud voice, or one Piper model) with its own
+    parallelism cap. Renders of different lanes never wait on each other.
+    Lanes record how long a render waited for its slot and how long it took.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._lanes: dict[str, _FairLane] = {}
+        self._lock = threading.Lock()
+
+    def _lane(self, name: str, cap: int) -> _FairLane:
+        with self._lock:
+            lane = self._lanes.get(name)
+            if lane is None or (lane.cap != max(1, int(cap)) and not lane.active and not lane.waiting):
+                lane = self._lanes[name] = _FairLane(name, cap)
+            return lane
+
+    @asynccontextmanager
+    async def slot(self, lane_name: str, chat_key: Any, *, cap: int) -> AsyncIterator[None]:
+        lane = self._lane(lane_name, cap)
+        queued_at = self._clock()
+        await lane.acquire(str(chat_key if chat_key is not None else "anonymous"))
+        started = self._clock()
+        lane.queue_wait.add(started - queued_at)
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            lane.render.add(self._clock() - started)
+            if ok:
+                lane.completed += 1
+            else:
+                lane.failed += 1
+            lane.release()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lanes = dict(self._lanes)
+        return {name: lane.stats() for name, lane in lanes.items()}
+
+
+tts_scheduler = TTSScheduler()
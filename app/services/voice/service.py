@@ -5,15 +5,18 @@ import asyncio
 import logging
 import shutil
 import tempfile
+import time
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Any, Mapping
 
+from app.observability.metrics import latency_metrics
 from app.services.voice.audio import clean_tts_text, wav_to_ogg_opus
 from app.services.voice.natural_audio import wav_to_natural_ogg_opus
 from app.services.voice.openai_backend import OpenAITTSBackend, normalize_tts_voice
 from app.services.voice.piper_backend import PiperBackend, PiperModelManager
+from app.services.voice.scheduler import TTSScheduler, tts_scheduler
 
 log = logging.getLogger("bco.voice.service")
 
@@ -59,6 +62,7 @@ class VoiceService:
     settings: Any
     backend: Any = None
     cloud_backend: Any = None
+    scheduler: TTSScheduler | None = None
 
     def __post_init__(self) -> None:
         self._provider_setting = str(getattr(self.settings, "voice_provider", "auto") or "auto").strip().casefold()
@@ -76,7 +80,10 @@ class VoiceService:
                 model_name=getattr(self.settings, "voice_model_name", "ru_RU-denis-medium"),
                 timeout_s=getattr(self.settings, "voice_model_timeout_s", 120.0),
             )
-            self.backend = PiperBackend(manager)
+            self.backend = PiperBackend(
+                manager,
+                workers=max(1, min(int(getattr(self.settings, "voice_piper_workers", 2) or 2), 8)),
+            )
 
         self._owns_cloud_backend = False
         if self.cloud_backend is None and self._should_configure_cloud():
@@ -92,7 +99,9 @@ class VoiceService:
             )
             self._owns_cloud_backend = True
 
-        self._lock = asyncio.Lock()
+        if self.scheduler is None:
+            self.scheduler = tts_scheduler
+        self._cloud_concurrency = max(1, min(int(getattr(self.settings, "voice_cloud_concurrency", 8) or 8), 64))
 
     def _should_configure_cloud(self) -> bool:
         if not self._high_fidelity_enabled:
@@ -209,6 +218,12 @@ class VoiceService:
         return min(full_limit, duplex_limit)
 
     async def synthesize(self, text: str, profile: Mapping[str, Any] | None = None) -> VoiceArtifact:
+        """Render one voice reply.
+
+        Renders run in parallel up to each backend's cap. `_bco_chat_id` in the
+        profile is the fairness key, so one chat queueing many replies cannot
+        starve the others.
+        """
         if not self.enabled:
             raise RuntimeError("Voice/TTS is disabled")
         data = dict(profile or {})
@@ -222,26 +237,29 @@ class VoiceService:
         provider = "piper"
         mastering = "piper-rescue-v2"
         voice_name = self.voice_name_for(data)
+        chat_key = data.get("_bco_chat_id")
+        started = time.perf_counter()
         try:
-            async with self._lock:
-                cloud_ok = await self._cloud_wav(spoken, wav_path, data)
-                if cloud_ok:
-                    provider = "openai"
-                    mastering = "natural-v3"
-                    voice_name = self.voice_name_for(data)
-                    await asyncio.to_thread(
-                        wav_to_natural_ogg_opus,
-                        wav_path,
-                        ogg_path,
-                        bitrate_kbps=self._opus_bitrate_kbps,
-                    )
-                else:
+            cloud_ok = False
+            if self.high_fidelity_active:
+                async with self.scheduler.slot("openai", chat_key, cap=self._cloud_concurrency):
+                    cloud_ok = await self._cloud_wav(spoken, wav_path, data)
+                    if cloud_ok:
+                        await asyncio.to_thread(
+                            wav_to_natural_ogg_opus,
+                            wav_path,
+                            ogg_path,
+                            bitrate_kbps=self._opus_bitrate_kbps,
+                        )
+            if cloud_ok:
+                provider = "openai"
+                mastering = "natural-v3"
+                voice_name = self.voice_name_for(data)
+            else:
+                local_name = getattr(self.backend, "model_name", None)
+                local_workers = max(1, int(getattr(self.backend, "workers", 1) or 1))
+                async with self.scheduler.slot(f"piper:{local_name or 'local'}", chat_key, cap=local_workers):
                     await self._local_wav(spoken, wav_path, data)
-                    provider = "piper"
-                    mastering = "piper-rescue-v2"
-                    local_name = getattr(self.backend, "model_name", None)
-                    if local_name:
-                        voice_name = str(local_name)
                     await asyncio.to_thread(
                         wav_to_ogg_opus,
                         wav_path,
@@ -249,6 +267,11 @@ class VoiceService:
                         data,
                         self._opus_bitrate_kbps,
                     )
+                provider = "piper"
+                mastering = "piper-rescue-v2"
+                if local_name:
+                    voice_name = str(local_name)
+            latency_metrics.observe("bco_voice_synthesize_seconds", time.perf_counter() - started, provider=provider)
             return VoiceArtifact(
                 path=ogg_path,
                 spoken_text=spoken,
@@ -259,5 +282,6 @@ class VoiceService:
                 opus_bitrate_kbps=self._opus_bitrate_kbps,
             )
         except Exception:
+            latency_metrics.observe("bco_voice_synthesize_seconds", time.perf_counter() - started, provider="error")
             shutil.rmtree(temp_dir, ignore_errors=True)
             raise
@@ -183,6 +183,7 @@ class VoiceTelegramController:
 
         profile = self._profile(chat_id)
         profile["_bco_voice_reply"] = str(input_mode or "").startswith("voice")
+        profile["_bco_chat_id"] = chat_id
         try:
             await self._chat_action(chat_id, "record_voice")
             artifact = await self.voice.synthesize(text, profile)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+
+try:
+    import brotli
+except ImportError:  # gzip variants are still built; brotli is added when installed
+    brotli = None
+
+log = logging.getLogger("webapp")
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_SCHEMA = "bco-webapp-assets-v1"
+URL_PREFIX = "/webapp/dist/"
+HASHED_SUFFIXES = (".js", ".css")
+# Preference order when the client accepts several encodings.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+_SKIP_DIRS = {"_ARCHIVE", "dist"}
+_MEDIA_TYPES = {".js": "application/javascript", ".css": "text/css"}
+# Variants that do not save at least this much are not worth a separate file.
+_MIN_SAVING = 0.9
+
+
+def _hashed_name(rel: str, digest: str) -> str:
+    stem, dot, ext = rel.rpartition(".")
+    return f"{stem}.{digest}.{ext}" if dot else f"{rel}.{digest}"
+
+
+def _write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def build_assets(static_dir: str | Path, dist_dir: str | Path) -> dict[str, Any]:
+    """Copy every JS/CSS file to a content-hashed name with compressed variants.
+
+    Writes `manifest.json` last, so a half-finished build is never picked up.
+    Output is deterministic: rebuilding unchanged sources changes nothing.
+    """
+
+    static_root = Path(static_dir).resolve()
+    dist_root = Path(dist_dir).resolve()
+    assets: dict[str, dict[str, Any]] = {}
+    build = hashlib.sha256()
+    for path in sorted(static_root.rglob("*")):
+        rel_parts = path.relative_to(static_root).parts
+        if not path.is_file() or path.suffix not in HASHED_SUFFIXES or _SKIP_DIRS & set(rel_parts[:-1]):
+            continue
+        rel = "/".join(rel_parts)
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        hashed = _hashed_name(rel, digest)
+        _write(dist_root / hashed, data)
+        encodings: dict[str, int] = {}
+        variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants["br"] = brotli.compress(data, quality=11)
+        for encoding, suffix in ENCODINGS:
+            packed = variants.get(encoding)
+            if packed is not None and len(packed) <= len(data) * _MIN_SAVING:
+                _write(dist_root / (hashed + suffix), packed)
+                encodings[encoding] = len(packed)
+        assets[rel] = {"path": hashed, "etag": digest, "size": len(data), "encodings": encodings}
+        build.update(f"{rel}:{digest}\n".encode())
+    manifest = {"schema": MANIFEST_SCHEMA, "build": build.hexdigest()[:12], "assets": assets}
+    _write(dist_root / MANIFEST_NAME, json.dumps(manifest, sort_keys=True, indent=1).encode())
+    return manifest
+
+
+@dataclass(frozen=True)
+class HashedAsset:
+    rel: str
+    file: Path
+    etag: str
+    media_type: str
+    encodings: Mapping[str, int]
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted: set[str] = set()
+    for part in str(header or "").split(","):
+        name, _sep, params = part.strip().partition(";")
+        name = name.strip().casefold()
+        quality = params.strip().casefold()
+        if name and not re.fullmatch(r"q\s*=\s*0(\.0*)?", quality):
+            accepted.add(name)
+    return accepted
+
+
+class AssetManifest:
+    """Built asset table: source path -> immutable hashed URL and variants."""
+
+    def __init__(self, dist_dir: Path, raw: Mapping[str, Any]) -> None:
+        self.dist_dir = dist_dir
+        self.build = str(raw.get("build") or "")[:12]
+        self._by_source: dict[str, str] = {}
+        self._by_hashed: dict[str, HashedAsset] = {}
+        for rel, entry in dict(raw.get("assets") or {}).items():
+            hashed = str(entry.get("path") or "")
+            if not hashed:
+                continue
+            self._by_source[str(rel)] = hashed
+            self._by_hashed[hashed] = HashedAsset(
+                rel=str(rel),
+                file=dist_dir / hashed,
+                etag=str(entry.get("etag") or ""),
+                media_type=_MEDIA_TYPES.get(Path(rel).suffix, "application/octet-stream"),
+                encodings={str(k): int(v) for k, v in dict(entry.get("encodings") or {}).items()},
+            )
+
+    @classmethod
+    def load(cls, dist_dir: str | Path) -> "AssetManifest | None":
+        root = Path(dist_dir).resolve()
+        try:
+            raw = json.loads((root / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            log.warning("webapp asset manifest unreadable error=%s; serving unhashed assets", type(exc).__name__)
+            return None
+        if not isinstance(raw, Mapping) or raw.get("schema") != MANIFEST_SCHEMA:
+            return None
+        return cls(root, raw)
+
+    def __len__(self) -> int:
+        return len(self._by_source)
+
+    def url_map(self) -> dict[str, str]:
+        return {f"/webapp/{rel}": URL_PREFIX + hashed for rel, hashed in self._by_source.items()}
+
+    def hashed_names(self) -> list[str]:
+        return sorted(self._by_hashed)
+
+    def lookup(self, hashed: str) -> HashedAsset | None:
+        return self._by_hashed.get(hashed)
+
+    def rewrite_index(self, html: str) -> str:
+        """Point index.html at hashed URLs and publish the map for script loaders."""
+
+        urls = self.url_map()
+        if urls:
+            pattern = re.compile("|".join(re.escape(source) for source in sorted(urls, key=len, reverse=True)) + r"(?![\w.-])")
+            html = pattern.sub(lambda match: urls[match.group(0)], html)
+        payload = json.dumps(urls, sort_keys=True, separators=(",", ":")).replace("</", "<\\/")
+        return html.replace("<head>", f"<head>\n  <script>window.__BCO_ASSETS__={payload};</script>", 1)
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from app.webapp.assets import brotli, build_assets
+from app.webapp.webapp_router_base import DIST_DIR, STATIC_DIR
+
+
+def main() -> int:
+    manifest = build_assets(STATIC_DIR, DIST_DIR)
+    assets = manifest["assets"]
+    compressed = sum(min(entry["encodings"].values(), default=entry["size"]) for entry in assets.values())
+    print(
+        f"BCO webapp assets: {len(assets)} hashed build={manifest['build']} "
+        f"bytes={sum(entry['size'] for entry in assets.values())} compressed={compressed} "
+        f"brotli={'on' if brotli is not None else 'unavailable'} dir={DIST_DIR}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
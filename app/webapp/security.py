@@ -6,8 +6,10 @@ import hmac
 import json
 import logging
 import os
+import threading
 import time
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Callable
 from urllib.parse import parse_qsl
@@ -58,6 +60,77 @@ def bot_token() -> str:
     )
 
 
+class VerifiedInitDataCache:
+    """Recently verified initData, keyed by a digest of the bot token and payload.
+
+    A Mini App session sends the same signed initData on every API call, so
+    the HMAC check and query parse run once per session and later calls are
+    one dict lookup. Only successful verifications are stored, so tampered
+    payloads always take the full check, and `auth_date` is re-checked on
+    every hit, so a cached payload expires exactly when a fresh verification
+    would reject it.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, dict[str, Any]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0}
+
+    @staticmethod
+    def key(token: str, raw: str) -> bytes:
+        return hashlib.sha256(f"{len(token)}:{token}:{raw}".encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> dict[str, Any] | None:
+        with self._lock:
+            meta = self._entries.get(key)
+            if meta is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return dict(meta)
+
+    def put(self, key: bytes, meta: dict[str, Any]) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = dict(meta)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def expire(self, key: bytes) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._stats["expired"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries, **self._stats}
+
+
+_VERIFIED_INIT_DATA = VerifiedInitDataCache(int(os.getenv("WEBAPP_INIT_DATA_CACHE_SIZE", "4096") or "4096"))
+
+
+def init_data_cache_status() -> dict[str, Any]:
+    return _VERIFIED_INIT_DATA.status()
+
+
+def _auth_date_fresh(auth_date: Any, max_age_sec: int | None) -> bool:
+    if max_age_sec is None:
+        return True
+    try:
+        value = int(auth_date or "0")
+        return value > 0 and abs(int(time.time()) - value) <= int(max_age_sec)
+    except Exception:
+        return False
+
+
 def verify_init_data(
     init_data: str,
     *,
@@ -70,6 +143,15 @@ def verify_init_data(
     if not raw or not token:
         return False, {}
 
+    cache = _VERIFIED_INIT_DATA
+    key = cache.key(token, raw)
+    cached = cache.get(key)
+    if cached is not None:
+        if _auth_date_fresh(cached.get("auth_date"), max_age_sec):
+            return True, cached
+        cache.expire(key)
+        return False, {}
+
     pairs = dict(parse_qsl(raw, keep_blank_values=True))
     their_hash = pairs.pop("hash", None)
     if not their_hash:
@@ -81,13 +163,8 @@ def verify_init_data(
     if not hmac.compare_digest(calc_hash, their_hash):
         return False, {}
 
-    if max_age_sec is not None:
-        try:
-            auth_date = int(pairs.get("auth_date") or "0")
-            if auth_date <= 0 or abs(int(time.time()) - auth_date) > int(max_age_sec):
-                return False, {}
-        except Exception:
-            return False, {}
+    if not _auth_date_fresh(pairs.get("auth_date"), max_age_sec):
+        return False, {}
 
     user_id = None
     chat_id = None
@@ -102,12 +179,14 @@ def verify_init_data(
     except Exception:
         pass
 
-    return True, {
+    meta = {
         "user_id": user_id,
         "chat_id": chat_id,
         "auth_date": pairs.get("auth_date"),
         "query_id": pairs.get("query_id"),
     }
+    cache.put(key, meta)
+    return True, dict(meta)
 
 
 def require_trusted_init_data(
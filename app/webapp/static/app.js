@@ -1,2 +1,2 @@
 /* BLACK CROWN OPS — boot coordinator (ecosystem i18n + accumulated intelligence layers) */
-(()=>{"use strict";if(window.__BCO_APP_COORDINATOR__)return;window.__BCO_APP_COORDINATOR__=true;const build=String(window.__BCO_BUILD__||"dev");function loadScript(src,marker){if(marker&&window[marker])return Promise.resolve(true);return new Promise((resolve,reject)=>{const existing=document.querySelector(`script[data-bco-src="${src}"]`);if(existing){existing.addEventListener("load",()=>resolve(true),{once:true});existing.addEventListener("error",()=>reject(new Error(`Failed: ${src}`)),{once:true});return}const script=document.createElement("script");script.src=`${src}?build=${encodeURIComponent(build)}`;script.async=false;script.dataset.bcoSrc=src;script.onload=()=>resolve(true);script.onerror=()=>reject(new Error(`Failed: ${src}`));document.body.appendChild(script)})}async function flags(){const c=new AbortController(),t=setTimeout(()=>c.abort(),3500);try{const r=await fetch(`/webapp/api/runtime?build=${encodeURIComponent(build)}`,{method:"POST",cache:"no-store",credentials:"same-origin",signal:c.signal});if(!r.ok)throw new Error(`runtime HTTP ${r.status}`);const p=await r.json(),f=p&&p.webapp?p.webapp:{};window.__BCO_RUNTIME_FLAGS__=f;return f}catch(e){const f={live_stream:true,cinematic_ui:true,v18_overlay:true,transport:"ndjson",runtime_unavailable:true};window.__BCO_RUNTIME_FLAGS__=f;return f}finally{clearTimeout(t)}}const optional=(s,m)=>loadScript(s,m).catch(e=>{console.warn("[BCO] optional layer unavailable",s,e);return false});window.__BCO_APP_BOOT_PROMISE__=optional("/webapp/bco.i18n.js","__BCO_I18N_V38_LOADED__").then(()=>Promise.all([loadScript("/webapp/app.base.js","__BCO_APP_BASE_LOADED__"),flags()])).then(([,f])=>{window.__BCO_APP_BASE_LOADED__=true;if(f.v18_overlay===false)return false;return optional("/webapp/bco.live.js","__BCO_LIVE_LAYER_LOADED__")}).then(()=>optional("/webapp/bco.crown-session.js","__BCO_CROWN_SESSION_V45_LOADED__")).then(()=>optional("/webapp/bco.profile-projection.js","__BCO_PROFILE_PROJECTION_V49_LOADED__")).then(()=>optional("/webapp/bco.session-home.js","__BCO_SESSION_HOME_V45_LOADED__")).then(()=>optional("/webapp/bco.after-action.js","__BCO_AFTER_ACTION_V48_LOADED__")).then(()=>optional("/webapp/bco.operator.js","__BCO_OPERATOR_V25_LOADED__")).then(()=>optional("/webapp/bco.war-room.js","__BCO_WAR_ROOM_V44_LOADED__")).then(()=>optional("/webapp/bco.orchestrator.js","__BCO_MISSION_ORCHESTRATOR_V36_LOADED__")).then(()=>optional("/webapp/bco.deep-history.js","__BCO_DEEP_HISTORY_V29_LOADED__")).then(()=>optional("/webapp/bco.strategy.js","__BCO_STRATEGY_V35_LOADED__")).then(()=>optional("/webapp/bco.ecosystem-shell.js","__BCO_ECOSYSTEM_SHELL_V49_LOADED__")).then(()=>optional("/webapp/bco.ecosystem-parity.js","__BCO_ECOSYSTEM_PARITY_V49_LOADED__")).then(()=>optional("/webapp/bco.aaa-surfaces.js","__BCO_AAA_SURFACES_V50__")).then(()=>optional("/webapp/bco.home-v50.js","__BCO_HOME_V50__")).then(()=>optional("/webapp/bco.operator-profile-v51.js","__BCO_OPERATOR_PROFILE_V51__")).then(()=>optional("/webapp/bco.vod-lab-v52.js","__BCO_VOD_LAB_V52__")).then(()=>optional("/webapp/bco.crown-core-v53.js","__BCO_CROWN_CORE_V53__")).then(()=>optional("/webapp/bco.training-v54.js","__BCO_TRAINING_V54__")).then(()=>optional("/webapp/bco.account-v55.js","__BCO_ACCOUNT_V55__")).then(()=>optional("/webapp/bco.world-hub-v58.js","__BCO_WORLD_HUB_V58__")).then(()=>optional("/webapp/bco.crown-chat-v59.js","__BCO_CROWN_CHAT_V59__")).then(()=>optional("/webapp/bco.chat-history-v60.js","__BCO_CHAT_HISTORY_V60__")).then(()=>optional("/webapp/bco.voice-v61.js","__BCO_VOICE_V61__")).then(()=>optional("/webapp/bco.voice-v62.js","__BCO_VOICE_V62__")).then(()=>optional("/webapp/bco.voice-v63.js","__BCO_VOICE_V63__")).then(()=>optional("/webapp/bco.voice-v64.js","__BCO_VOICE_V64__")).then(()=>optional("/webapp/bco.voice-v65.js","__BCO_VOICE_V65__")).then(()=>optional("/webapp/bco.ru-v55.js","__BCO_RU_V55__")).then(()=>{try{window.BCO_RU?.apply?.();window.BCO_I18N?.setLocale?.("ru",true)}catch(_){}return true}).catch(e=>{window.__BCO_V18_READY__=false;console.error("[BCO] boot coordinator failed",e);throw e})})();
\ No newline at end of file
+(()=>{"use strict";if(window.__BCO_APP_COORDINATOR__)return;window.__BCO_APP_COORDINATOR__=true;const build=String(window.__BCO_BUILD__||"dev");function loadScript(src,marker){if(marker&&window[marker])return Promise.resolve(true);return new Promise((resolve,reject)=>{const existing=document.querySelector(`script[data-bco-src="${src}"]`);if(existing){existing.addEventListener("load",()=>resolve(true),{once:true});existing.addEventListener("error",()=>reject(new Error(`Failed: ${src}`)),{once:true});return}const script=document.createElement("script");script.src=(window.__BCO_ASSETS__||{})[src]||`${src}?build=${encodeURIComponent(build)}`;script.async=false;script.dataset.bcoSrc=src;script.onload=()=>resolve(true);script.onerror=()=>reject(new Error(`Failed: ${src}`));document.body.appendChild(script)})}async function flags(){const c=new AbortController(),t=setTimeout(()=>c.abort(),3500);try{const r=await fetch(`/webapp/api/runtime?build=${encodeURIComponent(build)}`,{method:"POST",cache:"no-store",credentials:"same-origin",signal:c.signal});if(!r.ok)throw new Error(`runtime HTTP ${r.status}`);const p=await r.json(),f=p&&p.webapp?p.webapp:{};window.__BCO_RUNTIME_FLAGS__=f;return f}catch(e){const f={live_stream:true,cinematic_ui:true,v18_overlay:true,transport:"ndjson",runtime_unavailable:true};window.__BCO_RUNTIME_FLAGS__=f;return f}finally{clearTimeout(t)}}const optional=(s,m)=>loadScript(s,m).catch(e=>{console.warn("[BCO] optional layer unavailable",s,e);return false});window.__BCO_APP_BOOT_PROMISE__=optional("/webapp/bco.i18n.js","__BCO_I18N_V38_LOADED__").then(()=>Promise.all([loadScript("/webapp/app.base.js","__BCO_APP_BASE_LOADED__"),flags()])).then(([,f])=>{window.__BCO_APP_BASE_LOADED__=true;if(f.v18_overlay===false)return false;return optional("/webapp/bco.live.js","__BCO_LIVE_LAYER_LOADED__")}).then(()=>optional("/webapp/bco.crown-session.js","__BCO_CROWN_SESSION_V45_LOADED__")).then(()=>optional("/webapp/bco.profile-projection.js","__BCO_PROFILE_PROJECTION_V49_LOADED__")).then(()=>optional("/webapp/bco.session-home.js","__BCO_SESSION_HOME_V45_LOADED__")).then(()=>optional("/webapp/bco.after-action.js","__BCO_AFTER_ACTION_V48_LOADED__")).then(()=>optional("/webapp/bco.operator.js","__BCO_OPERATOR_V25_LOADED__")).then(()=>optional("/webapp/bco.war-room.js","__BCO_WAR_ROOM_V44_LOADED__")).then(()=>optional("/webapp/bco.orchestrator.js","__BCO_MISSION_ORCHESTRATOR_V36_LOADED__")).then(()=>optional("/webapp/bco.deep-history.js","__BCO_DEEP_HISTORY_V29_LOADED__")).then(()=>optional("/webapp/bco.strategy.js","__BCO_STRATEGY_V35_LOADED__")).then(()=>optional("/webapp/bco.ecosystem-shell.js","__BCO_ECOSYSTEM_SHELL_V49_LOADED__")).then(()=>optional("/webapp/bco.ecosystem-parity.js","__BCO_ECOSYSTEM_PARITY_V49_LOADED__")).then(()=>optional("/webapp/bco.aaa-surfaces.js","__BCO_AAA_SURFACES_V50__")).then(()=>optional("/webapp/bco.home-v50.js","__BCO_HOME_V50__")).then(()=>optional("/webapp/bco.operator-profile-v51.js","__BCO_OPERATOR_PROFILE_V51__")).then(()=>optional("/webapp/bco.vod-lab-v52.js","__BCO_VOD_LAB_V52__")).then(()=>optional("/webapp/bco.crown-core-v53.js","__BCO_CROWN_CORE_V53__")).then(()=>optional("/webapp/bco.training-v54.js","__BCO_TRAINING_V54__")).then(()=>optional("/webapp/bco.account-v55.js","__BCO_ACCOUNT_V55__")).then(()=>optional("/webapp/bco.world-hub-v58.js","__BCO_WORLD_HUB_V58__")).then(()=>optional("/webapp/bco.crown-chat-v59.js","__BCO_CROWN_CHAT_V59__")).then(()=>optional("/webapp/bco.chat-history-v60.js","__BCO_CHAT_HISTORY_V60__")).then(()=>optional("/webapp/bco.voice-v61.js","__BCO_VOICE_V61__")).then(()=>optional("/webapp/bco.voice-v62.js","__BCO_VOICE_V62__")).then(()=>optional("/webapp/bco.voice-v63.js","__BCO_VOICE_V63__")).then(()=>optional("/webapp/bco.voice-v64.js","__BCO_VOICE_V64__")).then(()=>optional("/webapp/bco.voice-v65.js","__BCO_VOICE_V65__")).then(()=>optional("/webapp/bco.ru-v55.js","__BCO_RU_V55__")).then(()=>{try{window.BCO_RU?.apply?.();window.BCO_I18N?.setLocale?.("ru",true)}catch(_){}return true}).catch(e=>{window.__BCO_V18_READY__=false;console.error("[BCO] boot coordinator failed",e);throw e})})();
\ No newline at end of file
@@ -39,7 +39,7 @@
       script.dataset.bcoModule = marker;
       script.async = false;
       const build = window.__BCO_BUILD__ || Date.now();
-      script.src = `${path}?build=${encodeURIComponent(build)}`;
+      script.src = (window.__BCO_ASSETS__ || {})[path] || `${path}?build=${encodeURIComponent(build)}`;
       document.body.appendChild(script);
     });
   }
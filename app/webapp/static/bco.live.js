@@ -39,7 +39,7 @@
     const link = document.createElement("link");
     link.rel = "stylesheet";
     link.dataset.bcoV18 = "cinematic";
-    link.href = `/webapp/bco.cinematic.css?build=${encodeURIComponent(BUILD)}`;
+    link.href = (window.__BCO_ASSETS__ || {})["/webapp/bco.cinematic.css"] || `/webapp/bco.cinematic.css?build=${encodeURIComponent(BUILD)}`;
     document.head.appendChild(link);
   }
 
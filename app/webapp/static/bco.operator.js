@@ -32,7 +32,7 @@
     const link = document.createElement("link");
     link.rel = "stylesheet";
     link.dataset.bcoOperator = "v25";
-    link.href = `/webapp/bco.operator.css?build=${encodeURIComponent(BUILD)}`;
+    link.href = (window.__BCO_ASSETS__ || {})["/webapp/bco.operator.css"] || `/webapp/bco.operator.css?build=${encodeURIComponent(BUILD)}`;
     document.head.appendChild(link);
   }
 
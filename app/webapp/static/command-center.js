@@ -15,7 +15,7 @@
     const link = document.createElement("link");
     link.rel = "stylesheet";
     link.dataset.bcoCommandCenter = "1";
-    link.href = `/webapp/command-center.css?build=${encodeURIComponent(BUILD)}`;
+    link.href = (window.__BCO_ASSETS__ || {})["/webapp/command-center.css"] || `/webapp/command-center.css?build=${encodeURIComponent(BUILD)}`;
     document.head.appendChild(link);
   }
 
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Mapping
+
+from app.webapp.assets import ENCODINGS, AssetManifest, _accepted_encodings
+
+# A payload is either bytes held in memory or, past the byte budget, the file on disk.
+Payload = bytes | Path
+
+
+def etag_for_bytes(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class StaticEntry:
+    etag: str
+    media_type: str
+    body: Payload
+    encodings: Mapping[str, Payload] = field(default_factory=dict)
+
+    def variant(self, accept_encoding: str) -> tuple[Payload, str | None]:
+        """The payload to send for this Accept-Encoding and its Content-Encoding."""
+
+        if self.encodings:
+            accepted = _accepted_encodings(accept_encoding)
+            for encoding, _suffix in ENCODINGS:
+                if encoding in self.encodings and encoding in accepted:
+                    return self.encodings[encoding], encoding
+        return self.body, None
+
+
+class _Budget:
+    def __init__(self, max_bytes: int) -> None:
+        self.left = max(0, int(max_bytes))
+        self.memory_bytes = 0
+        self.disk_files = 0
+
+    def take(self, path: Path, data: bytes | None = None) -> Payload:
+        size = len(data) if data is not None else path.stat().st_size
+        if size > self.left:
+            self.disk_files += 1
+            return path
+        payload = data if data is not None else path.read_bytes()
+        self.left -= len(payload)
+        self.memory_bytes += len(payload)
+        return payload
+
+
+class StaticAssetTable:
+    """Everything the Mini App static routes serve, loaded once.
+
+    Lookups are dict reads keyed by the request path, so serving a file, its
+    ETag or a 404 touches no filesystem. Files are held in memory up to
+    `max_bytes`; anything past the budget keeps a load-time ETag and streams
+    from disk. Edits on disk are picked up only by loading a new table.
+    """
+
+    def __init__(
+        self,
+        *,
+        files: dict[str, StaticEntry],
+        hashed: dict[str, StaticEntry],
+        index: StaticEntry | None,
+        index_error: bool,
+        build: str,
+        stats: Mapping[str, Any],
+    ) -> None:
+        self.files = files
+        self.hashed = hashed
+        self.index = index
+        self.index_error = index_error
+        self.build = build
+        self._stats = dict(stats)
+
+    @classmethod
+    def load(
+        cls,
+        static_dir: str | Path,
+        index_file: str | Path,
+        *,
+        manifest: AssetManifest | None = None,
+        build_id: str = "",
+        max_bytes: int = 32 * 1024 * 1024,
+    ) -> "StaticAssetTable":
+        static_root = Path(static_dir).resolve()
+        budget = _Budget(max_bytes)
+
+        # Hashed assets first: with a manifest they carry the Mini App's boot traffic.
+        hashed: dict[str, StaticEntry] = {}
+        if manifest is not None:
+            for name in manifest.hashed_names():
+                asset = manifest.lookup(name)
+                try:
+                    hashed[name] = StaticEntry(
+                        etag=f'"{asset.etag}"',
+                        media_type=asset.media_type,
+                        body=budget.take(asset.file),
+                        encodings={
+                            encoding: budget.take(asset.file.with_name(asset.file.name + suffix))
+                            for encoding, suffix in ENCODINGS
+                            if encoding in asset.encodings
+                        },
+                    )
+                except OSError:
+                    continue
+
+        files: dict[str, StaticEntry] = {}
+        newest = 0
+        if static_root.is_dir():
+            for path in sorted(static_root.rglob("*")):
+                try:
+                    if not path.is_file():
+                        continue
+                    path.resolve().relative_to(static_root)
+                    newest = max(newest, int(path.stat().st_mtime))
+                    data = path.read_bytes()
+                except (OSError, ValueError):
+                    continue
+                rel = path.relative_to(static_root).as_posix()
+                files[rel] = StaticEntry(
+                    etag=etag_for_bytes(data),
+                    media_type=mimetypes.guess_type(rel)[0] or "text/plain",
+                    body=budget.take(path, data),
+                )
+
+        build = (build_id or (manifest.build if manifest is not None else "") or str(newest or int(time.time())))[:12]
+
+        index: StaticEntry | None = None
+        index_error = False
+        index_path = Path(index_file).resolve()
+        if index_path.exists():
+            try:
+                html = index_path.read_text(encoding="utf-8", errors="ignore")
+            except Exception:
+                index_error = True
+            else:
+                html = html.replace("__BUILD__", build).replace("%BUILD%", build)
+                if manifest is not None:
+                    html = manifest.rewrite_index(html)
+                data = html.encode("utf-8", errors="ignore")
+                index = StaticEntry(etag=etag_for_bytes(data), media_type="text/html", body=data)
+
+        stats = {
+            "files": len(files),
+            "hashed": len(hashed),
+            "memory_bytes": budget.memory_bytes,
+            "disk_files": budget.disk_files,
+            "max_bytes": int(max_bytes),
+        }
+        return cls(files=files, hashed=hashed, index=index, index_error=index_error, build=build, stats=stats)
+
+    def __len__(self) -> int:
+        return len(self.files) + len(self.hashed)
+
+    def get(self, rel: str) -> StaticEntry | None:
+        return self.files.get("/".join(part for part in rel.split("/") if part not in ("", ".")))
+
+    def status(self) -> dict[str, Any]:
+        return {"build": self.build, "index": self.index is not None, **self._stats}
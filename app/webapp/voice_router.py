@@ -276,7 +276,7 @@ async def voice_speak(
 
         enforce_usage_limit(_usage_guard(), chat_id, "voice", request_id)
         started = time.perf_counter()
-        artifact = await APP_VOICE.synthesize(str(body.text or "").strip(), profile)
+        artifact = await APP_VOICE.synthesize(str(body.text or "").strip(), {**profile, "_bco_chat_id": chat_id})
         try:
             audio_bytes = artifact.path.read_bytes()
             if not audio_bytes:
@@ -3,11 +3,11 @@
 from __future__ import annotations
 
 import asyncio
-import hashlib
 import inspect
 import json
 import logging
 import os
+import threading
 import time
 from pathlib import Path
 from typing import Any
@@ -16,7 +16,10 @@ from fastapi import APIRouter, Header, HTTPException, Request
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
 from pydantic import BaseModel, Field
 
+from app.webapp.assets import URL_PREFIX, AssetManifest
+from app.webapp.static_cache import StaticAssetTable, StaticEntry
 from app.webapp.security import (
+    init_data_cache_status,
     new_request_id,
     require_trusted_init_data,
     safe_http_error,
@@ -29,12 +32,15 @@ router = APIRouter()
 BASE_DIR = Path(__file__).resolve().parent
 STATIC_DIR = (BASE_DIR / "static").resolve()
 INDEX_FILE = (STATIC_DIR / "index.html").resolve()
+# Output of `python -m app.webapp.prepare_assets`; without it assets are served unhashed.
+DIST_DIR = Path(os.getenv("WEBAPP_DIST_DIR", ".bco_webapp") or ".bco_webapp").resolve()
 
 _WEBAPP_MAX_BYTES = int(os.getenv("WEBAPP_MAX_BYTES", "16000") or "16000")
 _WEBAPP_LOG_CHARS = int(os.getenv("WEBAPP_LOG_CHARS", "1200") or "1200")
-_BUILD_CACHE_VALUE: str | None = None
-_BUILD_CACHE_AT = 0.0
-_BUILD_CACHE_TTL_SEC = 2.0
+# Static files held in memory; past this budget they stream from disk.
+_STATIC_CACHE_MAX_BYTES = int(os.getenv("WEBAPP_STATIC_CACHE_MAX_BYTES", "33554432") or "33554432")
+_STATIC: StaticAssetTable | None = None
+_STATIC_LOCK = threading.Lock()
 
 APP_BRAIN = None
 APP_PROFILES = None
@@ -52,19 +58,6 @@ def _truncate(value: Any, limit: int) -> str:
     return text if len(text) <= limit else text[: limit - 1] + "…"
 
 
-def _etag_for_bytes(data: bytes) -> str:
-    return hashlib.sha1(data).hexdigest()[:16]
-
-
-def _etag_for_file(path: Path) -> str:
-    try:
-        st = path.stat()
-        payload = f"{path.name}:{int(st.st_mtime)}:{st.st_size}".encode()
-        return hashlib.sha1(payload).hexdigest()[:16]
-    except Exception:
-        return str(int(time.time()))
-
-
 def _cache_headers(kind: str, *, etag: str | None = None) -> dict[str, str]:
     if kind == "html":
         headers = {
@@ -72,6 +65,9 @@ def _cache_headers(kind: str, *, etag: str | None = None) -> dict[str, str]:
             "Pragma": "no-cache",
             "Expires": "0",
         }
+    elif kind == "immutable":
+        # Content-hashed URL: a new build is a new URL, so clients never revalidate.
+        headers = {"Cache-Control": "public, max-age=31536000, immutable", "Vary": "Accept-Encoding"}
     else:
         headers = {"Cache-Control": "public, max-age=0, must-revalidate"}
     if etag:
@@ -79,32 +75,43 @@ def _cache_headers(kind: str, *, etag: str | None = None) -> dict[str, str]:
     return headers
 
 
-def _scan_static_mtime() -> int:
-    newest = 0
-    if not STATIC_DIR.exists():
-        return int(time.time())
-    try:
-        for path in STATIC_DIR.rglob("*"):
-            if path.is_file():
-                newest = max(newest, int(path.stat().st_mtime))
-    except Exception:
-        return int(time.time())
-    return newest or int(time.time())
+def reload_static_assets() -> dict[str, Any]:
+    """Re-read the static tree, asset manifest and index.html into a new table.
+
+    Runs at startup; call it again after changing files on disk. Requests
+    keep using the previous table until the new one is swapped in.
+    """
+
+    global _STATIC
+    with _STATIC_LOCK:
+        manifest = AssetManifest.load(DIST_DIR)
+        build = (os.getenv("WEBAPP_BUILD_ID") or "").strip() or (os.getenv("RENDER_GIT_COMMIT") or "").strip()
+        table = StaticAssetTable.load(
+            STATIC_DIR,
+            INDEX_FILE,
+            manifest=manifest,
+            build_id=build,
+            max_bytes=_STATIC_CACHE_MAX_BYTES,
+        )
+        _STATIC = table
+    status = table.status()
+    log.info(
+        "webapp static assets loaded files=%s hashed=%s memory_bytes=%s disk_files=%s build=%s",
+        status["files"], status["hashed"], status["memory_bytes"], status["disk_files"], status["build"],
+    )
+    return status
+
+
+def _static_assets() -> StaticAssetTable:
+    table = _STATIC
+    if table is None:
+        reload_static_assets()
+        table = _STATIC
+    return table
 
 
 def _build_id() -> str:
-    global _BUILD_CACHE_VALUE, _BUILD_CACHE_AT
-    now = time.time()
-    if _BUILD_CACHE_VALUE and now - _BUILD_CACHE_AT < _BUILD_CACHE_TTL_SEC:
-        return _BUILD_CACHE_VALUE
-    value = (os.getenv("WEBAPP_BUILD_ID") or "").strip()
-    if not value:
-        value = (os.getenv("RENDER_GIT_COMMIT") or "").strip()
-    if not value:
-        value = str(_scan_static_mtime())
-    _BUILD_CACHE_VALUE = value[:12]
-    _BUILD_CACHE_AT = now
-    return _BUILD_CACHE_VALUE
+    return _static_assets().build
 
 
 def _is_safe_rel_path(path: str) -> bool:
@@ -114,28 +121,34 @@ def _is_safe_rel_path(path: str) -> bool:
     return all(part != ".." for part in value.split("/") if part)
 
 
-def _render_index_html(request: Request | None = None) -> HTMLResponse:
-    if not INDEX_FILE.exists():
+def _static_response(entry: StaticEntry, request: Request | None, kind: str) -> Response:
+    headers = _cache_headers(kind, etag=entry.etag)
+    request_headers = request.headers if request is not None else {}
+    if (request_headers.get("if-none-match") or "").strip() == entry.etag:
+        return Response(status_code=304, headers=headers)
+    payload, encoding = entry.variant(request_headers.get("accept-encoding") or "")
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    if isinstance(payload, Path):
+        return FileResponse(path=str(payload), media_type=entry.media_type, headers=headers)
+    return Response(content=payload, media_type=entry.media_type, headers=headers)
+
+
+def _render_index_html(request: Request | None = None) -> Response:
+    table = _static_assets()
+    if table.index is None:
+        if table.index_error:
+            return HTMLResponse(
+                "<h3>Mini App failed to load</h3>",
+                status_code=500,
+                headers=_cache_headers("html"),
+            )
         return HTMLResponse(
             "<h3>Mini App is not configured</h3><p>Missing app/webapp/static/index.html</p>",
             status_code=503,
             headers=_cache_headers("html"),
         )
-    try:
-        html = INDEX_FILE.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        return HTMLResponse(
-            "<h3>Mini App failed to load</h3>",
-            status_code=500,
-            headers=_cache_headers("html"),
-        )
-
-    build = _build_id()
-    html = html.replace("__BUILD__", build).replace("%BUILD%", build)
-    etag = _etag_for_bytes(html.encode("utf-8", errors="ignore"))
-    if request is not None and (request.headers.get("if-none-match") or "").strip() == etag:
-        return HTMLResponse(status_code=304, content="", headers=_cache_headers("html", etag=etag))
-    return HTMLResponse(content=html, headers=_cache_headers("html", etag=etag))
+    return _static_response(table.index, request, "html")
 
 
 def bind_runtime(*, brain=None, profiles=None, store=None, settings=None):
@@ -144,6 +157,10 @@ def bind_runtime(*, brain=None, profiles=None, store=None, settings=None):
     APP_PROFILES = profiles
     APP_STORE = store
     APP_SETTINGS = settings
+    try:
+        reload_static_assets()
+    except Exception as exc:
+        log.warning("webapp static asset preload failed error=%s", type(exc).__name__)
     log.info(
         "bind_runtime ok: brain=%s profiles=%s store=%s settings=%s",
         bool(brain), bool(profiles), bool(store), bool(settings),
@@ -162,6 +179,8 @@ def webapp_health():
         "build": _build_id(),
         "static_dir_exists": STATIC_DIR.exists(),
         "index_exists": INDEX_FILE.exists(),
+        "static_assets": _static_assets().status(),
+        "init_data_cache": init_data_cache_status(),
     })
 
 
@@ -179,19 +198,20 @@ def webapp_files(req_path: str, request: Request):
     if "." not in Path(req_path).name:
         return _render_index_html(request)
 
-    target = (STATIC_DIR / req_path).resolve()
-    try:
-        target.relative_to(STATIC_DIR)
-    except Exception:
-        raise HTTPException(status_code=400, detail="bad path")
+    if req_path.startswith(URL_PREFIX[len("/webapp/"):]):
+        return _hashed_asset(req_path[len(URL_PREFIX) - len("/webapp/"):], request)
 
-    if not target.exists() or not target.is_file():
+    entry = _static_assets().get(req_path)
+    if entry is None:
         return Response(status_code=404, content="Not Found")
+    return _static_response(entry, request, "asset")
+
 
-    etag = _etag_for_file(target)
-    if (request.headers.get("if-none-match") or "").strip() == etag:
-        return Response(status_code=304, headers=_cache_headers("asset", etag=etag))
-    return FileResponse(path=str(target), headers=_cache_headers("asset", etag=etag))
+def _hashed_asset(hashed: str, request: Request) -> Response:
+    entry = _static_assets().hashed.get(hashed)
+    if entry is None:
+        return Response(status_code=404, content="Not Found")
+    return _static_response(entry, request, "immutable")
 
 
 class AskBody(BaseModel):
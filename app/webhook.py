@@ -2,20 +2,25 @@
 from __future__ import annotations
 
 import asyncio
+import hmac
 import json
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Header, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 
 from app.adapters.telegram.client import TelegramClient
+from app.adapters.telegram.scheduler import TelegramSendScheduler
 from app.adapters.telegram.types import Update
 from app.config import get_settings
 from app.core.router import Router
 from app.observability.log import get_logger, setup_logging
+from app.observability.metrics import latency_metrics
 from app.observability.readiness import readiness_snapshot
 from app.release import APP_VERSION, RELEASE_CONTRACT
+from app.security.shared_state import build_guard_state
 from app.security.usage_guard import UpdateReplayGuard, UsageGuard
+from app.services.ai.client_pool import openai_pool
 from app.services.brain.engine import BrainEngine
 from app.services.conversation.service import ConversationService
 from app.services.entitlements.service import PremiumEntitlementService
@@ -24,6 +29,7 @@ from app.services.entitlements.telegram import EntitlementTelegramController
 from app.services.profiles.service import ProfileService
 from app.services.storage.factory import build_store
 from app.services.telegram.command_console import CommandConsoleController
+from app.services.telegram.update_queue import ChatOrderedUpdateQueue
 from app.services.vod.service import VODAnalysisService
 from app.services.vod.telegram import VODTelegramIngress
 from app.services.voice.ingress import TelegramVoiceIngress
@@ -38,18 +44,38 @@ def create_app() -> FastAPI:
     settings = get_settings()
     setup_logging(settings.log_level)
 
-    tg = TelegramClient(settings.bot_token)
+    openai_pool.configure(
+        max_connections=getattr(settings, "openai_pool_max_connections", 20),
+        max_keepalive_connections=max(1, int(getattr(settings, "openai_pool_max_connections", 20) or 20) // 2),
+        acquire_timeout_s=getattr(settings, "openai_pool_acquire_timeout_s", 30.0),
+        concurrency={
+            "chat": getattr(settings, "openai_chat_concurrency", 16),
+            "vision": getattr(settings, "openai_vision_concurrency", 4),
+            "tts": getattr(settings, "openai_tts_concurrency", 8),
+        },
+    )
+    tg = TelegramClient(
+        settings.bot_token,
+        scheduler=TelegramSendScheduler.from_settings(settings),
+        max_retry_after_s=settings.telegram_max_retry_after_s,
+    )
     store = build_store(settings)
     profiles = ProfileService(store=store)
-    entitlement_service = PremiumEntitlementService(settings)
+    entitlement_service = PremiumEntitlementService(
+        settings,
+        on_link_change=getattr(store, "invalidate_telegram_identity", None),
+    )
     entitlement_controller = EntitlementTelegramController(tg=tg, service=entitlement_service)
     site_entitlement_bridge = SiteEntitlementBridgeAPI(settings=settings, entitlements=entitlement_service)
-    usage_guard = UsageGuard.from_settings(settings)
+    guard_state = build_guard_state(getattr(settings, "guard_state_path", ""))
+    usage_guard = UsageGuard.from_settings(settings, state=guard_state)
     replay_guard = UpdateReplayGuard(
         ttl_s=settings.telegram_update_dedupe_ttl_s,
         max_entries=settings.telegram_update_dedupe_max_entries,
+        state=guard_state,
     )
     command_console: CommandConsoleController | None = None
+    update_queue: ChatOrderedUpdateQueue | None = None
 
     transcription_backend = OpenAITranscriptionBackend(
         api_key=settings.openai_api_key,
@@ -90,9 +116,19 @@ def create_app() -> FastAPI:
             except Exception as exc:
                 log.warning("AAA Telegram command surface setup failed: %s", type(exc).__name__)
 
+        if update_queue is not None:
+            update_queue.start()
+
         try:
             yield
         finally:
+            if update_queue is not None:
+                drain_timeout_s = float(getattr(settings, "telegram_update_drain_timeout_s", 20.0) or 20.0)
+                try:
+                    drained = await update_queue.drain(drain_timeout_s)
+                    log.info("telegram update queue drained=%s stats=%s", drained, update_queue.stats())
+                except Exception as exc:
+                    log.warning("telegram update queue drain failed: %s", type(exc).__name__)
             try:
                 await transcription_backend.close()
             except Exception as exc:
@@ -105,6 +141,10 @@ def create_app() -> FastAPI:
                 await entitlement_service.close()
             except Exception as exc:
                 log.warning("entitlement service shutdown failed: %s", type(exc).__name__)
+            try:
+                await openai_pool.aclose()
+            except Exception as exc:
+                log.warning("openai client pool shutdown failed: %s", type(exc).__name__)
             await tg.close()
             close_store = getattr(store, "close", None)
             if callable(close_store):
@@ -210,40 +250,29 @@ def create_app() -> FastAPI:
             usage_guard=usage_guard,
             replay_guard=replay_guard,
             entitlement_service=entitlement_service,
+            update_queue=update_queue,
+            telegram_scheduler=tg.scheduler,
         )
 
-    @app.post("/tg/webhook", include_in_schema=False)
-    async def telegram_webhook(
-        request: Request,
-        x_telegram_bot_api_secret_token: str | None = Header(default=None),
-    ):
-        if settings.webhook_secret and x_telegram_bot_api_secret_token != settings.webhook_secret:
-            raise HTTPException(status_code=401, detail="bad secret token")
-
-        max_bytes = max(1024, int(settings.telegram_max_update_bytes or 256 * 1024))
-        content_length = request.headers.get("content-length")
-        if content_length:
-            try:
-                if int(content_length) > max_bytes:
-                    raise HTTPException(status_code=413, detail="telegram update too large")
-            except ValueError:
-                pass
-
-        body = await request.body()
-        if len(body) > max_bytes:
-            raise HTTPException(status_code=413, detail="telegram update too large")
-        try:
-            raw = json.loads(body.decode("utf-8")) if body else {}
-        except Exception:
-            raise HTTPException(status_code=400, detail="invalid telegram update")
-        if not isinstance(raw, dict):
-            raise HTTPException(status_code=400, detail="invalid telegram update")
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics(authorization: str | None = Header(default=None)):
+        token = str(getattr(settings, "metrics_token", "") or "")
+        if not token:
+            raise HTTPException(status_code=404, detail="Not Found")
+        supplied = (authorization or "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied.encode("utf-8"), token.encode("utf-8")):
+            raise HTTPException(status_code=401, detail="bad metrics token")
+        return PlainTextResponse(
+            latency_metrics.render_prometheus(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
 
-        update_id = raw.get("update_id")
-        if update_id is not None and not replay_guard.accept(update_id):
-            return JSONResponse({"ok": True, "duplicate": True})
+    async def process_update(upd: dict) -> dict:
+        with latency_metrics.time("bco_webhook_seconds", stage="process"):
+            return await _process_update(upd)
 
-        upd = Update.parse(raw)
+    async def _process_update(upd: dict) -> dict:
+        """Full update chain: voice, console, entitlements, VOD, router, auto-voice."""
         input_mode = "text"
 
         try:
@@ -253,13 +282,13 @@ def create_app() -> FastAPI:
                 msg = (upd.get("message") or upd.get("edited_message") or {}) if isinstance(upd, dict) else {}
                 input_mode = str(msg.get("_bco_input_mode") or "") if isinstance(msg, dict) else ""
                 if not input_mode.startswith("voice"):
-                    return JSONResponse({"ok": True, "voice_consumed": True})
+                    return {"ok": True, "voice_consumed": True}
         except Exception as exc:
             log.exception("voice ingress pre-handler crashed: %s", type(exc).__name__)
 
         try:
             if await command_console.maybe_handle(upd):
-                return JSONResponse({"ok": True})
+                return {"ok": True}
         except Exception as exc:
             log.exception("AAA command console pre-handler crashed: %s", type(exc).__name__)
 
@@ -274,19 +303,19 @@ def create_app() -> FastAPI:
 
         try:
             if await entitlement_controller.maybe_handle_command(upd):
-                return JSONResponse({"ok": True})
+                return {"ok": True}
         except Exception as exc:
             log.exception("Premium account bridge pre-handler crashed: %s", type(exc).__name__)
 
         try:
             if await voice_controller.maybe_handle_command(upd):
-                return JSONResponse({"ok": True})
+                return {"ok": True}
         except Exception as exc:
             log.exception("voice command pre-handler crashed: %s", type(exc).__name__)
 
         try:
             if await vod_ingress.maybe_handle(upd):
-                return JSONResponse({"ok": True})
+                return {"ok": True}
         except Exception as exc:
             log.exception("VOD pre-handler crashed: %s", type(exc).__name__)
 
@@ -299,7 +328,7 @@ def create_app() -> FastAPI:
                 if callable(handler):
                     try:
                         await handler(upd, data_raw)
-                        return JSONResponse({"ok": True})
+                        return {"ok": True}
                     except Exception as exc:
                         log.exception("handle_webapp_data crashed: %s", exc)
                 else:
@@ -320,7 +349,60 @@ def create_app() -> FastAPI:
         except Exception as exc:
             log.warning("voice auto post-handler failed: %s", type(exc).__name__)
 
-        return JSONResponse({"ok": True})
+        return {"ok": True}
+
+    if getattr(settings, "telegram_update_queue_enabled", True):
+        update_queue = ChatOrderedUpdateQueue(
+            process_update,
+            workers=getattr(settings, "telegram_update_workers", 8),
+            max_pending=getattr(settings, "telegram_update_queue_max", 1000),
+            max_pending_per_chat=getattr(settings, "telegram_update_queue_max_per_chat", 50),
+        )
+
+    @app.post("/tg/webhook", include_in_schema=False)
+    async def telegram_webhook(
+        request: Request,
+        x_telegram_bot_api_secret_token: str | None = Header(default=None),
+    ):
+        with latency_metrics.time("bco_webhook_seconds", stage="ack"):
+            return await _accept_update(request, x_telegram_bot_api_secret_token)
+
+    async def _accept_update(request: Request, secret_token: str | None) -> JSONResponse:
+        if settings.webhook_secret and secret_token != settings.webhook_secret:
+            raise HTTPException(status_code=401, detail="bad secret token")
+
+        max_bytes = max(1024, int(settings.telegram_max_update_bytes or 256 * 1024))
+        content_length = request.headers.get("content-length")
+        if content_length:
+            try:
+                if int(content_length) > max_bytes:
+                    raise HTTPException(status_code=413, detail="telegram update too large")
+            except ValueError:
+                pass
+
+        body = await request.body()
+        if len(body) > max_bytes:
+            raise HTTPException(status_code=413, detail="telegram update too large")
+        try:
+            raw = json.loads(body.decode("utf-8")) if body else {}
+        except Exception:
+            raise HTTPException(status_code=400, detail="invalid telegram update")
+        if not isinstance(raw, dict):
+            raise HTTPException(status_code=400, detail="invalid telegram update")
+
+        update_id = raw.get("update_id")
+        if update_id is not None and not replay_guard.accept(update_id):
+            return JSONResponse({"ok": True, "duplicate": True})
+
+        upd = Update.parse(raw)
+        if update_queue is None:
+            return JSONResponse(await process_update(upd))
+        if not update_queue.submit(upd):
+            # Let Telegram redeliver later instead of dropping the update.
+            if update_id is not None:
+                replay_guard.forget(update_id)
+            return JSONResponse({"ok": False, "busy": True}, status_code=503, headers={"Retry-After": "1"})
+        return JSONResponse({"ok": True, "queued": True})
 
     return app
 
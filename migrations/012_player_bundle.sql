@@ -0,0 +1,57 @@
+-- BLACK CROWN OPS — coalesced player bundle read v1
+-- One server-only round trip for the player row and its recent history.
+-- Read-only and additive: no table, row or legacy RPC is changed.
+
+create or replace function public.bco_player_bundle(
+    p_chat_id bigint,
+    p_progression_limit integer default 100,
+    p_episode_limit integer default 40
+)
+returns jsonb
+language sql
+stable
+security definer
+set search_path = public, pg_temp
+as $function$
+  select jsonb_build_object(
+    'schema', 'bco-player-bundle-v1',
+    'profile', coalesce(p.profile, '{}'::jsonb),
+    'summary', coalesce(p.summary, ''),
+    'derived', coalesce(p.derived, '{}'::jsonb),
+    'mistakes', coalesce((
+      select jsonb_agg(to_jsonb(m) order by m.count desc, m.last_seen desc)
+      from (
+        select mistake_key, label, count, first_seen, last_seen, evidence
+        from public.bco_player_mistakes
+        where chat_id = p_chat_id
+        order by count desc, last_seen desc
+        limit 20
+      ) m
+    ), '[]'::jsonb),
+    'progression', coalesce((
+      select jsonb_agg(jsonb_build_object('data', e.data, 'created_at', e.created_at) order by e.id desc)
+      from (
+        select id, data, created_at
+        from public.bco_progression_events
+        where chat_id = p_chat_id
+        order by id desc
+        limit greatest(1, least(coalesce(p_progression_limit, 100), 100))
+      ) e
+    ), '[]'::jsonb),
+    'episodes', coalesce((
+      select jsonb_agg(jsonb_build_object('kind', e.kind, 'data', e.data, 'created_at', e.created_at) order by e.id desc)
+      from (
+        select id, kind, data, created_at
+        from public.bco_episodes
+        where chat_id = p_chat_id
+        order by id desc
+        limit greatest(1, least(coalesce(p_episode_limit, 40), 100))
+      ) e
+    ), '[]'::jsonb)
+  )
+  from (select 1) anchor
+  left join public.bco_players p on p.chat_id = p_chat_id;
+$function$;
+
+revoke all on function public.bco_player_bundle(bigint, integer, integer) from public, anon, authenticated;
+grant execute on function public.bco_player_bundle(bigint, integer, integer) to service_role;
@@ -0,0 +1,49 @@
+-- BLACK CROWN OPS — crown session-cycle index v1
+-- Open-session and per-session evidence lookups without scanning a player's
+-- progression history. Additive: partial expression indexes on the existing
+-- event table plus one read-only server RPC. No table or row is changed.
+
+create index if not exists bco_progression_events_session_open_idx
+    on public.bco_progression_events (chat_id, (data->>'mission_id'), id desc)
+    where data->>'type' = 'crown_session_cycle' and data->>'status' = 'prepared';
+
+create index if not exists bco_progression_events_session_closed_idx
+    on public.bco_progression_events (chat_id, (data->>'crown_session_id'))
+    where data->>'type' = 'crown_session_cycle' and data->>'status' = 'closed';
+
+-- The predicate is implied by list_crown_session_events' `data->>'crown_session_id' = $x`
+-- filter; `data ? 'crown_session_id'` is not, and would leave this index unused.
+create index if not exists bco_progression_events_session_events_idx
+    on public.bco_progression_events (chat_id, (data->>'crown_session_id'), id desc)
+    where data->>'crown_session_id' is not null;
+
+create or replace function public.bco_open_crown_session(
+    p_chat_id bigint,
+    p_mission_id text default null
+)
+returns jsonb
+language sql
+stable
+security definer
+set search_path = public, pg_temp
+as $function$
+  select e.data || jsonb_build_object('created_at', e.created_at)
+  from public.bco_progression_events e
+  where e.chat_id = p_chat_id
+    and e.data->>'type' = 'crown_session_cycle'
+    and e.data->>'status' = 'prepared'
+    and (coalesce(p_mission_id, '') = '' or e.data->>'mission_id' = p_mission_id)
+    and not exists (
+      select 1
+      from public.bco_progression_events c
+      where c.chat_id = p_chat_id
+        and c.data->>'type' = 'crown_session_cycle'
+        and c.data->>'status' = 'closed'
+        and c.data->>'crown_session_id' = e.data->>'crown_session_id'
+    )
+  order by e.id desc
+  limit 1;
+$function$;
+
+revoke all on function public.bco_open_crown_session(bigint, text) from public, anon, authenticated;
+grant execute on function public.bco_open_crown_session(bigint, text) to service_role;
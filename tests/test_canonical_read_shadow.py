@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
 from uuid import UUID
 
 import httpx
 
 from app.observability.quality import QualityTelemetry
 from app.services.storage.canonical_shadow import CanonicalReadShadowStore
+from app.services.storage.shadow_worker import ShadowComparisonWorker
 from app.services.storage.supabase import SupabaseStore
 
 
@@ -14,7 +17,7 @@ OWNER = str(UUID("11111111-1111-1111-1111-111111111111"))
 OTHER = str(UUID("22222222-2222-2222-2222-222222222222"))
 
 
-def _store(handler, *, sample_rate: float = 1.0):
+def _store(handler, *, sample_rate: float = 1.0, worker=None):
     primary = SupabaseStore(
         url="https://example.supabase.co",
         service_role_key="server-secret",
@@ -28,6 +31,7 @@ def _store(handler, *, sample_rate: float = 1.0):
             enabled=True,
             sample_rate=sample_rate,
             telemetry=telemetry,
+            worker=worker,
         ),
         telemetry,
     )
@@ -209,3 +213,66 @@ def test_quality_snapshot_contains_no_identity_or_player_payload():
     assert "message content" not in encoded
     assert '"read_authority": "legacy"' in encoded
     assert '"canonical_returned_to_callers": false' in encoded
+
+
+def _slow_canonical_handler(delay_s: float, gate: threading.Event | None = None):
+    def handler(request: httpx.Request):
+        path = request.url.path
+        if request.url.params.get("chat_id"):
+            return httpx.Response(200, json=[{"profile": {"game": "Warzone"}}])
+        if gate is not None:
+            gate.wait(5)
+        time.sleep(delay_s)
+        if path.endswith("/rest/v1/rpc/black_crown_eligible_identity_candidates"):
+            return _candidate_response([OWNER])
+        return httpx.Response(200, json=[{"profile": {"game": "Verdansk"}}])
+
+    return handler
+
+
+def test_reads_return_before_their_background_comparisons_run():
+    rounds = 20
+    gate = threading.Event()
+    worker = ShadowComparisonWorker(max_queue=rounds, workers=2)
+    store, telemetry = _store(_slow_canonical_handler(0.0, gate), worker=worker)
+    try:
+        for _ in range(rounds):
+            value = store.get_profile(42)
+            assert value == {"game": "Warzone"}
+            value["game"] = "mutated by caller"
+        # Every read returned while the canonical side was still blocked.
+        assert store.canonical_read_shadow_status()["comparisons"]["completed"] == 0
+        gate.set()
+        assert worker.drain(10)
+        status = telemetry.snapshot()["canonical_read_shadow"]
+        comparisons = store.canonical_read_shadow_status()["comparisons"]
+    finally:
+        gate.set()
+        store.close()
+
+    assert status["outcomes"] == {"mismatch": rounds}
+    assert comparisons["completed"] == rounds and comparisons["dropped"] == 0
+
+
+def test_full_shadow_queue_drops_samples_without_blocking_the_read():
+    gate = threading.Event()
+    worker = ShadowComparisonWorker(max_queue=1, workers=1)
+    store, telemetry = _store(_slow_canonical_handler(0.0, gate), worker=worker)
+    try:
+        assert store.get_profile(42) == {"game": "Warzone"}
+        deadline = time.monotonic() + 5
+        while worker.status()["queue_depth"] and time.monotonic() < deadline:
+            time.sleep(0.001)  # the first comparison is now blocked in flight
+        for _ in range(4):
+            assert store.get_profile(42) == {"game": "Warzone"}
+        gate.set()
+        assert worker.drain(5)
+        outcomes = telemetry.snapshot()["canonical_read_shadow"]["outcomes"]
+        comparisons = store.canonical_read_shadow_status()["comparisons"]
+    finally:
+        store.close()
+
+    # One comparison runs, one waits in the queue, the rest are dropped.
+    assert comparisons["mode"] == "background"
+    assert comparisons["dropped"] == 3 and comparisons["completed"] == 2
+    assert outcomes == {"shadow_dropped": 3, "mismatch": 2}
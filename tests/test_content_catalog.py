@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.content import catalog as catalog_module
+from app.content.catalog import ContentCatalog, default_catalog
+from app.domain.enums import Game, InputDevice, Mode, SkillTier
+from app.services.brain.intents import Intent, IntentResult
+from app.services.brain.knowledge_context import KnowledgeRequest, StaticKnowledgeProvider
+
+DATA = Path(__file__).resolve().parents[1] / "app" / "content" / "data"
+PACK = (Game.WARZONE, Mode.WZ_BR, InputDevice.XBOX, SkillTier.PRO)
+
+
+def _write(path: Path, payload: dict, *, bump_ns: int = 0) -> None:
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    if bump_ns:
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump_ns))
+
+
+def test_catalog_indexes_every_file_and_is_read_only():
+    catalog = ContentCatalog(str(DATA), reload_interval_s=None)
+    pack = catalog.load_settings_pack(*PACK)
+    raw = json.loads((DATA / "warzone__wz_br__xbox__pro.json").read_text(encoding="utf-8"))
+
+    assert pack.title == raw["title"] and pack.last_updated == raw["last_updated"]
+    assert pack.settings.keys() == raw["settings"].keys()
+    assert catalog.load_training_plan(Game.WARZONE, Mode.WZ_BR, SkillTier.PRO)["blocks"][0]["name"]
+    assert catalog.load_classes(Game.BF6)["classes"][0]["name"] == "Assault"
+    assert catalog.load_settings_pack(*PACK) is pack
+    with pytest.raises(TypeError):
+        pack.settings["injected"] = 1  # type: ignore[index]
+    with pytest.raises(FileNotFoundError):
+        catalog.load_settings_pack(Game.BF6, Mode.BF6_PVP, InputDevice.KBM, SkillTier.PRO)
+    assert StaticKnowledgeProvider().catalog is default_catalog()
+
+
+def test_edited_files_are_picked_up_and_broken_edits_keep_the_last_good_copy(tmp_path):
+    path = tmp_path / "classes__bf6.json"
+    _write(path, {"title": "v1", "classes": []})
+    catalog = ContentCatalog(str(tmp_path), reload_interval_s=0)
+    assert catalog.load_classes(Game.BF6)["title"] == "v1"
+
+    _write(path, {"title": "v2", "classes": []}, bump_ns=1_000_000)
+    assert catalog.load_classes(Game.BF6)["title"] == "v2"
+
+    path.write_text("{ half written", encoding="utf-8")
+    assert catalog.load_classes(Game.BF6)["title"] == "v2"
+
+    _write(tmp_path / "training__warzone__wz_br__pro.json", {"title": "new plan"})
+    assert catalog.load_training_plan(Game.WARZONE, Mode.WZ_BR, SkillTier.PRO)["title"] == "new plan"
+    assert catalog.reloads == 3
+
+    _write(path, {"title": "v3", "classes": []}, bump_ns=2_000_000)
+    throttled = ContentCatalog(str(tmp_path), reload_interval_s=3600)
+    _write(path, {"title": "v4", "classes": []}, bump_ns=3_000_000)
+    assert throttled.load_classes(Game.BF6)["title"] == "v3"
+
+
+def test_settings_queries_are_served_from_the_index_without_parsing(monkeypatch):
+    request = KnowledgeRequest(
+        intent=IntentResult(Intent.GAME_SETTINGS, 0.99),
+        text="Настрой сенсу",
+        profile={"game": "Warzone", "platform": "Xbox", "input": "Controller", "difficulty": "Pro"},
+    )
+    provider = StaticKnowledgeProvider(ContentCatalog(str(DATA), reload_interval_s=None))
+    pack = provider.catalog.load_settings_pack(*PACK)
+
+    parses = []
+    real_loads = catalog_module.json.loads
+    monkeypatch.setattr(catalog_module.json, "loads", lambda *a, **kw: parses.append(1) or real_loads(*a, **kw))
+    for _ in range(50):
+        assert provider.catalog.load_settings_pack(*PACK) is pack
+        assert provider.query(request).facts
+    assert parses == [] and provider.catalog.reloads == 0
+
+
+@pytest.mark.skipif(not os.getenv("BCO_BENCHMARKS"), reason="benchmark; set BCO_BENCHMARKS=1 to run")
+def test_benchmark_settings_query_before_and_after():
+    rounds = 300
+    started = time.perf_counter()
+    for _ in range(rounds):
+        # The previous catalog: read and decode the preset file on every query.
+        json.loads((DATA / "warzone__wz_br__xbox__pro.json").read_text(encoding="utf-8"))
+    parse_s = (time.perf_counter() - started) / rounds
+
+    catalog = ContentCatalog(str(DATA))
+    started = time.perf_counter()
+    for _ in range(rounds):
+        catalog.load_settings_pack(*PACK)
+    lookup_s = (time.perf_counter() - started) / rounds
+
+    assert lookup_s * 5 < parse_s, f"file_parse_us={parse_s * 1e6:.1f} indexed_lookup_us={lookup_s * 1e6:.2f}"
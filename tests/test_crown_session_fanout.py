@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+import time
+
+import pytest
+
+from app.services.crown_session import CrownSessionService
+from app.services.profiles.service import ProfileService
+from app.services.storage.memory import InMemoryStore
+from app.services.storage.resilient import ResilientStore
+
+STORE_DELAY_S = 0.04
+ENTITLEMENT_DELAY_S = 0.12
+
+
+class SlowStore(InMemoryStore):
+    """Local stand-in for a remote store: every call costs one round trip."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: dict[str, int] = {}
+        self.threads: set[int] = set()
+        self.bundle_overlapped: bool | None = None
+        self._gate_bundle = False
+        self._other_call = threading.Event()
+        self._calls_lock = threading.Lock()
+
+    def __getattribute__(self, name):
+        value = super().__getattribute__(name)
+        if callable(value) and not name.startswith("_") and name != "calls":
+            @functools.wraps(value)
+            def slow(*args, **kwargs):
+                with self._calls_lock:
+                    self.calls[name] = self.calls.get(name, 0) + 1
+                    self.threads.add(threading.get_ident())
+                if name != "get_player_bundle":
+                    self._other_call.set()
+                elif self._gate_bundle:
+                    # Held until another part reaches the store; a sequential snapshot never gets there.
+                    self.bundle_overlapped = self._other_call.wait(5.0)
+                time.sleep(STORE_DELAY_S)
+                return value(*args, **kwargs)
+
+            return slow
+        return value
+
+
+class Status:
+    linked = True
+    premium = True
+    entitlements = ("bco_premium",)
+    site_user_id = None
+    linked_at = None
+
+
+class SlowEntitlements:
+    def __init__(self, delay_s: float = ENTITLEMENT_DELAY_S) -> None:
+        self.delay_s = delay_s
+
+    async def get_status(self, telegram_user_id):
+        await asyncio.sleep(self.delay_s)
+        return Status()
+
+
+def _service(entitlements=None, **kwargs) -> tuple[CrownSessionService, SlowStore]:
+    primary = SlowStore()
+    seed = InMemoryStore()
+    store = ResilientStore(primary=primary, fallback=seed)
+    for index in range(40):
+        store.add_progression_event(42, {"type": "training", "n": index})
+    store.set_profile(42, {"game": "Warzone", "input": "Controller"})
+    primary.calls.clear()
+    profiles = ProfileService(store)
+    return CrownSessionService(store=store, profiles=profiles, entitlements=entitlements or SlowEntitlements(), **kwargs), primary
+
+
+def _sequential_baseline(service: CrownSessionService) -> float:
+    """The pre-fan-out shape: every part in turn, store calls on the loop thread."""
+
+    from app.services.analytics.command_center import CommandCenterService
+    from app.services.identity import CrownIdentityCore
+    from app.services.operator_intelligence.orchestrated_service import OrchestratedOperatorIntelligenceService
+
+    async def run() -> float:
+        started = time.perf_counter()
+        CrownIdentityCore(service.store).resolve_telegram(42)
+        service.profiles.get(42)
+        CommandCenterService(store=service.store, profiles=service.profiles).snapshot(42)
+        OrchestratedOperatorIntelligenceService.from_components(store=service.store, profiles=service.profiles).snapshot(42)
+        await service.entitlements.get_status(42)
+        return time.perf_counter() - started
+
+    return asyncio.run(run())
+
+
+def test_snapshot_parts_overlap_off_the_event_loop():
+    service, primary = _service()
+    _sequential_baseline(service)
+    baseline_calls = sum(primary.calls.values())
+    primary.calls.clear()
+    primary.threads.clear()
+    primary._gate_bundle = True
+
+    async def run() -> tuple[dict, int]:
+        session = await service.snapshot(chat_id=42, telegram_user_id=42)
+        return session, threading.get_ident()
+
+    session, loop_thread = asyncio.run(run())
+    assert session["partial"] == []
+    assert session["profile"]["game"] == "Warzone"
+    assert session["entitlement"]["state"] == "resolved"
+    assert primary.calls.get("get_player_bundle") == 1
+    assert sum(primary.calls.values()) < baseline_calls
+    # The bundle read was still in flight when another part reached the store,
+    # and no store round trip ran on the event loop's thread.
+    assert primary.bundle_overlapped is True
+    assert loop_thread not in primary.threads
+
+
+def test_deadline_leaves_slow_parts_out_and_reports_them():
+    class StuckEntitlements:
+        cancelled = False
+
+        async def get_status(self, telegram_user_id):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+
+    entitlements = StuckEntitlements()
+    service, _primary = _service(entitlements=entitlements, deadline_s=0.6)
+    session = asyncio.run(service.snapshot(chat_id=42, telegram_user_id=42))
+    assert entitlements.cancelled is True  # the snapshot returned without waiting for it
+    assert session["partial"] == ["entitlement"]
+    assert session["entitlement"]["state"] == "unavailable"
+    assert session["entitlement"]["premium"] is False
+    assert session["profile"]["game"] == "Warzone"
+
+
+def test_failed_parts_degrade_instead_of_failing_the_session():
+    class BrokenIdentityStore(InMemoryStore):
+        def resolve_telegram_identity(self, telegram_user_id):
+            raise RuntimeError("identity down")
+
+    class BrokenProfiles:
+        def get(self, chat_id):
+            raise RuntimeError("profiles down")
+
+    store = BrokenIdentityStore()
+    session = asyncio.run(
+        CrownSessionService(store=store, profiles=BrokenProfiles(), entitlements=SlowEntitlements(0.0)).snapshot(chat_id=7, telegram_user_id=7)
+    )
+    assert "profile" in session["partial"]
+    assert session["identity"]["canonical"] is False
+    assert session["entitlement"]["state"] == "resolved"
+
+
+@pytest.mark.skipif(not os.getenv("BCO_BENCHMARKS"), reason="benchmark; set BCO_BENCHMARKS=1 to run")
+def test_benchmark_concurrent_snapshot_against_local_stand_ins():
+    service, _primary = _service()
+    baseline_s = _sequential_baseline(service)
+
+    async def run() -> float:
+        started = time.perf_counter()
+        await service.snapshot(chat_id=42, telegram_user_id=42)
+        return time.perf_counter() - started
+
+    fanout_s = asyncio.run(run())
+    assert fanout_s * 1.3 < baseline_s, f"baseline_ms={baseline_s * 1000:.0f} fanout_ms={fanout_s * 1000:.0f}"
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+from app.observability.readiness import readiness_snapshot
+from app.services.storage.memory import InMemoryStore
+from app.services.storage.outbox import PendingWrite, SQLiteOutbox
+from app.services.storage.resilient import ResilientStore
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Runs one process lifetime against a file-backed fake Supabase. The fake
+# applies each operation_id at most once (like the Phase 8 idempotency
+# primitives) and can hard-kill its own process right after a commit.
+_PHASE = textwrap.dedent(
+    """
+    import json, os, sys
+    from pathlib import Path
+    from app.services.storage.memory import InMemoryStore
+    from app.services.storage.outbox import SQLiteOutbox
+    from app.services.storage.resilient import ResilientStore
+
+    phase, work = sys.argv[1], Path(sys.argv[2])
+    remote, attempts = work / "remote.jsonl", work / "attempts.jsonl"
+
+    class FilePrimary:
+        def __init__(self, down=False, crash_after=0):
+            self.down, self.crash_after, self.applied_now = down, crash_after, 0
+
+        def add(self, chat_id, role, content, *, operation_id=None):
+            if self.down:
+                raise TimeoutError("primary down")
+            with attempts.open("a") as fh:
+                fh.write(json.dumps(operation_id) + "\\n")
+            seen = {json.loads(line)["op"] for line in remote.read_text().splitlines()} if remote.exists() else set()
+            if operation_id not in seen:
+                with remote.open("a") as fh:
+                    fh.write(json.dumps({"op": operation_id, "content": content}) + "\\n")
+                    fh.flush()
+                    os.fsync(fh.fileno())
+            self.applied_now += 1
+            if self.crash_after and self.applied_now == self.crash_after:
+                os._exit(17)  # killed after the commit, before the outbox ack
+
+        def ping(self):
+            if self.down:
+                raise TimeoutError("primary down")
+
+    primary = FilePrimary(down=phase == "queue", crash_after=5 if phase == "replay" else 0)
+    store = ResilientStore(primary, InMemoryStore(), replay_batch=4, outbox=SQLiteOutbox(work / "outbox.sqlite3"))
+    if phase == "queue":
+        for index in range(12):
+            store.add(7, "user", f"turn {index}")
+        os._exit(9)  # killed with the whole backlog still pending
+    store.probe_primary()
+    store.probe_primary()
+    store.probe_primary()
+    """
+)
+
+
+def _run_phase(phase: str, work: Path) -> int:
+    return subprocess.run(
+        [sys.executable, "-c", _PHASE, phase, str(work)],
+        cwd=ROOT,
+        capture_output=True,
+        timeout=60,
+    ).returncode
+
+
+def _journaled(work: Path) -> int:
+    # Count rows without opening an outbox, which would claim the dead phase's rows.
+    db = sqlite3.connect(str(work / "outbox.sqlite3"))
+    try:
+        return int(db.execute("select count(*) from bco_outbox").fetchone()[0])
+    finally:
+        db.close()
+
+
+def test_process_killed_mid_replay_loses_and_duplicates_nothing(tmp_path: Path):
+    assert _run_phase("queue", tmp_path) == 9
+    assert _journaled(tmp_path) == 12
+    assert not (tmp_path / "remote.jsonl").exists()
+
+    # First replay batch (4) is acked; the 5th write commits remotely and
+    # the process dies before its ack.
+    assert _run_phase("replay", tmp_path) == 17
+    assert _journaled(tmp_path) == 8
+
+    assert _run_phase("finish", tmp_path) == 0
+    remote = [json.loads(line) for line in (tmp_path / "remote.jsonl").read_text().splitlines()]
+    attempts = [json.loads(line) for line in (tmp_path / "attempts.jsonl").read_text().splitlines()]
+    assert [row["content"] for row in remote] == [f"turn {index}" for index in range(12)]
+    assert len({row["op"] for row in remote}) == 12
+    # The interrupted write was retried with the same operation_id, once.
+    assert len(attempts) == 13
+    assert attempts[4] == attempts[5] == remote[4]["op"]
+    assert _journaled(tmp_path) == 0
+
+
+def test_sqlite_outbox_keeps_fifo_order_arguments_and_age(tmp_path: Path):
+    path = tmp_path / "outbox.sqlite3"
+    outbox = SQLiteOutbox(path, max_entries=10)
+    old = PendingWrite("op-1", "set_profile", (7, {"rank": "Diamond"}), {}, enqueued_at=time.time() - 30)
+    assert outbox.append(old)
+    assert outbox.append(old)  # same operation_id is journaled once
+    assert outbox.append(PendingWrite("op-2", "add", (7, "user", "hi"), {}))
+    outbox.close()
+
+    reopened = SQLiteOutbox(path, max_entries=10)
+    assert len(reopened) == 2
+    head = reopened.head()
+    assert (head.operation_id, head.method, head.args) == ("op-1", "set_profile", (7, {"rank": "Diamond"}))
+    assert time.time() - reopened.oldest_enqueued_at() >= 29
+    reopened.ack(head)
+    assert reopened.head().operation_id == "op-2"
+    reopened.close()
+
+
+def test_durable_backlog_depth_and_age_reach_readiness(tmp_path: Path):
+    class DownPrimary:
+        def add(self, *args, **kwargs):
+            raise TimeoutError("primary down")
+
+    store = ResilientStore(DownPrimary(), InMemoryStore(), outbox=SQLiteOutbox(tmp_path / "outbox.sqlite3"))
+    store.add(7, "user", "hi")
+    time.sleep(0.01)
+    recovery = readiness_snapshot(object(), store)["storage"]["recovery"]
+    assert recovery["outbox_pending"] == 1
+    assert recovery["outbox_durable"] is True
+    assert recovery["outbox_oldest_age_s"] > 0
+    assert recovery["outbox_max"] == 50_000
+
+
+def test_workers_sharing_one_journal_only_see_their_own_rows(tmp_path: Path):
+    path = tmp_path / "outbox.sqlite3"
+    a = SQLiteOutbox(path, owner=str(os.getpid()))
+    b = SQLiteOutbox(path, owner=str(os.getppid()))
+    assert a.append(PendingWrite("op-a", "add", (7, "user", "a"), {}))
+    assert b.append(PendingWrite("op-b", "add", (8, "user", "b"), {}))
+    assert (len(a), len(b)) == (1, 1)
+    assert a.head().operation_id == "op-a" and b.head().operation_id == "op-b"
+
+    b.ack(a.head())  # never deletes a sibling's row
+    assert len(a) == 1
+    a.ack(a.head())
+    assert (len(a), a.head(), len(b)) == (0, None, 1)
+
+    # A row left by a process that is gone is replayed by the next opener.
+    dead = SQLiteOutbox(path, owner="999999999")
+    assert dead.append(PendingWrite("op-dead", "add", (9, "user", "c"), {}))
+    dead.close()
+    assert len(a) == 0 and a.head().operation_id == "op-dead"
+    assert len(a) == 1 and len(SQLiteOutbox(path, owner=str(os.getppid()))) == 1
+
+
+def test_len_follows_the_journal_not_a_cached_count(tmp_path: Path):
+    path = tmp_path / "outbox.sqlite3"
+    outbox = SQLiteOutbox(path)
+    assert outbox.append(PendingWrite("op-1", "add", (7, "user", "hi"), {}))
+    other = SQLiteOutbox(path)  # same process, e.g. a store rebuilt in place
+    other.ack(other.head())
+    assert len(outbox) == 0 and outbox.head() is None
+
+
+def test_store_calls_probe_the_journal_without_counting_it(tmp_path: Path):
+    outbox = SQLiteOutbox(tmp_path / "outbox.sqlite3", max_entries=10)
+    store = ResilientStore(InMemoryStore(), InMemoryStore(), outbox=outbox)
+    statements: list[str] = []
+    outbox._db.set_trace_callback(statements.append)
+    store.add(7, "user", "hi")
+    assert store.get(7)[-1]["content"] == "hi"
+    outbox._db.set_trace_callback(None)
+    assert statements and not any("count(" in sql for sql in statements)
+
+
+def test_outbox_cap_counts_only_this_workers_rows(tmp_path: Path):
+    path = tmp_path / "outbox.sqlite3"
+    sibling = SQLiteOutbox(path, max_entries=10, owner=str(os.getppid()))
+    for index in range(10):
+        assert sibling.append(PendingWrite(f"sib-{index}", "add", (8, "user", "b"), {}))
+    assert not sibling.append(PendingWrite("sib-full", "add", (8, "user", "b"), {}))
+    outbox = SQLiteOutbox(path, max_entries=10)
+    assert outbox.append(PendingWrite("op-1", "add", (7, "user", "a"), {}))
+    assert len(outbox) == 1
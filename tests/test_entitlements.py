@@ -110,7 +110,7 @@ def test_status_requires_authoritative_bco_premium_entitlement():
         service = PremiumEntitlementService(settings(), client=client)
         try:
             first = await service.get_status(123)
-            second = await service.get_status(123)
+            second = await service.get_status(124)
             assert first.linked is True
             assert first.premium is False
             assert second.premium is True
@@ -136,3 +136,77 @@ def test_unlink_uses_server_only_rpc():
             await client.aclose()
 
     run(scenario())
+
+
+def test_status_cache_hits_negative_caches_and_invalidates_on_link_changes():
+    calls = []
+    state = {"fail": True}
+
+    def handler(request: httpx.Request):
+        name = request.url.path.rsplit("/", 1)[-1]
+        calls.append(name)
+        if name == "blackcrown_get_telegram_entitlement_status":
+            if state["fail"]:
+                return httpx.Response(503)
+            return httpx.Response(200, json={"ok": True, "linked": True, "premium": True, "entitlements": ["bco_premium"]})
+        if name == "blackcrown_create_telegram_link_challenge":
+            return httpx.Response(200, json={"ok": True, "ttl_seconds": 600})
+        if name == "blackcrown_complete_telegram_link":
+            return httpx.Response(200, json={"ok": True, "linked": True, "premium": True, "entitlements": ["bco_premium"]})
+        return httpx.Response(200, json={"ok": True, "unlinked": True})
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = PremiumEntitlementService(settings(), client=client)
+        try:
+            for _ in range(2):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await service.get_status(123)
+            assert calls.count("blackcrown_get_telegram_entitlement_status") == 1
+
+            state["fail"] = False
+            service.invalidate_status(123)
+            first = await service.get_status(123)
+            second = await service.get_status(123)
+            assert first is second and first.premium is True
+            assert calls.count("blackcrown_get_telegram_entitlement_status") == 2
+
+            await service.unlink(123)
+            await service.get_status(123)
+            assert calls.count("blackcrown_get_telegram_entitlement_status") == 3
+
+            await service.get_status(456)
+            with patch("app.services.entitlements.service.secrets.token_urlsafe", return_value=TOKEN):
+                await service.create_link_challenge(telegram_user_id=123, telegram_chat_id=123)
+            await service.complete_site_link(code=TOKEN, site_user_id="site-user-1")
+            await service.get_status(123)
+            await service.get_status(456)  # another user's entry survives a targeted invalidation
+            assert calls.count("blackcrown_get_telegram_entitlement_status") == 5
+            return service.readiness()["status_cache"]
+        finally:
+            await client.aclose()
+
+    stats = run(scenario())
+    assert stats["hits"] == 2 and stats["negative_hits"] == 1
+    assert stats["misses"] == 5 and stats["invalidations"] == 3
+    assert stats["entries"] == 2
+
+
+def test_status_cache_can_be_disabled():
+    calls = []
+
+    def handler(_request: httpx.Request):
+        calls.append(1)
+        return httpx.Response(200, json={"ok": True, "linked": False, "premium": False, "entitlements": []})
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = PremiumEntitlementService(settings(entitlement_cache_ttl_s=0), client=client)
+        try:
+            await service.get_status(123)
+            await service.get_status(123)
+        finally:
+            await client.aclose()
+
+    run(scenario())
+    assert len(calls) == 2
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import multiprocessing
+import sqlite3
+
+from app.security.shared_state import SQLiteGuardState, build_guard_state
+from app.security.usage_guard import GuardRule, UpdateReplayGuard, UsageGuard, WindowLimit
+
+WORKERS = 4
+ATTEMPTS = 40
+
+
+def _guard(path: str) -> UsageGuard:
+    return UsageGuard(
+        enabled=True,
+        state=SQLiteGuardState(path),
+        rules={
+            "ai": GuardRule(
+                subject_limits=(WindowLimit(5, 3600),),
+                global_limits=(WindowLimit(12, 3600),),
+            )
+        },
+    )
+
+
+def _worker(path: str, start, results) -> None:
+    # Each process opens its own guard on the shared file, like a uvicorn worker.
+    guard = _guard(path)
+    replay = UpdateReplayGuard(state=SQLiteGuardState(path))
+    start.wait()
+    allowed: dict[str, int] = {}
+    for attempt in range(ATTEMPTS):
+        subject = attempt % 2
+        if guard.check(subject, "ai").allowed:
+            allowed[str(subject)] = allowed.get(str(subject), 0) + 1
+    accepted = [update_id for update_id in range(50) if replay.accept(update_id)]
+    results.put({"allowed": allowed, "accepted": accepted})
+
+
+def test_quotas_and_update_dedupe_hold_across_worker_processes(tmp_path):
+    path = str(tmp_path / "guards.sqlite3")
+    ctx = multiprocessing.get_context("spawn")
+    start = ctx.Event()
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_worker, args=(path, start, results)) for _ in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+    start.set()
+    reports = [results.get(timeout=30) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=30)
+        assert worker.exitcode == 0
+
+    per_subject = {"0": 0, "1": 0}
+    for report in reports:
+        for subject, count in report["allowed"].items():
+            per_subject[subject] += count
+    # Process-local guards would have allowed 4 x 5 per subject and 4 x 12 overall.
+    assert per_subject == {"0": 5, "1": 5}
+
+    accepted = sorted(update_id for report in reports for update_id in report["accepted"])
+    assert accepted == list(range(50))
+
+    guard = _guard(path)
+    assert guard.check(0, "ai").allowed is False
+    snapshot = guard.snapshot()
+    assert snapshot["backend"] == "sqlite" and snapshot["active_buckets"] == 3
+
+
+def test_global_quota_is_shared_and_failures_fall_back_to_local(tmp_path):
+    path = str(tmp_path / "guards.sqlite3")
+    first, second = _guard(path), _guard(path)
+    decisions = [guard.check(subject, "ai") for subject in range(20) for guard in (first, second)]
+    assert sum(d.allowed for d in decisions) == 12
+    assert {d.scope for d in decisions if not d.allowed} == {"global"}
+
+    broken = _guard(path)
+    assert broken._state is not None
+    broken._state.close()
+    assert broken.check(99, "ai").allowed is True  # local windows are still empty
+    assert broken.snapshot()["shared_errors"] == 1
+
+    replay = UpdateReplayGuard(state=SQLiteGuardState(path))
+    assert replay.accept(7) is True
+    replay.forget(7)
+    assert UpdateReplayGuard(state=SQLiteGuardState(path)).accept(7) is True
+    assert replay.accept(7) is False
+    assert replay.snapshot() == {"tracked": 1, "duplicates": 1, "backend": "sqlite"}
+
+    assert build_guard_state("") is None
+    assert isinstance(build_guard_state(tmp_path / "nested" / "guards.sqlite3"), SQLiteGuardState)
+
+
+def test_locked_shared_state_falls_back_to_the_local_window(tmp_path):
+    path = tmp_path / "guards.sqlite3"
+    replay = UpdateReplayGuard(state=SQLiteGuardState(path))
+    assert replay._state.busy_timeout_ms <= 50
+    holder = sqlite3.connect(str(path), isolation_level=None)
+    holder.execute("begin immediate")  # another worker mid-transaction
+    try:
+        assert replay.accept(7) is True
+        assert replay.accept(7) is False  # the local window still dedupes
+    finally:
+        holder.execute("rollback")
+        holder.close()
+    assert replay.snapshot()["duplicates"] == 1
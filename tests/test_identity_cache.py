@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+
+from app.observability.readiness import readiness_snapshot
+from app.services.crown_session import CrownSessionService
+from app.services.entitlements.service import PremiumEntitlementService
+from app.services.identity import CrownIdentityCore
+from app.services.identity.cache import IdentityCache
+from app.services.profiles.service import ProfileService
+from app.services.storage.factory import PersistentResilientStore
+from app.services.storage.memory import InMemoryStore
+from app.services.storage.turn_snapshot import player_turn
+
+OWNER = "11111111-1111-1111-1111-111111111111"
+
+
+class CountingPrimary(InMemoryStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.resolutions = 0
+        self.linked: set[int] = {42}
+        self.fail = False
+
+    def resolve_telegram_identity(self, telegram_user_id: int):
+        self.resolutions += 1
+        if self.fail:
+            raise RuntimeError("resolver down")
+        if int(telegram_user_id) not in self.linked:
+            return {}
+        return {"black_crown_user_id": OWNER, "identity_status": "active", "account_status": "active"}
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Status:
+    linked = True
+    premium = False
+    entitlements = ()
+    site_user_id = None
+    linked_at = None
+
+
+class Entitlements:
+    async def get_status(self, telegram_user_id):
+        return Status()
+
+
+def _store(**cache) -> tuple[PersistentResilientStore, CountingPrimary]:
+    primary = CountingPrimary()
+    store = PersistentResilientStore(primary=primary, fallback=InMemoryStore(), identity_cache=IdentityCache(**cache))
+    store.set_profile(42, {"game": "Warzone"})
+    return store, primary
+
+
+def test_chat_turns_resolve_identity_once():
+    store, primary = _store()
+    profiles = ProfileService(store)
+    crown = CrownSessionService(store=store, profiles=profiles, entitlements=Entitlements())
+
+    for _ in range(20):
+        with player_turn(42):
+            assert profiles.get(42)["black_crown_user_id"] == OWNER
+            assert CrownIdentityCore(store).resolve_telegram(42) is not None
+        session = asyncio.run(crown.snapshot(chat_id=42, telegram_user_id=42))
+        assert session["identity"]["canonical"] is True
+
+    assert primary.resolutions == 1
+    status = readiness_snapshot(SimpleNamespace(), store)["storage"]["identity_cache"]
+    assert status["entries"] == 1 and status["misses"] == 1 and status["hits"] >= 59
+
+
+def test_unresolved_users_use_the_short_ttl():
+    clock = Clock()
+    store, primary = _store(ttl_s=600, negative_ttl_s=30, clock=clock)
+
+    assert store.resolve_telegram_identity(7) == {}
+    assert store.resolve_telegram_identity(7) == {}
+    store.resolve_telegram_identity(42)
+    assert primary.resolutions == 2
+
+    clock.now += 31
+    primary.linked.add(7)
+    assert store.resolve_telegram_identity(7)["black_crown_user_id"] == OWNER
+    store.resolve_telegram_identity(42)
+    assert primary.resolutions == 3
+    assert store.identity_cache_status()["negative_hits"] == 1
+
+
+def test_link_unlink_and_purge_invalidate():
+    store, primary = _store()
+    store.resolve_telegram_identity(42)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path.endswith("/rpc/blackcrown_unlink_telegram")
+        return httpx.Response(200, json={"ok": True, "unlinked": True})
+
+    async def unlink() -> None:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        service = PremiumEntitlementService(
+            SimpleNamespace(
+                supabase_url="https://wqriwhciqvrbhkkiuhxb.supabase.co",
+                supabase_service_role_key="sb_secret_test_server_key",
+                blackcrown_account_url="https://blackcrown.work/account/telegram",
+            ),
+            client=client,
+            on_link_change=store.invalidate_telegram_identity,
+        )
+        try:
+            assert await service.unlink(42) is True
+        finally:
+            await client.aclose()
+
+    primary.linked.discard(42)
+    asyncio.run(unlink())
+    assert store.resolve_telegram_identity(42) == {}
+    assert primary.resolutions == 2
+
+    primary.linked.add(42)
+    store.purge_player(42)
+    assert store.resolve_telegram_identity(42)["black_crown_user_id"] == OWNER
+    assert primary.resolutions == 3
+
+
+def test_degraded_and_raced_resolutions_are_not_cached():
+    store, primary = _store()
+    primary.fail = True
+    assert store.resolve_telegram_identity(42) == {}
+    primary.fail = False
+    assert store.resolve_telegram_identity(42)["black_crown_user_id"] == OWNER
+    assert primary.resolutions == 2
+
+    cache = IdentityCache()
+    generation = cache.generation
+    cache.invalidate(9)  # a link change lands while the resolver is in flight
+    cache.put(9, {"black_crown_user_id": OWNER}, generation=generation)
+    assert cache.get(9) is None
+
+
+def test_cache_is_bounded():
+    cache = IdentityCache(max_entries=3)
+    for user_id in range(10):
+        cache.put(user_id, {"black_crown_user_id": str(user_id)})
+    status = cache.status()
+    assert status["entries"] == 3 and status["evictions"] == 7
+    assert cache.get(0) is None and cache.get(9) == {"black_crown_user_id": "9"}
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.observability.metrics import (
+    MAX_SERIES_PER_METRIC,
+    HistogramSpec,
+    LatencyMetrics,
+    latency_metrics,
+)
+from app.observability.readiness import readiness_snapshot
+from app.services.storage.supabase import SupabaseStore
+from app.webhook import create_app
+
+
+def _counts(name: str) -> dict[tuple, int]:
+    return {tuple(sorted(row["labels"].items())): row["count"] for row in latency_metrics.snapshot()[name]}
+
+
+def test_histogram_buckets_and_quantiles():
+    metrics = LatencyMetrics((HistogramSpec("t_seconds", "test", {"outcome": frozenset({"ok"})}, (0.1, 0.2, 0.4)),))
+    for value in (0.05, 0.15, 0.15, 0.3, 9.0):
+        metrics.observe("t_seconds", value, outcome="ok")
+
+    row = metrics.snapshot()["t_seconds"][0]
+    assert row["labels"] == {"outcome": "ok"} and row["count"] == 5
+    assert 100.0 <= row["p50_ms"] <= 200.0
+    assert row["p99_ms"] == 400.0
+
+    text = metrics.render_prometheus()
+    assert "# TYPE t_seconds histogram" in text
+    assert 't_seconds_bucket{outcome="ok",le="0.1"} 1' in text
+    assert 't_seconds_bucket{outcome="ok",le="0.2"} 3' in text
+    assert 't_seconds_bucket{outcome="ok",le="0.4"} 4' in text
+    assert 't_seconds_bucket{outcome="ok",le="+Inf"} 5' in text
+    assert 't_seconds_count{outcome="ok"} 5' in text
+
+
+def test_label_cardinality_is_bounded():
+    values = frozenset(str(index) for index in range(200))
+    metrics = LatencyMetrics((HistogramSpec("c_seconds", "test", {"key": values}),))
+    metrics.observe("c_seconds", 0.01, key="chat:123456")
+    assert metrics.snapshot()["c_seconds"][0]["labels"] == {"key": "other"}
+
+    for value in sorted(values):
+        metrics.observe("c_seconds", 0.01, key=value)
+    rows = metrics.snapshot()["c_seconds"]
+    assert len(rows) == MAX_SERIES_PER_METRIC
+    assert sum(row["count"] for row in rows) == 201
+    # Unknown metric names are ignored rather than creating new series.
+    metrics.observe("nope_seconds", 1.0)
+    assert "nope_seconds" not in metrics.snapshot()
+
+
+def test_timer_marks_errors():
+    metrics = LatencyMetrics()
+    with pytest.raises(RuntimeError):
+        with metrics.time("bco_vod_analyze_seconds"):
+            raise RuntimeError("boom")
+    with metrics.time("bco_vod_analyze_seconds"):
+        pass
+    outcomes = {row["labels"]["outcome"]: row["count"] for row in metrics.snapshot()["bco_vod_analyze_seconds"]}
+    assert outcomes == {"error": 1, "ok": 1}
+
+
+def test_store_requests_are_timed_by_method_target_and_status():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/rpc/bco_resolve_identity"):
+            return httpx.Response(500, json={"message": "down"})
+        return httpx.Response(200, json=[])
+
+    store = SupabaseStore(url="https://example.supabase.co", service_role_key="server-secret")
+    store._client.close()
+    store._client = httpx.Client(transport=httpx.MockTransport(handler))
+    before = _counts("bco_store_request_seconds")
+
+    store.get(42)
+    with pytest.raises(httpx.HTTPStatusError):
+        store._request("POST", "/rpc/bco_resolve_identity", json={})
+
+    after = _counts("bco_store_request_seconds")
+    ok = (("method", "GET"), ("outcome", "ok"), ("target", "table"))
+    failed = (("method", "POST"), ("outcome", "http_5xx"), ("target", "rpc"))
+    assert after[ok] - before.get(ok, 0) >= 1
+    assert after[failed] - before.get(failed, 0) == 1
+    assert "latency" in readiness_snapshot(SimpleNamespace(), None)
+
+
+def test_metrics_endpoint_requires_token(monkeypatch):
+    client = TestClient(create_app())
+    monkeypatch.setattr(get_settings(), "metrics_token", "")
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(get_settings(), "metrics_token", "scrape-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    client.post("/tg/webhook", json={"update_id": 991_990_001})
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert '# TYPE bco_webhook_seconds histogram' in response.text
+    assert 'bco_webhook_seconds_count{stage="ack"}' in response.text
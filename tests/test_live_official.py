@@ -1,3 +1,5 @@
+import time
+
 from app.services.brain.intents import Intent, IntentResult
 from app.services.brain.knowledge_context import KnowledgeConfidence, KnowledgeRequest
 from app.services.brain.live_official import OfficialPatchKnowledgeProvider
@@ -104,3 +106,142 @@ def test_redirect_outside_allowlist_fails_closed():
     ctx = provider.query(_request("Warzone"))
     assert ctx.confidence == KnowledgeConfidence.UNKNOWN
     assert ctx.facts == []
+
+
+class _PatchServer:
+    """Local HTTP server with ETags that counts full and 304 responses."""
+
+    def __init__(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.lock = threading.Lock()
+        self.full: list[str] = []
+        self.not_modified: list[str] = []
+        server = self
+        pages = {
+            "/patchnotes": INDEX_HTML,
+            "/patchnotes/2026/07/call-of-duty-bo7-warzone-season-05-patch-notes": WZ_HTML,
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = pages.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = f'"{abs(hash(body))}"'
+                if self.headers.get("If-None-Match") == etag:
+                    with server.lock:
+                        server.not_modified.append(self.path)
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                time.sleep(0.05)
+                with server.lock:
+                    server.full.append(self.path)
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _local_provider(monkeypatch, server):
+    import app.services.brain.live_official as live_official
+
+    monkeypatch.setattr(live_official, "_is_allowed_url", lambda url: url.startswith(server.base))
+    provider = OfficialPatchKnowledgeProvider(ttl_s=900)
+    monkeypatch.setattr(provider, "_index_url", lambda game: f"{server.base}/patchnotes")
+    return provider
+
+
+def test_concurrent_queries_share_one_fetch_against_local_server(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    server = _PatchServer()
+    try:
+        provider = _local_provider(monkeypatch, server)
+        with ThreadPoolExecutor(max_workers=12) as pool:
+            contexts = list(pool.map(lambda _: provider.query(_request("Warzone")), range(12)))
+    finally:
+        server.close()
+
+    assert all(ctx.confidence == KnowledgeConfidence.VERIFIED_CURRENT for ctx in contexts)
+    assert {ctx.last_updated for ctx in contexts} == {"2026-07-22"}
+    assert sorted(server.full) == [
+        "/patchnotes",
+        "/patchnotes/2026/07/call-of-duty-bo7-warzone-season-05-patch-notes",
+    ]
+
+
+def test_stale_entry_is_served_while_304_revalidation_skips_parsing(monkeypatch):
+    import app.services.brain.live_official as live_official
+
+    server = _PatchServer()
+    try:
+        provider = _local_provider(monkeypatch, server)
+        first = provider.query(_request("Warzone"))
+        parses = []
+        original = live_official._VisibleTextParser
+
+        class CountingParser(original):
+            def feed(self, data):
+                parses.append(len(data))
+                super().feed(data)
+
+        monkeypatch.setattr(live_official, "_VisibleTextParser", CountingParser)
+        entry = provider._cache["warzone"]
+        entry.expires_at = time.monotonic() - 1
+        stale = provider.query(_request("Warzone"))
+        assert stale.facts == first.facts
+        deadline = time.monotonic() + 5
+        while provider._cache["warzone"] is entry and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        server.close()
+
+    refreshed = provider._cache["warzone"]
+    assert refreshed is not entry and refreshed.expires_at > time.monotonic()
+    assert refreshed.document.blocks is entry.document.blocks
+    assert len(server.full) == 2 and len(server.not_modified) == 2
+    assert parses == []
+
+
+def test_failed_refresh_reaches_every_waiter_once():
+    import threading
+
+    calls = []
+    gate = threading.Event()
+
+    def failing_fetch(url):
+        calls.append(url)
+        gate.wait(1.0)
+        raise OSError("down")
+
+    provider = OfficialPatchKnowledgeProvider(fetcher=failing_fetch)
+    threads = [threading.Thread(target=lambda: results.append(provider.query(_request("Warzone")))) for _ in range(6)]
+    results: list = []
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    gate.set()
+    for thread in threads:
+        thread.join()
+    assert calls == [COD_INDEX]
+    assert len(results) == 6 and all(ctx.confidence == KnowledgeConfidence.UNKNOWN for ctx in results)
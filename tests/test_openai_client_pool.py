@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import wave
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import app.services.voice.openai_backend as openai_backend
+from app.observability.readiness import readiness_snapshot
+from app.services.ai.client_pool import OpenAIClientPool, OpenAIPoolSaturated
+from app.services.brain import ai_hook
+from app.services.brain.ai_hook import AIHook
+from app.services.voice.openai_backend import OpenAITTSBackend
+
+
+def _wav_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(22050)
+        wav.writeframes(b"\x00\x00" * 400)
+    return buffer.getvalue()
+
+
+def test_chat_leases_reuse_one_keep_alive_client_across_replies(monkeypatch):
+    pool = OpenAIClientPool()
+    monkeypatch.setattr(ai_hook, "openai_pool", pool)
+    try:
+        first = AIHook(api_key="sk-test")._client()
+        second = AIHook(api_key="sk-test")._client()
+        assert first._client is second._client
+        assert pool.stats()["purposes"]["chat"]["in_flight"] == 2
+        first.close()
+        first.close()
+        second.close()
+        stats = pool.stats()
+        assert stats["pools_opened"] == 1
+        assert stats["purposes"]["chat"] == {"cap": 16, "in_flight": 0, "max_in_flight": 2, "acquired": 2, "rejected": 0}
+    finally:
+        pool.close()
+    assert pool.stats()["http_pools"] == 0
+
+
+def test_saturated_chat_cap_fails_fast_with_unavailable_reply(monkeypatch):
+    pool = OpenAIClientPool(acquire_timeout_s=0.1, concurrency={"chat": 1})
+    monkeypatch.setattr(ai_hook, "openai_pool", pool)
+    held = pool.lease("chat", "sk-test")
+    try:
+        with pytest.raises(OpenAIPoolSaturated):
+            pool.lease("chat", "sk-test")
+        hook = AIHook(api_key="sk-test")
+        reply = hook.generate(profile={"game": "Warzone"}, history=[], user_text="где встать?")
+        assert "временно недоступен" in reply
+        assert hook.last_generation_meta["error_class"] == "OpenAIPoolSaturated"
+        assert pool.stats()["purposes"]["chat"]["rejected"] == 2
+    finally:
+        held.close()
+        pool.close()
+
+
+def test_tts_requests_share_the_async_pool_under_their_cap(monkeypatch, tmp_path: Path):
+    pool = OpenAIClientPool(concurrency={"tts": 2})
+    monkeypatch.setattr(openai_backend, "openai_pool", pool)
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.02)
+        state["in_flight"] -= 1
+        return httpx.Response(200, content=_wav_bytes(), request=request)
+
+    async def scenario() -> None:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        backend = OpenAITTSBackend(api_key="sk-test", client=client)
+        try:
+            await asyncio.gather(*[
+                backend.synthesize_wav("держи высоту", tmp_path / f"{index}.wav", {}) for index in range(6)
+            ])
+        finally:
+            await client.aclose()
+
+    asyncio.run(scenario())
+    assert state["max_in_flight"] == 2
+    assert pool.stats()["purposes"]["tts"]["acquired"] == 6
+
+
+def test_pooled_async_client_is_closed_by_lifespan_shutdown():
+    pool = OpenAIClientPool()
+
+    async def scenario() -> httpx.AsyncClient:
+        client = pool.async_http()
+        assert pool.async_http() is client
+        await pool.aclose()
+        return client
+
+    client = asyncio.run(scenario())
+    assert client.is_closed
+    assert pool.stats()["http_pools"] == 0
+
+
+def test_readiness_exposes_pool_stats_without_secrets():
+    snapshot = readiness_snapshot(SimpleNamespace(openai_api_key="sk-secret-value"), None)
+    ai_clients = snapshot["ai_clients"]
+    assert set(ai_clients["purposes"]) == {"chat", "vision", "tts"}
+    assert "sk-secret-value" not in repr(ai_clients)
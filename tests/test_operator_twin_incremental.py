@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.observability.readiness import readiness_snapshot
+from app.services.operator_intelligence import OperatorIntelligenceService
+from app.services.operator_intelligence import service as core
+from app.services.operator_intelligence.service import DOMAINS
+from app.services.profiles.service import ProfileService
+from app.services.storage.bundle import load_player_bundle
+from app.services.storage.factory import PersistentResilientStore
+from app.services.storage.memory import InMemoryStore
+from app.services.storage.player_changes import PlayerChangeJournal
+from app.services.storage.supabase import SupabaseStore
+
+CHAT = 42
+LABELS = (
+    "late rotate into gas", "repeat peek after first damage", "panic reload in open field",
+    "tilt after bad death", "overpush without cover", "bad callout timing", "flick overshoot",
+    "slide into third party", "inconsistent accuracy swing", "random note",
+)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class ColumnStampedStore(InMemoryStore):
+    """Keeps rows the way Supabase does: the event in `data`, next to its own insert-time `created_at`."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.inserts = 0
+
+    def _column_stamp(self) -> str:
+        self.inserts += 1
+        return (datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=self.inserts)).isoformat()
+
+    def add_episode(self, chat_id, event):
+        payload = dict(event or {})
+        super().add_episode(chat_id, {"kind": payload.pop("kind", "event"), "data": payload, "created_at": self._column_stamp()})
+
+    def list_episodes(self, chat_id, limit=20):
+        return [SupabaseStore._event_row(row, kind=row.get("kind")) for row in super().list_episodes(chat_id, limit)]
+
+    def add_progression_event(self, chat_id, event):
+        super().add_progression_event(chat_id, {"data": dict(event or {}), "created_at": self._column_stamp()})
+
+    def list_progression_events(self, chat_id):
+        return [SupabaseStore._event_row(row) for row in super().list_progression_events(chat_id)]
+
+    def reset_profile(self, chat_id):
+        # Deletes the bco_players row, which also holds the summary and derived intelligence.
+        super().reset_profile(chat_id)
+        self._summaries.pop(int(chat_id), None)
+        self._derived.pop(int(chat_id), None)
+
+
+def _service(store) -> OperatorIntelligenceService:
+    return OperatorIntelligenceService(store=store, profiles=ProfileService(store=store), orchestrator_enabled=True)
+
+
+def _stamp(rng: random.Random, clock: Clock) -> str:
+    return (clock.now - timedelta(days=rng.randint(0, 80), hours=rng.randint(0, 23))).isoformat()
+
+
+def _random_write(rng: random.Random, store, clock: Clock) -> None:
+    roll = rng.random()
+    if roll < 0.35:
+        event = {
+            "type": rng.choice(("operator_mission", "operator_mission", "premium_strategy")),
+            "status": rng.choice(("completed", "accepted", "completed")),
+            "mission_id": f"m{rng.randint(0, 9)}",
+            "focus": rng.choice(DOMAINS + ("calibration",)),
+            "outcome": rng.choice(("clean", "mixed", "failed", "reported")),
+            "at": _stamp(rng, clock),
+        }
+        if rng.random() < 0.6:
+            event["metrics"] = {"accuracy_pct": rng.randint(20, 80)}
+        if rng.random() < 0.3:
+            event.pop("at")  # ordered by the store's created_at instead
+        store.add_progression_event(CHAT, event)
+    elif roll < 0.55:
+        episode = {
+            "kind": rng.choice(("vod_sampled_frames", "vod_sampled_frames", "chat_turn")),
+            "confirmed_mistakes": rng.sample(LABELS, rng.randint(0, 3)),
+            "at": _stamp(rng, clock),
+        }
+        if rng.random() < 0.3:
+            episode.pop("at")
+        store.add_episode(CHAT, episode)
+    elif roll < 0.7:
+        store.add_recurring_mistake(CHAT, rng.choice(LABELS))
+    elif roll < 0.8:
+        store.set_profile(CHAT, {field: rng.randint(30, 90) for field in rng.sample(sorted(core._PROFILE_SCORE_FIELDS.values()), 2)})
+    elif roll < 0.88:
+        store.set_derived_intelligence(CHAT, {"trends": {"accuracy_pct": {"delta": rng.uniform(-6, 6)}}})
+    elif roll < 0.96:
+        clock.now += timedelta(hours=rng.randint(1, 72))
+    elif roll < 0.98:
+        store.reset_profile(CHAT)
+    else:
+        store.purge_player(CHAT)
+
+
+def _full_recompute_dimensions(service, store) -> dict:
+    bundle = load_player_bundle(store, CHAT, progression_limit=60, episodes_limit=40)
+    profile = service.base._profile(CHAT, bundle["profile"])
+    evidence = service.base._collect_evidence(profile, bundle["mistakes"][:20], bundle["progression"][:60], bundle["episodes"][:40], bundle["derived"])
+    dimensions = {domain: service.base._dimension(domain, evidence[domain]) for domain in DOMAINS}
+    for dim in dimensions.values():
+        dim.pop("_priority", None)
+    return dimensions
+
+
+@pytest.mark.parametrize("primary_store", [InMemoryStore, ColumnStampedStore])
+def test_incremental_twin_matches_full_recompute_over_random_event_streams(monkeypatch, primary_store):
+    clock = Clock()
+    monkeypatch.setattr(core, "_now", clock)
+    served = reused = 0
+    for seed in range(25):
+        rng = random.Random(seed)
+        store = PersistentResilientStore(
+            primary=primary_store(),
+            fallback=InMemoryStore(),
+            change_journal=PlayerChangeJournal(ttl_s=3600, max_changes=16),
+        )
+        incremental, reference = _service(store), _service(store.primary)
+        for _step in range(80):
+            _random_write(rng, store, clock)
+            if rng.random() < 0.5:
+                continue
+            snapshot = incremental.snapshot(CHAT)
+            assert snapshot == reference.snapshot(CHAT)
+            assert snapshot["operator"]["dimensions"] == _full_recompute_dimensions(reference, store.primary)
+            mission = dict(snapshot.get("mission") or {})
+            if rng.random() < 0.3 and mission.get("status") == "candidate":
+                incremental.accept(CHAT, mission["id"])
+            elif rng.random() < 0.3 and mission.get("status") == "active":
+                incremental.complete(CHAT, mission["id"], outcome=rng.choice(("clean", "failed")), metrics={"accuracy_pct": rng.randint(20, 80)})
+            assert incremental.snapshot(CHAT) == reference.snapshot(CHAT)
+        views = store.player_views_status()["views"]
+        twin = next(view for name, view in views.items() if name.startswith("operator_twin:"))
+        served += twin["hits"] + twin["incremental"]
+        reused += twin["dimensions_reused"]
+    assert served > 0 and reused > 0
+
+
+def test_change_journal_only_vouches_for_complete_histories():
+    journal = PlayerChangeJournal(max_players=2, max_changes=2)
+    head = journal.head()
+    with journal.write(1, "progression", {"n": 1}):
+        assert journal.changes(1, head) is None  # write in flight
+    assert [kind for _seq, kind, _payload in journal.changes(1, head)] == ["progression"]
+
+    with journal.write(1, "episode", {"n": 2}):
+        pass
+    with journal.write(1, "mistakes"):
+        pass
+    assert journal.changes(1, head) is None  # oldest change fell out of the log
+    assert [kind for _seq, kind, _payload in journal.changes(1, head + 1)] == ["episode", "mistakes"]
+
+    try:
+        with journal.write(2, "progression", {"n": 3}):
+            raise RuntimeError("store down")
+    except RuntimeError:
+        pass
+    assert [kind for _seq, kind, _payload in journal.changes(2, head)] == ["reset"]
+
+    late = journal.head()
+    with journal.write(3, "profile"):
+        pass  # evicts player 1
+    assert journal.changes(1, head + 1) is None
+    assert journal.changes(4, late) == []
+    assert journal.view("twin", lambda owner: owner) is journal.view("twin", dict)
+
+
+def test_accept_and_complete_reuse_the_twin_instead_of_bundle_reads():
+    def measure(store, primary) -> float:
+        service = _service(store)
+        for i in range(30):
+            store.add_progression_event(CHAT, {"type": "operator_mission", "status": "completed", "mission_id": f"m{i}", "focus": "aim", "outcome": "failed", "metrics": {"accuracy_pct": 30 + i % 9}})
+            store.add_recurring_mistake(CHAT, LABELS[i % len(LABELS)])
+        service.snapshot(CHAT)
+        primary.bundle_reads = 0
+        for _ in range(20):
+            mission = service.snapshot(CHAT)["mission"]
+            accepted = service.accept(CHAT, mission["id"])
+            service.complete(CHAT, accepted["mission"]["id"], outcome="clean", metrics={"accuracy_pct": 61})
+        return primary.bundle_reads / 20
+
+    class CountingStore(InMemoryStore):
+        bundle_reads = 0
+
+        def get_player_bundle(self, chat_id, **kwargs):
+            self.bundle_reads += 1
+            return super().get_player_bundle(chat_id, **kwargs)
+
+    plain = CountingStore()
+    before_reads = measure(plain, plain)
+    primary = CountingStore()
+    store = PersistentResilientStore(primary=primary, fallback=InMemoryStore())
+    after_reads = measure(store, primary)
+
+    assert before_reads == 6 and after_reads == 1
+    status = readiness_snapshot(SimpleNamespace(), store)["storage"]["player_views"]
+    assert status["enabled"] is True and status["players"] == 1
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import threading
 
 import httpx
 
@@ -182,3 +183,30 @@ def test_supabase_episode_rows_are_normalized_for_command_center():
     assert rows[0]["kind"] == "vod_sampled_frames"
     assert rows[0]["analysis"]["summary"] == "evidence"
     assert rows[0]["confirmed_mistakes"] == ["overpeek"]
+
+
+def test_read_in_flight_does_not_hide_a_write_queued_meanwhile():
+    class SlowReadPrimary(FakeIdempotentPrimary):
+        def __init__(self):
+            super().__init__()
+            self.entered = threading.Event()
+            self.release = threading.Event()
+
+        def get(self, chat_id):
+            rows = super().get(chat_id)
+            self.entered.set()
+            self.release.wait(5)
+            return rows
+
+    primary = SlowReadPrimary()
+    store = ResilientStore(primary, InMemoryStore())
+    store.add(7, "user", "before")
+    result = []
+    reader = threading.Thread(target=lambda: result.append(store.get(7)))
+    reader.start()
+    assert primary.entered.wait(5)
+    primary.down = True
+    store.add(7, "user", "during")  # queued while the primary read is in flight
+    primary.release.set()
+    reader.join(5)
+    assert [row["content"] for row in result[0]] == ["before", "during"]
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import httpx
+
+from app.services.player_memory.service import PlayerMemoryService
+from app.services.storage.bundle import load_player_bundle
+from app.services.storage.engine import AsyncSupabaseEngine
+from app.services.storage.factory import PersistentSupabaseStore
+from app.services.storage.memory import InMemoryStore
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+class CountingPostgREST:
+    """Local PostgREST stand-in that records every round trip."""
+
+    def __init__(self, *, bundle_rpc: bool = True):
+        self.bundle_rpc = bundle_rpc
+        self.paths: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.rsplit("/rest/v1/", 1)[-1]
+        self.paths.append(path)
+        if path == "rpc/bco_player_bundle":
+            if not self.bundle_rpc:
+                return httpx.Response(404, json={"code": "PGRST202"}, request=request)
+            body = json.loads(request.content.decode("utf-8"))
+            assert body["p_chat_id"] == 77
+            return httpx.Response(200, json={
+                "schema": "bco-player-bundle-v1",
+                "profile": {"game": "Warzone", "rank": "Diamond"},
+                "summary": "rotates late",
+                "derived": {"playstyle": "anchor"},
+                "mistakes": [{"mistake_key": "k", "label": "late rotation", "count": 3}],
+                "progression": [{"data": {"kills": 4}, "created_at": "2026-01-02"}],
+                "episodes": [{"kind": "vod", "data": {"verdict": "ok"}, "created_at": "2026-01-01"}],
+            }, request=request)
+        if path == "bco_players":
+            select = request.url.params.get("select")
+            row = {"profile": {"game": "Warzone"}, "summary": "rotates late", "derived": {"playstyle": "anchor"}}
+            return httpx.Response(200, json=[{select: row[select]}], request=request)
+        if path == "bco_player_mistakes":
+            return httpx.Response(200, json=[{"mistake_key": "k", "label": "late rotation", "count": 3}], request=request)
+        if path in {"bco_progression_events", "bco_training_sessions"}:
+            return httpx.Response(200, json=[{"data": {"kills": 4}, "created_at": "2026-01-02"}], request=request)
+        if path == "bco_episodes":
+            return httpx.Response(200, json=[{"kind": "vod", "data": {"verdict": "ok"}, "created_at": "2026-01-01"}], request=request)
+        return httpx.Response(200, json=[], request=request)
+
+
+def _store(stand_in: CountingPostgREST) -> PersistentSupabaseStore:
+    store = PersistentSupabaseStore(url="https://example.supabase.co", service_role_key="server-secret")
+    store._client.close()
+    store._client = AsyncSupabaseEngine(transport=httpx.MockTransport(stand_in))
+    return store
+
+
+def test_player_bundle_is_one_round_trip_with_list_shapes():
+    stand_in = CountingPostgREST()
+    store = _store(stand_in)
+    try:
+        bundle = load_player_bundle(store, 77, progression_limit=60, episodes_limit=40)
+    finally:
+        store.close()
+    assert stand_in.paths == ["rpc/bco_player_bundle"]
+    assert bundle["profile"]["rank"] == "Diamond"
+    assert bundle["summary"] == "rotates late"
+    assert bundle["mistakes"][0]["label"] == "late rotation"
+    assert bundle["progression"] == [{"kills": 4, "created_at": "2026-01-02"}]
+    assert bundle["episodes"] == [{"verdict": "ok", "kind": "vod", "created_at": "2026-01-01"}]
+
+
+def test_missing_bundle_rpc_falls_back_to_per_surface_reads_once():
+    stand_in = CountingPostgREST(bundle_rpc=False)
+    store = _store(stand_in)
+    try:
+        first = load_player_bundle(store, 77)
+        stand_in.paths.clear()
+        second = load_player_bundle(store, 77)
+    finally:
+        store.close()
+    assert first == second
+    assert first["derived"] == {"playstyle": "anchor"}
+    assert "rpc/bco_player_bundle" not in stand_in.paths
+    assert len(stand_in.paths) == 6
+
+
+def test_player_memory_context_reads_collapse_to_bundle_and_training():
+    stand_in = CountingPostgREST()
+    store = _store(stand_in)
+    try:
+        context = PlayerMemoryService(store, profiles=None).context(77, {"game": "Warzone"})
+    finally:
+        store.close()
+    assert sorted(stand_in.paths) == ["bco_training_sessions", "rpc/bco_player_bundle"]
+    assert context["top_mistakes"] == [{"label": "late rotation", "count": 3}]
+    assert context["memory_summary"] == "rotates late"
+    assert context["recent_progression"] == [{"kills": 4, "created_at": "2026-01-02"}]
+
+
+def test_in_memory_bundle_matches_per_surface_reads():
+    store = InMemoryStore()
+    store.set_profile(5, {"game": "Warzone"})
+    store.set_summary(5, "holds power")
+    store.add_recurring_mistake(5, "late rotation")
+    for kills in range(4):
+        store.add_progression_event(5, {"kills": kills})
+    store.add_episode(5, {"kind": "vod", "verdict": "ok"})
+    bundle = load_player_bundle(store, 5, progression_limit=3)
+    assert bundle["profile"] == store.get_profile(5)
+    assert bundle["summary"] == "holds power"
+    assert bundle["mistakes"] == store.list_mistake_stats(5)
+    assert bundle["progression"] == store.list_progression_events(5)[:3]
+    assert bundle["episodes"] == store.list_episodes(5, 40)
+
+
+def test_bundle_migration_is_server_only_and_read_only():
+    sql = (ROOT / "migrations" / "012_player_bundle.sql").read_text(encoding="utf-8")
+    assert "security definer" in sql
+    assert "set search_path = public, pg_temp" in sql
+    assert "from public, anon, authenticated" in sql
+    assert "to service_role" in sql
+    assert "insert into" not in sql.lower() and "update public" not in sql.lower()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.observability.readiness import readiness_snapshot
+from app.services.operator_intelligence.orchestrated_service import OrchestratedOperatorIntelligenceService
+from app.services.profiles.service import ProfileService
+from app.services.storage.factory import PersistentResilientStore
+from app.services.storage.memory import InMemoryStore
+from app.services.storage.progression import (
+    ProgressionProjection,
+    ProgressionProjectionCache,
+    progression_projection,
+)
+
+
+class CountingStore(InMemoryStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.list_reads = 0
+
+    def list_progression_events(self, chat_id: int):
+        self.list_reads += 1
+        return super().list_progression_events(chat_id)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _seed(store, chat_id: int, missions: int = 40) -> None:
+    for i in range(missions):
+        store.add_progression_event(
+            chat_id,
+            {
+                "type": "operator_mission",
+                "status": "completed",
+                "mission_id": f"m{i}",
+                "focus": "aim",
+                "outcome": ("clean", "mixed", "failed")[i % 3],
+                "metrics": {"accuracy_pct": 30 + i % 10},
+            },
+        )
+        store.add_progression_event(
+            chat_id,
+            {
+                "type": "operator_mission_evidence",
+                "status": "observed",
+                "mission_id": f"m{i}",
+                "classification": "mission_relevant_evidence",
+                "confidence": "medium",
+            },
+        )
+
+
+def test_projection_views_follow_the_store_window():
+    rows = [{"type": "premium_strategy", "n": 0}, {"type": "operator_mission", "status": "active", "n": 1}]
+    projection = ProgressionProjection(rows, window=3)
+    assert [row["n"] for row in projection.recent()] == [0, 1]
+    assert projection.outcomes == []
+
+    projection.record({"type": "operator_mission", "status": "completed", "outcome": "clean", "n": 2})
+    projection.record({"type": "operator_mission_evidence", "n": 3})
+    assert [row["n"] for row in projection.recent()] == [3, 2, 0]
+    assert [row["n"] for row in projection.missions] == [2]
+    assert [row["n"] for row in projection.select("outcomes", "missions", "strategies")] == [2, 0]
+    assert all("created_at" in row for row in projection.recent(2))
+
+    projection.missions[0]["n"] = 99
+    assert projection.outcomes[0]["n"] == 2
+
+
+def test_resilient_store_keeps_projection_current_and_drops_it_on_purge():
+    clock = Clock()
+    primary = CountingStore()
+    store = PersistentResilientStore(
+        primary=primary,
+        fallback=InMemoryStore(),
+        progression_cache=ProgressionProjectionCache(ttl_s=15, clock=clock),
+    )
+    _seed(store, 42, missions=2)
+
+    first = progression_projection(store, 42)
+    assert primary.list_reads == 1 and len(first.missions) == 2
+
+    store.add_progression_event(42, {"type": "crown_session_cycle", "status": "closed"})
+    second = progression_projection(store, 42)
+    assert second is first and primary.list_reads == 1
+    assert [row["status"] for row in second.sessions] == ["closed"]
+    assert second.recent(1)[0]["type"] == "crown_session_cycle"
+
+    clock.now += 16
+    progression_projection(store, 42)
+    assert primary.list_reads == 2
+
+    store.purge_player(42)
+    assert len(progression_projection(store, 42)) == 0
+    assert primary.list_reads == 3
+    status = store.progression_cache_status()
+    assert status["records"] == 1 and status["invalidations"] == 1 and status["hits"] == 1
+
+    readiness = readiness_snapshot(SimpleNamespace(), store)["storage"]["progression_projection"]
+    assert readiness["players"] == 1 and readiness["records"] == 1
+
+
+def _twin_snapshot_cost(store, counter: CountingStore, chat_id: int, rounds: int) -> tuple[float, float]:
+    """Progression reads and CPU milliseconds per Operator Twin snapshot."""
+
+    service = OrchestratedOperatorIntelligenceService(
+        store=store,
+        profiles=ProfileService(store=store),
+        orchestrator_enabled=True,
+    )
+    service.snapshot(chat_id)
+    counter.list_reads = 0
+    started = time.process_time()
+    for _ in range(rounds):
+        service.snapshot(chat_id)
+    cpu_ms = (time.process_time() - started) * 1000 / rounds
+    return counter.list_reads / rounds, cpu_ms
+
+
+def _plain_and_cached(chat_id: int) -> tuple[tuple[CountingStore, CountingStore], tuple[PersistentResilientStore, CountingStore]]:
+    raw = CountingStore()
+    _seed(raw, chat_id)
+    primary = CountingStore()
+    cached = PersistentResilientStore(primary=primary, fallback=InMemoryStore())
+    _seed(cached, chat_id)
+    return (raw, raw), (cached, primary)
+
+
+def test_operator_twin_snapshots_share_the_cached_projection():
+    chat_id = 7
+    plain, cached = _plain_and_cached(chat_id)
+    before_reads, _cpu = _twin_snapshot_cost(*plain, chat_id, rounds=100)
+    after_reads, _cpu = _twin_snapshot_cost(*cached, chat_id, rounds=100)
+
+    # Three services each read progression per snapshot; the cached projection serves all of them.
+    assert before_reads == 3 and after_reads == 0
+
+
+@pytest.mark.skipif(not os.getenv("BCO_BENCHMARKS"), reason="benchmark; set BCO_BENCHMARKS=1 to run")
+def test_benchmark_operator_twin_snapshot_reads_and_cpu():
+    chat_id = 7
+    plain, cached = _plain_and_cached(chat_id)
+    before_reads, before_ms = _twin_snapshot_cost(*plain, chat_id, rounds=100)
+    after_reads, after_ms = _twin_snapshot_cost(*cached, chat_id, rounds=100)
+
+    assert after_reads < before_reads
+    assert after_ms < before_ms, f"reads {before_reads:.1f} -> {after_reads:.1f}, cpu {before_ms:.2f}ms -> {after_ms:.2f}ms"
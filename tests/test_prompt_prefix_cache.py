@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+
+from app.services.brain.intents import Intent, IntentResult
+from app.services.brain.knowledge_context import KnowledgeContext
+from app.services.brain.prompt_builder import PromptBuilder
+from app.services.brain.prompt_replay import estimate_tokens, main, replay
+from app.services.brain.response_policy import get_response_policy
+
+
+def _sections(profile: dict, intent: Intent, emotion: str = "neutral") -> list[tuple[str, str]]:
+    result = IntentResult(intent, 0.9)
+    return PromptBuilder().build_sections(
+        profile=profile,
+        intent=result,
+        policy=get_response_policy(result, profile),
+        knowledge=KnowledgeContext.unknown(),
+        emotion_state=emotion,
+        emotion_intensity="low",
+    )
+
+
+def test_static_prefix_is_byte_identical_across_players_and_turns():
+    a = _sections({"game": "Warzone", "voice": "COACH", "difficulty": "Demon", "language": "en"}, Intent.AIM, "tilt")
+    b = _sections({"game": "BF6", "role": "Engineer", "language": "en", "kd": 1.4}, Intent.META_CURRENT)
+    ru = _sections({"game": "Warzone", "language": "ru"}, Intent.TRAINING)
+
+    assert [name for name, _ in a] == ["static", "player", "turn"]
+    assert a[0] == b[0]
+    assert "UTC date" not in a[0][1] and "Intent:" not in a[0][1] and "Warzone" not in a[0][1]
+    # Locales differ only in the closing language rule.
+    static_en, static_ru = a[0][1], ru[0][1]
+    assert static_en != static_ru
+    assert static_en.rsplit("\n", 1)[0] == static_ru.rsplit("\n", 1)[0]
+
+    system = PromptBuilder().build_system(
+        profile={"game": "Warzone", "language": "en"},
+        intent=IntentResult(Intent.AIM, 0.9),
+        policy=get_response_policy(IntentResult(Intent.AIM, 0.9), {}),
+        knowledge=KnowledgeContext.unknown(),
+        emotion_state="neutral",
+        emotion_intensity="low",
+    )
+    assert system.startswith(static_en + "\n\nDelivery:")
+
+
+def test_replay_reports_shared_prefix_and_section_sizes(tmp_path, capsys):
+    players = [
+        {"game": "Warzone", "platform": "Xbox", "input": "Controller", "difficulty": "Pro", "language": "ru"},
+        {"game": "BF6", "role": "Engineer", "voice": "COACH", "language": "ru"},
+        {"game": "Warzone", "input": "KBM", "difficulty": "Demon", "language": "ru"},
+    ]
+    texts = ["Как держать угол на крыше?", "Меня убили на ротации, что не так?", "Дай тренировку на аим", "Что по мете?"]
+    turns = [
+        {"chat_id": index, "profile": profile, "text": text, "reply": "Ок, разберём."}
+        for text in texts
+        for index, profile in enumerate(players)
+    ]
+
+    report = replay(turns, min_cached_tokens=256)
+    stats = report.as_dict()
+    assert stats["requests"] == 12
+    assert stats["avg_section_tokens"]["static"] > stats["avg_section_tokens"]["turn"] / 2
+    # Every request after the first reuses at least the whole static block.
+    assert report.shared_prefix_tokens >= 11 * estimate_tokens(_sections(players[0], Intent.AIM)[0][1]) - 11
+    assert 0.5 < report.shared_prefix_ratio <= 1.0
+    assert report.cacheable_ratio == report.shared_prefix_ratio
+
+    path = tmp_path / "turns.jsonl"
+    path.write_text("\n".join(json.dumps(turn, ensure_ascii=False) for turn in turns), encoding="utf-8")
+    capsys.readouterr()
+    assert main([str(path), "--min-cached-tokens", "256"]) == 0
+    printed = json.loads(capsys.readouterr().out)
+    assert printed["shared_prefix_ratio"] == stats["shared_prefix_ratio"]
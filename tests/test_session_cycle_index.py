@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.services.session_cycle import CrownSessionCycleService
+from app.services.storage.memory import InMemoryStore
+from app.services.storage.resilient import ResilientStore
+from app.services.storage.session_index import CrownSessionIndex, open_session_from_events
+from app.services.storage.supabase import SupabaseStore
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _cycle(status: str, session_id: str, mission_id: str, at: str) -> dict:
+    return {"type": "crown_session_cycle", "status": status, "crown_session_id": session_id, "mission_id": mission_id, "at": at}
+
+
+def test_index_matches_the_progression_scan():
+    events = [
+        _cycle("prepared", "s1", "m1", "2026-01-01T00:00:01"),
+        _cycle("prepared", "s2", "m2", "2026-01-01T00:00:02"),
+        {"type": "operator_mission_evidence", "crown_session_id": "s2", "mission_id": "m2", "at": "2026-01-01T00:00:03"},
+        _cycle("prepared", "s3", "m1", "2026-01-01T00:00:04"),
+        _cycle("closed", "s3", "m1", "2026-01-01T00:00:05"),
+        _cycle("closed", "s9", "m3", "2026-01-01T00:00:06"),
+        _cycle("prepared", "s9", "m3", "2026-01-01T00:00:07"),  # closed ids never reopen
+    ]
+    index = CrownSessionIndex()
+    for count, event in enumerate(events, 1):
+        index.record(event)
+        for mission in (None, "m1", "m2", "m3", "missing"):
+            expected = open_session_from_events(events[:count], mission)
+            found = index.open_session(mission)
+            assert (found or {}).get("crown_session_id") == (expected or {}).get("crown_session_id"), (count, mission)
+    assert [x["type"] for x in index.session_events("s2")] == ["operator_mission_evidence"]
+
+
+def test_open_session_survives_thousands_of_later_progression_rows():
+    store = InMemoryStore()
+    service = CrownSessionCycleService(store)
+    opened = service.start(7, {"id": "m1", "title": "HOLD"})
+    store.add_progression_event(7, {"type": "operator_mission_evidence", "crown_session_id": opened["crown_session_id"], "mission_id": "m1"})
+    for index in range(3000):
+        store.add_progression_event(7, {"type": "training", "n": index})
+
+    # The recent-events window no longer contains the prepare event...
+    assert open_session_from_events(store.list_progression_events(7), "m1") is None
+    # ...but the index still finds it, and start() does not open a duplicate.
+    assert service.current(7, "m1")["crown_session_id"] == opened["crown_session_id"]
+    assert service.start(7, {"id": "m1"})["crown_session_id"] == opened["crown_session_id"]
+    assert len(store.list_crown_session_events(7, opened["crown_session_id"])) == 1
+
+    service.close(7, opened["crown_session_id"], "m1", "clean")
+    assert service.current(7) is None
+    store.purge_player(7)
+    assert store.list_crown_session_events(7, opened["crown_session_id"]) == []
+
+
+def test_supabase_uses_session_rpc_and_falls_back_when_migration_is_missing():
+    state = {"rpc": True}
+    seen: list[str] = []
+    prepared = _cycle("prepared", "s1", "m1", "2026-01-01T00:00:01")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(f"{request.method} {request.url.path.rsplit('/', 1)[-1]}")
+        if request.url.path.endswith("/rpc/bco_open_crown_session"):
+            if not state["rpc"]:
+                return httpx.Response(404, json={"code": "PGRST202"})
+            assert json.loads(request.content) == {"p_chat_id": 9, "p_mission_id": "m1"}
+            return httpx.Response(200, json=prepared)
+        if "data->>crown_session_id" in request.url.params:
+            assert request.url.params["data->>crown_session_id"] == "eq.s1"
+        return httpx.Response(200, json=[{"data": prepared, "created_at": "2026-01-01T00:00:01+00:00"}])
+
+    primary = SupabaseStore(url="https://example.supabase.co", service_role_key="server-secret")
+    primary._client.close()
+    primary._client = httpx.Client(transport=httpx.MockTransport(handler))
+    store = ResilientStore(primary=primary, fallback=InMemoryStore())
+
+    assert CrownSessionCycleService(store).current(9, "m1")["crown_session_id"] == "s1"
+    assert store.list_crown_session_events(9, "s1")[0]["crown_session_id"] == "s1"
+    state["rpc"] = False
+    assert CrownSessionCycleService(store).current(9, "m1")["crown_session_id"] == "s1"
+    assert CrownSessionCycleService(store).current(9, "m1")["crown_session_id"] == "s1"
+    assert seen.count("POST bco_open_crown_session") == 2  # the 404 disables the RPC once
+    assert store.recovery_status()["primary_available"] is True
+
+
+def test_open_session_lookup_issues_no_scan_reads():
+    class CountingStore(InMemoryStore):
+        scans = 0
+
+        def list_progression_events(self, *args, **kwargs):
+            self.scans += 1
+            return super().list_progression_events(*args, **kwargs)
+
+    store = CountingStore()
+    rows: list[dict] = []
+    for number in range(5000):
+        if number % 50 == 0:
+            event = _cycle("prepared", f"s{number}", f"m{number % 7}", f"2026-01-01T{number:08d}")
+        elif number % 50 == 25:
+            event = _cycle("closed", f"s{number - 25}", f"m{(number - 25) % 7}", f"2026-01-01T{number:08d}")
+        else:
+            event = {"type": "training", "n": number}
+        rows.append(event)
+        store.add_progression_event(7, event)
+
+    service = CrownSessionCycleService(store)
+    for mission in ("m3", None, "missing"):
+        expected = open_session_from_events(list(reversed(rows)), mission)
+        assert service.current(7, mission) == expected
+    assert store.scans == 0
+
+
+@pytest.mark.skipif(not os.getenv("BCO_BENCHMARKS"), reason="benchmark; set BCO_BENCHMARKS=1 to run")
+def test_benchmark_open_session_lookup_with_thousands_of_rows():
+    rows: list[dict] = []
+    index = CrownSessionIndex()
+    for number in range(5000):
+        if number % 50 == 0:
+            event = _cycle("prepared", f"s{number}", f"m{number % 7}", f"2026-01-01T{number:08d}")
+        elif number % 50 == 25:
+            event = _cycle("closed", f"s{number - 25}", f"m{(number - 25) % 7}", f"2026-01-01T{number:08d}")
+        else:
+            event = {"type": "training", "n": number}
+        rows.append(event)
+        index.record(event)
+    newest_first = list(reversed(rows))
+
+    started = time.perf_counter()
+    for _ in range(50):
+        scanned = open_session_from_events(newest_first, "m3")
+    scan_s = (time.perf_counter() - started) / 50
+    started = time.perf_counter()
+    for _ in range(50):
+        indexed = index.open_session("m3")
+    index_s = (time.perf_counter() - started) / 50
+
+    assert scanned == indexed
+    assert index_s * 20 < scan_s, f"scan_ms={scan_s * 1000:.3f} index_ms={index_s * 1000:.4f}"
+
+
+def test_session_index_migration_is_server_only_and_read_only():
+    sql = (ROOT / "migrations" / "013_crown_session_index.sql").read_text(encoding="utf-8")
+    assert "security definer" in sql
+    assert "set search_path = public, pg_temp" in sql
+    assert "from public, anon, authenticated" in sql
+    assert "to service_role" in sql
+    assert "insert into" not in sql.lower() and "update public" not in sql.lower()
+    # PostgREST filters by `data->>'crown_session_id' = ...`, which only implies this predicate.
+    assert "where data->>'crown_session_id' is not null;" in sql
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from app.services.storage.engine import AsyncSupabaseEngine, StorageDeadlineExceeded
+from app.services.storage.factory import PersistentSupabaseStore
+
+
+class PostgRESTStandIn:
+    """Minimal local PostgREST stand-in with fixed per-request latency."""
+
+    def __init__(self, latency_s: float = 0.02, slow_path: str = "", slow_s: float = 0.0):
+        self.latency_s = latency_s
+        self.slow_path = slow_path
+        self.slow_s = slow_s
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            delay = self.slow_s if self.slow_path and request.url.path.endswith(self.slow_path) else self.latency_s
+            await asyncio.sleep(delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        if request.method == "GET" and request.url.path.endswith("/bco_players"):
+            return httpx.Response(200, json=[{"profile": {"game": "Warzone"}}], request=request)
+        if request.method == "GET":
+            return httpx.Response(200, json=[{"role": "user", "content": "hi"}], request=request)
+        return httpx.Response(201, request=request)
+
+
+def _store(stand_in: PostgRESTStandIn, *, pool: int = 32, deadline_s: float = 2.0) -> PersistentSupabaseStore:
+    store = PersistentSupabaseStore(url="https://example.supabase.co", service_role_key="server-secret")
+    store._client.close()
+    store._client = AsyncSupabaseEngine(
+        deadline_s=deadline_s,
+        max_connections=pool,
+        transport=httpx.MockTransport(stand_in),
+    )
+    return store
+
+
+def test_store_requests_keep_postgrest_contract_through_engine():
+    seen = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(204, request=request)
+
+    store = PersistentSupabaseStore(url="https://example.supabase.co", service_role_key="server-secret")
+    store._client.close()
+    store._client = AsyncSupabaseEngine(transport=httpx.MockTransport(handler))
+    try:
+        store.set_profile(123, {"rank": "Diamond"})
+        assert seen[0].url.path.endswith("/rest/v1/rpc/bco_patch_profile")
+        assert seen[0].headers["authorization"] == "Bearer server-secret"
+        assert json.loads(seen[0].content.decode("utf-8")) == {"p_chat_id": 123, "p_patch": {"rank": "Diamond"}}
+        assert store.engine_status()["completed"] == 1
+    finally:
+        store.close()
+
+
+def test_engine_is_lazy_and_closes_cleanly():
+    store = PersistentSupabaseStore(url="https://example.supabase.co", service_role_key="server-secret")
+    assert store.engine_status()["started"] is False
+    store.close()
+    store.close()
+
+
+def test_slow_call_hits_deadline_without_stalling_other_calls():
+    stand_in = PostgRESTStandIn(latency_s=0.01, slow_path="/bco_episodes", slow_s=5.0)
+    store = _store(stand_in, deadline_s=0.3)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            slow = pool.submit(store.list_episodes, 1)
+            fast = [pool.submit(store.get_profile, cid) for cid in range(6)]
+            assert all(f.result(timeout=2.0) == {"game": "Warzone"} for f in fast)
+            with pytest.raises(StorageDeadlineExceeded):
+                slow.result(timeout=3.0)
+        status = store.engine_status()
+        assert status["deadline_exceeded"] == 1 and status["completed"] >= 6
+        assert stand_in.max_in_flight >= 2
+    finally:
+        store.close()
+
+
+def test_async_callers_do_not_block_their_event_loop():
+    stand_in = PostgRESTStandIn(latency_s=0.05)
+    engine = AsyncSupabaseEngine(transport=httpx.MockTransport(stand_in), max_connections=8)
+
+    async def scenario() -> list[int]:
+        seen_in_flight: list[int] = []
+        done = asyncio.Event()
+
+        async def heartbeat():
+            while not done.is_set():
+                seen_in_flight.append(stand_in.in_flight)
+                await asyncio.sleep(0.005)
+
+        beat = asyncio.create_task(heartbeat())
+        responses = await asyncio.gather(*[
+            engine.arequest("GET", "https://example.supabase.co/rest/v1/bco_messages") for _ in range(16)
+        ])
+        done.set()
+        await beat
+        assert all(r.status_code == 200 for r in responses)
+        return seen_in_flight
+
+    try:
+        # The caller's loop kept ticking while requests were in flight on the engine.
+        assert any(count > 0 for count in asyncio.run(scenario()))
+        assert stand_in.max_in_flight <= 8
+    finally:
+        engine.close()
+
+
+@pytest.mark.skipif(not os.getenv("BCO_BENCHMARKS"), reason="benchmark; set BCO_BENCHMARKS=1 to run")
+def test_benchmark_webhook_store_path_p99_under_200_concurrent_chats():
+    """Benchmark: the Router/ConversationService store sequence for 200 chats.
+
+    Each simulated webhook turn performs the store calls of `_chat_to_brain`
+    (profile read, user write, history read, assistant write) off the event
+    loop against a 20ms PostgREST stand-in. Serialized, that is 16s of storage
+    time; the bounded pool must keep the per-turn p99 well below that.
+    """
+
+    stand_in = PostgRESTStandIn(latency_s=0.02)
+    store = _store(stand_in, pool=32)
+
+    async def turn(chat_id: int) -> float:
+        started = time.perf_counter()
+        await asyncio.to_thread(store.get_profile, chat_id)
+        await asyncio.to_thread(store.add, chat_id, "user", "где я умер?")
+        await asyncio.to_thread(store.get, chat_id)
+        await asyncio.to_thread(store.add, chat_id, "assistant", "держи высоту")
+        return time.perf_counter() - started
+
+    async def scenario() -> list[float]:
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=200))
+        return await asyncio.gather(*[turn(cid) for cid in range(200)])
+
+    try:
+        latencies = sorted(asyncio.run(scenario()))
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        assert stand_in.requests == 800
+        assert 1 < stand_in.max_in_flight <= 32
+        assert p99 < 3.0, f"p50={p50 * 1000:.0f}ms p99={p99 * 1000:.0f}ms"
+        assert store.engine_status()["errors"] == 0
+    finally:
+        store.close()
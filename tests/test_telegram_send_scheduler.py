@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from types import SimpleNamespace
+
+import httpx
+
+from app.adapters.telegram.client import TelegramClient
+from app.adapters.telegram.scheduler import TelegramSendScheduler
+from app.observability.readiness import readiness_snapshot
+
+
+class FakeBotAPI:
+    """Bot API stand-in that answers 429 when a chat or the bot sends too fast."""
+
+    def __init__(self, *, chat_interval_s: float, global_per_s: int, group_per_s: int) -> None:
+        self.chat_interval_s = chat_interval_s
+        self.global_per_s = global_per_s
+        self.group_per_s = group_per_s
+        self.last_chat: dict[int, float] = {}
+        self.window: dict[int | None, deque[float]] = {}
+        self.forced_429: dict[int, float] = {}
+        self.delivered: list[tuple[str, int, str, float]] = []
+        self.rejected = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        now = time.monotonic()
+        method = request.url.path.rsplit("/", 1)[-1]
+        payload = json.loads(request.content)
+        chat = int(payload["chat_id"])
+        if chat in self.forced_429:
+            retry_after = self.forced_429.pop(chat)
+            return self._too_many(retry_after)
+        # 5 ms of slack for timer jitter.
+        too_fast = self._over(None, self.global_per_s, now)
+        if chat < 0:
+            too_fast = self._over(chat, self.group_per_s, now) or too_fast
+        elif now - self.last_chat.get(chat, -1e9) < self.chat_interval_s - 0.005:
+            too_fast = True
+        if too_fast:
+            self.rejected += 1
+            return self._too_many(1)
+        self.last_chat[chat] = now
+        for key in (None, chat):
+            self.window.setdefault(key, deque()).append(now)
+        self.delivered.append((method, chat, str(payload.get("text") or ""), now))
+        return httpx.Response(200, json={"ok": True, "result": {"message_id": len(self.delivered)}})
+
+    def _over(self, key: int | None, limit: int, now: float) -> bool:
+        sent = self.window.get(key) or deque()
+        return sum(1 for at in sent if at > now - 0.995) >= limit
+
+    @staticmethod
+    def _too_many(retry_after: float) -> httpx.Response:
+        return httpx.Response(
+            429,
+            json={"ok": False, "error_code": 429, "description": "Too Many Requests", "parameters": {"retry_after": retry_after}},
+        )
+
+
+def _client(api: FakeBotAPI, scheduler: TelegramSendScheduler) -> TelegramClient:
+    client = TelegramClient("TEST", scheduler=scheduler)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+    return client
+
+
+def _scheduler() -> TelegramSendScheduler:
+    # Telegram's limits scaled so the test runs in about a second.
+    return TelegramSendScheduler(global_rate_per_s=12, chat_rate_per_s=20, chat_burst=1, group_limit=3, group_period_s=1.0)
+
+
+def test_bursts_stay_inside_chat_group_and_global_limits():
+    api = FakeBotAPI(chat_interval_s=0.05, global_per_s=12, group_per_s=3)
+    scheduler = _scheduler()
+
+    async def scenario() -> dict:
+        client = _client(api, scheduler)
+        depth = 0
+
+        async def watch() -> None:
+            nonlocal depth
+            while True:
+                depth = max(depth, scheduler.status()["queue_depth"])
+                await asyncio.sleep(0.005)
+
+        watcher = asyncio.create_task(watch())
+        try:
+            await asyncio.gather(
+                *(client.send_message(chat, f"m{index}") for chat in (1, 2, 3) for index in range(4)),
+                *(client.send_message(-100, f"g{index}") for index in range(4)),
+            )
+        finally:
+            watcher.cancel()
+            await client.close()
+        return {"max_depth": depth}
+
+    result = asyncio.run(scenario())
+    assert api.rejected == 0
+    assert len(api.delivered) == 16
+    for chat in (1, 2, 3):
+        texts = [text for _method, sent_to, text, _at in api.delivered if sent_to == chat]
+        assert texts == [f"m{index}" for index in range(4)]
+    group_times = [at for _method, sent_to, _text, at in api.delivered if sent_to == -100]
+    assert group_times[3] - group_times[0] >= 0.99
+    assert api.delivered[-1][3] - api.delivered[0][3] >= 0.99  # 16 sends at 12/s
+    assert result["max_depth"] >= 8
+    assert scheduler.status()["queue_depth"] == 0
+
+
+def test_429_retry_after_is_honored_and_retried():
+    api = FakeBotAPI(chat_interval_s=0.0, global_per_s=1000, group_per_s=1000)
+    api.forced_429[7] = 0.3
+    scheduler = _scheduler()
+
+    async def scenario() -> float:
+        client = _client(api, scheduler)
+        started = time.monotonic()
+        try:
+            await client.send_message(7, "after flood wait")
+        finally:
+            await client.close()
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(scenario())
+    assert elapsed >= 0.3
+    assert [text for _m, _c, text, _at in api.delivered] == ["after flood wait"]
+    status = readiness_snapshot(SimpleNamespace(), None, telegram_scheduler=scheduler)["telegram_outbound"]
+    assert status["rate_limited"] == 1 and status["sent"] == 2
+
+
+def test_stale_drafts_are_dropped_before_the_final_message():
+    api = FakeBotAPI(chat_interval_s=0.0, global_per_s=1000, group_per_s=1000)
+    scheduler = TelegramSendScheduler(chat_rate_per_s=2, chat_burst=1)
+
+    async def scenario() -> list:
+        client = _client(api, scheduler)
+        try:
+            await client.send_message(5, "warm up")  # spends the chat's burst
+            drafts = [asyncio.create_task(client.send_live_draft(5, 1, f"draft {index}")) for index in range(3)]
+            await asyncio.sleep(0.05)
+            final = asyncio.create_task(client.send_message(5, "final answer"))
+            return [*(await asyncio.gather(*drafts)), await final]
+        finally:
+            await client.close()
+
+    modes = asyncio.run(scenario())
+    assert modes == ["skipped", "skipped", "skipped", None]
+    assert [text for _m, _c, text, _at in api.delivered] == ["warm up", "final answer"]
+    assert scheduler.status()["dropped_drafts"] == 3
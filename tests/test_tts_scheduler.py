@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import wave
+from pathlib import Path
+from types import SimpleNamespace
+
+from app.observability.readiness import readiness_snapshot
+from app.services.voice.piper_backend import PiperBackend
+from app.services.voice.scheduler import TTSScheduler, tts_scheduler
+from app.services.voice.service import VoiceService
+
+
+def _write_wav(path: Path) -> Path:
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(22050)
+        wav.writeframes(b"\x10\x00\xf0\xff" * 1200)
+    return path
+
+
+def _settings(**overrides):
+    base = dict(
+        voice_enabled=True,
+        voice_high_fidelity_enabled=True,
+        voice_local_fallback_enabled=True,
+        voice_opus_bitrate_kbps=48,
+        openai_api_key="sk-test",
+    )
+    base.update(overrides)
+    return SimpleNamespace(**base)
+
+
+class SlowCloud:
+    """Cloud TTS stand-in whose renders take a fixed network-bound time."""
+
+    configured = True
+
+    def __init__(self, delay_s: float):
+        self.delay_s = delay_s
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def synthesize_wav(self, text, output_path, profile=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay_s)
+            return _write_wav(Path(output_path))
+        finally:
+            self.in_flight -= 1
+
+
+def _render_batch(
+    cloud_workers: int,
+    renders: int = 16,
+    delay_s: float = 0.08,
+    scheduler: TTSScheduler | None = None,
+) -> tuple[float, SlowCloud, TTSScheduler]:
+    cloud = SlowCloud(delay_s)
+    scheduler = scheduler or TTSScheduler()
+    service = VoiceService(
+        _settings(voice_cloud_concurrency=cloud_workers),
+        backend=object(),
+        cloud_backend=cloud,
+        scheduler=scheduler,
+    )
+
+    async def scenario() -> float:
+        started = time.perf_counter()
+        artifacts = await asyncio.gather(*[
+            service.synthesize("Держи высоту.", {"_bco_chat_id": index % 4}) for index in range(renders)
+        ])
+        elapsed = time.perf_counter() - started
+        for artifact in artifacts:
+            assert artifact.provider == "openai"
+            artifact.cleanup()
+        return elapsed
+
+    return asyncio.run(scenario()), cloud, scheduler
+
+
+def test_cloud_renders_run_up_to_the_lane_cap():
+    results = {workers: _render_batch(workers) for workers in (1, 2, 4, 8)}
+    for workers, (_elapsed, cloud, scheduler) in results.items():
+        assert cloud.max_in_flight == workers
+        assert scheduler.stats()["openai"]["cap"] == workers
+
+    assert results[1][0] >= 16 * 0.08
+    lane = results[8][2].stats()["openai"]
+    assert lane["completed"] == 16 and lane["active"] == 0 and lane["waiting"] == 0
+    assert lane["queue_wait"]["count"] == 16 and lane["render"]["count"] == 16
+    assert lane["render"]["p50_ms"] >= 80
+    # With one worker, the last render waits for all the others.
+    assert results[1][2].stats()["openai"]["queue_wait"]["max_ms"] >= 15 * 80
+
+
+def test_fair_queue_rotates_between_chats():
+    scheduler = TTSScheduler()
+    order: list[str] = []
+
+    async def render(chat: str, label: str, gate: asyncio.Event) -> None:
+        async with scheduler.slot("piper:test", chat, cap=1):
+            order.append(label)
+            await gate.wait()
+
+    async def scenario() -> None:
+        gate = asyncio.Event()
+        tasks = [asyncio.create_task(render("A", f"A{index}", gate)) for index in range(1, 5)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(render("B", f"B{index}", gate)) for index in range(1, 3)]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["piper:test"]["waiting_chats"] == 2
+        gate.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    # Chat B's replies are not stuck behind chat A's whole backlog.
+    assert order == ["A1", "A2", "B1", "A3", "B2", "A4"]
+
+
+def test_cancelled_waiter_releases_its_place():
+    scheduler = TTSScheduler()
+
+    async def scenario() -> dict:
+        gate = asyncio.Event()
+
+        async def render(chat: str) -> None:
+            async with scheduler.slot("openai", chat, cap=1):
+                await gate.wait()
+
+        holder = asyncio.create_task(render("A"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(render("B"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        gate.set()
+        await holder
+        async with scheduler.slot("openai", "C", cap=1):
+            pass
+        return scheduler.stats()["openai"]
+
+    stats = asyncio.run(scenario())
+    assert stats["active"] == 0 and stats["waiting"] == 0 and stats["completed"] == 2
+
+
+def test_piper_renders_of_one_model_run_on_a_worker_pool(tmp_path: Path):
+    state = {"in_flight": 0, "max_in_flight": 0, "loads": 0}
+    lock = threading.Lock()
+
+    class FakeVoice:
+        def synthesize_wav(self, text, wav_file, syn_config=None):
+            with lock:
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            time.sleep(0.05)
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(22050)
+            wav_file.writeframes(b"\x01\x00" * 2000)
+            with lock:
+                state["in_flight"] -= 1
+
+    backend = PiperBackend(SimpleNamespace(model_name="ru_RU-test-medium"), workers=3)
+
+    def load_voice():
+        with lock:
+            state["loads"] += 1
+        return FakeVoice()
+
+    backend._load_voice = load_voice
+    threads = [
+        threading.Thread(target=backend.synthesize_wav, args=("тест", tmp_path / f"{index}.wav", {}))
+        for index in range(9)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert state["max_in_flight"] == 3
+    assert state["loads"] == 3
+    assert backend.pool_stats() == {"ru_RU-test-medium": {"workers": 3, "loaded": 3}}
+    assert all((tmp_path / f"{index}.wav").stat().st_size > 44 for index in range(9))
+
+
+def test_readiness_reports_render_lanes():
+    _render_batch(2, renders=2, delay_s=0.0, scheduler=tts_scheduler)
+    voice = readiness_snapshot(SimpleNamespace(), None)["voice_runtime"]
+    assert voice["cloud_concurrency"] == 8
+    lane = voice["render_lanes"]["openai"]
+    assert lane["cap"] == 2 and lane["completed"] >= 2
+    assert set(lane["queue_wait"]) == {"count", "avg_ms", "p50_ms", "p95_ms", "max_ms"}
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from types import SimpleNamespace
+
+from app.services.conversation.service import ConversationService
+from app.services.profiles.service import ProfileService
+from app.services.storage.memory import InMemoryStore
+from app.services.storage.resilient import ResilientStore
+from app.services.storage.turn_snapshot import active_turn, player_turn
+
+
+class CountingStore:
+    """Persistent-primary stand-in that counts every read it serves."""
+
+    def __init__(self):
+        self.inner = InMemoryStore()
+        self.reads: Counter[str] = Counter()
+
+    def __getattr__(self, name):
+        fn = getattr(self.inner, name)
+        if not name.startswith(("get", "list")):
+            return fn
+
+        def read(*args, **kwargs):
+            self.reads[name] += 1
+            return fn(*args, **kwargs)
+
+        return read
+
+
+class _Brain:
+    settings = SimpleNamespace(
+        operator_intelligence_enabled=True,
+        adaptive_mission_control_enabled=True,
+        operator_context_bridge_enabled=True,
+    )
+
+    def __init__(self):
+        self.contexts = []
+
+    def reply(self, **kwargs):
+        self.contexts.append(kwargs["player_context"])
+        return "держи высоту"
+
+
+def _turn_setup():
+    primary = CountingStore()
+    store = ResilientStore(primary=primary, fallback=InMemoryStore())
+    profiles = ProfileService(store=store)
+    brain = _Brain()
+    service = ConversationService(brain=brain, store=store, profiles=profiles)
+    store.add_progression_event(77, {"type": "match_report", "metrics": {"kills": 3}})
+    profile = profiles.get(77)
+    primary.reads.clear()
+    return primary, store, service, brain, profile
+
+
+def test_full_chat_turn_reads_player_state_once():
+    primary, store, service, brain, profile = _turn_setup()
+    store.add(77, "user", "привет")
+    history = store.get(77)
+    primary.reads.clear()
+
+    assert service.reply(text="привет", profile=profile, history=history) == "держи высоту"
+
+    # Player memory, operator context (incl. v27/v28 progression re-reads) and
+    # the post-reply derived refresh all share one bundle and one training read.
+    assert dict(primary.reads) == {"get_player_bundle": 1, "list_training_sessions": 1}
+    assert "operator_context" in brain.contexts[-1]
+    assert active_turn(77) is None
+
+
+def test_writes_inside_the_turn_invalidate_only_what_they_change():
+    primary, store, service, brain, profile = _turn_setup()
+
+    service.reply(text="я умер на ротации, 5 киллов, как тренировать аим?", profile=profile, history=[])
+
+    # observe() records a mistake/episode/progression/training and patches the
+    # profile, so the derived refresh must read those surfaces again.
+    assert dict(primary.reads) == {"get_player_bundle": 2, "list_training_sessions": 2, "get_profile": 1}
+    derived = store.get_derived_intelligence(77)
+    assert derived["training_sessions"] == 1
+    assert derived["recent_episodes"] >= 1
+
+
+def test_turn_snapshot_invalidates_on_write_and_copies_values():
+    primary = CountingStore()
+    store = ResilientStore(primary=primary, fallback=InMemoryStore())
+    store.set_profile(5, {"game": "Warzone"})
+    with player_turn(5):
+        first = store.get_profile(5)
+        first["game"] = "mutated by caller"
+        assert store.get_profile(5) == {"game": "Warzone"}
+        store.set_profile(5, {"rank": "Diamond"})
+        assert store.get_profile(5) == {"game": "Warzone", "rank": "Diamond"}
+        store.add(5, "user", "hi")
+        store.get_profile(5)
+    assert primary.reads["get_profile"] == 2
+
+
+def test_reset_profile_drops_the_whole_player_row_from_the_turn():
+    primary = CountingStore()
+    store = ResilientStore(primary=primary, fallback=InMemoryStore())
+    store.set_summary(5, "rotates late")
+    store.set_derived_intelligence(5, {"training_sessions": 2})
+    with player_turn(5):
+        reads = ("get_profile", "get_summary", "get_derived_intelligence")
+        for name in reads:
+            getattr(store, name)(5)
+        store.reset_profile(5)
+        for name in reads:
+            getattr(store, name)(5)
+    assert [primary.reads[name] for name in reads] == [2, 2, 2]
+
+
+def test_turn_snapshot_never_serves_other_chats_or_threads():
+    primary = CountingStore()
+    store = ResilientStore(primary=primary, fallback=InMemoryStore())
+    store.set_summary(1, "chat one")
+    store.set_summary(2, "chat two")
+    seen = {}
+
+    def other_thread():
+        seen["thread_turn"] = active_turn(1)
+        seen["thread_summary"] = store.get_summary(1)
+
+    with player_turn(1):
+        assert store.get_summary(1) == "chat one"
+        assert store.get_summary(2) == "chat two"
+        assert store.get_summary(2) == "chat two"
+        worker = threading.Thread(target=other_thread)
+        worker.start()
+        worker.join()
+        assert store.get_summary(1) == "chat one"
+
+    assert seen == {"thread_turn": None, "thread_summary": "chat one"}
+    # Chat 1 once inside the turn plus once from the unscoped thread; chat 2 is
+    # never memoized by chat 1's snapshot.
+    assert primary.reads["get_summary"] == 4
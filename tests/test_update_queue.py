@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.security.usage_guard import UpdateReplayGuard
+from app.services.telegram.update_queue import ChatOrderedUpdateQueue, update_order_key
+from app.webhook import create_app
+
+
+def _msg(update_id: int, chat_id: int) -> dict:
+    return {"update_id": update_id, "message": {"chat": {"id": chat_id}, "text": f"u{update_id}"}}
+
+
+def test_updates_keep_chat_order_and_run_chats_in_parallel():
+    events: list[tuple[str, int, int]] = []
+    running: dict[int, int] = {}
+
+    async def handler(update: dict) -> None:
+        chat_id = update["message"]["chat"]["id"]
+        running[chat_id] = running.get(chat_id, 0) + 1
+        assert running[chat_id] == 1, "two updates of one chat overlapped"
+        events.append(("start", chat_id, update["update_id"]))
+        # Earlier updates are slower, so any reordering would show up.
+        await asyncio.sleep(0.03 if update["update_id"] % 10 == 1 else 0.005)
+        events.append(("end", chat_id, update["update_id"]))
+        running[chat_id] -= 1
+
+    async def scenario() -> ChatOrderedUpdateQueue:
+        queue = ChatOrderedUpdateQueue(handler, workers=4)
+        queue.start()
+        for index in range(1, 5):
+            assert queue.submit(_msg(10 + index, 1))
+            assert queue.submit(_msg(20 + index, 2))
+        assert await queue.drain(5.0)
+        return queue
+
+    queue = asyncio.run(scenario())
+    for chat_id, base in ((1, 10), (2, 20)):
+        done = [update_id for kind, chat, update_id in events if kind == "end" and chat == chat_id]
+        assert done == [base + index for index in range(1, 5)]
+    assert queue.stats()["max_in_flight"] == 2
+    assert queue.stats()["processed"] == 8
+    assert queue.stats()["pending"] == 0
+
+
+def test_bounded_queue_refuses_work_and_replay_guard_lets_retry_through():
+    async def scenario() -> tuple[ChatOrderedUpdateQueue, list[bool]]:
+        gate = asyncio.Event()
+
+        async def handler(_update: dict) -> None:
+            await gate.wait()
+
+        queue = ChatOrderedUpdateQueue(handler, workers=2, max_pending=3, max_pending_per_chat=2)
+        queue.start()
+        results = [
+            queue.submit(_msg(1, 7)),
+            queue.submit(_msg(2, 7)),
+            queue.submit(_msg(3, 7)),  # over the per-chat bound
+            queue.submit(_msg(4, 8)),
+            queue.submit(_msg(5, 9)),  # over the total bound
+        ]
+        gate.set()
+        assert await queue.drain(5.0)
+        return queue, results
+
+    queue, results = asyncio.run(scenario())
+    assert results == [True, True, False, True, False]
+    assert queue.stats()["rejected"] == 2
+    assert queue.stats()["processed"] == 3
+
+    guard = UpdateReplayGuard()
+    assert guard.accept(55)
+    guard.forget(55)
+    assert guard.accept(55)
+    assert not guard.accept(55)
+
+
+def test_drain_finishes_backlog_then_cancels_at_deadline():
+    seen: list[int] = []
+
+    async def handler(update: dict) -> None:
+        await asyncio.sleep(0.01 if update["update_id"] < 100 else 10)
+        seen.append(update["update_id"])
+
+    async def scenario() -> tuple[bool, bool, bool, ChatOrderedUpdateQueue]:
+        queue = ChatOrderedUpdateQueue(handler, workers=2)
+        queue.start()
+        for index in range(6):
+            queue.submit(_msg(index, index % 3))
+        drained = await queue.drain(5.0)
+        after_close = queue.submit(_msg(50, 1))
+        queue.start()
+        queue.submit(_msg(100, 1))
+        queue.submit(_msg(101, 1))
+        timed_out = await queue.drain(0.05)
+        return drained, after_close, timed_out, queue
+
+    drained, after_close, timed_out, queue = asyncio.run(scenario())
+    assert drained is True and sorted(seen) == list(range(6))
+    assert after_close is False
+    assert timed_out is False
+    stats = queue.stats()
+    assert stats["dropped"] == 2 and stats["pending"] == 0 and stats["active_lanes"] == 0
+
+
+def test_order_key_groups_callbacks_with_their_chat():
+    assert update_order_key(_msg(1, 42)) == "chat:42"
+    assert update_order_key({"update_id": 2, "callback_query": {"from": {"id": 9}, "message": {"chat": {"id": 42}}}}) == "chat:42"
+    assert update_order_key({"update_id": 3, "inline_query": {"from": {"id": 9}}}) == "user:9"
+    assert update_order_key({"update_id": 4}) == "update:4"
+
+
+def test_webhook_acks_before_processing_and_reports_queue():
+    app = create_app()
+    with TestClient(app) as client:
+        response = client.post("/tg/webhook", json={"update_id": 991_880_001})
+        assert response.status_code == 200
+        assert response.json() == {"ok": True, "queued": True}
+        deadline = time.monotonic() + 5
+        while True:
+            updates = client.get("/health/details").json()["telegram_updates"]
+            if updates["processed"] >= 1 or time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+    assert updates["mode"] == "queued"
+    assert updates["processed"] == 1 and updates["pending"] == 0
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import os
+import time
 from types import SimpleNamespace
 
+import pytest
+
 from app.security.usage_guard import GuardRule, UpdateReplayGuard, UsageGuard, WindowLimit
 from app.services.conversation.service import ConversationService
 
@@ -150,3 +154,66 @@ def test_conversation_guard_blocks_before_brain_generation():
     blocked = conversation.reply(text="second", profile=profile, history=[])
     assert "Слишком много AI-запросов" in blocked
     assert brain.calls == 1
+
+
+def test_usage_guard_expires_idle_buckets_first_and_caps_bytes():
+    clock = Clock()
+    guard = _guard(clock, subject_max=1000, global_max=100_000, max_buckets=200)
+
+    for chat_id in range(150):
+        assert guard.check(chat_id, "ai").allowed is True
+    clock.advance(61)
+    # The first 150 windows are over; new chats reclaim them instead of evicting live ones.
+    for chat_id in range(1000, 1300):
+        guard.check(chat_id, "ai")
+    snapshot = guard.snapshot()
+    assert snapshot["evictions"]["expired"] == 150
+    assert snapshot["evictions"]["capacity"] == 300 - 199
+    assert snapshot["active_buckets"] <= 200
+    assert snapshot["tracked_events"] == 199 + 300
+
+    small = UsageGuard(
+        enabled=True,
+        clock=clock,
+        max_buckets=100_000,
+        max_bytes=1,
+        rules={"ai": GuardRule(subject_limits=(WindowLimit(10, 60),))},
+    )
+    for chat_id in range(5000):
+        small.check(chat_id, "ai")
+    assert 0 < small.snapshot()["approx_bytes"] <= 128 * 900 + 200 * 32
+
+
+def test_usage_guard_flood_of_distinct_chat_ids_stays_bounded():
+    clock = Clock()
+    # Production-sized budgets: a spam wave is mostly refused by the global window.
+    guard = _guard(clock, subject_max=12, global_max=180, max_buckets=10_000)
+    keys = 200_000
+
+    for chat_id in range(keys):
+        guard.check(chat_id, "ai")
+        clock.now += 0.0001
+
+    snapshot = guard.snapshot()
+    assert snapshot["active_buckets"] <= 10_000
+    assert sum(snapshot["evictions"].values()) >= keys - 10_000
+    assert snapshot["evictions"]["expired"] > snapshot["evictions"].get("capacity", 0)
+    assert snapshot["tracked_events"] <= 10_000 + 180
+
+
+@pytest.mark.skipif(not os.getenv("BCO_BENCHMARKS"), reason="benchmark; set BCO_BENCHMARKS=1 to run")
+def test_benchmark_usage_guard_flood_of_distinct_chat_ids():
+    clock = Clock()
+    guard = _guard(clock, subject_max=12, global_max=180, max_buckets=10_000)
+    keys = 1_000_000
+
+    started = time.perf_counter()
+    for chat_id in range(keys):
+        guard.check(chat_id, "ai")
+        clock.now += 0.0001
+    elapsed = time.perf_counter() - started
+
+    snapshot = guard.snapshot()
+    assert snapshot["active_buckets"] <= 10_000
+    # A linear scan over 10k buckets per check lands far above this.
+    assert elapsed / keys < 50e-6, f"per_check_us={elapsed / keys * 1e6:.2f} evictions={snapshot['evictions']}"
@@ -1,8 +1,12 @@
+import os
 import subprocess
+import time
 
 import imageio_ffmpeg
+import pytest
 
-from app.services.vod.service import FrameExtractor
+from app.services.vod import service as vod_service
+from app.services.vod.service import FrameExtractor, cluster_timestamps, select_sample_timestamps
 
 
 def test_frame_extractor_works_with_bundled_ffmpeg(tmp_path):
@@ -32,3 +36,94 @@ def test_frame_extractor_works_with_bundled_ffmpeg(tmp_path):
     samples = extractor.extract(str(video), duration_s=3)
     assert len(samples) >= 2
     assert all(x.jpeg_bytes.startswith(b"\xff\xd8") for x in samples)
+
+
+def _clip(path, *, seconds: int, rate: int, size: str, gop: int):
+    subprocess.run(
+        [
+            imageio_ffmpeg.get_ffmpeg_exe(),
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-f",
+            "lavfi",
+            "-i",
+            f"testsrc2=size={size}:rate={rate}",
+            "-t",
+            str(seconds),
+            "-pix_fmt",
+            "yuv420p",
+            "-c:v",
+            "libx264",
+            "-preset",
+            "veryfast",
+            "-g",
+            str(gop),
+            "-y",
+            str(path),
+        ],
+        check=True,
+        timeout=60,
+    )
+    return path
+
+
+def test_single_pass_matches_per_timestamp_seeks_frame_for_frame(tmp_path):
+    # 1 fps: 0:01.100 and 0:01.900 both land on the frame at 2.0 s.
+    video = _clip(tmp_path / "sparse.mp4", seconds=6, rate=1, size="320x180", gop=300)
+    extractor = FrameExtractor(max_frames=6, max_width=320, timeout_s=10)
+    timecodes = ["0:01.100", "0:01.900", "0:03", "0:04.200"]
+    samples = extractor.extract(str(video), duration_s=6, requested_timecodes=timecodes)
+    timestamps = [x.timestamp_s for x in samples]
+    assert cluster_timestamps(timestamps) == [timestamps]
+
+    seeks = extractor._extract_each(extractor._ffmpeg(), video, timestamps, tmp_path)
+    assert [x.timestamp_s for x in seeks] == timestamps
+    assert [x.jpeg_bytes for x in samples] == [x.jpeg_bytes for x in seeks]
+    assert samples[0].jpeg_bytes == samples[1].jpeg_bytes
+
+
+def test_clustered_timestamps_decode_in_one_ffmpeg_run(tmp_path, monkeypatch):
+    # Long keyframe interval (screen recorders, OBS defaults) with dense
+    # samples: every per-timestamp seek re-decodes from the same keyframe.
+    video = _clip(tmp_path / "dense.mp4", seconds=12, rate=30, size="640x360", gop=300)
+    extractor = FrameExtractor(max_frames=12, max_width=640, timeout_s=30)
+    timecodes = [f"0:{second:02d}" for second in range(1, 12)]
+    timestamps = select_sample_timestamps(duration_s=12, requested_timecodes=timecodes, max_frames=12)
+    ffmpeg = extractor._ffmpeg()
+
+    runs: list[list[str]] = []
+    real_run = vod_service.subprocess.run
+
+    def counting_run(args, *a, **kw):
+        runs.append(list(args))
+        return real_run(args, *a, **kw)
+
+    monkeypatch.setattr(vod_service.subprocess, "run", counting_run)
+    seeks = extractor._extract_each(ffmpeg, video, timestamps, tmp_path)
+    per_timestamp_runs, runs[:] = len(runs), []
+    samples = extractor.extract(str(video), duration_s=12, requested_timecodes=timecodes)
+
+    assert per_timestamp_runs == len(timestamps) == len(samples)
+    assert len(runs) == len(cluster_timestamps(timestamps)) == 1
+    assert [x.timestamp_s for x in samples] == [x.timestamp_s for x in seeks]
+
+
+@pytest.mark.skipif(not os.getenv("BCO_BENCHMARKS"), reason="benchmark; set BCO_BENCHMARKS=1 to run")
+def test_benchmark_single_pass_against_per_timestamp_seeks(tmp_path):
+    video = _clip(tmp_path / "bench.mp4", seconds=12, rate=30, size="640x360", gop=300)
+    extractor = FrameExtractor(max_frames=12, max_width=640, timeout_s=30)
+    timecodes = [f"0:{second:02d}" for second in range(1, 12)]
+    timestamps = select_sample_timestamps(duration_s=12, requested_timecodes=timecodes, max_frames=12)
+
+    def best_of(fn, runs: int = 3) -> float:
+        times = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+        return min(times)
+
+    old_s = best_of(lambda: extractor._extract_each(extractor._ffmpeg(), video, timestamps, tmp_path))
+    new_s = best_of(lambda: extractor.extract(str(video), duration_s=12, requested_timecodes=timecodes))
+    assert new_s * 1.5 < old_s, f"frames={len(timestamps)} per_timestamp_s={old_s:.3f} single_pass_s={new_s:.3f}"
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.webapp import webapp_router_base as base
+from app.webapp.assets import MANIFEST_NAME, build_assets
+
+BOOT_SOURCES = ("index.html", "app.js", "bco.engine.js", "bco.live.js", "bco.operator.js", "command-center.js")
+
+
+def _boot_assets() -> list[str]:
+    """JS/CSS files a Mini App open requests, from the static boot loaders."""
+
+    found: set[str] = set()
+    for name in BOOT_SOURCES:
+        text = (base.STATIC_DIR / name).read_text(encoding="utf-8")
+        for rel in re.findall(r"/webapp/([\w./-]+\.(?:js|css))", text):
+            if (base.STATIC_DIR / rel).is_file():
+                found.add(rel)
+    return sorted(found)
+
+
+def _client(monkeypatch, dist_dir) -> TestClient:
+    monkeypatch.setattr(base, "DIST_DIR", dist_dir)
+    monkeypatch.setattr(base, "_STATIC", None)
+    monkeypatch.delenv("WEBAPP_BUILD_ID", raising=False)
+    monkeypatch.delenv("RENDER_GIT_COMMIT", raising=False)
+    app = FastAPI()
+    app.include_router(base.router)
+    return TestClient(app)
+
+
+def _wire_bytes(response) -> int:
+    return int(response.headers.get("content-length") or len(response.content))
+
+
+def test_cold_and_warm_miniapp_load_cost(monkeypatch, tmp_path):
+    assets = _boot_assets()
+    assert len(assets) >= 30
+
+    legacy = _client(monkeypatch, tmp_path / "missing")
+    index = legacy.get("/webapp")
+    assert "__BCO_ASSETS__=" not in index.text
+    cold = [legacy.get(f"/webapp/{rel}") for rel in assets]
+    legacy_cold = (1 + len(cold), _wire_bytes(index) + sum(_wire_bytes(r) for r in cold))
+    warm = [legacy.get(f"/webapp/{rel}", headers={"If-None-Match": r.headers["etag"]}) for rel, r in zip(assets, cold)]
+    assert {r.status_code for r in warm} == {304}
+    legacy_warm = (1 + len(warm), _wire_bytes(index))
+
+    manifest = build_assets(base.STATIC_DIR, tmp_path / "dist")
+    hashed = _client(monkeypatch, tmp_path / "dist")
+    index = hashed.get("/webapp")
+    urls = json.loads(re.search(r"window\.__BCO_ASSETS__=(\{.*?\});", index.text).group(1))
+    assert 'load("/webapp/dist/app.' in index.text and 'load("/webapp/app.js")' not in index.text
+    assert '"/webapp/dist/style.' in index.text
+    responses = [hashed.get(urls[f"/webapp/{rel}"], headers={"Accept-Encoding": "br, gzip"}) for rel in assets]
+    for rel, response in zip(assets, responses):
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert response.content == (base.STATIC_DIR / rel).read_bytes()
+    assert {r.headers.get("content-encoding") for r in responses} <= {"br", "gzip", None}
+    hashed_cold = (1 + len(responses), _wire_bytes(index) + sum(_wire_bytes(r) for r in responses))
+    # Immutable assets are answered from the client cache; only the HTML goes out.
+    hashed_warm = (1, _wire_bytes(index))
+
+    assert hashed_cold[1] < legacy_cold[1] * 0.5
+    assert hashed_warm[0] == 1 < legacy_warm[0]
+    assert index.text.count(manifest["build"]) >= 1
+
+
+def test_hashed_assets_negotiate_encoding_and_rebuild_deterministically(monkeypatch, tmp_path):
+    first = build_assets(base.STATIC_DIR, tmp_path / "dist")
+    assert build_assets(base.STATIC_DIR, tmp_path / "dist") == first
+    assert not any(rel.startswith("_ARCHIVE/") for rel in first["assets"])
+    entry = first["assets"]["app.base.js"]
+    assert entry["path"] == f"app.base.{entry['etag']}.js" and "gzip" in entry["encodings"]
+
+    client = _client(monkeypatch, tmp_path / "dist")
+    url = f"/webapp/dist/{entry['path']}"
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and _wire_bytes(plain) == entry["size"]
+    assert plain.headers["content-type"].startswith("application/javascript")
+    packed = client.get(url, headers={"Accept-Encoding": "gzip;q=1, br;q=0"})
+    assert packed.headers["content-encoding"] == "gzip" and packed.headers["vary"] == "Accept-Encoding"
+    assert _wire_bytes(packed) == entry["encodings"]["gzip"] and packed.content == plain.content
+    assert client.get(url, headers={"If-None-Match": plain.headers["etag"]}).status_code == 304
+    assert client.get("/webapp/dist/app.base.000000000000.js").status_code == 404
+    assert client.get("/webapp/app.js").headers["cache-control"] == "public, max-age=0, must-revalidate"
+
+    (tmp_path / "dist" / MANIFEST_NAME).write_text("{", encoding="utf-8")
+    broken = _client(monkeypatch, tmp_path / "dist")
+    assert "__BCO_ASSETS__=" not in broken.get("/webapp").text
+
+
+@pytest.mark.parametrize("name", ["app.js", "bco.engine.js", "bco.live.js", "bco.operator.js", "command-center.js"])
+def test_loaders_resolve_hashed_urls_before_build_query(name: str):
+    source = (base.STATIC_DIR / name).read_text(encoding="utf-8")
+    assert "window.__BCO_ASSETS__" in source
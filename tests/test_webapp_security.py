@@ -4,13 +4,14 @@ import json
 import time
 from urllib.parse import urlencode
 
-from app.webapp.security import verify_init_data
+from app.webapp import security
+from app.webapp.security import VerifiedInitDataCache, verify_init_data
 from app.webapp.webapp_router import _is_safe_rel_path
 
 
-def _signed_init_data(token: str) -> str:
+def _signed_init_data(token: str, auth_date: int | None = None) -> str:
     values = {
-        "auth_date": str(int(time.time())),
+        "auth_date": str(int(auth_date if auth_date is not None else time.time())),
         "query_id": "AA-test",
         "user": json.dumps({"id": 12345, "first_name": "Test"}, separators=(",", ":")),
     }
@@ -39,3 +40,72 @@ def test_static_path_traversal_blocked():
     assert _is_safe_rel_path("assets/logo.png") is True
     assert _is_safe_rel_path("../secret") is False
     assert _is_safe_rel_path("/etc/passwd") is False
+
+
+def _count_hmac(monkeypatch) -> list[int]:
+    calls = [0]
+    real_new = hmac.new
+
+    def counting_new(*args, **kwargs):
+        calls[0] += 1
+        return real_new(*args, **kwargs)
+
+    monkeypatch.setattr(security.hmac, "new", counting_new)
+    return calls
+
+
+def test_verified_init_data_is_cached_and_rejections_are_not(monkeypatch):
+    token = "123456:TEST_TOKEN"
+    monkeypatch.setattr(security, "_VERIFIED_INIT_DATA", VerifiedInitDataCache(max_entries=2))
+    raw = _signed_init_data(token)
+    tampered = raw.replace("Test", "Hacker")
+    stale = _signed_init_data(token, auth_date=int(time.time()) - 90000)
+    calls = _count_hmac(monkeypatch)
+
+    first = verify_init_data(raw, token=token)
+    assert calls[0] == 2
+    for _ in range(5):
+        assert verify_init_data(raw, token=token) == first
+    assert calls[0] == 2  # served from the cache
+    first[1]["user_id"] = 0
+    assert verify_init_data(raw, token=token)[1]["user_id"] == 12345
+
+    # A tampered copy of a cached payload, a different token, or a stale
+    # auth_date are all checked in full on first use and never cached.
+    for _ in range(2):
+        assert verify_init_data(tampered, token=token) == (False, {})
+        assert verify_init_data(raw, token="654321:OTHER") == (False, {})
+        assert verify_init_data(stale, token=token) == (False, {})
+    assert calls[0] == 2 + 3 * 2 * 2
+    assert security.init_data_cache_status()["entries"] == 1
+
+
+def test_cached_init_data_expires_with_auth_date(monkeypatch):
+    token = "123456:TEST_TOKEN"
+    monkeypatch.setattr(security, "_VERIFIED_INIT_DATA", VerifiedInitDataCache())
+    now = [time.time()]
+    monkeypatch.setattr(security.time, "time", lambda: now[0])
+    raw = _signed_init_data(token, auth_date=int(now[0]))
+    assert verify_init_data(raw, token=token)[0] is True
+    assert verify_init_data(raw, token=token, max_age_sec=60)[0] is True
+
+    now[0] += 120
+    assert verify_init_data(raw, token=token, max_age_sec=60) == (False, {})
+    assert verify_init_data(raw, token=token)[0] is True  # full check again, still within a day
+    now[0] += 86400
+    assert verify_init_data(raw, token=token) == (False, {})
+    assert verify_init_data(raw, token=token) == (False, {})
+    status = security.init_data_cache_status()
+    assert status["expired"] == 2 and status["entries"] == 0
+
+
+def test_repeat_calls_of_one_session_hit_the_cache(monkeypatch):
+    token = "123456:TEST_TOKEN"
+    monkeypatch.setattr(security, "_VERIFIED_INIT_DATA", VerifiedInitDataCache())
+    sessions = [_signed_init_data(token, auth_date=int(time.time()) - offset) for offset in range(3)]
+    for _ in range(10):
+        for raw in sessions:
+            assert verify_init_data(raw, token=token)[0] is True
+
+    status = security.init_data_cache_status()
+    assert (status["misses"], status["hits"], status["entries"]) == (3, 27, 3)
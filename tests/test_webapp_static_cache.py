@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import FileResponse, Response
+from fastapi.testclient import TestClient
+
+from app.webapp import webapp_router_base as base
+from app.webapp.assets import build_assets
+
+ASSETS = ("app.js", "app.base.js", "bco.engine.js", "style.css", "command-center.css", "bco.live.js")
+
+
+def _static_copy(monkeypatch, tmp_path) -> Path:
+    static_dir = tmp_path / "static"
+    shutil.copytree(base.STATIC_DIR, static_dir, ignore=shutil.ignore_patterns("_ARCHIVE"))
+    monkeypatch.setattr(base, "STATIC_DIR", static_dir)
+    monkeypatch.setattr(base, "INDEX_FILE", static_dir / "index.html")
+    monkeypatch.setattr(base, "DIST_DIR", tmp_path / "dist")
+    monkeypatch.setattr(base, "_STATIC", None)
+    monkeypatch.setenv("WEBAPP_BUILD_ID", "cache-test")
+    return static_dir
+
+
+def _client(*routers) -> TestClient:
+    app = FastAPI()
+    for router in routers:
+        app.include_router(router)
+    return TestClient(app)
+
+
+def _disk_route(static_dir: Path):
+    """The per-request filesystem path the table replaced, kept as the baseline."""
+
+    router = APIRouter()
+
+    @router.get("/disk/{req_path:path}")
+    def disk(req_path: str):
+        target = (static_dir / req_path).resolve()
+        target.relative_to(static_dir)
+        if not target.exists() or not target.is_file():
+            return Response(status_code=404, content="Not Found")
+        st = target.stat()
+        etag = f"{target.name}:{int(st.st_mtime)}:{st.st_size}"
+        return FileResponse(path=str(target), headers={"ETag": etag})
+
+    return router
+
+
+def test_static_routes_serve_from_memory_without_filesystem_calls(monkeypatch, tmp_path):
+    static_dir = _static_copy(monkeypatch, tmp_path)
+    client = _client(base.router)
+    status = base.reload_static_assets()
+    assert status["build"] == "cache-test" and status["disk_files"] == 0 and status["index"] is True
+
+    stats: list[str] = []
+    real_stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda path, *a, **kw: stats.append(str(path)) or real_stat(path, *a, **kw))
+    index = client.get("/webapp")
+    script = client.get("/webapp/app.js")
+    assert client.get("/webapp/./app.js").content == script.content
+    assert client.get("/webapp/app.js", headers={"If-None-Match": script.headers["etag"]}).status_code == 304
+    assert client.get("/webapp/missing.js").status_code == 404
+    assert client.get("/webapp/../secret.txt").status_code in {400, 404}
+    assert stats == []
+    monkeypatch.setattr(os, "stat", real_stat)
+
+    assert "cache-test" in index.text and index.headers["cache-control"].startswith("no-store")
+    assert script.content == (static_dir / "app.js").read_bytes()
+    assert script.headers["content-type"].split(";")[0] in {"text/javascript", "application/javascript"}
+
+    # Disk edits only show up after the explicit reload.
+    (static_dir / "app.js").write_text("// edited\n", encoding="utf-8")
+    assert client.get("/webapp/app.js").content == script.content
+    base.reload_static_assets()
+    edited = client.get("/webapp/app.js")
+    assert edited.content == b"// edited\n" and edited.headers["etag"] != script.headers["etag"]
+
+
+def test_byte_budget_keeps_the_rest_on_disk(monkeypatch, tmp_path):
+    static_dir = _static_copy(monkeypatch, tmp_path)
+    build_assets(static_dir, tmp_path / "dist")
+    monkeypatch.setattr(base, "_STATIC_CACHE_MAX_BYTES", 64 * 1024)
+    client = _client(base.router)
+    status = base.reload_static_assets()
+    assert 0 < status["memory_bytes"] <= 64 * 1024 and status["disk_files"] > 0 and status["hashed"] > 0
+
+    for rel in ASSETS:
+        assert client.get(f"/webapp/{rel}").content == (static_dir / rel).read_bytes()
+    assert "__BCO_ASSETS__=" in client.get("/webapp").text
+    assert client.get("/webapp/health").json()["static_assets"]["disk_files"] == status["disk_files"]
+
+
+def test_static_routes_make_no_stat_calls_where_the_disk_route_did(monkeypatch, tmp_path):
+    static_dir = _static_copy(monkeypatch, tmp_path)
+    client = _client(base.router, _disk_route(static_dir.resolve()))
+    base.reload_static_assets()
+    stats = [0]
+    real_stat = os.stat
+
+    def counting_stat(path, *args, **kwargs):
+        stats[0] += 1
+        return real_stat(path, *args, **kwargs)
+
+    def stats_per_request(prefix: str) -> float:
+        stats[0] = 0
+        monkeypatch.setattr(os, "stat", counting_stat)
+        for rel in ASSETS:
+            response = client.get(f"{prefix}{rel}")
+            assert response.status_code == 200 and response.content == (static_dir / rel).read_bytes()
+        monkeypatch.setattr(os, "stat", real_stat)
+        return stats[0] / len(ASSETS)
+
+    assert stats_per_request("/webapp/") == 0 < stats_per_request("/disk/")
+
+
+@pytest.mark.skipif(not os.getenv("BCO_BENCHMARKS"), reason="benchmark; set BCO_BENCHMARKS=1 to run")
+def test_static_route_throughput_benchmark(monkeypatch, tmp_path):
+    static_dir = _static_copy(monkeypatch, tmp_path)
+    client = _client(base.router, _disk_route(static_dir.resolve()))
+    base.reload_static_assets()
+    rounds = 40
+
+    def rate(prefix: str) -> float:
+        for rel in ASSETS:
+            assert client.get(f"{prefix}{rel}").status_code == 200
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for rel in ASSETS:
+                client.get(f"{prefix}{rel}")
+        return rounds * len(ASSETS) / (time.perf_counter() - started)
+
+    disk, memory = rate("/disk/"), rate("/webapp/")
+    assert memory > disk * 0.8, f"disk {disk:.0f} req/s -> memory {memory:.0f} req/s over {len(ASSETS)} assets"